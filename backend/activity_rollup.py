@@ -0,0 +1,266 @@
+"""
+일별 활동 집계(rollup) 관리
+키워드/제목/콘텐츠/포스팅이 생성될 때 (user_id, site_id, day) 집계 행을 같은 트랜잭션에서 증분 갱신하여
+대시보드 / 생산성 지표 / 사이트 통계가 이력 테이블을 스캔하지 않고 O(일수) 행만 읽도록 함
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import select, update, delete, insert, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import DailyActivityRollup, Keyword, GeneratedTitle, GeneratedContent, Site, ArchivedRow
+from logger import app_logger
+
+# 사이트와 무관한 활동의 site_id (NULL 은 기본키/UNIQUE 비교에서 서로 다른 값이 되므로 빈 문자열 사용)
+NO_SITE = ""
+
+METRICS = (
+    "keywords_count",
+    "titles_count",
+    "contents_count",
+    "posts_published_count",
+    "posts_failed_count",
+)
+
+# 쓰기 지연 배처로 기록되는 테이블 → 증분할 집계 컬럼
+TABLE_METRICS = {
+    Keyword.__tablename__: "keywords_count",
+    GeneratedTitle.__tablename__: "titles_count",
+    GeneratedContent.__tablename__: "contents_count",
+}
+
+# ON CONFLICT DO UPDATE 를 지원하는 방언별 INSERT 생성자
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+RollupKey = Tuple[str, str, date]
+Increments = Dict[RollupKey, Dict[str, int]]
+
+def rollup_today() -> date:
+    """집계 기준 날짜 (created_at server_default 와 같은 UTC 기준)"""
+    return datetime.utcnow().date()
+
+def add_increment(
+    increments: Increments,
+    user_id: Any,
+    site_id: Optional[str] = None,
+    day: Optional[date] = None,
+    **counts: int
+) -> None:
+    """증분 누적 (같은 키는 한 번의 UPSERT 로 합쳐짐)"""
+    if user_id is None:
+        return
+    unknown = set(counts) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown rollup metrics: {sorted(unknown)}")
+    
+    key = (str(user_id), site_id or NO_SITE, day or rollup_today())
+    bucket = increments.setdefault(key, {})
+    for metric, amount in counts.items():
+        if amount:
+            bucket[metric] = bucket.get(metric, 0) + amount
+
+def _upsert_statement(dialect_name: str, key: RollupKey, counts: Dict[str, int]):
+    """INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col (미지원 방언은 None)"""
+    insert_fn = _UPSERT_INSERTS.get(dialect_name)
+    if insert_fn is None:
+        return None
+    
+    user_id, site_id, day = key
+    stmt = insert_fn(DailyActivityRollup).values(
+        user_id=user_id,
+        site_id=site_id,
+        day=day,
+        **{metric: counts.get(metric, 0) for metric in METRICS}
+    )
+    set_ = {
+        metric: getattr(DailyActivityRollup, metric) + getattr(stmt.excluded, metric)
+        for metric in counts
+    }
+    set_["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=["user_id", "site_id", "day"], set_=set_)
+
+def _increment_statement(key: RollupKey, counts: Dict[str, int]):
+    """UPSERT 미지원 방언용 UPDATE (영향 행이 없으면 INSERT)"""
+    user_id, site_id, day = key
+    return update(DailyActivityRollup).where(
+        DailyActivityRollup.user_id == user_id,
+        DailyActivityRollup.site_id == site_id,
+        DailyActivityRollup.day == day
+    ).values(
+        updated_at=func.now(),
+        **{metric: getattr(DailyActivityRollup, metric) + amount for metric, amount in counts.items()}
+    )
+
+def _insert_statement(key: RollupKey, counts: Dict[str, int]):
+    user_id, site_id, day = key
+    return insert(DailyActivityRollup).values(
+        user_id=user_id,
+        site_id=site_id,
+        day=day,
+        **{metric: counts.get(metric, 0) for metric in METRICS}
+    )
+
+def _pending(increments: Increments) -> List[Tuple[RollupKey, Dict[str, int]]]:
+    """비어 있지 않은 증분을 키 순서대로 (동시 트랜잭션의 행 잠금 순서를 맞춰 교착 방지)"""
+    return sorted((key, counts) for key, counts in increments.items() if counts)
+
+def apply_increments(session: Session, increments: Increments) -> None:
+    """동기 세션에 증분 반영 - 커밋은 호출자 트랜잭션에서 수행"""
+    dialect_name = session.get_bind().dialect.name
+    for key, counts in _pending(increments):
+        stmt = _upsert_statement(dialect_name, key, counts)
+        if stmt is not None:
+            session.execute(stmt)
+            continue
+        if session.execute(_increment_statement(key, counts)).rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(_insert_statement(key, counts))
+        except IntegrityError:
+            # 다른 트랜잭션이 먼저 행을 만든 경우
+            session.execute(_increment_statement(key, counts))
+
+async def apply_increments_async(db: AsyncSession, increments: Increments) -> None:
+    """비동기 세션에 증분 반영 - 커밋은 호출자 트랜잭션에서 수행"""
+    dialect_name = db.get_bind().dialect.name
+    for key, counts in _pending(increments):
+        stmt = _upsert_statement(dialect_name, key, counts)
+        if stmt is not None:
+            await db.execute(stmt)
+            continue
+        if (await db.execute(_increment_statement(key, counts))).rowcount:
+            continue
+        try:
+            async with db.begin_nested():
+                await db.execute(_insert_statement(key, counts))
+        except IntegrityError:
+            await db.execute(_increment_statement(key, counts))
+
+async def record_activity(
+    db: AsyncSession,
+    user_id: Any,
+    site_id: Optional[str] = None,
+    **counts: int
+) -> None:
+    """요청 경로에서 생성한 항목을 같은 트랜잭션으로 집계 (예: contents_count=1)"""
+    increments: Increments = {}
+    add_increment(increments, user_id, site_id, **counts)
+    await apply_increments_async(db, increments)
+
+def batcher_flush_hook(session: Session, buffers: Dict[Any, List[Dict[str, Any]]]) -> None:
+    """쓰기 지연 배처 플러시 훅 - INSERT 와 같은 트랜잭션에서 집계 갱신
+    (created_at 은 server_default 이므로 오늘 날짜로 집계)"""
+    increments: Increments = {}
+    for table, rows in buffers.items():
+        metric = TABLE_METRICS.get(table.name)
+        if metric is None:
+            continue
+        for row in rows:
+            add_increment(increments, row.get("created_by"), **{metric: 1})
+    apply_increments(session, increments)
+
+def _period_filters(user_id: Any, days: Optional[int], site_id: Optional[str]) -> list:
+    filters = [DailyActivityRollup.user_id == str(user_id)]
+    if site_id is not None:
+        filters.append(DailyActivityRollup.site_id == site_id)
+    if days is not None:
+        # 오늘을 포함한 최근 N일
+        filters.append(DailyActivityRollup.day > rollup_today() - timedelta(days=days))
+    return filters
+
+async def get_activity_totals(
+    db: AsyncSession,
+    user_id: Any,
+    days: Optional[int] = None,
+    site_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """기간 합계 (days=None 이면 전체 기간, site_id=None 이면 모든 사이트)"""
+    row = (await db.execute(
+        select(
+            *[func.coalesce(func.sum(getattr(DailyActivityRollup, metric)), 0) for metric in METRICS],
+            func.max(DailyActivityRollup.updated_at)
+        ).where(*_period_filters(user_id, days, site_id))
+    )).one()
+    
+    totals: Dict[str, Any] = {metric: int(value) for metric, value in zip(METRICS, row)}
+    totals["last_activity"] = row[-1]
+    return totals
+
+def _as_date(value: Any) -> Optional[date]:
+    """DATE() 결과 정규화 (SQLite 는 문자열, PostgreSQL 은 date 객체)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def rebuild_rollups(session: Session) -> int:
+    """이력 테이블에서 집계 테이블 재구성 (최초 도입 / 불일치 복구용), 생성된 집계 행 수 반환
+    
+    키워드/제목/콘텐츠는 생성일별로 다시 세고, 자동화로 누적된 사이트 카운터는
+    일별 이력이 없으므로 사이트의 마지막 갱신일 한 행으로 옮긴다.
+    """
+    increments: Increments = {}
+    
+    for model in (Keyword, GeneratedTitle, GeneratedContent):
+        metric = TABLE_METRICS[model.__tablename__]
+        rows = session.execute(
+            select(model.created_by, func.date(model.created_at).label("day"), func.count().label("count"))
+            .where(model.created_by.isnot(None))
+            .group_by(model.created_by, "day")
+        ).all()
+        for user_id, day, count in rows:
+            add_increment(increments, user_id, NO_SITE, _as_date(day), **{metric: count})
+    
+    # 보관 계층으로 옮겨진 행도 포함 (created_at 은 ISO 문자열로 보관)
+    archived = session.execute(
+        select(
+            ArchivedRow.table_name,
+            ArchivedRow.created_by,
+            func.substr(ArchivedRow.created_at, 1, 10).label("day"),
+            func.count().label("count")
+        )
+        .where(ArchivedRow.table_name.in_(TABLE_METRICS), ArchivedRow.created_by.isnot(None))
+        .group_by(ArchivedRow.table_name, ArchivedRow.created_by, "day")
+    ).all()
+    for table_name, user_id, day, count in archived:
+        add_increment(increments, user_id, NO_SITE, _as_date(day), **{TABLE_METRICS[table_name]: count})
+    
+    sites = session.execute(
+        select(
+            Site.id,
+            Site.created_by,
+            func.coalesce(Site.updated_at, Site.created_at),
+            Site.total_keywords_generated,
+            Site.total_titles_generated,
+            Site.total_posts_generated,
+            Site.total_posts_published
+        ).where(Site.created_by.isnot(None))
+    ).all()
+    for site_id, user_id, last_activity, keywords, titles, contents, published in sites:
+        add_increment(
+            increments, user_id, site_id, _as_date(last_activity),
+            keywords_count=keywords or 0,
+            titles_count=titles or 0,
+            contents_count=contents or 0,
+            posts_published_count=published or 0
+        )
+    
+    session.execute(delete(DailyActivityRollup))
+    apply_increments(session, increments)
+    session.commit()
+    
+    app_logger.info(f"활동 집계 재구성 완료: {len(increments)}행")
+    return len(increments)
@@ -10,6 +10,10 @@ from dataclasses import dataclass
 from datetime import datetime
 import asyncio
 
+from seo_scoring import score_document, score_title
+from title_lexicon import title_lexicon
+from generation_seed import generation_rng
+
 @dataclass
 class BlogTitle:
     title: str
@@ -28,8 +32,39 @@ class BlogContent:
     readability_score: int
     geo_optimization_score: int
 
+# 제목 바이럴/GEO 점수 어휘 범주와 배점 (범주별로 하나라도 있으면 가산)
+TITLE_SCORE_LEXICON = {
+    "blog.emotional": ["놀라운", "충격", "대박", "인생", "바뀌었다", "후기"],
+    "blog.curiosity": ["비밀", "진실", "이유", "왜", "어떻게"],
+    "blog.trend": ["요즘", "핫한", "MZ세대", "올해", "2025"],
+    "blog.personal": ["후기", "경험", "써봤더니", "해봤더니"],
+    "blog.urgency": ["지금", "당장", "오늘", "즉시"],
+    "blog.negative": ["실패", "후회", "망한", "위험"],
+    "blog.geo_ai_friendly": ["전문가", "연구", "분석", "데이터", "입증", "밝히는", "완벽", "가이드"],
+    "blog.geo_authority": ["완벽", "전문", "마스터", "비밀", "진실"],
+    "blog.geo_comprehensive": ["모든 것", "총정리", "완벽", "전체", "종합"],
+    "blog.geo_recency": ["2025", "최신", "새로운", "요즘"]
+}
+VIRAL_SCORE_POINTS = {
+    "blog.emotional": 25,
+    "blog.curiosity": 20,
+    "blog.trend": 20,
+    "blog.personal": 15,
+    "blog.urgency": 10,
+    "blog.negative": 10
+}
+GEO_SCORE_POINTS = {
+    "blog.geo_ai_friendly": 30,
+    "blog.geo_authority": 25,
+    "blog.geo_comprehensive": 20,
+    "blog.geo_recency": 10
+}
+
 class AdvancedBlogWriter:
     def __init__(self):
+        # 제목 점수 어휘 - 한 번의 스캔으로 모든 범주 판정 (지침 저장소에서 범주 단위 교체 가능)
+        title_lexicon.register_defaults(TITLE_SCORE_LEXICON)
+        
         # LSI 키워드 데이터베이스
         self.lsi_keywords_db = {
             "운동": ["헬스", "피트니스", "다이어트", "근육", "유산소", "무산소", "스트레칭", "웨이트"],
@@ -71,14 +106,23 @@ class AdvancedBlogWriter:
             "MZ세대", "GenZ", "AI", "디지털", "온라인", "스마트", "지속가능한"
         ]
 
-    async def generate_blog_content(self, keyword: str) -> Dict[str, Any]:
-        """키워드 기반 완전 자동 블로그 콘텐츠 생성"""
+    async def generate_blog_content(
+        self,
+        keyword: str,
+        variation: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ) -> Dict[str, Any]:
+        """키워드 기반 완전 자동 블로그 콘텐츠 생성
+
+        variation 을 주거나 결정적 모드면 같은 키워드에 같은 글 (변형 번호마다 다른 글)
+        """
+        rng = rng or generation_rng("advanced_blog", keyword, variation=variation)
         
         # 1단계: SEO 검색 의도 + GEO 인용 가능성 기반 서브주제 추출
         subtopics = self._extract_subtopics(keyword)
         
         # 2단계: SEO + GEO 최적화 제목 3개 생성
-        title_candidates = self._generate_optimized_titles(keyword, subtopics)
+        title_candidates = self._generate_optimized_titles(keyword, subtopics, rng)
         
         # 3단계: 최고 점수 제목 선택
         best_title = max(title_candidates, key=lambda x: x.total_score)
@@ -91,7 +135,8 @@ class AdvancedBlogWriter:
             best_title.title, 
             keyword, 
             subtopics, 
-            lsi_keywords
+            lsi_keywords,
+            rng
         )
         
         return {
@@ -169,8 +214,9 @@ class AdvancedBlogWriter:
         
         return specific_subtopics
 
-    def _generate_optimized_titles(self, keyword: str, subtopics: List[str]) -> List[BlogTitle]:
+    def _generate_optimized_titles(self, keyword: str, subtopics: List[str], rng: Optional[random.Random] = None) -> List[BlogTitle]:
         """SEO + GEO 최적화 제목 3개 생성"""
+        rng = rng or random
         
         title_templates = [
             # SEO 강화형
@@ -195,7 +241,7 @@ class AdvancedBlogWriter:
         ]
         
         titles = []
-        selected_templates = random.sample(title_templates, 3)
+        selected_templates = rng.sample(title_templates, 3)
         
         for template in selected_templates:
             title_obj = BlogTitle(
@@ -233,21 +279,23 @@ class AdvancedBlogWriter:
         
         lsi_keywords.extend(general_lsi[:3])
         
-        return list(set(lsi_keywords))[:10]  # 중복 제거 후 최대 10개
+        return list(dict.fromkeys(lsi_keywords))[:10]  # 중복 제거 후 최대 10개 (순서 유지 - 시드가 같으면 같은 선택)
 
-    def _generate_full_content(self, title: str, keyword: str, subtopics: List[str], lsi_keywords: List[str]) -> BlogContent:
+    def _generate_full_content(self, title: str, keyword: str, subtopics: List[str], lsi_keywords: List[str],
+                               rng: Optional[random.Random] = None) -> BlogContent:
         """SEO + GEO 완전 최적화 블로그 본문 생성"""
+        rng = rng or random
         
         # 인용 구문 선택
-        citation = random.choice(self.citation_phrases)
-        secondary_citation = random.choice(self.citation_phrases)
+        citation = rng.choice(self.citation_phrases)
+        secondary_citation = rng.choice(self.citation_phrases)
         
         # 감정 키워드 선택
-        emotional_word = random.choice(self.emotional_keywords["호기심"])
-        trust_word = random.choice(self.emotional_keywords["신뢰성"])
+        emotional_word = rng.choice(self.emotional_keywords["호기심"])
+        trust_word = rng.choice(self.emotional_keywords["신뢰성"])
         
         # 트렌드 키워드 선택
-        trend_word = random.choice(self.trend_keywords)
+        trend_word = rng.choice(self.trend_keywords)
         
         # 본문 구성
         content_sections = []
@@ -266,8 +314,8 @@ class AdvancedBlogWriter:
         for i, subtopic in enumerate(subtopics, 1):
             
             # LSI 키워드 자연스럽게 삽입
-            section_lsi = random.choice(lsi_keywords) if lsi_keywords else keyword
-            section_citation = random.choice(self.citation_phrases)
+            section_lsi = rng.choice(lsi_keywords) if lsi_keywords else keyword
+            section_citation = rng.choice(self.citation_phrases)
             
             section_content = f"""
 ## {i}. {subtopic}
@@ -304,8 +352,9 @@ class AdvancedBlogWriter:
         # 메타데이터 계산
         word_count = len(full_content.replace(" ", ""))
         seo_keywords = [keyword] + lsi_keywords[:5]
-        readability_score = self._calculate_readability_score(full_content)
-        geo_score = self._calculate_content_geo_score(full_content)
+        scores = score_document(full_content, keyword=keyword, title=title)
+        readability_score = int(scores["readability_score"])
+        geo_score = int(scores["geo_score"])
         
         return BlogContent(
             title=title,
@@ -318,144 +367,24 @@ class AdvancedBlogWriter:
         )
 
     def _calculate_seo_score(self, title: str, keyword: str) -> int:
-        """SEO 점수 계산"""
-        score = 0
-        
-        # 키워드 포함 여부
-        if keyword in title:
-            score += 25
-        
-        # 제목 길이 (25-60자가 최적)
-        title_length = len(title)
-        if 25 <= title_length <= 60:
-            score += 20
-        elif 20 <= title_length <= 70:
-            score += 15
-        
-        # 숫자 포함 (클릭률 증가)
-        if any(char.isdigit() for char in title):
-            score += 15
-        
-        # 감정 유발 키워드
-        emotion_words = ["완벽", "꿀팁", "비밀", "놀라운", "쉬운", "간단한"]
-        if any(word in title for word in emotion_words):
-            score += 15
-        
-        # 연도 포함 (최신성)
-        if "2025" in title or "올해" in title:
-            score += 10
-        
-        # 질문형/느낌표
-        if "?" in title or "!" in title:
-            score += 10
-        
-        return min(score, 100)
+        """SEO 점수 계산 (공통 점수 엔진의 제목 기준)"""
+        return int(score_title(title, keyword))
 
     def _calculate_geo_score(self, title: str) -> int:
         """GEO (생성형 엔진 최적화) 점수 계산"""
-        score = 0
-        
-        # AI 인용 친화적 키워드
-        ai_friendly_words = ["전문가", "연구", "분석", "데이터", "입증", "밝히는", "완벽", "가이드"]
-        if any(word in title for word in ai_friendly_words):
-            score += 30
-        
-        # 권위성 표현
-        authority_words = ["완벽", "전문", "마스터", "비밀", "진실"]
-        if any(word in title for word in authority_words):
-            score += 25
-        
-        # 포괄적 표현 (AI가 좋아함)
-        comprehensive_words = ["모든 것", "총정리", "완벽", "전체", "종합"]
-        if any(word in title for word in comprehensive_words):
-            score += 20
+        matches = title_lexicon.scan(title)
+        score = sum(points for category, points in GEO_SCORE_POINTS.items() if matches.any(category))
         
         # 구체적 수치
         if any(char.isdigit() for char in title):
             score += 15
         
-        # 최신성 (AI가 최신 정보 선호)
-        if any(word in title for word in ["2025", "최신", "새로운", "요즘"]):
-            score += 10
-        
         return min(score, 100)
 
     def _calculate_viral_score(self, title: str) -> int:
-        """바이럴 잠재력 점수 계산"""
-        score = 0
-        
-        # 감정 유발 키워드
-        emotional_words = ["놀라운", "충격", "대박", "인생", "바뀌었다", "후기"]
-        if any(word in title for word in emotional_words):
-            score += 25
-        
-        # 호기심 유발
-        curiosity_words = ["비밀", "진실", "이유", "왜", "어떻게"]
-        if any(word in title for word in curiosity_words):
-            score += 20
-        
-        # 트렌드 키워드
-        trend_words = ["요즘", "핫한", "MZ세대", "올해", "2025"]
-        if any(word in title for word in trend_words):
-            score += 20
-        
-        # 개인적 경험
-        personal_words = ["후기", "경험", "써봤더니", "해봤더니"]
-        if any(word in title for word in personal_words):
-            score += 15
-        
-        # 시간 제한성
-        urgency_words = ["지금", "당장", "오늘", "즉시"]
-        if any(word in title for word in urgency_words):
-            score += 10
-        
-        # 부정적 호기심
-        negative_words = ["실패", "후회", "망한", "위험"]
-        if any(word in title for word in negative_words):
-            score += 10
-        
-        return min(score, 100)
-
-    def _calculate_readability_score(self, content: str) -> int:
-        """가독성 점수 계산"""
-        score = 80  # 기본 점수
-        
-        # 문장 길이 체크
-        sentences = content.split('.')
-        avg_sentence_length = sum(len(s) for s in sentences) / len(sentences) if sentences else 0
-        
-        if 20 <= avg_sentence_length <= 40:
-            score += 10
-        elif avg_sentence_length > 60:
-            score -= 15
-        
-        # 문단 구조 체크
-        paragraphs = content.split('\n\n')
-        if len(paragraphs) >= 4:
-            score += 10
-        
-        return min(max(score, 0), 100)
-
-    def _calculate_content_geo_score(self, content: str) -> int:
-        """콘텐츠 GEO 최적화 점수"""
-        score = 0
-        
-        # 인용 친화적 표현 개수
-        citation_count = sum(1 for phrase in self.citation_phrases if phrase in content)
-        score += min(citation_count * 15, 45)
-        
-        # 구조화된 정보 (리스트, 번호)
-        if '•' in content or '**' in content:
-            score += 20
-        
-        # 헤딩 구조
-        heading_count = content.count('##')
-        score += min(heading_count * 10, 30)
-        
-        # 구체적 수치/데이터
-        if any(char.isdigit() for char in content):
-            score += 5
-        
+        """바이럴 잠재력 점수 계산 (범주별로 하나라도 있으면 가산)"""
+        matches = title_lexicon.scan(title)
+        score = sum(points for category, points in VIRAL_SCORE_POINTS.items() if matches.any(category))
         return min(score, 100)
 
     def _categorize_keyword(self, keyword: str) -> str:
@@ -6,10 +6,14 @@ SEO, 바이럴성, 시의성, 클릭 유도 요소를 모두 반영한 전문적
 import re
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from dataclasses import dataclass
 import asyncio
 
+from title_lexicon import title_lexicon
+from title_ranking import rank_candidates, candidate_budget
+from generation_seed import generation_rng
+
 @dataclass
 class TitleTemplate:
     format_type: str  # 질문형, 리스트형, How-to형, 비교형, 공감형
@@ -51,6 +55,16 @@ class AdvancedTitleGenerator:
         self.negative_words = [
             "실패", "포기", "불가능", "어려운", "복잡한", "귀찮은", "힘든"
         ]
+        
+        # 제목 점수 어휘 - 한 번의 스캔으로 모든 범주 판정 (지침 저장소에서 범주 단위 교체 가능)
+        title_lexicon.register_defaults({
+            "advanced.click_bait": self.click_baits,
+            "advanced.click": ["?", "!", "이유", "방법", "비법"],
+            "advanced.curiosity": self.emotion_triggers["호기심"],
+            "advanced.viral": dict.fromkeys(["놀라운", "충격", "대박", "꿀팁", "비밀", "독점"], 10),
+            "advanced.trend": self.trend_keywords,
+            "advanced.timely": dict.fromkeys(self.seasonal_keywords["current"] + ["2025", "요즘", "지금", "올해"], 15)
+        })
     
     def _get_seasonal_keywords(self) -> Dict[str, List[str]]:
         """현재 계절에 맞는 키워드 반환"""
@@ -135,14 +149,23 @@ class AdvancedTitleGenerator:
             TitleTemplate("경험형", "{keyword} 3개월 도전기 공개", "도전", 3, 3)
         ]
     
-    async def generate_optimized_titles(self, keyword: str, count: int = 5) -> List[Dict[str, Any]]:
+    async def generate_optimized_titles(
+        self,
+        keyword: str,
+        count: int = 5,
+        variation: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[Dict[str, Any]]:
         """
         키워드를 기반으로 최적화된 블로그 제목 생성
         
         Args:
             keyword: 기본 키워드
             count: 생성할 제목 개수
+            variation: 변형 번호 - 주거나 결정적 모드면 같은 입력에 같은 제목
+            rng: 직접 넘기는 Random (없으면 입력 지문으로 만듦)
         """
+        rng = rng or generation_rng("advanced_titles", keyword, count, variation=variation)
         
         # 키워드 분석 및 확장
         analyzed_keyword = self._analyze_keyword(keyword)
@@ -151,35 +174,30 @@ class AdvancedTitleGenerator:
         # 시의성 키워드 추가
         timely_keywords = self._get_timely_keywords()
         
-        # 다양한 템플릿으로 제목 생성
-        generated_titles = []
-        
-        # 템플릿 타입별로 균등하게 분배
-        template_types = list(set(t.format_type for t in self.title_templates))
-        templates_per_type = max(1, count // len(template_types))
-        
-        for template_type in template_types:
-            type_templates = [t for t in self.title_templates if t.format_type == template_type]
-            selected_templates = random.sample(type_templates, min(templates_per_type, len(type_templates)))
-            
-            for template in selected_templates:
-                if len(generated_titles) >= count:
-                    break
-                
-                title_data = self._generate_single_title(keyword, template, timely_keywords, expanded_keywords)
-                if title_data:
-                    generated_titles.append(title_data)
-        
-        # 부족한 개수만큼 추가 생성
-        while len(generated_titles) < count:
-            random_template = random.choice(self.title_templates)
-            title_data = self._generate_single_title(keyword, random_template, timely_keywords, expanded_keywords)
-            if title_data and title_data not in generated_titles:
-                generated_titles.append(title_data)
-        
-        # 점수순으로 정렬하여 상위 항목 반환
-        generated_titles.sort(key=lambda x: x['total_score'], reverse=True)
-        return generated_titles[:count]
+        # 템플릿 타입을 번갈아 후보를 만들며 상위 후보 풀만 유지, MMR 로 점수가 높으면서 서로 다른 제목 선택
+        candidates = self._iter_candidates(keyword, candidate_budget(count), timely_keywords, expanded_keywords, rng)
+        return rank_candidates(candidates, count, "total_score")
+    
+    def _iter_candidates(self, keyword: str, budget: int, timely_keywords: List[str], expanded_keywords: List[str],
+                         rng: Optional[random.Random] = None) -> Iterator[Dict[str, Any]]:
+        """후보 제목 생성 (템플릿 타입별로 균등하게 분배)"""
+        rng = rng or random
+        template_types = list(dict.fromkeys(t.format_type for t in self.title_templates))
+        templates_by_type = {
+            template_type: [t for t in self.title_templates if t.format_type == template_type]
+            for template_type in template_types
+        }
+        produced = 0
+        for attempt in range(budget * 2):  # 생성 실패가 이어져도 끝나도록
+            template_type = template_types[attempt % len(template_types)]
+            title_data = self._generate_single_title(
+                keyword, rng.choice(templates_by_type[template_type]), timely_keywords, expanded_keywords, rng
+            )
+            if title_data:
+                produced += 1
+                yield title_data
+                if produced >= budget:
+                    return
     
     def _analyze_keyword(self, keyword: str) -> Dict[str, Any]:
         """키워드 분석"""
@@ -210,7 +228,7 @@ class AdvancedTitleGenerator:
             if any(term in keyword for term in terms):
                 expansions.extend(terms[:2])
         
-        return list(set(expansions))
+        return list(dict.fromkeys(expansions))
     
     def _get_timely_keywords(self) -> List[str]:
         """시의성 있는 키워드 반환"""
@@ -246,26 +264,28 @@ class AdvancedTitleGenerator:
         
         return timely[:5]  # 최대 5개
     
-    def _generate_single_title(self, keyword: str, template: TitleTemplate, timely_keywords: List[str], expanded_keywords: List[str]) -> Dict[str, Any]:
+    def _generate_single_title(self, keyword: str, template: TitleTemplate, timely_keywords: List[str], expanded_keywords: List[str],
+                               rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """단일 제목 생성"""
+        rng = rng or random
         try:
             # 기본 제목 생성
             title = template.template.format(keyword=keyword, alternative=self._get_alternative_keyword(keyword))
             
             # 시의성 키워드 추가 (30% 확률)
-            if random.random() < 0.3 and timely_keywords:
-                timely_word = random.choice(timely_keywords)
+            if rng.random() < 0.3 and timely_keywords:
+                timely_word = rng.choice(timely_keywords)
                 title = f"{timely_word} {title}"
             
             # 트렌드 키워드 추가 (20% 확률)
-            if random.random() < 0.2:
-                trend_word = random.choice(self.trend_keywords)
+            if rng.random() < 0.2:
+                trend_word = rng.choice(self.trend_keywords)
                 title = title.replace(keyword, f"{trend_word} {keyword}")
             
             # 감정 유발 키워드 추가 (40% 확률)
-            if random.random() < 0.4:
-                emotion_category = random.choice(list(self.emotion_triggers.keys()))
-                emotion_word = random.choice(self.emotion_triggers[emotion_category])
+            if rng.random() < 0.4:
+                emotion_category = rng.choice(list(self.emotion_triggers.keys()))
+                emotion_word = rng.choice(self.emotion_triggers[emotion_category])
                 title = f"{emotion_word} {title}"
             
             # 길이 조정 (35자 이내)
@@ -318,31 +338,31 @@ class AdvancedTitleGenerator:
             "timely": 0.0
         }
         
+        matches = title_lexicon.scan(title)
+        
         # SEO 점수
         scores["seo"] = template.seo_power * 20  # 기본 점수
         if keyword in title:
             scores["seo"] += 10
-        if any(word in title for word in self.click_baits):
+        if matches.any("advanced.click_bait"):
             scores["seo"] += 15
         if len(title) <= 35:
             scores["seo"] += 10
         
         # 클릭 유도 점수
         scores["click"] = template.urgency_level * 15
-        if any(word in title for word in ["?", "!", "이유", "방법", "비법"]):
+        if matches.any("advanced.click"):
             scores["click"] += 20
-        if any(word in title for word in self.emotion_triggers["호기심"]):
+        if matches.any("advanced.curiosity"):
             scores["click"] += 15
         
-        # 바이럴 점수
-        viral_words = ["놀라운", "충격", "대박", "꿀팁", "비밀", "독점"]
-        scores["viral"] = sum(10 for word in viral_words if word in title)
-        if any(word in title for word in self.trend_keywords):
+        # 바이럴 점수 (단어당 10점)
+        scores["viral"] = matches.weight("advanced.viral")
+        if matches.any("advanced.trend"):
             scores["viral"] += 25
         
-        # 시의성 점수
-        timely_words = self.seasonal_keywords["current"] + ["2025", "요즘", "지금", "올해"]
-        scores["timely"] = sum(15 for word in timely_words if word in title)
+        # 시의성 점수 (단어당 15점)
+        scores["timely"] = matches.weight("advanced.timely")
         
         # 총점 계산 (가중 평균)
         weights = {"seo": 0.3, "click": 0.3, "viral": 0.2, "timely": 0.2}
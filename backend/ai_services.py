@@ -5,6 +5,8 @@ from typing import List, Optional
 import json
 import random
 from config import settings
+from title_similarity import apply_duplicate_rates
+from related_content import link_guideline
 
 # Initialize AI services
 if settings.openai_api_key:
@@ -23,7 +25,8 @@ class AIService:
         """Generate titles using AI"""
         raise NotImplementedError
     
-    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium") -> dict:
+    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium",
+                               related_posts: Optional[List[dict]] = None) -> dict:
         """Generate content using AI"""
         raise NotImplementedError
 
@@ -73,8 +76,8 @@ class OpenAIService(AIService):
 
 JSON 형식으로 응답해주세요:
 [
-    {{"title": "제목1", "duplicate_rate": 5.2}},
-    {{"title": "제목2", "duplicate_rate": 3.8}}
+    {{"title": "제목1"}},
+    {{"title": "제목2"}}
 ]
 """
 
@@ -98,14 +101,16 @@ JSON 형식으로 응답해주세요:
                 content = content[3:-3]
                 
             titles = json.loads(content)
-            return titles[:count]
+            # 중복률은 모델 추정값 대신 기존 제목과의 실측 유사도
+            return apply_duplicate_rates([{"title": item["title"]} for item in titles[:count]])
             
         except Exception as e:
             print(f"OpenAI API Error: {e}")
             # Fallback to mock data
             return self._generate_mock_titles(keyword, count)
     
-    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium") -> dict:
+    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium",
+                               related_posts: Optional[List[dict]] = None) -> dict:
         """Generate content using OpenAI"""
         
         length_desc = {
@@ -128,6 +133,8 @@ JSON 형식으로 응답해주세요:
 4. 마크다운 형식으로 작성
 5. 서론, 본론, 결론 구조
 
+{link_guideline(related_posts or [])}
+
 추가로 다음 정보도 평가해주세요:
 - SEO 점수 (0-100)
 - 가독성 점수 (0-100) 
@@ -175,10 +182,7 @@ JSON 형식으로 응답해주세요:
             f"{keyword} 입문자를 위한 단계별 가이드"
         ]
         
-        return [
-            {"title": templates[i % len(templates)], "duplicate_rate": round(random.uniform(2.0, 9.5), 1)}
-            for i in range(count)
-        ]
+        return apply_duplicate_rates([{"title": templates[i % len(templates)]} for i in range(count)])
     
     def _generate_mock_content(self, title: str, keywords: Optional[str] = None) -> dict:
         """Generate mock content as fallback"""
@@ -253,7 +257,7 @@ class GeminiService(AIService):
 - 각각 다른 스타일
 
 JSON 배열 형식으로 응답:
-[{{"title": "제목", "duplicate_rate": 예상중복률}}]
+[{{"title": "제목"}}]
 """
 
         try:
@@ -267,13 +271,15 @@ JSON 배열 형식으로 응답:
                 content = content[3:-3]
                 
             titles = json.loads(content)
-            return titles[:count]
+            # 중복률은 모델 추정값 대신 기존 제목과의 실측 유사도
+            return apply_duplicate_rates([{"title": item["title"]} for item in titles[:count]])
             
         except Exception as e:
             print(f"Gemini API Error: {e}")
             return self._generate_mock_titles(keyword, count)
     
-    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium") -> dict:
+    async def generate_content(self, title: str, keywords: Optional[str] = None, length: str = "medium",
+                               related_posts: Optional[List[dict]] = None) -> dict:
         """Generate content using Gemini"""
         
         prompt = f"""
@@ -290,6 +296,8 @@ JSON 배열 형식으로 응답:
 - 자연스러운 키워드 배치
 
 서론, 본론(여러 섹션), 결론 구조로 작성해주세요.
+
+{link_guideline(related_posts or [])}
 """
 
         try:
@@ -317,10 +325,7 @@ JSON 배열 형식으로 응답:
             f"{keyword}로 성공하는 5가지 전략"
         ]
         
-        return [
-            {"title": templates[i % len(templates)], "duplicate_rate": round(random.uniform(2.0, 9.5), 1)}
-            for i in range(count)
-        ]
+        return apply_duplicate_rates([{"title": templates[i % len(templates)]} for i in range(count)])
     
     def _generate_mock_content(self, title: str, keywords: Optional[str] = None) -> dict:
         """Same as OpenAI fallback"""
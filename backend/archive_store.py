@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+보관(cold) 계층
+보관 기간이 지난 키워드/제목/콘텐츠/포스팅 결과 행과 saved_content 항목을 월별 추가 전용 압축 세그먼트
+(<테이블>/<YYYY-MM>.jsonl.zst, zstandard 미설치 시 .jsonl.gz)로 옮기고 hot 테이블에서 삭제
+- 세그먼트는 배치 하나가 압축 프레임 하나이므로 프레임 위치(offset, length)만 알면 해당 배치만 풀어서 조회
+- DB 행의 위치는 archived_rows 색인 테이블, saved_content 는 세그먼트 옆 index.jsonl 에 기록
+- 이력 API 는 ?archived=true 일 때 hot 행과 보관 행을 같은 커서 순서로 병합
+
+    python archive_store.py run --horizon-days 365
+    python archive_store.py stats
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, delete, exists, insert, func, text, and_, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import ArchivedRow, Keyword, GeneratedTitle, GeneratedContent, PostingResult
+from history_queries import sortable_created_at
+from logger import app_logger
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", 365))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+
+SAVED_CONTENT_TABLE = "saved_content"
+
+# 자식 → 부모 순서 (부모 행은 hot 자식이 참조하지 않을 때만 보관)
+ARCHIVE_MODELS = (GeneratedContent, PostingResult, GeneratedTitle, Keyword)
+_REFERENCED_BY = {
+    GeneratedTitle.__tablename__: (GeneratedContent.__table__, "title_id"),
+    Keyword.__tablename__: (GeneratedTitle.__table__, "keyword_id"),
+}
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+def _month_of(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m")
+    if isinstance(value, str) and len(value) >= 7:
+        return value[:7]
+    return "unknown"
+
+class SegmentStore:
+    """월별 추가 전용 세그먼트 파일 (프레임 = 압축된 JSONL 배치)"""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = root
+        self.codec = "zstd" if ZSTD_AVAILABLE else "gzip"
+        self._lock = threading.Lock()
+
+    def _extension(self) -> str:
+        return ".jsonl.zst" if self.codec == "zstd" else ".jsonl.gz"
+
+    def append(self, table_name: str, month: str, records: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+        """프레임 하나를 세그먼트 끝에 추가하고 (세그먼트, offset, length) 반환 - fsync 후 반환"""
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False, default=_jsonable) + "\n" for record in records
+        ).encode("utf-8")
+        if self.codec == "zstd":
+            frame = zstandard.ZstdCompressor(level=10).compress(payload)
+        else:
+            frame = gzip.compress(payload, 9)
+
+        segment = f"{table_name}/{month}{self._extension()}"
+        path = os.path.join(self.root, segment)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock, open(path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        return segment, offset, len(frame)
+
+    def read_frame(self, segment: str, offset: int, length: int) -> List[Dict[str, Any]]:
+        with open(os.path.join(self.root, segment), "rb") as f:
+            f.seek(offset)
+            frame = f.read(length)
+        if segment.endswith(".zst"):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read .jsonl.zst archive segments")
+            payload = zstandard.ZstdDecompressor().decompress(frame)
+        else:
+            payload = gzip.decompress(frame)
+        return [json.loads(line) for line in payload.decode("utf-8").splitlines() if line]
+
+    def find(self, segment: str, offset: int, length: int, row_id: str) -> Optional[Dict[str, Any]]:
+        for record in self.read_frame(segment, offset, length):
+            if str(record.get("id")) == str(row_id):
+                return record
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        tables: Dict[str, Dict[str, int]] = {}
+        if os.path.isdir(self.root):
+            for table_name in sorted(os.listdir(self.root)):
+                directory = os.path.join(self.root, table_name)
+                if not os.path.isdir(directory):
+                    continue
+                segments = [name for name in os.listdir(directory) if name.endswith((".jsonl.zst", ".jsonl.gz"))]
+                tables[table_name] = {
+                    "segments": len(segments),
+                    "bytes": sum(os.path.getsize(os.path.join(directory, name)) for name in segments)
+                }
+        return {"root": self.root, "codec": self.codec, "tables": tables}
+
+# 전역 세그먼트 저장소
+segment_store = SegmentStore()
+
+# ---- DB 테이블 보관 ----
+
+def _sort_key(value: Any) -> str:
+    """색인/커서 비교용 created_at 문자열 (SQLite 는 저장된 원문, PostgreSQL 은 ISO 형식)"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def _upsert_index(session, rows: List[Dict[str, Any]]):
+    insert_fn = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert_fn is not None:
+        stmt = insert_fn(ArchivedRow)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["table_name", "row_id"],
+            set_={
+                "created_at": stmt.excluded.created_at,
+                "segment": stmt.excluded.segment,
+                "frame_offset": stmt.excluded.frame_offset,
+                "frame_length": stmt.excluded.frame_length
+            }
+        ), rows)
+        return
+    for row in rows:
+        session.execute(delete(ArchivedRow).where(
+            ArchivedRow.table_name == row["table_name"], ArchivedRow.row_id == row["row_id"]
+        ))
+    session.execute(insert(ArchivedRow), rows)
+
+def _run_write(job: Callable, session_factory: Callable):
+    """보관 색인 기록 + hot 행 삭제 (SQLite 단일 쓰기 큐가 있으면 경유)"""
+    from db_writer import single_writer
+    if single_writer is not None and session_factory is None:
+        return single_writer.run(job)
+    from database import SessionLocal
+    session = (session_factory or SessionLocal)()
+    try:
+        result = job(session)
+        session.commit()
+        return result
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def _candidates_query(model, cutoff: datetime, dialect_name: str, limit: int):
+    table = model.__table__
+    query = select(
+        table,
+        sortable_created_at(table.c.created_at, dialect_name).label("_sort_at")
+    ).where(table.c.created_at < cutoff)
+    referenced = _REFERENCED_BY.get(table.name)
+    if referenced is not None:
+        child, column = referenced
+        query = query.where(~exists().where(child.c[column] == table.c.id))
+    return query.order_by(table.c.created_at, table.c.id).limit(limit)
+
+def _to_records(session, model, rows) -> List[Dict[str, Any]]:
+    records = []
+    columns = [column.name for column in model.__table__.columns]
+    for row in rows:
+        mapping = row._mapping
+        records.append({name: mapping[name] for name in columns})
+
+    if model is GeneratedContent:
+        # 보관 세그먼트는 본문까지 자체 포함 (content_blobs 는 이후 정리 대상)
+        from content_blobs import load_bodies
+        bodies = load_bodies(session, (record["content_hash"] for record in records))
+        for record in records:
+            if record.get("content_hash"):
+                record["content"] = bodies.get(record["content_hash"], record.get("content") or "")
+    return records
+
+def archive_table(
+    model,
+    cutoff: datetime,
+    store: SegmentStore = segment_store,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    session_factory: Optional[Callable] = None
+) -> int:
+    """cutoff 이전 행을 세그먼트로 옮기고 삭제, 보관한 행 수 반환
+
+    프레임 기록(fsync) 후 색인/삭제를 커밋하므로 중간에 중단되면 같은 행이 다시 보관될 수 있으나
+    색인은 최신 위치로 덮어쓰여 결과는 같다.
+    """
+    from database import SessionLocal
+    table = model.__table__
+    archived = 0
+
+    while True:
+        read_session = (session_factory or SessionLocal)()
+        try:
+            dialect_name = read_session.get_bind().dialect.name
+            rows = read_session.execute(_candidates_query(model, cutoff, dialect_name, batch_size)).all()
+            if not rows:
+                break
+            records = _to_records(read_session, model, rows)
+        finally:
+            read_session.close()
+
+        by_month: "OrderedDict[str, List[Tuple[Any, Dict[str, Any]]]]" = OrderedDict()
+        for row, record in zip(rows, records):
+            by_month.setdefault(_month_of(record.get("created_at")), []).append((row, record))
+
+        index_rows = []
+        for month, items in by_month.items():
+            segment, offset, length = store.append(table.name, month, [record for _, record in items])
+            index_rows.extend({
+                "table_name": table.name,
+                "row_id": str(record["id"]),
+                "created_by": None if record.get("created_by") is None else str(record["created_by"]),
+                "created_at": _sort_key(row._mapping["_sort_at"]),
+                "segment": segment,
+                "frame_offset": offset,
+                "frame_length": length
+            } for row, record in items)
+
+        ids = [record["id"] for record in records]
+
+        def job(session, index_rows=index_rows, ids=ids):
+            _upsert_index(session, index_rows)
+            session.execute(delete(table).where(table.c.id.in_(ids)))
+
+        _run_write(job, session_factory)
+        archived += len(ids)
+
+    return archived
+
+def _drop_archived_partitions(engine, table_name: str, cutoff: datetime) -> List[str]:
+    """보관이 끝나 비어 있는 월 파티션 분리 후 삭제 (PostgreSQL)"""
+    from postgres_profile import is_partitioned, detach_partitions_before, month_start
+    with engine.begin() as conn:
+        if not is_partitioned(conn, table_name):
+            return []
+        detached = detach_partitions_before(conn, table_name, month_start(cutoff.date()))
+        for name in detached:
+            conn.execute(text(f'DROP TABLE "{name}"'))
+    return detached
+
+def run_archive(
+    horizon_days: int = ARCHIVE_HORIZON_DAYS,
+    tables: Optional[Iterable[str]] = None,
+    store: SegmentStore = segment_store,
+    include_saved_content: bool = True
+) -> Dict[str, Any]:
+    """보관 작업 한 번 실행 (관리자 API / CLI / 스케줄러)"""
+    from database import engine, SessionLocal
+    from content_blobs import prune_orphan_blobs
+
+    cutoff = datetime.utcnow() - timedelta(days=horizon_days)
+    wanted = set(tables) if tables else None
+    result: Dict[str, Any] = {"cutoff": cutoff.isoformat(), "archived": {}, "dropped_partitions": {}}
+
+    ArchivedRow.__table__.create(bind=engine, checkfirst=True)
+    for model in ARCHIVE_MODELS:
+        table_name = model.__tablename__
+        if wanted is not None and table_name not in wanted:
+            continue
+        result["archived"][table_name] = archive_table(model, cutoff, store)
+        if engine.dialect.name == "postgresql" and _REFERENCED_BY.get(table_name) is None:
+            # 참조 제약이 없는 테이블은 cutoff 이전 행이 모두 옮겨졌으므로 지난 달 파티션은 비어 있음
+            result["dropped_partitions"][table_name] = _drop_archived_partitions(engine, table_name, cutoff)
+
+    if result["archived"].get(GeneratedContent.__tablename__):
+        session = SessionLocal()
+        try:
+            result["pruned_blobs"] = prune_orphan_blobs(session)
+        finally:
+            session.close()
+
+    if include_saved_content and (wanted is None or SAVED_CONTENT_TABLE in wanted):
+        from content_storage import content_storage
+        result["archived"][SAVED_CONTENT_TABLE] = archive_saved_content(content_storage, cutoff, store)
+
+    app_logger.info(f"보관 작업 완료: {result['archived']}")
+    return result
+
+# ---- DB 보관 행 조회 ----
+
+def get_archived_record(session, table_name: str, row_id: str, store: SegmentStore = segment_store) -> Optional[Dict[str, Any]]:
+    entry = session.get(ArchivedRow, (table_name, str(row_id)))
+    if entry is None:
+        return None
+    return store.find(entry.segment, entry.frame_offset, entry.frame_length, entry.row_id)
+
+def fetch_archived_rows(
+    session,
+    table_name: str,
+    user_id: Any,
+    cursor: Optional[Tuple[str, str]],
+    limit: int,
+    store: SegmentStore = segment_store
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """사용자의 보관 행을 최신순으로 (정렬키, id, 레코드) 목록 반환 - 프레임은 한 번씩만 해제"""
+    query = select(ArchivedRow).where(
+        ArchivedRow.table_name == table_name,
+        ArchivedRow.created_by == str(user_id)
+    )
+    if cursor is not None:
+        cursor_at, cursor_id = cursor
+        query = query.where(or_(
+            ArchivedRow.created_at < cursor_at,
+            and_(ArchivedRow.created_at == cursor_at, ArchivedRow.row_id < cursor_id)
+        ))
+    entries = session.execute(
+        query.order_by(ArchivedRow.created_at.desc(), ArchivedRow.row_id.desc()).limit(limit)
+    ).scalars().all()
+
+    frames: Dict[Tuple[str, int, int], Dict[str, Dict[str, Any]]] = {}
+    result = []
+    for entry in entries:
+        key = (entry.segment, entry.frame_offset, entry.frame_length)
+        if key not in frames:
+            frames[key] = {str(record.get("id")): record for record in store.read_frame(*key)}
+        record = frames[key].get(entry.row_id)
+        if record is not None:
+            result.append((entry.created_at, entry.row_id, record))
+    return result
+
+def get_archive_stats(session, store: SegmentStore = segment_store) -> Dict[str, Any]:
+    counts = dict(session.execute(
+        select(ArchivedRow.table_name, func.count()).group_by(ArchivedRow.table_name)
+    ).all())
+    return {"rows": counts, "segments": store.get_stats()}
+
+# ---- saved_content 보관 ----
+
+_saved_index_cache: Dict[str, Any] = {"mtime": None, "entries": {}}
+_saved_index_lock = threading.Lock()
+
+def _saved_index_path(store: SegmentStore) -> str:
+    return os.path.join(store.root, SAVED_CONTENT_TABLE, "index.jsonl")
+
+def archive_saved_items(storage, items: List[Dict[str, Any]], store: SegmentStore = segment_store) -> int:
+    """ContentStorage 항목들을 세그먼트로 옮기고 저장소 색인에서 제거"""
+    by_month: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    for item in items:
+        record = storage.get_content(item["id"]) or dict(item)
+        by_month.setdefault(_month_of(record.get("created_at")), []).append(record)
+
+    index_path = _saved_index_path(store)
+    archived = 0
+    for month, records in by_month.items():
+        segment, offset, length = store.append(SAVED_CONTENT_TABLE, month, records)
+        with _saved_index_lock, open(index_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({
+                    "id": record["id"],
+                    "title": record.get("title"),
+                    "keyword": record.get("keyword"),
+                    "created_at": record.get("created_at"),
+                    "segment": segment,
+                    "offset": offset,
+                    "length": length
+                }, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        storage.drop_entries([record["id"] for record in records])
+        archived += len(records)
+    return archived
+
+def archive_saved_content(storage, cutoff: datetime, store: SegmentStore = segment_store) -> int:
+    """마지막 수정이 cutoff 이전인 항목과 보관 개수를 넘은 saved_content 항목 보관"""
+    old_items = storage.expired_entries(before=cutoff.isoformat())
+    if not old_items:
+        return 0
+    archived = archive_saved_items(storage, old_items, store)
+    storage.compact_if_needed()
+    return archived
+
+def find_saved_content(content_id: str, store: SegmentStore = segment_store) -> Optional[Dict[str, Any]]:
+    """보관된 saved_content 항목 조회 (색인은 파일이 바뀔 때만 다시 읽음)"""
+    index_path = _saved_index_path(store)
+    try:
+        mtime = os.path.getmtime(index_path)
+    except OSError:
+        return None
+    with _saved_index_lock:
+        if _saved_index_cache["mtime"] != mtime:
+            entries = {}
+            with open(index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["id"]] = entry
+            _saved_index_cache.update(mtime=mtime, entries=entries)
+        entry = _saved_index_cache["entries"].get(content_id)
+    if entry is None:
+        return None
+    return store.find(entry["segment"], entry["offset"], entry["length"], content_id)
+
+def main():
+    import argparse
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="보관(cold) 계층 관리")
+    parser.add_argument("command", choices=["run", "stats"])
+    parser.add_argument("--horizon-days", type=int, default=ARCHIVE_HORIZON_DAYS)
+    parser.add_argument("--tables", nargs="*", help="보관할 테이블 (기본: 전체)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print(f"✅ {run_archive(args.horizon_days, args.tables)}")
+    session = SessionLocal()
+    try:
+        print(f"📊 {get_archive_stats(session)}")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,11 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import User
+from query_profiler import query_profiler
 import os
 
 from config import settings
@@ -22,6 +24,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Security scheme
 security = HTTPBearer()
+# 인증이 비활성화된 엔드포인트용 - 토큰이 없어도 401 대신 None
+optional_security = HTTPBearer(auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -69,24 +73,34 @@ def verify_token(token: str):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the current authenticated user."""
     token = credentials.credentials
     payload = verify_token(token)
     email = payload.get("sub")
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_user_by_email(db, email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    query_profiler.tag_user(user.id)
     return user
 
+async def get_optional_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """Get the authenticated user when a bearer token is sent, otherwise None."""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials, db)
+
 def get_current_active_user(current_user: User = Depends(get_current_user)):
     """Get the current authenticated and active user."""
     if not current_user.is_active:
@@ -105,9 +119,14 @@ def get_current_admin_user(current_user: User = Depends(get_current_active_user)
         )
     return current_user
 
-def authenticate_user(db: Session, email: str, password: str):
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Look up a user by email."""
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     """Authenticate a user with email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_user_by_email(db, email)
     if not user:
         return False
     if not verify_password(password, user.password_hash):
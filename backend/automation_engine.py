@@ -6,10 +6,12 @@
 import json
 import asyncio
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import random
 
+from database import AsyncSessionLocal
 from models import (
     Site, AutomationSession, GeneratedKeywordBatch, 
     GeneratedTitleBatch, PostingResult, SystemPrompt
@@ -19,6 +21,18 @@ from advanced_title_generator import AdvancedTitleGenerator
 from advanced_blog_writer import AdvancedBlogWriter
 from logger import app_logger, ai_logger
 from wordpress_api import WordPressAPI
+from progress_broker import progress_broker, session_topic, user_topic
+from checkpoint_store import checkpoint_store
+from activity_rollup import record_activity
+from content_blobs import dehydrate_contents, hydrate_contents
+from title_similarity import title_index, apply_duplicate_rates
+from body_fingerprints import body_index, SOURCE_POSTED
+from related_content import related_index, link_guideline, SOURCE_POSTED as RELATED_SOURCE_POSTED
+
+# 체크포인트 저장소의 작업 구분값
+CHECKPOINT_JOB_TYPE = "automation_session"
+# 더 진행할 단계가 없는 세션 상태 (published = 일부만 발행)
+FINISHED_STEP_STATUSES = ("completed", "failed", "published")
 
 class AutomationEngine:
     def __init__(self):
@@ -39,9 +53,49 @@ class AutomationEngine:
             "교육": ["공부", "학습", "시험", "자격증", "영어", "온라인강의", "책", "교육", "진로", "취업"]
         }
     
+    async def _publish_session_event(self, session: AutomationSession, event: str, **data):
+        """세션 토픽과 사용자 토픽으로 진행 이벤트 발행"""
+        topics = [session_topic(session.id)]
+        if session.created_by:
+            topics.append(user_topic(session.created_by))
+        try:
+            await progress_broker.publish(topics, event, {
+                "session_id": session.id,
+                "step_status": session.step_status,
+                **data
+            })
+        except Exception as e:
+            app_logger.warning(f"세션 진행 이벤트 발행 실패: {e}")
+    
+    async def _publish_session_failure(self, session_id: str, session: Optional[AutomationSession], stage: str, error: Exception):
+        """단계 실패를 종료 이벤트로 발행 - 롤백 전에 호출 (세션을 찾기 전 실패면 세션 토픽에만)"""
+        try:
+            topics = [session_topic(session_id)]
+            step_status = None
+            if session is not None:
+                step_status = session.step_status
+                if session.created_by:
+                    topics.append(user_topic(session.created_by))
+            await progress_broker.publish(topics, "failed", {
+                "session_id": session_id,
+                "step_status": step_status,
+                "stage": stage,
+                "error": str(error)
+            })
+        except Exception as e:
+            app_logger.warning(f"세션 실패 이벤트 발행 실패: {e}")
+    
+    async def is_session_active(self, session_id: str) -> bool:
+        """세션 스트림을 계속 열어 둘지 - 세션이 없거나 끝난 상태면 False"""
+        async with AsyncSessionLocal() as db:
+            step_status = (await db.execute(
+                select(AutomationSession.step_status).where(AutomationSession.id == session_id)
+            )).scalar_one_or_none()
+        return step_status is not None and step_status not in FINISHED_STEP_STATUSES
+    
     async def start_automation_session(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         site_id: str, 
         user_id: str, 
         category: str,
@@ -62,20 +116,20 @@ class AutomationEngine:
             )
             
             db.add(session)
-            db.commit()
-            db.refresh(session)
+            await db.commit()
+            await db.refresh(session)
             
             app_logger.info(f"자동화 세션 생성 완료: {session.id}")
             return session
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             app_logger.error(f"자동화 세션 시작 실패: {e}")
             raise
     
     async def generate_category_keywords(
         self,
-        db: Session,
+        db: AsyncSession,
         session_id: str,
         category: str,
         count: int = 20,
@@ -85,26 +139,23 @@ class AutomationEngine:
         
         ai_logger.info(f"카테고리 키워드 생성 시작: {category}, 개수: {count}")
         
+        session = None
         try:
             # 세션 조회
-            session = db.query(AutomationSession).filter(
-                AutomationSession.id == session_id
-            ).first()
+            session = await db.get(AutomationSession, session_id)
             
             if not session:
                 raise ValueError("세션을 찾을 수 없습니다")
             
             # 사이트 정보 조회
-            site = db.query(Site).filter(Site.id == session.site_id).first()
+            site = await db.get(Site, session.site_id)
             if not site:
                 raise ValueError("사이트를 찾을 수 없습니다")
             
             # 지침 로드
             guideline = None
             if site.keyword_guideline_id:
-                guideline_obj = db.query(SystemPrompt).filter(
-                    SystemPrompt.id == site.keyword_guideline_id
-                ).first()
+                guideline_obj = await db.get(SystemPrompt, site.keyword_guideline_id)
                 if guideline_obj:
                     guideline = guideline_obj.prompt_content
             
@@ -173,8 +224,10 @@ class AutomationEngine:
             
             # 사이트 통계 업데이트
             site.total_keywords_generated += len(selected_keywords)
+            await record_activity(db, site.created_by, site.id, keywords_count=len(selected_keywords))
             
-            db.commit()
+            await db.commit()
+            await self._publish_session_event(session, "step", keywords_count=len(selected_keywords))
             
             ai_logger.info(f"카테고리 키워드 생성 완료: {len(selected_keywords)}개")
             
@@ -189,13 +242,14 @@ class AutomationEngine:
             }
             
         except Exception as e:
-            db.rollback()
+            await self._publish_session_failure(session_id, session, "keywords", e)
+            await db.rollback()
             ai_logger.error(f"카테고리 키워드 생성 실패: {e}")
             raise
     
     async def generate_keyword_titles(
         self,
-        db: Session,
+        db: AsyncSession,
         session_id: str,
         selected_keywords: List[str],
         titles_per_keyword: int = 10
@@ -204,55 +258,81 @@ class AutomationEngine:
         
         ai_logger.info(f"키워드 제목 생성 시작: {len(selected_keywords)}개 키워드")
         
+        session = None
         try:
             # 세션 조회
-            session = db.query(AutomationSession).filter(
-                AutomationSession.id == session_id
-            ).first()
+            session = await db.get(AutomationSession, session_id)
             
             if not session:
                 raise ValueError("세션을 찾을 수 없습니다")
             
             # 사이트 정보 조회
-            site = db.query(Site).filter(Site.id == session.site_id).first()
+            site = await db.get(Site, session.site_id)
             
             # 지침 로드
             guideline = None
             if site.title_guideline_id:
-                guideline_obj = db.query(SystemPrompt).filter(
-                    SystemPrompt.id == site.title_guideline_id
-                ).first()
+                guideline_obj = await db.get(SystemPrompt, site.title_guideline_id)
                 if guideline_obj:
                     guideline = guideline_obj.prompt_content
             
             all_titles = []
             title_batches = []
+            failed_keywords = {}
+            new_titles_count = 0
+            
+            # 이전 실행에서 완료된 키워드는 체크포인트 결과 재사용
+            checkpoints = await checkpoint_store.load_async(session_id)
+            saved_batch_keywords = set((await db.execute(
+                select(GeneratedTitleBatch.keyword).where(
+                    GeneratedTitleBatch.session_id == session_id
+                )
+            )).scalars().all())
             
             # 각 키워드에 대해 제목 생성
             for keyword in selected_keywords:
+                item_key = f"titles:{keyword}"
+                checkpoint = checkpoints.get(item_key)
                 try:
-                    # 제목 생성
-                    titles = await self.title_generator.generate_advanced_titles(
-                        keyword=keyword,
-                        count=titles_per_keyword,
-                        guidelines=guideline
-                    )
-                    
-                    # 제목 데이터 변환
-                    title_data = []
-                    for title in titles:
-                        title_info = {
-                            "title": title.title,
-                            "seo_score": title.seo_score,
-                            "viral_score": title.viral_potential,
-                            "geo_score": title.geo_score,
-                            "click_potential": title.total_score,
-                            "length": len(title.title),
-                            "format_type": title.format_type,
-                            "keyword": keyword
-                        }
-                        title_data.append(title_info)
-                        all_titles.append(title_info)
+                    if checkpoint and checkpoint["status"] == "completed":
+                        title_data = checkpoint["result"]
+                        all_titles.extend(title_data)
+                        if keyword in saved_batch_keywords:
+                            continue
+                    else:
+                        # 제목 생성
+                        titles = await self.title_generator.generate_advanced_titles(
+                            keyword=keyword,
+                            count=titles_per_keyword,
+                            guidelines=guideline
+                        )
+                        
+                        # 제목 데이터 변환
+                        title_data = []
+                        for title in titles:
+                            title_info = {
+                                "title": title.title,
+                                "seo_score": title.seo_score,
+                                "viral_score": title.viral_potential,
+                                "geo_score": title.geo_score,
+                                "click_potential": title.total_score,
+                                "length": len(title.title),
+                                "format_type": title.format_type,
+                                "keyword": keyword
+                            }
+                            title_data.append(title_info)
+                            all_titles.append(title_info)
+                        # 기존 제목 대비 전체 / 이 사이트 안의 실측 중복률, 이후 후보의 비교 대상에 추가
+                        apply_duplicate_rates(title_data, session.site_id)
+                        title_index.add_many((t["title"] for t in title_data), session.site_id)
+                        
+                        # 완료 즉시 체크포인트 저장 (이후 실패해도 재생성하지 않음)
+                        await checkpoint_store.save_item_async(
+                            session_id, CHECKPOINT_JOB_TYPE, item_key, title_data,
+                            stage="title", user_id=session.created_by,
+                            attempts=(checkpoint["attempts"] if checkpoint else 0) + 1
+                        )
+                        new_titles_count += len(title_data)
                     
                     # 배치별 통계 계산
                     avg_viral = sum(t["viral_score"] for t in title_data) / len(title_data) if title_data else 0
@@ -276,14 +356,25 @@ class AutomationEngine:
                     )
                     
                     title_batches.append(title_batch)
+                    await self._publish_session_event(
+                        session, "item", stage="titles", keyword=keyword, titles=title_data
+                    )
                     
                 except Exception as e:
                     ai_logger.warning(f"키워드 '{keyword}' 제목 생성 실패: {e}")
+                    failed_keywords[keyword] = str(e)
+                    await checkpoint_store.mark_failed_async(
+                        session_id, CHECKPOINT_JOB_TYPE, item_key, str(e),
+                        stage="title", user_id=session.created_by,
+                        attempts=(checkpoint["attempts"] if checkpoint else 0) + 1
+                    )
+                    await self._publish_session_event(
+                        session, "item_failed", stage="titles", keyword=keyword, error=str(e)
+                    )
                     continue
             
-            # 모든 배치 저장
-            for batch in title_batches:
-                db.add(batch)
+            # 모든 배치 저장 (세션 상태와 같은 트랜잭션에서 한 번에 INSERT)
+            db.add_all(title_batches)
             
             # 세션 업데이트
             session.generated_titles = json.dumps(all_titles, ensure_ascii=False)
@@ -292,10 +383,12 @@ class AutomationEngine:
             session.step_status = "titles_generated"
             session.updated_at = datetime.utcnow()
             
-            # 사이트 통계 업데이트
-            site.total_titles_generated += len(all_titles)
+            # 사이트 통계 업데이트 (재사용된 체크포인트는 중복 집계하지 않음)
+            site.total_titles_generated += new_titles_count
+            await record_activity(db, site.created_by, site.id, titles_count=new_titles_count)
             
-            db.commit()
+            await db.commit()
+            await self._publish_session_event(session, "step", titles_count=len(all_titles))
             
             ai_logger.info(f"키워드 제목 생성 완료: {len(all_titles)}개")
             
@@ -305,54 +398,68 @@ class AutomationEngine:
                 "titles": all_titles,
                 "total_count": len(all_titles),
                 "titles_per_keyword": titles_per_keyword,
-                "status": "success"
+                "failed_keywords": failed_keywords,
+                "status": "success" if not failed_keywords else "partial"
             }
             
         except Exception as e:
-            db.rollback()
+            await self._publish_session_failure(session_id, session, "titles", e)
+            await db.rollback()
             ai_logger.error(f"키워드 제목 생성 실패: {e}")
             raise
     
     async def generate_title_contents(
         self,
-        db: Session,
+        db: AsyncSession,
         session_id: str,
         selected_titles: List[str]
     ) -> Dict[str, Any]:
-        """선택된 제목들로 블로그 글 자동 생성"""
+        """선택된 제목들로 블로그 글 자동 생성 (재호출 시 완료된 글은 체크포인트에서 재사용, 실패분만 재시도)"""
         
         ai_logger.info(f"제목 블로그 글 생성 시작: {len(selected_titles)}개 제목")
         
+        session = None
         try:
             # 세션 조회
-            session = db.query(AutomationSession).filter(
-                AutomationSession.id == session_id
-            ).first()
+            session = await db.get(AutomationSession, session_id)
             
             if not session:
                 raise ValueError("세션을 찾을 수 없습니다")
             
             # 사이트 정보 조회
-            site = db.query(Site).filter(Site.id == session.site_id).first()
+            site = await db.get(Site, session.site_id)
             
             # 지침 로드
             guideline = None
             if site.blog_guideline_id:
-                guideline_obj = db.query(SystemPrompt).filter(
-                    SystemPrompt.id == site.blog_guideline_id
-                ).first()
+                guideline_obj = await db.get(SystemPrompt, site.blog_guideline_id)
                 if guideline_obj:
                     guideline = guideline_obj.prompt_content
             
             generated_contents = []
+            failed_titles = {}
+            new_contents_count = 0
+            
+            # 이전 실행에서 완료된 글은 체크포인트 결과 재사용 (유료 AI 호출 재실행 방지)
+            checkpoints = await checkpoint_store.load_async(session_id)
             
             # 각 제목에 대해 블로그 글 생성
             for title in selected_titles:
+                item_key = f"content:{title}"
+                checkpoint = checkpoints.get(item_key)
+                if checkpoint and checkpoint["status"] == "completed":
+                    generated_contents.append(checkpoint["result"])
+                    continue
+                
                 try:
+                    # 이 사이트에 이미 발행된 관련 글을 내부 링크 후보로 지침에 추가
+                    related_posts = await asyncio.to_thread(related_index.safe_related, title, title, session.site_id)
+                    title_guideline = "\n\n".join(part for part in (guideline, link_guideline(related_posts)) if part)
+                    
                     # 블로그 글 생성
                     content_result = await self.blog_writer.generate_blog_content(
                         title=title,
-                        guidelines=guideline
+                        guidelines=title_guideline or None
                     )
                     
                     # 콘텐츠 데이터 변환
@@ -368,24 +475,55 @@ class AutomationEngine:
                         "subtopics": content_result.subtopics,
                         "generated_at": datetime.utcnow().isoformat()
                     }
+                    # 다른 사이트에 이미 발행된 글과 본문이 겹치는지 (템플릿 반복 방지)
+                    duplicate_check = await asyncio.to_thread(body_index.safe_check, content_result.content)
+                    content_data["copyscape_result"] = duplicate_check["verdict"]
+                    content_data["duplicate_overlap"] = duplicate_check["overlap_percent"]
                     
                     generated_contents.append(content_data)
+                    new_contents_count += 1
+                    
+                    # 완료 즉시 체크포인트 저장
+                    await checkpoint_store.save_item_async(
+                        session_id, CHECKPOINT_JOB_TYPE, item_key, content_data,
+                        stage="content", user_id=session.created_by,
+                        attempts=(checkpoint["attempts"] if checkpoint else 0) + 1
+                    )
+                    await self._publish_session_event(
+                        session, "item", stage="contents", title=title,
+                        word_count=content_data["word_count"], seo_score=content_data["seo_score"],
+                        completed=len(generated_contents), total=len(selected_titles)
+                    )
                     
                 except Exception as e:
                     ai_logger.warning(f"제목 '{title}' 블로그 글 생성 실패: {e}")
+                    failed_titles[title] = str(e)
+                    await checkpoint_store.mark_failed_async(
+                        session_id, CHECKPOINT_JOB_TYPE, item_key, str(e),
+                        stage="content", user_id=session.created_by,
+                        attempts=(checkpoint["attempts"] if checkpoint else 0) + 1
+                    )
+                    await self._publish_session_event(
+                        session, "item_failed", stage="contents", title=title, error=str(e)
+                    )
                     continue
             
             # 세션 업데이트
-            session.generated_contents = json.dumps(generated_contents, ensure_ascii=False)
+            # 본문은 content_blobs 로 옮기고 세션 JSON 에는 해시만 보관
+            session.generated_contents = json.dumps(
+                await dehydrate_contents(db, generated_contents), ensure_ascii=False
+            )
             session.selected_titles = json.dumps(selected_titles, ensure_ascii=False)
             session.contents_count = len(generated_contents)
             session.step_status = "content_generated"
             session.updated_at = datetime.utcnow()
             
-            # 사이트 통계 업데이트
-            site.total_posts_generated += len(generated_contents)
+            # 사이트 통계 업데이트 (재사용된 체크포인트는 중복 집계하지 않음)
+            site.total_posts_generated += new_contents_count
+            await record_activity(db, site.created_by, site.id, contents_count=new_contents_count)
             
-            db.commit()
+            await db.commit()
+            await self._publish_session_event(session, "step", contents_count=len(generated_contents))
             
             ai_logger.info(f"제목 블로그 글 생성 완료: {len(generated_contents)}개")
             
@@ -394,17 +532,20 @@ class AutomationEngine:
                 "titles": selected_titles,
                 "contents": generated_contents,
                 "total_count": len(generated_contents),
-                "status": "success"
+                "reused_count": len(generated_contents) - new_contents_count,
+                "failed_titles": failed_titles,
+                "status": "success" if not failed_titles else "partial"
             }
             
         except Exception as e:
-            db.rollback()
+            await self._publish_session_failure(session_id, session, "contents", e)
+            await db.rollback()
             ai_logger.error(f"제목 블로그 글 생성 실패: {e}")
             raise
     
     async def publish_contents(
         self,
-        db: Session,
+        db: AsyncSession,
         session_id: str,
         selected_content_titles: List[str],
         schedule_settings: Optional[Dict] = None
@@ -413,17 +554,16 @@ class AutomationEngine:
         
         app_logger.info(f"자동 포스팅 시작: {len(selected_content_titles)}개 글")
         
+        session = None
         try:
             # 세션 조회
-            session = db.query(AutomationSession).filter(
-                AutomationSession.id == session_id
-            ).first()
+            session = await db.get(AutomationSession, session_id)
             
             if not session:
                 raise ValueError("세션을 찾을 수 없습니다")
             
             # 사이트 정보 조회
-            site = db.query(Site).filter(Site.id == session.site_id).first()
+            site = await db.get(Site, session.site_id)
             if not site or not site.wordpress_url:
                 raise ValueError("WordPress 연동 정보가 없습니다")
             
@@ -432,10 +572,10 @@ class AutomationEngine:
                 raise ValueError("생성된 콘텐츠가 없습니다")
             
             contents = json.loads(session.generated_contents)
-            selected_contents = [
+            selected_contents = await hydrate_contents(db, [
                 content for content in contents 
                 if content["title"] in selected_content_titles
-            ]
+            ])
             
             if not selected_contents:
                 raise ValueError("선택된 콘텐츠가 없습니다")
@@ -452,6 +592,7 @@ class AutomationEngine:
             
             posting_results = []
             successful_posts = 0
+            published_posts = []
             
             # 각 콘텐츠 포스팅
             for i, content in enumerate(selected_contents):
@@ -465,11 +606,17 @@ class AutomationEngine:
                             minutes=delay_minutes + (i * interval_minutes)
                         )
                     
+                    # 완성된 본문 기준으로 같은 사이트의 관련 글을 다시 골라 본문 끝에 링크 목록으로
+                    related_posts = await asyncio.to_thread(
+                        related_index.safe_related, content["content"], content["title"], session.site_id
+                    )
+                    
                     # WordPress 포스팅
                     post_result = await self.wordpress_api.publish_post(
                         title=content["title"],
                         content=content["content"],
-                        scheduled_time=post_time
+                        scheduled_time=post_time,
+                        related_posts=related_posts
                     )
                     
                     # 포스팅 결과 저장
@@ -487,6 +634,9 @@ class AutomationEngine:
                     )
                     
                     db.add(posting_result)
+                    if posting_result.post_status == "published":
+                        title_index.add(content["title"], session.site_id)
+                        published_posts.append(posting_result)
                     
                     posting_results.append({
                         "title": content["title"],
@@ -497,6 +647,7 @@ class AutomationEngine:
                     })
                     
                     successful_posts += 1
+                    await self._publish_session_event(session, "item", stage="publish", **posting_results[-1])
                     
                 except Exception as e:
                     app_logger.error(f"포스팅 실패 - 제목: {content['title']}, 오류: {e}")
@@ -519,6 +670,7 @@ class AutomationEngine:
                         "status": "failed",
                         "error": str(e)
                     })
+                    await self._publish_session_event(session, "item_failed", stage="publish", **posting_results[-1])
             
             # 세션 업데이트
             session.posted_contents = json.dumps(posting_results, ensure_ascii=False)
@@ -531,8 +683,33 @@ class AutomationEngine:
             
             # 사이트 통계 업데이트
             site.total_posts_published += successful_posts
+            await record_activity(
+                db, site.created_by, site.id,
+                posts_published_count=successful_posts,
+                posts_failed_count=len(selected_contents) - successful_posts
+            )
             
-            db.commit()
+            await db.commit()
+            # 발행된 본문을 중복 검사 대상에 추가 (사이트 간 본문 겹침 검출)
+            await asyncio.to_thread(body_index.safe_add, SOURCE_POSTED, [
+                {"doc_id": post.id, "body": post.content, "site_id": post.site_id, "owner": site.created_by,
+                 "title": post.title, "created_at": datetime.utcnow()}
+                for post in published_posts
+            ])
+            # 다음 글의 내부 링크 후보로 (URL 포함)
+            await asyncio.to_thread(related_index.safe_add, RELATED_SOURCE_POSTED, [
+                {"doc_id": post.id, "body": post.content, "site_id": post.site_id, "title": post.title,
+                 "url": post.post_url, "created_at": datetime.utcnow()}
+                for post in published_posts
+            ])
+            # 발행 단계가 끝나면 항상 종료 이벤트 - 일부만 성공하면 partial 표시한 completed
+            await self._publish_session_event(
+                session,
+                "failed" if successful_posts == 0 else "completed",
+                published_count=successful_posts,
+                partial=0 < successful_posts < len(selected_contents),
+                results=posting_results
+            )
             
             app_logger.info(f"자동 포스팅 완료: 성공 {successful_posts}/{len(selected_contents)}개")
             
@@ -546,16 +723,15 @@ class AutomationEngine:
             }
             
         except Exception as e:
-            db.rollback()
+            await self._publish_session_failure(session_id, session, "publish", e)
+            await db.rollback()
             app_logger.error(f"자동 포스팅 실패: {e}")
             raise
     
-    async def get_session_status(self, db: Session, session_id: str) -> Dict[str, Any]:
+    async def get_session_status(self, db: AsyncSession, session_id: str) -> Dict[str, Any]:
         """자동화 세션 상태 조회"""
         try:
-            session = db.query(AutomationSession).filter(
-                AutomationSession.id == session_id
-            ).first()
+            session = await db.get(AutomationSession, session_id)
             
             if not session:
                 return {"error": "세션을 찾을 수 없습니다"}
@@ -580,7 +756,7 @@ class AutomationEngine:
             if session.generated_titles:
                 result["titles"] = json.loads(session.generated_titles)
             if session.generated_contents:
-                result["contents"] = json.loads(session.generated_contents)
+                result["contents"] = await hydrate_contents(db, json.loads(session.generated_contents))
             if session.posted_contents:
                 result["posting_results"] = json.loads(session.posted_contents)
             
@@ -1,13 +1,22 @@
 import asyncio
-from typing import List, Dict, Optional, Callable
-from datetime import datetime
+import os
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Callable, Awaitable, Any, Set, Deque
+from datetime import datetime, timedelta
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from sqlalchemy.orm import Session
 from models import User, Keyword, GeneratedTitle, GeneratedContent
 from logger import app_logger
+from progress_broker import progress_broker, task_topic, user_topic
+from checkpoint_store import checkpoint_store
+from task_result_store import TaskResultStore
+from title_similarity import title_index, apply_duplicate_rates
 import json
 
+# 체크포인트 저장소의 작업 구분값
+CHECKPOINT_JOB_TYPE = "batch_task"
+
 class TaskStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -34,6 +43,14 @@ class BatchTask:
     error_message: Optional[str] = None
     result: Optional[Dict] = None
     progress: int = 0
+    # 체크포인트 / 재개 상태
+    checkpoints: Dict[str, Dict] = field(default_factory=dict, repr=False)
+    failed_items: Dict[str, str] = field(default_factory=dict)
+    retry_filter: Optional[Set[str]] = None
+    resumed_count: int = 0
+    reused_items: int = 0
+    # 결과가 블롭 저장소로 이관된 경우의 참조 ID
+    result_ref: Optional[str] = None
     
     def __post_init__(self):
         if self.created_at is None:
@@ -42,14 +59,63 @@ class BatchTask:
 class BatchProcessor:
     """배치 처리 시스템"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        retention_hours: Optional[float] = None,
+        max_finished_tasks: Optional[int] = None,
+        max_tasks_per_user: Optional[int] = None,
+        spill_threshold_bytes: Optional[int] = None,
+        result_store: Optional[TaskResultStore] = None
+    ):
         self.tasks: Dict[str, BatchTask] = {}
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.max_concurrent_tasks = 3
         
+        # 보존 정책 (종료된 작업만 제거 대상)
+        self.retention = timedelta(hours=retention_hours if retention_hours is not None
+                                   else float(os.environ.get("BATCH_TASK_RETENTION_HOURS", 72)))
+        self.max_finished_tasks = max_finished_tasks or int(os.environ.get("BATCH_TASK_MAX_FINISHED", 1000))
+        self.max_tasks_per_user = max_tasks_per_user or int(os.environ.get("BATCH_TASK_MAX_PER_USER", 200))
+        self.spill_threshold_bytes = spill_threshold_bytes or int(os.environ.get("BATCH_RESULT_SPILL_BYTES", 16 * 1024))
+        self._result_store = result_store
+        
+        # 사용자별 작업 인덱스 (생성 순서 유지) / 종료 시각 순 작업 목록 / 대기 큐
+        self.user_index: Dict[str, Dict[str, None]] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Deque[str] = deque()
+        # 완료를 기다리지 않는 백그라운드 작업 (GC 로 사라지지 않도록 끝날 때까지 참조 유지)
+        self._background: Set[asyncio.Task] = set()
+        # 제출/종료가 없는 유휴 워커도 보존 기간이 지난 작업을 정리하도록 주기 실행
+        self.retention_interval = float(os.environ.get("BATCH_RETENTION_INTERVAL_SECONDS", 600))
+        self._retention_task: Optional[asyncio.Task] = None
+    
+    @property
+    def result_store(self) -> TaskResultStore:
+        # 첫 이관 시점에 디렉터리 생성
+        if self._result_store is None:
+            self._result_store = TaskResultStore()
+        return self._result_store
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+    
+    def _register(self, task: BatchTask):
+        self.tasks[task.id] = task
+        self.user_index.setdefault(task.user_id, {})[task.id] = None
+    
     async def submit_task(self, task: BatchTask) -> str:
         """배치 작업 제출"""
-        self.tasks[task.id] = task
+        self._register(task)
+        self._enforce_retention(task.user_id)
+        
+        # 워커가 죽어도 재개할 수 있도록 작업 정의를 먼저 영속화
+        await checkpoint_store.save_job_spec_async(
+            task.id, CHECKPOINT_JOB_TYPE, task.user_id,
+            {"task_type": task.task_type.value, "parameters": task.parameters}
+        )
         
         app_logger.info(
             f"Batch task submitted",
@@ -57,10 +123,13 @@ class BatchProcessor:
             task_type=task.task_type.value,
             user_id=task.user_id
         )
+        await self._publish(task, "submitted")
         
         # 동시 실행 작업 수 체크
         if len(self.running_tasks) < self.max_concurrent_tasks:
             await self._start_task(task.id)
+        else:
+            self._pending.append(task.id)
         
         return task.id
     
@@ -68,10 +137,13 @@ class BatchProcessor:
         """작업 실행 시작"""
         if task_id not in self.tasks:
             return
-            
+        
         task = self.tasks[task_id]
         task.status = TaskStatus.RUNNING
         task.started_at = datetime.now()
+        task.completed_at = None
+        task.error_message = None
+        await checkpoint_store.update_job_status_async(task_id, TaskStatus.RUNNING.value)
         
         app_logger.info(
             f"Starting batch task",
@@ -79,18 +151,25 @@ class BatchProcessor:
             task_type=task.task_type.value
         )
         
+        await self._publish(task, "started", resumed=task.resumed_count > 0)
+        
         # 비동기 작업 생성
         async_task = asyncio.create_task(self._execute_task(task))
         self.running_tasks[task_id] = async_task
         
-        # 작업 완료 콜백 설정
+        # 작업 완료 콜백 설정 (정리 작업이 끝날 때까지 참조 유지)
         async_task.add_done_callback(
-            lambda t: asyncio.create_task(self._task_completed(task_id))
+            lambda t: self._spawn(self._task_completed(task_id))
         )
     
     async def _execute_task(self, task: BatchTask):
         """작업 실행"""
         try:
+            # 이전 실행에서 완료된 항목 로드 (재개 시 재사용)
+            task.checkpoints = await checkpoint_store.load_async(task.id)
+            task.failed_items = {}
+            task.reused_items = 0
+            
             if task.task_type == TaskType.KEYWORD_ANALYSIS:
                 result = await self._execute_keyword_analysis(task)
             elif task.task_type == TaskType.TITLE_GENERATION:
@@ -102,10 +181,34 @@ class BatchProcessor:
             else:
                 raise ValueError(f"Unknown task type: {task.task_type}")
             
+            result["reused_items"] = task.reused_items
+            result["failed_items"] = dict(task.failed_items)
             task.result = result
-            task.status = TaskStatus.COMPLETED
-            task.progress = 100
+            task.completed_at = datetime.now()
             
+            if task.failed_items:
+                # 부분 결과는 유지하고 실패 항목만 재시도할 수 있도록 FAILED 처리
+                task.status = TaskStatus.FAILED
+                task.error_message = f"{len(task.failed_items)} item(s) failed; resume to retry"
+                await checkpoint_store.update_job_status_async(task.id, TaskStatus.FAILED.value, task.error_message)
+                await self._publish(
+                    task, "failed",
+                    error_message=task.error_message,
+                    failed_items=list(task.failed_items)
+                )
+            else:
+                task.status = TaskStatus.COMPLETED
+                task.progress = 100
+                await checkpoint_store.update_job_status_async(task.id, TaskStatus.COMPLETED.value)
+                # 항목별 결과는 item 이벤트로 이미 전달되었으므로 요약만 발행
+                await self._publish(
+                    task, "completed",
+                    summary={k: v for k, v in result.items() if k != "results"}
+                )
+        
+        except asyncio.CancelledError:
+            await checkpoint_store.update_job_status_async(task.id, TaskStatus.CANCELLED.value)
+            raise
         except Exception as e:
             task.status = TaskStatus.FAILED
             task.error_message = str(e)
@@ -115,8 +218,82 @@ class BatchProcessor:
                 task_id=task.id,
                 task_type=task.task_type.value
             )
-        finally:
             task.completed_at = datetime.now()
+            await checkpoint_store.update_job_status_async(task.id, TaskStatus.FAILED.value, task.error_message)
+            await self._publish(task, "failed", error_message=task.error_message)
+        finally:
+            task.retry_filter = None
+            if task.completed_at is None:
+                task.completed_at = datetime.now()
+    
+    async def _run_item(
+        self,
+        task: BatchTask,
+        item_key: str,
+        stage: str,
+        producer: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """항목 실행 - 체크포인트된 결과는 재사용하고, 새 결과는 즉시 저장"""
+        checkpoint = task.checkpoints.get(item_key)
+        if checkpoint and checkpoint["status"] == "completed":
+            task.reused_items += 1
+            return checkpoint["result"]
+        
+        if task.retry_filter is not None and item_key not in task.retry_filter:
+            # 선택 재시도 대상이 아닌 미완료 항목은 실패 상태로 남겨 다음 재개 대상에 포함
+            task.failed_items[item_key] = (
+                checkpoint["error_message"] if checkpoint and checkpoint["error_message"] else "not processed"
+            )
+            return None
+        
+        attempts = (checkpoint["attempts"] if checkpoint else 0) + 1
+        try:
+            result = await producer()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            task.failed_items[item_key] = str(e)
+            await checkpoint_store.mark_failed_async(
+                task.id, CHECKPOINT_JOB_TYPE, item_key, str(e),
+                stage=stage, user_id=task.user_id, attempts=attempts
+            )
+            app_logger.warning(f"Batch item failed", task_id=task.id, item_key=item_key, error=str(e))
+            await self._publish(task, "item_failed", item_key=item_key, error=str(e))
+            return None
+        
+        await checkpoint_store.save_item_async(
+            task.id, CHECKPOINT_JOB_TYPE, item_key, result,
+            stage=stage, user_id=task.user_id, attempts=attempts
+        )
+        task.checkpoints[item_key] = {"status": "completed", "result": result, "attempts": attempts}
+        return result
+    
+    async def _publish(self, task: BatchTask, event: str, **data):
+        """작업 토픽과 사용자 토픽으로 진행 이벤트 발행"""
+        try:
+            await progress_broker.publish(
+                [task_topic(task.id), user_topic(task.user_id)],
+                event,
+                {
+                    "task_id": task.id,
+                    "task_type": task.task_type.value,
+                    "status": task.status.value,
+                    "progress": task.progress,
+                    **data
+                }
+            )
+        except Exception as e:
+            app_logger.warning(f"Progress event publish failed", task_id=task.id, error=str(e))
+    
+    async def _report_progress(self, task: BatchTask, progress: int, item: Optional[Dict] = None):
+        """진행률 갱신 - 값이 바뀌었거나 항목 결과가 있을 때만 발행"""
+        if item is None and progress == task.progress:
+            return
+        task.progress = progress
+        if item is not None:
+            await self._publish(task, "item", item=item)
+        else:
+            await self._publish(task, "progress")
     
     async def _execute_keyword_analysis(self, task: BatchTask) -> Dict:
         """키워드 분석 배치 작업"""
@@ -127,21 +304,26 @@ class BatchProcessor:
         total_keywords = len(keywords)
         
         for i, keyword in enumerate(keywords):
-            # 진행률 업데이트
-            task.progress = int((i / total_keywords) * 100)
+            async def analyze(i=i, keyword=keyword):
+                # 실제 키워드 분석 실행 (여기서는 모의 데이터)
+                result = {
+                    "keyword": keyword,
+                    "search_volume": 1000 + i * 100,
+                    "competition": "Medium",
+                    "cpc": 1.5,
+                    "opportunity_score": 80 + i
+                }
+                
+                # 작업 간 지연 (API 레이트 리미팅)
+                await asyncio.sleep(0.5)
+                return result
             
-            # 실제 키워드 분석 실행 (여기서는 모의 데이터)
-            result = {
-                "keyword": keyword,
-                "search_volume": 1000 + i * 100,
-                "competition": "Medium",
-                "cpc": 1.5,
-                "opportunity_score": 80 + i
-            }
-            results.append(result)
+            result = await self._run_item(task, f"keyword:{keyword}", "keyword", analyze)
+            if result is not None:
+                results.append(result)
             
-            # 작업 간 지연 (API 레이트 리미팅)
-            await asyncio.sleep(0.5)
+            # 진행률 업데이트
+            await self._report_progress(task, int(((i + 1) / total_keywords) * 100), item=result)
         
         return {
             "type": "keyword_analysis",
@@ -158,18 +340,23 @@ class BatchProcessor:
         total_operations = len(keywords)
         
         for i, keyword in enumerate(keywords):
-            task.progress = int((i / total_operations) * 100)
+            async def generate(keyword=keyword):
+                # 실제 제목 생성 (여기서는 모의 데이터)
+                titles = apply_duplicate_rates([
+                    {"title": f"{keyword}의 완벽한 가이드 {j+1}"}
+                    for j in range(count_per_keyword)
+                ])
+                title_index.add_many(item["title"] for item in titles)
+                await asyncio.sleep(1.0)  # AI API 호출 간격
+                return titles
             
-            # 실제 제목 생성 (여기서는 모의 데이터)
-            titles = []
-            for j in range(count_per_keyword):
-                titles.append({
-                    "title": f"{keyword}의 완벽한 가이드 {j+1}",
-                    "duplicate_rate": 5.0 + j
-                })
-            
-            results[keyword] = titles
-            await asyncio.sleep(1.0)  # AI API 호출 간격
+            titles = await self._run_item(task, f"titles:{keyword}", "title", generate)
+            if titles is not None:
+                results[keyword] = titles
+            await self._report_progress(
+                task, int(((i + 1) / total_operations) * 100),
+                item={"keyword": keyword, "titles": titles} if titles is not None else None
+            )
         
         return {
             "type": "title_generation",
@@ -186,19 +373,22 @@ class BatchProcessor:
         total_titles = len(titles)
         
         for i, title in enumerate(titles):
-            task.progress = int((i / total_titles) * 100)
-            
-            # 실제 콘텐츠 생성 (여기서는 모의 데이터)
-            content = {
-                "title": title,
-                "content": f"# {title}\n\n이것은 자동 생성된 콘텐츠입니다...",
-                "seo_score": 85,
-                "geo_score": 78,
-                "word_count": 1500
-            }
-            results.append(content)
+            async def generate(title=title):
+                # 실제 콘텐츠 생성 (여기서는 모의 데이터)
+                content = {
+                    "title": title,
+                    "content": f"# {title}\n\n이것은 자동 생성된 콘텐츠입니다...",
+                    "seo_score": 85,
+                    "geo_score": 78,
+                    "word_count": 1500
+                }
+                await asyncio.sleep(2.0)  # AI API 호출 간격 (콘텐츠 생성은 더 오래 걸림)
+                return content
             
-            await asyncio.sleep(2.0)  # AI API 호출 간격 (콘텐츠 생성은 더 오래 걸림)
+            content = await self._run_item(task, f"content:{title}", "content", generate)
+            if content is not None:
+                results.append(content)
+            await self._report_progress(task, int(((i + 1) / total_titles) * 100), item=content)
         
         return {
             "type": "content_generation",
@@ -223,47 +413,78 @@ class BatchProcessor:
         
         for keyword in keywords:
             # 1. 키워드 분석
-            keyword_result = {
-                "search_volume": 1000,
-                "competition": "Medium",
-                "opportunity_score": 85
-            }
-            workflow_results["keywords"][keyword] = keyword_result
+            async def analyze_keyword():
+                await asyncio.sleep(0.5)
+                return {
+                    "search_volume": 1000,
+                    "competition": "Medium",
+                    "opportunity_score": 85
+                }
+            
+            keyword_result = await self._run_item(task, f"keyword:{keyword}", "keyword", analyze_keyword)
             current_step += 1
-            task.progress = int((current_step / total_steps) * 100)
-            await asyncio.sleep(0.5)
+            if keyword_result is None:
+                # 키워드 단계가 실패하면 하위 단계는 다음 재개 때 진행
+                current_step += titles_per_keyword + content_per_keyword
+                await self._report_progress(task, int((current_step / total_steps) * 100))
+                continue
+            
+            workflow_results["keywords"][keyword] = keyword_result
+            await self._report_progress(
+                task, int((current_step / total_steps) * 100),
+                item={"stage": "keyword", "keyword": keyword, **keyword_result}
+            )
             
             # 2. 제목 생성
             titles = []
             for i in range(titles_per_keyword):
-                title = f"{keyword}의 실전 가이드 {i+1}"
-                titles.append({
-                    "title": title,
-                    "duplicate_rate": 5.0 + i
-                })
+                async def generate_title(i=i):
+                    await asyncio.sleep(1.0)
+                    title = f"{keyword}의 실전 가이드 {i+1}"
+                    duplicate_rate = title_index.score(title)["duplicate_rate"]
+                    title_index.add(title)
+                    return {
+                        "title": title,
+                        "duplicate_rate": duplicate_rate
+                    }
+                
+                title_result = await self._run_item(task, f"title:{keyword}:{i}", "title", generate_title)
                 current_step += 1
-                task.progress = int((current_step / total_steps) * 100)
-                await asyncio.sleep(1.0)
+                if title_result is not None:
+                    titles.append(title_result)
+                await self._report_progress(
+                    task, int((current_step / total_steps) * 100),
+                    item={"stage": "title", "keyword": keyword, **title_result} if title_result else None
+                )
             
             workflow_results["titles"][keyword] = titles
             
             # 3. 콘텐츠 생성
             for i in range(content_per_keyword):
+                current_step += 1
+                if i >= len(titles):
+                    await self._report_progress(task, int((current_step / total_steps) * 100))
+                    continue
+                
                 title = titles[i]["title"]
-                content = {
-                    "title": title,
-                    "content": f"# {title}\n\n자동 생성된 고품질 콘텐츠...",
-                    "seo_score": 85,
-                    "word_count": 1500
-                }
                 
-                if keyword not in workflow_results["content"]:
-                    workflow_results["content"][keyword] = []
-                workflow_results["content"][keyword].append(content)
+                async def generate_content(title=title):
+                    await asyncio.sleep(2.0)
+                    return {
+                        "title": title,
+                        "content": f"# {title}\n\n자동 생성된 고품질 콘텐츠...",
+                        "seo_score": 85,
+                        "word_count": 1500
+                    }
                 
-                current_step += 1
-                task.progress = int((current_step / total_steps) * 100)
-                await asyncio.sleep(2.0)
+                content = await self._run_item(task, f"content:{keyword}:{i}", "content", generate_content)
+                if content is not None:
+                    workflow_results["content"].setdefault(keyword, []).append(content)
+                
+                await self._report_progress(
+                    task, int((current_step / total_steps) * 100),
+                    item={"stage": "content", "keyword": keyword, **content} if content else None
+                )
         
         return {
             "type": "batch_workflow",
@@ -285,30 +506,206 @@ class BatchProcessor:
                 status=task.status.value,
                 duration_seconds=(task.completed_at - task.started_at).total_seconds() if task.completed_at and task.started_at else 0
             )
+            if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
+                self._mark_finished(task)
         
         # 대기 중인 작업이 있으면 시작
         await self._start_next_pending_task()
     
     async def _start_next_pending_task(self):
         """대기 중인 다음 작업 시작"""
-        if len(self.running_tasks) >= self.max_concurrent_tasks:
+        while self._pending and len(self.running_tasks) < self.max_concurrent_tasks:
+            task_id = self._pending.popleft()
+            task = self.tasks.get(task_id)
+            # 대기 중 취소/제거된 작업은 건너뜀
+            if task and task.status == TaskStatus.PENDING:
+                await self._start_task(task_id)
+                break
+    
+    def _mark_finished(self, task: BatchTask):
+        """종료된 작업 정리 - 큰 결과 이관, 메모리 체크포인트 해제, 보존 정책 적용"""
+        task.checkpoints = {}
+        self._spill_result(task)
+        self._finished[task.id] = None
+        self._finished.move_to_end(task.id)
+        self._enforce_retention(task.user_id)
+    
+    def _spill_result(self, task: BatchTask):
+        """임계치를 넘는 결과는 압축 블롭으로 이관하고 ID로만 참조"""
+        if task.result is None:
+            return
+        try:
+            payload = TaskResultStore.encode(task.result)
+            if len(payload) < self.spill_threshold_bytes:
+                return
+            compressed_size = self.result_store.put(task.id, payload)
+        except Exception as e:
+            app_logger.error(f"Task result spill failed", error=e, task_id=task.id)
             return
         
-        for task_id, task in self.tasks.items():
-            if task.status == TaskStatus.PENDING:
-                await self._start_task(task_id)
+        task.result_ref = task.id
+        task.result = None
+        app_logger.info(
+            f"Task result spilled to blob storage",
+            task_id=task.id,
+            raw_bytes=len(payload),
+            compressed_bytes=compressed_size
+        )
+    
+    def _drop_result(self, task: BatchTask):
+        if task.result_ref:
+            try:
+                self.result_store.delete(task.result_ref)
+            except OSError as e:
+                app_logger.warning(f"Task result blob delete failed", task_id=task.id, error=str(e))
+            task.result_ref = None
+        task.result = None
+    
+    def _evict(self, task_id: str):
+        """작업 제거 - 결과 블롭, 진행 이벤트 히스토리, 체크포인트까지 함께 정리"""
+        task = self.tasks.pop(task_id, None)
+        self._finished.pop(task_id, None)
+        if task is None:
+            return
+        
+        user_tasks = self.user_index.get(task.user_id)
+        if user_tasks is not None:
+            user_tasks.pop(task_id, None)
+            if not user_tasks:
+                del self.user_index[task.user_id]
+        
+        self._drop_result(task)
+        progress_broker.forget(task_topic(task_id))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            checkpoint_store.clear(task_id)
+            return
+        # 이벤트 루프 안이면 DB 삭제는 워커 스레드에서 (보존 정책이 요청 처리를 막지 않도록)
+        self._spawn(checkpoint_store.clear_async(task_id))
+    
+    def _enforce_retention(self, user_id: Optional[str] = None):
+        """보존 기간 / 전체 개수 / 사용자별 개수 기준으로 종료된 작업 제거"""
+        cutoff = datetime.now() - self.retention
+        evicted = 0
+        
+        # 종료 시각 순으로 정렬되어 있으므로 앞에서부터만 확인
+        while self._finished:
+            oldest_id = next(iter(self._finished))
+            oldest = self.tasks.get(oldest_id)
+            if (oldest is not None and len(self._finished) <= self.max_finished_tasks
+                    and oldest.completed_at and oldest.completed_at >= cutoff):
                 break
+            self._evict(oldest_id)
+            evicted += 1
+        
+        if user_id is not None:
+            user_tasks = self.user_index.get(user_id, {})
+            overflow = len(user_tasks) - self.max_tasks_per_user
+            if overflow > 0:
+                # 실행/대기 중인 작업은 남기고 가장 오래된 종료 작업부터 제거
+                for task_id in [tid for tid in user_tasks if tid in self._finished][:overflow]:
+                    self._evict(task_id)
+                    evicted += 1
+        
+        if evicted:
+            app_logger.info(f"Evicted finished batch tasks", count=evicted, remaining=len(self.tasks))
+    
+    async def _run_retention(self):
+        while True:
+            await asyncio.sleep(self.retention_interval)
+            try:
+                self._enforce_retention()
+            except Exception as e:
+                app_logger.error(f"Batch task retention failed", error=e)
+    
+    def start(self):
+        """주기적 보존 정책 적용 시작"""
+        if self._retention_task is None:
+            self._retention_task = asyncio.create_task(self._run_retention())
+    
+    async def stop(self):
+        if self._retention_task is None:
+            return
+        self._retention_task.cancel()
+        try:
+            await self._retention_task
+        except asyncio.CancelledError:
+            pass
+        self._retention_task = None
     
     def get_task_status(self, task_id: str) -> Optional[BatchTask]:
         """작업 상태 조회"""
         return self.tasks.get(task_id)
     
+    def get_task_result(self, task: BatchTask) -> Optional[Dict]:
+        """작업 결과 조회 - 이관된 결과는 조회 시점에만 로드 (메모리에 다시 올리지 않음)"""
+        if task.result is not None or not task.result_ref:
+            return task.result
+        return self.result_store.get(task.result_ref)
+    
     def get_user_tasks(self, user_id: str) -> List[BatchTask]:
         """사용자별 작업 목록"""
-        return [
-            task for task in self.tasks.values()
-            if task.user_id == user_id
-        ]
+        return [self.tasks[task_id] for task_id in self.user_index.get(user_id, ())]
+    
+    async def resume_task(self, task_id: str, item_keys: Optional[List[str]] = None) -> bool:
+        """실패/취소된 작업 재개 - 완료 항목은 체크포인트에서 재사용
+        
+        item_keys가 주어지면 해당 항목만 재시도하고 나머지 미완료 항목은 그대로 둔다.
+        """
+        task = self.tasks.get(task_id)
+        if not task or task.status not in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+            return False
+        
+        task.status = TaskStatus.PENDING
+        task.retry_filter = set(item_keys) if item_keys else None
+        task.resumed_count += 1
+        # 재실행 중에는 보존 정책 대상에서 제외하고 이전 결과는 새 결과로 대체
+        self._finished.pop(task_id, None)
+        self._drop_result(task)
+        await checkpoint_store.update_job_status_async(task_id, TaskStatus.PENDING.value)
+        
+        app_logger.info(
+            f"Batch task resumed",
+            task_id=task_id,
+            retry_items=len(item_keys) if item_keys else "all"
+        )
+        await self._publish(task, "resumed", retry_items=item_keys)
+        
+        if len(self.running_tasks) < self.max_concurrent_tasks:
+            await self._start_task(task_id)
+        else:
+            self._pending.append(task_id)
+        return True
+    
+    def restore_interrupted_tasks(self) -> int:
+        """워커 재시작 시 중단된 작업을 FAILED 상태로 복원하여 재개 가능하게 함"""
+        restored = 0
+        for job in checkpoint_store.load_unfinished_jobs(CHECKPOINT_JOB_TYPE):
+            if job["job_id"] in self.tasks:
+                continue
+            try:
+                task = BatchTask(
+                    id=job["job_id"],
+                    task_type=TaskType(job["parameters"].get("task_type")),
+                    user_id=job["user_id"],
+                    parameters=job["parameters"].get("parameters", {}),
+                    status=TaskStatus.FAILED,
+                    created_at=job["created_at"],
+                    completed_at=datetime.now(),
+                    error_message="Interrupted by worker restart; resume to continue"
+                )
+            except ValueError:
+                continue
+            
+            self._register(task)
+            checkpoint_store.update_job_status(task.id, TaskStatus.FAILED.value, task.error_message)
+            self._mark_finished(task)
+            restored += 1
+        
+        if restored:
+            app_logger.info(f"Restored interrupted batch tasks", count=restored)
+        return restored
     
     async def cancel_task(self, task_id: str) -> bool:
         """작업 취소"""
@@ -316,17 +713,22 @@ class BatchProcessor:
         if not task:
             return False
         
-        if task.status == TaskStatus.RUNNING:
+        running = task.status == TaskStatus.RUNNING and task_id in self.running_tasks
+        if running:
             # 실행 중인 작업 취소
-            if task_id in self.running_tasks:
-                self.running_tasks[task_id].cancel()
-                del self.running_tasks[task_id]
+            self.running_tasks[task_id].cancel()
+            del self.running_tasks[task_id]
         
         task.status = TaskStatus.CANCELLED
         task.completed_at = datetime.now()
+        await checkpoint_store.update_job_status_async(task_id, TaskStatus.CANCELLED.value)
+        await self._publish(task, "cancelled")
+        if not running:
+            # 실행 중이던 작업은 완료 콜백(_task_completed)에서 한 번만 정리
+            self._mark_finished(task)
         
         app_logger.info(f"Batch task cancelled", task_id=task_id)
         return True
 
 # 글로벌 배치 프로세서 인스턴스
-batch_processor = BatchProcessor()
\ No newline at end of file
+batch_processor = BatchProcessor()
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+본문 중복(표절) 검사 색인
+생성 콘텐츠 / 발행 포스팅 본문을 winnowing 지문으로 만들어 역색인에 두고, 새 본문이 기존 글과 얼마나 겹치는지 계산
+- 본문 → 정규화(NFKC, 소문자, 공백/문장부호/마크다운 기호 제거) → 문자 k-gram 해시 → 창(w)마다 최솟값만 지문으로 선택
+  (k + w - 1 자 이상 같은 구간은 반드시 같은 지문을 공유)
+- 지문 → 문서 역색인(SQLite)으로 후보 문서를 찾고, 후보의 지문 집합과 정확히 비교
+- 겹침 비율 = 새 본문 지문 중 기존 문서에 있는 비율 (여러 문서에서 조각조각 가져온 경우 합집합 기준)
+- copyscape_result 판정: Pass / Review Required / Duplicate
+- 생성 시점에 검사 후 색인, 보관분까지 포함한 전체 재검사는 rescan (관리자 API / CLI)
+
+    python body_fingerprints.py rescan
+    python body_fingerprints.py check 본문파일.md
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from data_paths import data_path
+from logger import app_logger
+
+SOURCE_GENERATED = "generated"
+SOURCE_POSTED = "posted"
+
+# k=25 자, 창 20 - 44자 이상 같은 구간은 반드시 검출, 지문 밀도 약 2/(w+1)
+FINGERPRINT_K = int(os.getenv("BODY_FINGERPRINT_K", 25))
+FINGERPRINT_WINDOW = int(os.getenv("BODY_FINGERPRINT_WINDOW", 20))
+# 판정 기준 (겹침 %)
+REVIEW_PERCENT = float(os.getenv("BODY_DUPLICATE_REVIEW_PERCENT", 30))
+DUPLICATE_PERCENT = float(os.getenv("BODY_DUPLICATE_PERCENT", 60))
+# 템플릿 문구처럼 아주 흔한 지문은 최근 문서만 후보로 (게시 목록 전체를 읽지 않음)
+MAX_POSTINGS_PER_FINGERPRINT = 100
+MAX_VERIFIED_DOCUMENTS = 20
+MIN_MATCH_PERCENT = 5.0
+
+VERDICT_PASS = "Pass"
+VERDICT_REVIEW = "Review Required"
+VERDICT_DUPLICATE = "Duplicate"
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    site_id TEXT,
+    owner TEXT,
+    title TEXT,
+    created_at TEXT,
+    fingerprints BLOB NOT NULL,
+    UNIQUE (source, doc_id)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    hash INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (hash, doc)
+) WITHOUT ROWID;
+"""
+
+def normalize_body(body: str) -> str:
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", body or "").lower())
+
+def winnow(body: str, k: int = FINGERPRINT_K, window: int = FINGERPRINT_WINDOW) -> Set[int]:
+    """winnowing 지문 집합 - 각 창의 최솟값(같으면 가장 오른쪽), 연속된 창이 같은 위치를 고르면 한 번만"""
+    text = normalize_body(body)
+    if len(text) < k:
+        return {zlib.crc32(text.encode("utf-8"))} if text else set()
+    hashes = [zlib.crc32(text[i:i + k].encode("utf-8")) for i in range(len(text) - k + 1)]
+    if len(hashes) <= window:
+        return {min(hashes)}
+    # 단조 덱 - 앞쪽이 현재 창의 (가장 오른쪽) 최솟값 위치
+    fingerprints = set()
+    chosen = -1
+    candidates = deque()
+    for position, value in enumerate(hashes):
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(position)
+        if candidates[0] <= position - window:
+            candidates.popleft()
+        if position >= window - 1 and candidates[0] != chosen:
+            chosen = candidates[0]
+            fingerprints.add(hashes[chosen])
+    return fingerprints
+
+def verdict_for(overlap_percent: float) -> str:
+    if overlap_percent >= DUPLICATE_PERCENT:
+        return VERDICT_DUPLICATE
+    if overlap_percent >= REVIEW_PERCENT:
+        return VERDICT_REVIEW
+    return VERDICT_PASS
+
+def _pack(fingerprints: Set[int]) -> bytes:
+    return array("I", sorted(fingerprints)).tobytes()
+
+def _unpack(blob: bytes) -> Set[int]:
+    values = array("I")
+    values.frombytes(blob)
+    return set(values)
+
+class BodyFingerprintIndex:
+    """SQLite 기반 winnowing 지문 역색인"""
+
+    def __init__(self, path: Optional[str] = None):
+        # 경로를 주지 않으면 첫 연결 때 DATA_DIR 아래로 - import 만으로 색인 파일을 만들지 않음
+        self._path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = data_path("BODY_FINGERPRINT_INDEX", "body_fingerprints.db")
+        return self._path
+
+    def _db(self) -> sqlite3.Connection:
+        """스레드별 연결 (첫 연결에서 스키마 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                # owner 컬럼 도입 전 색인 파일 (rescan 으로 채워짐)
+                if "owner" not in {row["name"] for row in conn.execute("PRAGMA table_info(documents)")}:
+                    conn.execute("ALTER TABLE documents ADD COLUMN owner TEXT")
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._write_lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- 갱신 ----
+
+    def _remove(self, conn: sqlite3.Connection, source: str, doc_id: str) -> bool:
+        row = conn.execute(
+            "SELECT rowid, fingerprints FROM documents WHERE source = ? AND doc_id = ?", (source, str(doc_id))
+        ).fetchone()
+        if row is None:
+            return False
+        conn.executemany(
+            "DELETE FROM postings WHERE hash = ? AND doc = ?",
+            [(value, row["rowid"]) for value in _unpack(row["fingerprints"])]
+        )
+        conn.execute("DELETE FROM documents WHERE rowid = ?", (row["rowid"],))
+        return True
+
+    def add_documents(self, source: str, documents: Iterable[Dict[str, Any]]) -> int:
+        """문서 추가/교체 - doc_id, body, site_id, owner(작성자), title, created_at"""
+        count = 0
+        with self._transaction() as conn:
+            for doc in documents:
+                fingerprints = doc.get("fingerprints")
+                if fingerprints is None:
+                    fingerprints = winnow(doc.get("body"))
+                # 교체된 문서도 항상 더 큰 rowid 를 받도록 삭제 전에 정함 (rescan 이 재구성 전 문서를 rowid 로 구분)
+                rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM documents").fetchone()[0]
+                self._remove(conn, source, doc["doc_id"])
+                if not fingerprints:
+                    continue
+                created_at = doc.get("created_at")
+                conn.execute(
+                    "INSERT INTO documents (rowid, source, doc_id, site_id, owner, title, created_at, fingerprints) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        rowid, source, str(doc["doc_id"]),
+                        None if doc.get("site_id") is None else str(doc["site_id"]),
+                        None if doc.get("owner") is None else str(doc["owner"]),
+                        doc.get("title"),
+                        created_at.isoformat() if hasattr(created_at, "isoformat") else created_at,
+                        _pack(fingerprints)
+                    )
+                )
+                conn.executemany("INSERT INTO postings (hash, doc) VALUES (?, ?)", [(value, rowid) for value in fingerprints])
+                count += 1
+        return count
+
+    def remove_documents(self, source: str, doc_ids: Iterable[str]) -> int:
+        with self._transaction() as conn:
+            return sum(1 for doc_id in doc_ids if self._remove(conn, source, doc_id))
+
+    def last_rowid(self) -> int:
+        return self._db().execute("SELECT COALESCE(MAX(rowid), 0) FROM documents").fetchone()[0]
+
+    def remove_up_to(self, rowid: int, batch_size: int = 500) -> int:
+        """rowid 이하 문서 제거 - 재구성 중 다시 추가되지 않은(원본에서 사라진) 문서 정리, 짧은 트랜잭션으로 나눔"""
+        removed = 0
+        while True:
+            with self._transaction() as conn:
+                rows = conn.execute(
+                    "SELECT source, doc_id FROM documents WHERE rowid <= ? LIMIT ?", (rowid, batch_size)
+                ).fetchall()
+                for row in rows:
+                    self._remove(conn, row["source"], row["doc_id"])
+            removed += len(rows)
+            if len(rows) < batch_size:
+                return removed
+
+    def clear(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM documents")
+
+    def safe_add(self, source: str, documents: Iterable[Dict[str, Any]]):
+        """요청 경로용 - 색인 실패가 저장을 실패시키지 않도록 기록만 (rescan 으로 복구)"""
+        try:
+            self.add_documents(source, documents)
+        except Exception as e:
+            app_logger.warning(f"Body fingerprint index update failed ({source}): {e}")
+
+    # ---- 검사 ----
+
+    def _candidates(self, conn: sqlite3.Connection, fingerprints: Set[int]) -> List[int]:
+        """공유 지문이 많은 순으로 후보 문서 rowid"""
+        hits: Dict[int, int] = {}
+        for value in fingerprints:
+            for (doc,) in conn.execute(
+                "SELECT doc FROM postings WHERE hash = ? ORDER BY doc DESC LIMIT ?",
+                (value, MAX_POSTINGS_PER_FINGERPRINT)
+            ):
+                hits[doc] = hits.get(doc, 0) + 1
+        return sorted(hits, key=hits.get, reverse=True)[:MAX_VERIFIED_DOCUMENTS]
+
+    def check_fingerprints(
+        self,
+        fingerprints: Set[int],
+        exclude: Optional[Tuple[str, str]] = None,
+        before: Optional[str] = None,
+        pending: Optional[List[Tuple[str, Set[int]]]] = None
+    ) -> Dict[str, Any]:
+        """지문 집합의 겹침 검사
+
+        exclude: 자기 자신 (source, doc_id), before: 이 시각 이전 문서만,
+        pending: 아직 색인되지 않은 같은 배치의 앞선 글 (라벨, 지문)
+        """
+        started = time.perf_counter()
+        matches = []
+        covered: Set[int] = set()
+        for label, other in pending or ():
+            shared = fingerprints & other
+            percent = len(shared) / len(fingerprints) * 100 if fingerprints else 0.0
+            if percent >= MIN_MATCH_PERCENT:
+                covered |= shared
+                matches.append({
+                    "source": "batch", "doc_id": label, "site_id": None, "owner": None, "title": None,
+                    "overlap_percent": round(percent, 1), "shared_fingerprints": len(shared)
+                })
+        if fingerprints:
+            conn = self._db()
+            candidates = self._candidates(conn, fingerprints)
+            if candidates:
+                placeholders = ", ".join("?" * len(candidates))
+                rows = conn.execute(
+                    f"SELECT source, doc_id, site_id, owner, title, created_at, fingerprints FROM documents WHERE rowid IN ({placeholders})",
+                    candidates
+                ).fetchall()
+                for row in rows:
+                    if exclude is not None and (row["source"], row["doc_id"]) == (exclude[0], str(exclude[1])):
+                        continue
+                    if before is not None and row["created_at"] is not None and row["created_at"] >= before:
+                        continue
+                    shared = fingerprints & _unpack(row["fingerprints"])
+                    percent = len(shared) / len(fingerprints) * 100
+                    if percent < MIN_MATCH_PERCENT:
+                        continue
+                    covered |= shared
+                    matches.append({
+                        "source": row["source"],
+                        "doc_id": row["doc_id"],
+                        "site_id": row["site_id"],
+                        "owner": row["owner"],
+                        "title": row["title"],
+                        "overlap_percent": round(percent, 1),
+                        "shared_fingerprints": len(shared)
+                    })
+        matches.sort(key=lambda match: match["overlap_percent"], reverse=True)
+        overlap = round(len(covered) / len(fingerprints) * 100, 1) if fingerprints else 0.0
+        return {
+            "overlap_percent": overlap,
+            "verdict": verdict_for(overlap),
+            "fingerprints": len(fingerprints),
+            "matches": matches,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def check(self, body: str, exclude: Optional[Tuple[str, str]] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        return self.check_fingerprints(winnow(body), exclude, before)
+
+    def check_visible(self, body: str, owner: str, site_ids: Iterable[str] = ()) -> Dict[str, Any]:
+        """API 용 검사 - 겹침 비율/판정은 전체 색인 기준, 일치 문서 목록은 owner 가 만든 글과
+        owner 의 사이트(site_ids)에 발행된 글만 (다른 사용자의 문서 id/제목은 노출하지 않음)"""
+        result = self.check(body)
+        owned_sites = {str(site_id) for site_id in site_ids}
+        visible = [
+            match for match in result["matches"]
+            if match["owner"] == str(owner) or match["site_id"] in owned_sites
+        ]
+        result["hidden_matches"] = len(result["matches"]) - len(visible)
+        result["matches"] = [{key: value for key, value in match.items() if key != "owner"} for match in visible]
+        return result
+
+    def check_batch(self, bodies: List[str], labels: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """여러 본문 검사 - 색인된 글과 같은 배치의 앞선 글 모두와 비교 (템플릿으로 찍어낸 배치 검출)"""
+        labels = labels or [str(i) for i in range(len(bodies))]
+        results, pending = [], []
+        for label, body in zip(labels, bodies):
+            fingerprints = winnow(body)
+            results.append(self.check_fingerprints(fingerprints, pending=pending))
+            pending.append((label, fingerprints))
+        return results
+
+    def safe_check_batch(self, bodies: List[str], labels: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """요청 경로용 - 검사 실패 시 Pending (rescan 에서 다시 판정)"""
+        try:
+            return self.check_batch(bodies, labels)
+        except Exception as e:
+            app_logger.warning(f"Body duplicate check failed: {e}")
+            return [{"overlap_percent": None, "verdict": "Pending", "fingerprints": 0, "matches": []} for _ in bodies]
+
+    def safe_check(self, body: str) -> Dict[str, Any]:
+        return self.safe_check_batch([body])[0]
+
+    def stored_fingerprints(self, source: str) -> Iterable[Tuple[str, Optional[str], Set[int]]]:
+        """(doc_id, created_at, 지문) - 재검사에서 본문을 다시 읽지 않도록"""
+        last = 0
+        while True:
+            rows = self._db().execute(
+                "SELECT rowid, doc_id, created_at, fingerprints FROM documents WHERE source = ? AND rowid > ? "
+                "ORDER BY rowid LIMIT 500",
+                (source, last)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["doc_id"], row["created_at"], _unpack(row["fingerprints"])
+            last = rows[-1]["rowid"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._db()
+        rows = conn.execute("SELECT source, COUNT(*) AS count FROM documents GROUP BY source").fetchall()
+        return {
+            "documents": {row["source"]: row["count"] for row in rows},
+            "postings": conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            "k": FINGERPRINT_K,
+            "window": FINGERPRINT_WINDOW,
+            "index_size_mb": round(os.path.getsize(self.path) / (1024 * 1024), 2) if os.path.exists(self.path) else 0
+        }
+
+# 전역 본문 지문 색인
+body_index = BodyFingerprintIndex()
+
+# ---- 전체 재검사 ----
+
+def _sortable(value: Any) -> Optional[str]:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+def _index_hot_generated(session, index: BodyFingerprintIndex, batch_size: int) -> int:
+    from sqlalchemy import select
+    from models import GeneratedContent, GeneratedTitle
+    from content_blobs import load_bodies
+
+    count, last_id = 0, ""
+    while True:
+        rows = session.execute(
+            select(
+                GeneratedContent.id, GeneratedContent.content_hash, GeneratedContent.content,
+                GeneratedContent.created_by, GeneratedContent.created_at, GeneratedTitle.title
+            )
+            .outerjoin(GeneratedTitle, GeneratedTitle.id == GeneratedContent.title_id)
+            .where(GeneratedContent.id > last_id)
+            .order_by(GeneratedContent.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return count
+        bodies = load_bodies(session, (row.content_hash for row in rows))
+        count += index.add_documents(SOURCE_GENERATED, [
+            {
+                "doc_id": row.id,
+                "body": bodies.get(row.content_hash, "") if row.content_hash else row.content,
+                "owner": row.created_by,
+                "title": row.title,
+                "created_at": _sortable(row.created_at)
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+def _index_hot_posted(session, index: BodyFingerprintIndex, batch_size: int) -> int:
+    from sqlalchemy import select
+    from models import PostingResult
+
+    count, last_id = 0, ""
+    while True:
+        rows = session.execute(
+            select(PostingResult.id, PostingResult.site_id, PostingResult.title, PostingResult.content, PostingResult.created_at)
+            .where(PostingResult.post_status == "published", PostingResult.id > last_id)
+            .order_by(PostingResult.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return count
+        count += index.add_documents(SOURCE_POSTED, [
+            {"doc_id": row.id, "body": row.content, "site_id": row.site_id, "title": row.title,
+             "created_at": _sortable(row.created_at)}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+def _index_archived(session, index: BodyFingerprintIndex) -> Dict[str, int]:
+    """보관 세그먼트의 생성 콘텐츠 / 발행 포스팅 (프레임 단위로 한 번씩 해제)"""
+    from sqlalchemy import select
+    from models import ArchivedRow, GeneratedContent, PostingResult
+    from archive_store import segment_store
+
+    result = {}
+    for table_name, source in ((GeneratedContent.__tablename__, SOURCE_GENERATED), (PostingResult.__tablename__, SOURCE_POSTED)):
+        frames = session.execute(
+            select(ArchivedRow.segment, ArchivedRow.frame_offset, ArchivedRow.frame_length)
+            .where(ArchivedRow.table_name == table_name)
+            .distinct()
+        ).all()
+        count = 0
+        for frame in frames:
+            records = segment_store.read_frame(*frame)
+            if source == SOURCE_POSTED:
+                records = [record for record in records if record.get("post_status") == "published"]
+            count += index.add_documents(source, [
+                {"doc_id": record["id"], "body": record.get("content"), "site_id": record.get("site_id"),
+                 "owner": record.get("created_by"), "title": record.get("title"), "created_at": record.get("created_at")}
+                for record in records
+            ])
+        result[table_name] = count
+    return result
+
+def _update_results(verdicts: Dict[str, str], session_factory=None) -> int:
+    """generated_content.copyscape_result 갱신 (SQLite 단일 쓰기 큐가 있으면 경유)"""
+    from sqlalchemy import update
+    from models import GeneratedContent
+    from db_writer import single_writer
+
+    by_verdict: Dict[str, List[str]] = {}
+    for content_id, verdict in verdicts.items():
+        by_verdict.setdefault(verdict, []).append(content_id)
+
+    def job(session):
+        updated = 0
+        for verdict, ids in by_verdict.items():
+            for start in range(0, len(ids), 500):
+                updated += session.execute(
+                    update(GeneratedContent)
+                    .where(GeneratedContent.id.in_(ids[start:start + 500]), GeneratedContent.copyscape_result != verdict)
+                    .values(copyscape_result=verdict)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+        return updated
+
+    if single_writer is not None and session_factory is None:
+        return single_writer.run(job)
+    from database import SessionLocal
+    session = (session_factory or SessionLocal)()
+    try:
+        updated = job(session)
+        session.commit()
+        return updated
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def rescan(index: BodyFingerprintIndex = None, batch_size: int = 500, session_factory=None) -> Dict[str, Any]:
+    """색인 재구성 (hot + 보관) 후 hot 생성 콘텐츠마다 그보다 먼저 만들어진 글과 비교해 copyscape_result 재판정
+
+    색인을 비우지 않고 문서마다 교체한 뒤 다시 추가되지 않은 문서만 지움 - 재구성 중에도 검사/추가가 기존 색인을 그대로 씀
+    """
+    from database import SessionLocal
+
+    index = index or body_index
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"indexed": {}}
+    # 이 rowid 이하 = 재구성 전 문서 (다시 추가되면 더 큰 rowid 로 교체됨)
+    previous_rowid = index.last_rowid()
+    session = (session_factory or SessionLocal)()
+    try:
+        result["indexed"]["archived"] = _index_archived(session, index)
+        result["indexed"][SOURCE_GENERATED] = _index_hot_generated(session, index, batch_size)
+        result["indexed"][SOURCE_POSTED] = _index_hot_posted(session, index, batch_size)
+        # 보관된 글은 판정 갱신 대상이 아니므로 hot 행 id 만
+        from sqlalchemy import select
+        from models import GeneratedContent
+        hot_ids = set(session.execute(select(GeneratedContent.id)).scalars())
+    finally:
+        session.close()
+    result["removed"] = index.remove_up_to(previous_rowid)
+
+    verdicts: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    for doc_id, created_at, fingerprints in index.stored_fingerprints(SOURCE_GENERATED):
+        if doc_id not in hot_ids:
+            continue
+        verdict = index.check_fingerprints(fingerprints, exclude=(SOURCE_GENERATED, doc_id), before=created_at)["verdict"]
+        verdicts[doc_id] = verdict
+        counts[verdict] = counts.get(verdict, 0) + 1
+    result["checked"] = len(verdicts)
+    result["verdicts"] = counts
+    result["updated"] = _update_results(verdicts, session_factory)
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 1)
+    app_logger.info(f"Body duplicate rescan completed: {result}")
+    return result
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="본문 중복 검사 색인 관리")
+    parser.add_argument("command", choices=["rescan", "check", "stats"])
+    parser.add_argument("path", nargs="?", help="check 할 본문 파일")
+    args = parser.parse_args()
+
+    if args.command == "rescan":
+        print(f"✅ 재검사 완료: {rescan()}")
+    elif args.command == "check":
+        with open(args.path, "r", encoding="utf-8") as f:
+            print(json.dumps(body_index.check(f.read()), ensure_ascii=False, indent=2))
+    print(f"📊 {body_index.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+워크플로우 체크포인트 저장소
+배치 작업 / 자동화 세션의 항목별 결과를 완료 즉시 영속화하여
+실패·취소·워커 종료 후에도 성공한 항목을 재사용하고 실패 항목만 재시도
+"""
+
+import asyncio
+import json
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from database import SessionLocal
+from db_writer import single_writer
+from models import WorkflowCheckpoint
+from logger import app_logger
+
+# 작업 정의(파라미터/상태)를 저장하는 예약 항목 키
+JOB_SPEC_KEY = "__job__"
+
+class CheckpointStore:
+    """항목 단위 체크포인트 저장소 (요청 세션과 독립된 짧은 트랜잭션 사용)"""
+
+    def __init__(self, session_factory=SessionLocal, writer=single_writer):
+        self.session_factory = session_factory
+        # 단일 쓰기 큐가 있으면 (SQLite) 쓰기를 그쪽으로 보내 다른 배치 쓰기와 묶어 커밋
+        self.writer = writer
+
+    def _write(self, fn):
+        """쓰기 작업 fn(db) 실행 후 커밋"""
+        if self.writer is not None:
+            return self.writer.run(fn)
+        db = self.session_factory()
+        try:
+            result = fn(db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _write_async(self, fn):
+        """코루틴용 _write - 쓰기 큐 완료를 await 로 기다리고, 큐가 없으면 워커 스레드에서 커밋"""
+        if self.writer is not None:
+            return await self.writer.run_async(fn)
+        return await asyncio.to_thread(self._write, fn)
+
+    # ---- 쓰기 작업 fn(db) 생성 (동기/비동기 경로가 같은 작업을 공유) ----
+
+    @staticmethod
+    def _upsert_job(job_id: str, item_key: str, **values):
+        def upsert(db):
+            def find():
+                return db.query(WorkflowCheckpoint).filter(
+                    WorkflowCheckpoint.job_id == job_id,
+                    WorkflowCheckpoint.item_key == item_key
+                ).first()
+
+            row = find()
+            if row is None:
+                try:
+                    with db.begin_nested():
+                        # NOT NULL 컬럼(job_type)이 INSERT 에 포함되도록 값을 함께 지정
+                        row = WorkflowCheckpoint(job_id=job_id, item_key=item_key, **{"attempts": 0, **values})
+                        db.add(row)
+                        db.flush()
+                except IntegrityError:
+                    # 동시에 같은 항목을 기록한 경우 - 다시 읽어 갱신
+                    row = find()
+
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.updated_at = datetime.utcnow()
+
+        return upsert
+
+    def _job_spec_job(
+        self,
+        job_id: str,
+        job_type: str,
+        user_id: Optional[str],
+        parameters: Dict[str, Any],
+        status: str = "pending"
+    ):
+        """작업 정의 저장 (워커 재시작 후 복구용)"""
+        return self._upsert_job(
+            job_id, JOB_SPEC_KEY,
+            job_type=job_type,
+            created_by=user_id,
+            status=status,
+            result=json.dumps(parameters, ensure_ascii=False, default=str)
+        )
+
+    @staticmethod
+    def _job_status_job(job_id: str, status: str, error_message: Optional[str] = None):
+        return lambda db: db.query(WorkflowCheckpoint).filter(
+            WorkflowCheckpoint.job_id == job_id,
+            WorkflowCheckpoint.item_key == JOB_SPEC_KEY
+        ).update({
+            "status": status,
+            "error_message": error_message,
+            "updated_at": datetime.utcnow()
+        })
+
+    def _item_job(
+        self,
+        job_id: str,
+        job_type: str,
+        item_key: str,
+        result: Any,
+        stage: Optional[str] = None,
+        user_id: Optional[str] = None,
+        attempts: int = 1
+    ):
+        """완료된 항목 결과 저장"""
+        return self._upsert_job(
+            job_id, item_key,
+            job_type=job_type,
+            stage=stage,
+            created_by=user_id,
+            status="completed",
+            result=json.dumps(result, ensure_ascii=False, default=str),
+            error_message=None,
+            attempts=attempts
+        )
+
+    def _failure_job(
+        self,
+        job_id: str,
+        job_type: str,
+        item_key: str,
+        error_message: str,
+        stage: Optional[str] = None,
+        user_id: Optional[str] = None,
+        attempts: int = 1
+    ):
+        """실패 항목 기록 (재시도 대상)"""
+        return self._upsert_job(
+            job_id, item_key,
+            job_type=job_type,
+            stage=stage,
+            created_by=user_id,
+            status="failed",
+            error_message=error_message[:2000],
+            attempts=attempts
+        )
+
+    @staticmethod
+    def _clear_job(job_id: str):
+        """작업 체크포인트 삭제"""
+        return lambda db: db.query(WorkflowCheckpoint).filter(
+            WorkflowCheckpoint.job_id == job_id
+        ).delete(synchronize_session=False)
+
+    # ---- 공개 API (인자는 위 _*_job 과 같음) ----
+
+    def save_job_spec(self, *args, **kwargs) -> None:
+        self._write(self._job_spec_job(*args, **kwargs))
+
+    def update_job_status(self, *args, **kwargs) -> None:
+        self._write(self._job_status_job(*args, **kwargs))
+
+    def save_item(self, *args, **kwargs) -> None:
+        self._write(self._item_job(*args, **kwargs))
+
+    def mark_failed(self, *args, **kwargs) -> None:
+        self._write(self._failure_job(*args, **kwargs))
+
+    def clear(self, job_id: str) -> int:
+        return self._write(self._clear_job(job_id))
+
+    def load(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """작업의 항목별 체크포인트 조회 (작업 정의 제외)"""
+        db = self.session_factory()
+        try:
+            rows = db.query(
+                WorkflowCheckpoint.item_key,
+                WorkflowCheckpoint.stage,
+                WorkflowCheckpoint.status,
+                WorkflowCheckpoint.result,
+                WorkflowCheckpoint.error_message,
+                WorkflowCheckpoint.attempts
+            ).filter(
+                WorkflowCheckpoint.job_id == job_id,
+                WorkflowCheckpoint.item_key != JOB_SPEC_KEY
+            ).all()
+        finally:
+            db.close()
+
+        checkpoints = {}
+        for item_key, stage, status, result, error_message, attempts in rows:
+            checkpoints[item_key] = {
+                "stage": stage,
+                "status": status,
+                "result": json.loads(result) if result else None,
+                "error_message": error_message,
+                "attempts": attempts or 0
+            }
+        return checkpoints
+
+    def completed_results(self, job_id: str) -> Dict[str, Any]:
+        return {
+            key: checkpoint["result"]
+            for key, checkpoint in self.load(job_id).items()
+            if checkpoint["status"] == "completed"
+        }
+
+    def failed_items(self, job_id: str) -> Dict[str, str]:
+        return {
+            key: checkpoint["error_message"]
+            for key, checkpoint in self.load(job_id).items()
+            if checkpoint["status"] == "failed"
+        }
+
+    def load_unfinished_jobs(self, job_type: str) -> List[Dict[str, Any]]:
+        """완료되지 않은 작업 정의 목록 (워커 재시작 시 복구 대상)"""
+        db = self.session_factory()
+        try:
+            rows = db.query(WorkflowCheckpoint).filter(
+                WorkflowCheckpoint.item_key == JOB_SPEC_KEY,
+                WorkflowCheckpoint.job_type == job_type,
+                WorkflowCheckpoint.status.in_(["pending", "running"])
+            ).all()
+            return [
+                {
+                    "job_id": row.job_id,
+                    "user_id": row.created_by,
+                    "status": row.status,
+                    "parameters": json.loads(row.result) if row.result else {},
+                    "created_at": row.created_at
+                }
+                for row in rows
+            ]
+        finally:
+            db.close()
+
+    # ---- 코루틴용 - 이벤트 루프를 막지 않음 (쓰기는 쓰기 큐를 await, 조회는 워커 스레드) ----
+
+    async def save_job_spec_async(self, *args, **kwargs) -> None:
+        await self._write_async(self._job_spec_job(*args, **kwargs))
+
+    async def update_job_status_async(self, *args, **kwargs) -> None:
+        await self._write_async(self._job_status_job(*args, **kwargs))
+
+    async def save_item_async(self, *args, **kwargs) -> None:
+        await self._write_async(self._item_job(*args, **kwargs))
+
+    async def mark_failed_async(self, *args, **kwargs) -> None:
+        await self._write_async(self._failure_job(*args, **kwargs))
+
+    async def load_async(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self.load, job_id)
+
+    async def load_unfinished_jobs_async(self, job_type: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self.load_unfinished_jobs, job_type)
+
+    async def clear_async(self, job_id: str) -> int:
+        return await self._write_async(self._clear_job(job_id))
+
+class SafeCheckpointStore(CheckpointStore):
+    """체크포인트 저장소 장애가 본 작업을 중단시키지 않도록 감싼 저장소
+    모든 공개 메서드가 예외 대신 로그 + 기본값 (조회는 빈 결과 - 체크포인트 없이 처음부터 처리)
+    """
+
+    def _guard(self, action: str, default, fn, job_id, *args, **kwargs):
+        try:
+            return fn(job_id, *args, **kwargs)
+        except Exception as e:
+            app_logger.error(f"Checkpoint {action} failed", error=e, job_id=job_id)
+            return default
+
+    async def _guard_async(self, action: str, default, fn, job_id, *args, **kwargs):
+        try:
+            return await fn(job_id, *args, **kwargs)
+        except Exception as e:
+            app_logger.error(f"Checkpoint {action} failed", error=e, job_id=job_id)
+            return default
+
+    def save_job_spec(self, job_id: str, *args, **kwargs) -> None:
+        self._guard("write", None, super().save_job_spec, job_id, *args, **kwargs)
+
+    def update_job_status(self, job_id: str, *args, **kwargs) -> None:
+        self._guard("write", None, super().update_job_status, job_id, *args, **kwargs)
+
+    def save_item(self, job_id: str, *args, **kwargs) -> None:
+        self._guard("write", None, super().save_item, job_id, *args, **kwargs)
+
+    def mark_failed(self, job_id: str, *args, **kwargs) -> None:
+        self._guard("write", None, super().mark_failed, job_id, *args, **kwargs)
+
+    def load(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        return self._guard("read", {}, super().load, job_id)
+
+    def load_unfinished_jobs(self, job_type: str) -> List[Dict[str, Any]]:
+        try:
+            return super().load_unfinished_jobs(job_type)
+        except Exception as e:
+            app_logger.error("Checkpoint read failed", error=e, job_type=job_type)
+            return []
+
+    def clear(self, job_id: str) -> int:
+        return self._guard("delete", 0, super().clear, job_id)
+
+    async def save_job_spec_async(self, job_id: str, *args, **kwargs) -> None:
+        await self._guard_async("write", None, super().save_job_spec_async, job_id, *args, **kwargs)
+
+    async def update_job_status_async(self, job_id: str, *args, **kwargs) -> None:
+        await self._guard_async("write", None, super().update_job_status_async, job_id, *args, **kwargs)
+
+    async def save_item_async(self, job_id: str, *args, **kwargs) -> None:
+        await self._guard_async("write", None, super().save_item_async, job_id, *args, **kwargs)
+
+    async def mark_failed_async(self, job_id: str, *args, **kwargs) -> None:
+        await self._guard_async("write", None, super().mark_failed_async, job_id, *args, **kwargs)
+
+    async def clear_async(self, job_id: str) -> int:
+        return await self._guard_async("delete", 0, super().clear_async, job_id)
+
+# 글로벌 체크포인트 저장소 인스턴스
+checkpoint_store = SafeCheckpointStore()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+콘텐츠 본문 저장소
+생성된 글 본문을 content_blobs 테이블에 압축(zstd, 미설치 시 zlib)하여 SHA-256 해시 키로 한 번만 저장
+- generated_content / automation_sessions.generated_contents 는 본문 대신 content_hash 만 보관
+- 목록/통계 조회는 본문을 읽지 않고, 본문이 필요한 곳(포스팅, 상세)만 load_bodies 로 명시적으로 조회
+
+    python content_blobs.py migrate   # 기존 행의 본문을 blob 으로 이전
+    python content_blobs.py prune     # 참조되지 않는 blob 정리
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, insert, update, delete, inspect, text, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import ContentBlob, GeneratedContent, AutomationSession, make_excerpt
+from logger import app_logger
+
+try:
+    import zstandard
+    _zstd_compressor = zstandard.ZstdCompressor(level=9)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# 이보다 짧은 본문은 압축 이득보다 헤더 비용이 커서 원문 저장
+MIN_COMPRESS_BYTES = 256
+
+# ON CONFLICT DO NOTHING 을 지원하는 방언별 INSERT 생성자
+_IGNORE_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def compress_bytes(raw: bytes) -> Tuple[str, bytes]:
+    """zstd (미설치 시 zlib) 압축 → (codec, 압축 데이터) - 작업 결과 블롭도 같은 코덱 사용"""
+    if ZSTD_AVAILABLE:
+        return "zstd", _zstd_compressor.compress(raw)
+    return "zlib", zlib.compress(raw, 9)
+
+def decompress_bytes(codec: str, data: bytes) -> bytes:
+    if codec == "raw":
+        return data
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read zstd-compressed blobs")
+        return _zstd_decompressor.decompress(data)
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+def encode_body(body: str) -> Dict[str, Any]:
+    """본문 → content_blobs 행"""
+    raw = body.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        codec, data = "raw", raw
+    else:
+        codec, data = compress_bytes(raw)
+    return {
+        "hash": hashlib.sha256(raw).hexdigest(),
+        "codec": codec,
+        "size": len(raw),
+        "stored_size": len(data),
+        "data": data
+    }
+
+def decode_body(codec: str, data: bytes) -> str:
+    return decompress_bytes(codec, data).decode("utf-8")
+
+# ---- 쓰기 ----
+
+def store_bodies(session: Session, bodies: Iterable[str]) -> List[str]:
+    """본문 저장 후 해시 목록 반환 (이미 있는 본문은 건너뜀, 커밋은 호출자)"""
+    bodies = list(bodies)
+    rows: Dict[str, Dict[str, Any]] = {}
+    hashes = []
+    for body in bodies:
+        row = encode_body(body or "")
+        rows.setdefault(row["hash"], row)
+        hashes.append(row["hash"])
+    if not rows:
+        return hashes
+
+    insert_fn = _IGNORE_INSERTS.get(session.get_bind().dialect.name)
+    if insert_fn is not None:
+        session.execute(insert_fn(ContentBlob).on_conflict_do_nothing(index_elements=["hash"]), list(rows.values()))
+        return hashes
+
+    existing = set(session.execute(select(ContentBlob.hash).where(ContentBlob.hash.in_(rows))).scalars())
+    for blob_hash, row in rows.items():
+        if blob_hash in existing:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(insert(ContentBlob), [row])
+        except IntegrityError:
+            # 다른 트랜잭션이 같은 본문을 먼저 저장
+            pass
+    return hashes
+
+def content_columns(session: Session, bodies: Iterable[str]) -> List[Dict[str, Any]]:
+    """본문을 저장하고 GeneratedContent 에 넣을 컬럼 값(content_hash, excerpt) 반환"""
+    bodies = list(bodies)
+    hashes = store_bodies(session, bodies)
+    return [
+        {"content_hash": blob_hash, "excerpt": make_excerpt(body or "")}
+        for blob_hash, body in zip(hashes, bodies)
+    ]
+
+async def content_columns_async(db: AsyncSession, bodies: Iterable[str]) -> List[Dict[str, Any]]:
+    bodies = list(bodies)
+    return await db.run_sync(lambda session: content_columns(session, bodies))
+
+# ---- 읽기 ----
+
+def load_bodies(session: Session, hashes: Iterable[str]) -> Dict[str, str]:
+    """해시 → 본문 (없는 해시는 결과에서 빠짐)"""
+    wanted = {blob_hash for blob_hash in hashes if blob_hash}
+    if not wanted:
+        return {}
+    rows = session.execute(
+        select(ContentBlob.hash, ContentBlob.codec, ContentBlob.data).where(ContentBlob.hash.in_(wanted))
+    )
+    return {row.hash: decode_body(row.codec, row.data) for row in rows}
+
+async def load_bodies_async(db: AsyncSession, hashes: Iterable[str]) -> Dict[str, str]:
+    hashes = list(hashes)
+    return await db.run_sync(lambda session: load_bodies(session, hashes))
+
+async def get_content_body(db: AsyncSession, content_id: str) -> Optional[str]:
+    """GeneratedContent 본문 (이전 전의 행은 기존 content 컬럼에서)"""
+    row = (await db.execute(
+        select(GeneratedContent.content_hash, GeneratedContent.content).where(GeneratedContent.id == content_id)
+    )).first()
+    if row is None:
+        return None
+    if row.content_hash:
+        return (await load_bodies_async(db, [row.content_hash])).get(row.content_hash)
+    return row.content
+
+# ---- 자동화 세션 JSON ----
+
+async def dehydrate_contents(db: AsyncSession, contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """세션 JSON 에 넣기 전 본문을 blob 으로 옮기고 content_hash 로 대체"""
+    bodies = [item["content"] for item in contents if item.get("content") is not None]
+    hashes = iter(await db.run_sync(lambda session: store_bodies(session, bodies)))
+
+    result = []
+    for item in contents:
+        if item.get("content") is not None:
+            item = {key: value for key, value in item.items() if key != "content"}
+            item["content_hash"] = next(hashes)
+        result.append(item)
+    return result
+
+async def hydrate_contents(db: AsyncSession, contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """세션 JSON 의 content_hash 를 본문으로 복원 (본문이 그대로 들어 있는 기존 세션도 허용)"""
+    bodies = await load_bodies_async(db, (item.get("content_hash") for item in contents))
+    result = []
+    for item in contents:
+        blob_hash = item.get("content_hash")
+        if blob_hash and "content" not in item:
+            item = {**item, "content": bodies.get(blob_hash, "")}
+        result.append(item)
+    return result
+
+# ---- 이전 / 정리 ----
+
+def ensure_body_columns(engine) -> List[str]:
+    """기존 generated_content 테이블에 excerpt / content_hash 컬럼 추가 (create_all 은 컬럼을 추가하지 않음)"""
+    table = GeneratedContent.__table__
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table(table.name):
+            return []
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        added = []
+        for name in ("excerpt", "content_hash"):
+            if name in existing:
+                continue
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{name}" {column_type}'))
+            added.append(name)
+    if added:
+        app_logger.info(f"Added columns to {table.name}: {', '.join(added)}")
+    return added
+
+def migrate_legacy_bodies(session: Session, batch_size: int = 500) -> Dict[str, int]:
+    """content 컬럼에 본문이 남은 행을 blob 으로 이전 (배치마다 커밋, 중단 후 재실행 가능)"""
+    stats = {"contents": 0, "sessions": 0}
+    while True:
+        rows = session.execute(
+            select(GeneratedContent.id, GeneratedContent.content)
+            .where(GeneratedContent.content_hash.is_(None), GeneratedContent.content != "")
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        columns = content_columns(session, [row.content for row in rows])
+        for row, values in zip(rows, columns):
+            session.execute(
+                update(GeneratedContent).where(GeneratedContent.id == row.id).values(content="", **values)
+            )
+        session.commit()
+        stats["contents"] += len(rows)
+
+    sessions = session.execute(
+        select(AutomationSession.id, AutomationSession.generated_contents)
+        .where(AutomationSession.generated_contents.isnot(None))
+    ).all()
+    for row in sessions:
+        contents = json.loads(row.generated_contents)
+        pending = [item for item in contents if item.get("content") is not None]
+        if not pending:
+            continue
+        hashes = store_bodies(session, [item.pop("content") for item in pending])
+        for item, blob_hash in zip(pending, hashes):
+            item["content_hash"] = blob_hash
+        session.execute(
+            update(AutomationSession).where(AutomationSession.id == row.id)
+            .values(generated_contents=json.dumps(contents, ensure_ascii=False))
+        )
+        session.commit()
+        stats["sessions"] += 1
+    return stats
+
+def prune_orphan_blobs(session: Session) -> int:
+    """어떤 콘텐츠/세션에서도 참조하지 않는 blob 삭제"""
+    referenced = set(session.execute(
+        select(GeneratedContent.content_hash).where(GeneratedContent.content_hash.isnot(None)).distinct()
+    ).scalars())
+    for (generated_contents,) in session.execute(
+        select(AutomationSession.generated_contents).where(AutomationSession.generated_contents.isnot(None))
+    ):
+        referenced.update(item.get("content_hash") for item in json.loads(generated_contents))
+
+    orphans = [blob_hash for blob_hash in session.execute(select(ContentBlob.hash)).scalars() if blob_hash not in referenced]
+    for start in range(0, len(orphans), 500):
+        session.execute(delete(ContentBlob).where(ContentBlob.hash.in_(orphans[start:start + 500])))
+    session.commit()
+    return len(orphans)
+
+def get_blob_stats(session: Session) -> Dict[str, Any]:
+    count, raw_bytes, stored_bytes = session.execute(
+        select(func.count(ContentBlob.hash), func.sum(ContentBlob.size), func.sum(ContentBlob.stored_size))
+    ).one()
+    return {
+        "blobs": count,
+        "raw_bytes": raw_bytes or 0,
+        "stored_bytes": stored_bytes or 0,
+        "compression_ratio": round((raw_bytes or 0) / stored_bytes, 2) if stored_bytes else None,
+        "codec": "zstd" if ZSTD_AVAILABLE else "zlib"
+    }
+
+def main():
+    import argparse
+    from database import engine, SessionLocal
+
+    parser = argparse.ArgumentParser(description="콘텐츠 본문 blob 저장소 관리")
+    parser.add_argument("command", choices=["migrate", "prune", "stats"])
+    args = parser.parse_args()
+
+    ContentBlob.__table__.create(bind=engine, checkfirst=True)
+    ensure_body_columns(engine)
+    session = SessionLocal()
+    try:
+        if args.command == "migrate":
+            print(f"✅ 이전 완료: {migrate_legacy_bodies(session)}")
+        elif args.command == "prune":
+            print(f"🧹 삭제된 blob: {prune_orphan_blobs(session)}개")
+        print(f"📊 {get_blob_stats(session)}")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
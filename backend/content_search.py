@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+콘텐츠 전문 검색 색인
+저장 콘텐츠(ContentStorage)와 생성 콘텐츠(GeneratedContent)의 제목/키워드/본문을 SQLite FTS5 역색인으로 검색
+- 한국어는 형태소 분석 없이 음절 bigram 으로 색인 (조사가 붙은 어절도 부분 일치), 영문/숫자는 단어 단위
+- bm25 순위 (제목 > 키워드 > 본문 가중치), 접두어 검색(파이썬*), 상태/기간/소유자 필터
+- 저장/수정/삭제 시 해당 문서만 갱신, 전체 재색인은 reindex (관리자 API / CLI)
+
+    python content_search.py reindex
+    python content_search.py search "검색어"
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from data_paths import data_path
+from logger import app_logger
+
+SOURCE_SAVED = "saved"
+SOURCE_GENERATED = "generated"
+SOURCES = (SOURCE_SAVED, SOURCE_GENERATED)
+
+# 본문은 앞부분만 색인 (긴 글의 꼬리는 순위에 거의 영향이 없고 색인 크기만 키움)
+MAX_BODY_CHARS = int(os.getenv("CONTENT_SEARCH_MAX_BODY_CHARS", 10000))
+
+# bm25 열 가중치 (title, keyword, body, tags)
+_BM25_WEIGHTS = (10.0, 5.0, 1.0, 0.0)
+
+_HANGUL = re.compile(r"[가-힣]+")
+_TERM = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+
+# 메타데이터(목록 표시/날짜 필터)와 출처별 FTS5 테이블 (rowid 로 연결)
+# 소유자/상태 필터는 tags 열의 토큰으로 MATCH 안에서 교집합 - 순위 계산 전에 후보를 줄임
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    owner TEXT,
+    status TEXT,
+    title TEXT,
+    keyword TEXT,
+    excerpt TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    UNIQUE (source, doc_id)
+);
+""" + "".join(
+    f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS fts_{source} USING fts5(
+    title, keyword, body, tags, tokenize = 'unicode61 remove_diacritics 0'
+);
+"""
+    for source in SOURCES
+)
+
+def _hangul_terms(run: str) -> List[str]:
+    """한글 연속 구간 → 음절 bigram + 마지막 음절 (한 음절 검색도 모든 위치에서 접두어로 일치)"""
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)] + [run[-1]]
+
+def index_terms(text: str) -> str:
+    """색인용 텍스트 - FTS5 unicode61 토크나이저가 공백으로 나눌 토큰열"""
+    terms = []
+    for match in _TERM.finditer((text or "").lower()):
+        piece = match.group()
+        terms.extend(_hangul_terms(piece) if _HANGUL.fullmatch(piece) else [piece])
+    return " ".join(terms)
+
+def build_match_query(query: str) -> Optional[str]:
+    """사용자 검색어 → FTS5 MATCH 식 (단어끼리 AND)
+
+    한글 단어는 연속 bigram 구문("검색 색어")이라 부분 문자열 일치, 한 음절은 접두어.
+    영문/숫자는 단어 일치, 끝에 * 를 붙이면 접두어.
+    """
+    clauses = []
+    for word in (query or "").lower().split():
+        prefix = word.endswith("*")
+        for match in _TERM.finditer(word):
+            piece = match.group()
+            if _HANGUL.fullmatch(piece):
+                if len(piece) == 1:
+                    clauses.append(f'"{piece}"*')
+                else:
+                    bigrams = " ".join(piece[i:i + 2] for i in range(len(piece) - 1))
+                    clauses.append(f'"{bigrams}"')
+            else:
+                clauses.append(f'"{piece}"*' if prefix else f'"{piece}"')
+    return " ".join(clauses) or None
+
+def _tag(kind: str, value: Any) -> str:
+    """필터 값 → 영숫자 토큰 (unicode61 이 나누지 않도록 해시)"""
+    return kind + hashlib.md5(str(value).encode("utf-8")).hexdigest()[:16]
+
+def _fts_table(source: str) -> str:
+    if source not in SOURCES:
+        raise ValueError(f"Unknown search source: {source}")
+    return f"fts_{source}"
+
+class ContentSearchIndex:
+    """SQLite FTS5 기반 콘텐츠 검색 색인"""
+
+    def __init__(self, path: Optional[str] = None):
+        # 경로를 주지 않으면 첫 연결 때 DATA_DIR 아래로 - import 만으로 색인 파일을 만들지 않음
+        self._path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = data_path("CONTENT_SEARCH_INDEX", "content_search.db")
+        return self._path
+
+    def _db(self) -> sqlite3.Connection:
+        """스레드별 연결 (첫 연결에서 스키마 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._write_lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- 갱신 ----
+
+    def index_documents(self, source: str, documents: Iterable[Dict[str, Any]]) -> int:
+        """문서 추가/교체 - doc_id, title, keyword, body, owner, status, created_at, updated_at"""
+        fts = _fts_table(source)
+        count = 0
+        with self._transaction() as conn:
+            for doc in documents:
+                body = (doc.get("body") or "")[:MAX_BODY_CHARS]
+                values = (
+                    None if doc.get("owner") is None else str(doc["owner"]),
+                    doc.get("status"),
+                    doc.get("title"),
+                    doc.get("keyword"),
+                    body[:200],
+                    doc.get("created_at"),
+                    doc.get("updated_at") or doc.get("created_at"),
+                )
+                row = conn.execute(
+                    "SELECT rowid FROM documents WHERE source = ? AND doc_id = ?", (source, doc["doc_id"])
+                ).fetchone()
+                if row is None:
+                    rowid = conn.execute(
+                        "INSERT INTO documents (source, doc_id, owner, status, title, keyword, excerpt, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (source, doc["doc_id"], *values)
+                    ).lastrowid
+                else:
+                    rowid = row["rowid"]
+                    conn.execute(
+                        "UPDATE documents SET owner = ?, status = ?, title = ?, keyword = ?, excerpt = ?, "
+                        "created_at = ?, updated_at = ? WHERE rowid = ?",
+                        (*values, rowid)
+                    )
+                    conn.execute(f"DELETE FROM {fts} WHERE rowid = ?", (rowid,))
+                tags = [_tag("st", doc.get("status"))]
+                if doc.get("owner") is not None:
+                    tags.append(_tag("own", doc["owner"]))
+                conn.execute(
+                    f"INSERT INTO {fts} (rowid, title, keyword, body, tags) VALUES (?, ?, ?, ?, ?)",
+                    (rowid, index_terms(doc.get("title")), index_terms(doc.get("keyword")), index_terms(body), " ".join(tags))
+                )
+                count += 1
+        return count
+
+    def remove_documents(self, source: str, doc_ids: Iterable[str]) -> int:
+        fts = _fts_table(source)
+        doc_ids = list(doc_ids)
+        removed = 0
+        with self._transaction() as conn:
+            for start in range(0, len(doc_ids), 500):
+                batch = doc_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rowids = [row["rowid"] for row in conn.execute(
+                    f"SELECT rowid FROM documents WHERE source = ? AND doc_id IN ({placeholders})", (source, *batch)
+                )]
+                conn.executemany(f"DELETE FROM {fts} WHERE rowid = ?", [(rowid,) for rowid in rowids])
+                conn.executemany("DELETE FROM documents WHERE rowid = ?", [(rowid,) for rowid in rowids])
+                removed += len(rowids)
+        return removed
+
+    def clear(self, source: str):
+        fts = _fts_table(source)
+        with self._transaction() as conn:
+            conn.execute(f"DELETE FROM {fts}")
+            conn.execute("DELETE FROM documents WHERE source = ?", (source,))
+
+    def safe_index(self, source: str, documents: Iterable[Dict[str, Any]]):
+        """요청 경로용 - 색인 실패가 저장을 실패시키지 않도록 기록만 (reindex 로 복구)"""
+        try:
+            self.index_documents(source, documents)
+        except Exception as e:
+            app_logger.warning(f"Search index update failed ({source}): {e}")
+
+    def safe_remove(self, source: str, doc_ids: Iterable[str]):
+        try:
+            self.remove_documents(source, doc_ids)
+        except Exception as e:
+            app_logger.warning(f"Search index removal failed ({source}): {e}")
+
+    # ---- 검색 ----
+
+    def search(
+        self,
+        query: str,
+        source: str = SOURCE_SAVED,
+        owner: Optional[Any] = None,
+        status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """순위순 검색 결과 (score 는 bm25, 낮을수록 관련도 높음)
+
+        날짜 필터가 없으면 FTS 안에서 순위를 매겨 상위 limit 개만 메타데이터와 조인한다.
+        """
+        fts = _fts_table(source)
+        match = build_match_query(query)
+        if match is None:
+            return []
+        filters = []
+        if owner is not None:
+            filters.append(f"tags : {_tag('own', owner)}")
+        if status:
+            filters.append(f"tags : {_tag('st', status)}")
+        if filters:
+            match = f"({match}) AND {' AND '.join(filters)}"
+
+        columns = "d.doc_id, d.title, d.keyword, d.status, d.owner, d.excerpt, d.created_at, d.updated_at, f.score"
+        ranked = f"SELECT rowid, bm25({fts}, {', '.join(map(str, _BM25_WEIGHTS))}) AS score FROM {fts} WHERE {fts} MATCH ?"
+        if date_from or date_to:
+            conditions, params = [], [match]
+            if date_from:
+                conditions.append("d.created_at >= ?")
+                params.append(date_from)
+            if date_to:
+                conditions.append("d.created_at < ?")
+                params.append(date_to)
+            sql = (
+                f"SELECT {columns} FROM ({ranked}) f CROSS JOIN documents d ON d.rowid = f.rowid "
+                f"WHERE {' AND '.join(conditions)} ORDER BY f.score LIMIT ? OFFSET ?"
+            )
+            params.extend([limit, offset])
+        else:
+            sql = (
+                f"SELECT {columns} FROM ({ranked} ORDER BY score LIMIT ? OFFSET ?) f "
+                "CROSS JOIN documents d ON d.rowid = f.rowid ORDER BY f.score"
+            )
+            params = [match, limit, offset]
+        rows = self._db().execute(sql, params).fetchall()
+        return [{**dict(row), "score": round(row["score"], 4)} for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        rows = self._db().execute("SELECT source, COUNT(*) AS count FROM documents GROUP BY source").fetchall()
+        return {
+            "documents": {row["source"]: row["count"] for row in rows},
+            "index_size_mb": round(os.path.getsize(self.path) / (1024 * 1024), 2) if os.path.exists(self.path) else 0
+        }
+
+    def optimize(self):
+        """FTS5 세그먼트 병합 (대량 재색인 후)"""
+        with self._transaction() as conn:
+            for source in SOURCES:
+                conn.execute(f"INSERT INTO fts_{source} (fts_{source}) VALUES ('optimize')")
+
+# ---- 문서 변환 / 재색인 ----
+
+def saved_document(content: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "doc_id": content["id"],
+        "title": content.get("title"),
+        "keyword": content.get("keyword"),
+        "body": content.get("content"),
+        "status": content.get("status", "draft"),
+        "created_at": content.get("created_at"),
+        "updated_at": content.get("updated_at")
+    }
+
+def generated_document(content_id: str, title: Optional[str], keywords: Optional[str], body: str,
+                       owner: Any, created_at: Any = None) -> Dict[str, Any]:
+    return {
+        "doc_id": content_id,
+        "title": title,
+        "keyword": keywords,
+        "body": body,
+        "owner": owner,
+        "status": "generated",
+        "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else created_at
+    }
+
+def reindex_saved(index: "ContentSearchIndex", storage) -> int:
+    """ContentStorage 전체 재색인"""
+    index.clear(SOURCE_SAVED)
+    batch, count = [], 0
+    for item in storage.load_content_list():
+        content = storage.get_content(item["id"]) or item
+        batch.append(saved_document(content))
+        if len(batch) >= 500:
+            count += index.index_documents(SOURCE_SAVED, batch)
+            batch = []
+    count += index.index_documents(SOURCE_SAVED, batch)
+    return count
+
+def reindex_generated(index: "ContentSearchIndex", session, batch_size: int = 500) -> int:
+    """generated_content 전체 재색인 (id 키셋으로 배치 순회, 본문은 content_blobs 에서)"""
+    from sqlalchemy import select
+    from models import GeneratedContent, GeneratedTitle
+    from content_blobs import load_bodies
+
+    index.clear(SOURCE_GENERATED)
+    count, last_id = 0, ""
+    while True:
+        rows = session.execute(
+            select(
+                GeneratedContent.id, GeneratedContent.content_hash, GeneratedContent.content,
+                GeneratedContent.keywords, GeneratedContent.created_by, GeneratedContent.created_at,
+                GeneratedTitle.title
+            )
+            .outerjoin(GeneratedTitle, GeneratedTitle.id == GeneratedContent.title_id)
+            .where(GeneratedContent.id > last_id)
+            .order_by(GeneratedContent.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        bodies = load_bodies(session, (row.content_hash for row in rows))
+        count += index.index_documents(SOURCE_GENERATED, [
+            generated_document(
+                row.id, row.title, row.keywords,
+                bodies.get(row.content_hash, "") if row.content_hash else row.content,
+                row.created_by, row.created_at
+            )
+            for row in rows
+        ])
+        last_id = rows[-1].id
+    return count
+
+def reindex_all(sources: Optional[List[str]] = None) -> Dict[str, int]:
+    """관리자 재색인 - 저장/생성 콘텐츠 (sources 로 제한 가능)"""
+    result = {}
+    if sources is None or SOURCE_SAVED in sources:
+        from content_storage import content_storage
+        result[SOURCE_SAVED] = reindex_saved(content_search, content_storage)
+    if sources is None or SOURCE_GENERATED in sources:
+        from database import SessionLocal
+        session = SessionLocal()
+        try:
+            result[SOURCE_GENERATED] = reindex_generated(content_search, session)
+        finally:
+            session.close()
+    content_search.optimize()
+    app_logger.info(f"Content search reindexed: {result}")
+    return result
+
+# 전역 검색 색인 인스턴스
+content_search = ContentSearchIndex()
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="콘텐츠 전문 검색 색인 관리")
+    parser.add_argument("command", choices=["reindex", "search", "stats"])
+    parser.add_argument("query", nargs="?", default="")
+    parser.add_argument("--source", choices=[SOURCE_SAVED, SOURCE_GENERATED], default=None)
+    args = parser.parse_args()
+
+    if args.command == "reindex":
+        print(f"✅ 재색인 완료: {reindex_all([args.source] if args.source else None)}")
+    elif args.command == "search":
+        started = time.perf_counter()
+        results = content_search.search(args.query, source=args.source or SOURCE_SAVED, limit=20)
+        print(f"🔎 {len(results)}건 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        for item in results:
+            print(f"  {item['score']:>8} {item['doc_id']} {item['title']}")
+    print(f"📊 {content_search.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,243 @@
 """
 생성된 콘텐츠 저장 및 관리 시스템
+로그 구조 저장소 - 본문은 추가 전용 세그먼트 파일(segment-NNNNNN.log)에 레코드로 덧붙이고,
+메타데이터(id, 제목, 키워드, 상태, SEO 점수, 시각)와 레코드 위치는 내장 SQLite 색인(content_index.db)에 기록
+- 저장/수정/삭제는 레코드 하나 추가 + 색인 행 하나 갱신 (이력 크기와 무관)
+- 여러 워커 프로세스의 추가 쓰기는 잠금 파일(flock)로 직렬화, 색인은 SQLite 트랜잭션
+- 색인 갱신 전에 죽어도 세그먼트에 남은 레코드는 압축(compaction) 때 정리되고, 색인은 세그먼트로 재구성 가능
+- 보관 개수/기간 초과분은 삭제하지 않고 보관 계층(archive_store)으로 이동
+- 제목/키워드/본문 검색은 content_search 전문 검색 색인, 관련 글 추천은 related_content 색인 (저장/수정/삭제 시 함께 갱신)
 """
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+import sqlite3
+import struct
+import threading
 import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from content_search import content_search, saved_document, SOURCE_SAVED
+from related_content import related_index, saved_related_document, SOURCE_SAVED as RELATED_SOURCE_SAVED
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# 레코드 헤더: 본문 길이(4바이트) + CRC32(4바이트)
+_HEADER = struct.Struct(">II")
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    keyword TEXT,
+    content_type TEXT,
+    status TEXT,
+    seo_score REAL,
+    word_count INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    segment TEXT NOT NULL,
+    record_offset INTEGER NOT NULL,
+    record_length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contents_created ON contents (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_contents_status_created ON contents (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_contents_updated ON contents (updated_at);
+"""
+
+_META_FIELDS = ("id", "title", "keyword", "content_type", "created_at", "updated_at", "word_count", "seo_score", "status")
 
 class ContentStorage:
-    def __init__(self):
-        self.storage_dir = Path("/mnt/e/project/test-blogauto-project/backend/saved_content")
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        max_items: int = int(os.getenv("CONTENT_RETENTION_MAX_ITEMS", 1000)),
+        max_age_days: Optional[int] = int(os.getenv("CONTENT_RETENTION_DAYS", 0)) or None,
+        retention_check_every: int = int(os.getenv("CONTENT_RETENTION_CHECK_EVERY", 100)),
+        segment_max_bytes: int = int(os.getenv("CONTENT_SEGMENT_MAX_BYTES", 64 * 1024 * 1024))
+    ):
+        self.storage_dir = Path(storage_dir or os.getenv(
+            "CONTENT_STORAGE_DIR", "/mnt/e/project/test-blogauto-project/backend/saved_content"
+        ))
         self.storage_dir.mkdir(exist_ok=True)
-        self.content_file = self.storage_dir / "content_history.json"
+        self.content_file = self.storage_dir / "content_history.json"  # 이전 형식 (초기화 시 한 번 이전)
+        self.index_file = self.storage_dir / "content_index.db"
+        self.lock_file = self.storage_dir / ".lock"
+
+        # 보관 정책 - max_items 초과분과 max_age_days 이전 항목은 보관 계층으로 이동
+        self.max_items = max_items
+        self.max_age_days = max_age_days
+        self.retention_check_every = retention_check_every
+        self.segment_max_bytes = segment_max_bytes
+
+        self._local = threading.local()
+        self._thread_lock = threading.RLock()
+        self._writes_since_retention = 0
         self.init_storage()
-    
+
+    # ---- 초기화 / 잠금 ----
+
     def init_storage(self):
-        """저장소 초기화"""
-        if not self.content_file.exists():
-            self.save_content_list([])
-    
-    def load_content_list(self) -> List[Dict[str, Any]]:
-        """저장된 콘텐츠 목록 로드"""
+        """저장소 초기화 (색인 생성, 이전 JSON 목록 형식이면 이전)"""
+        with self._locked():
+            self._db().executescript(_INDEX_SCHEMA)
+            if self.content_file.exists():
+                self._migrate_legacy()
+
+    def _db(self) -> sqlite3.Connection:
+        """스레드별 색인 연결"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.index_file), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _locked(self):
+        """프로세스 내(스레드) + 프로세스 간(flock) 배타 잠금 - 세그먼트 추가와 색인 갱신을 한 단위로"""
+        with self._thread_lock:
+            depth = getattr(self._local, "lock_depth", 0)
+            if depth or not FCNTL_AVAILABLE:
+                # 이미 잡은 잠금 안에서 다시 호출 (flock 은 같은 프로세스라도 다른 fd 면 막히므로 재진입 처리)
+                self._local.lock_depth = depth + 1
+                try:
+                    yield
+                finally:
+                    self._local.lock_depth = depth
+                return
+            with open(self.lock_file, "a") as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                self._local.lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._local.lock_depth = 0
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            with open(self.content_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
-    
-    def save_content_list(self, content_list: List[Dict[str, Any]]):
-        """콘텐츠 목록 저장"""
-        with open(self.content_file, 'w', encoding='utf-8') as f:
-            json.dump(content_list, f, ensure_ascii=False, indent=2)
-    
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ---- 세그먼트 ----
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.storage_dir.glob("segment-*.log"))
+
+    def _active_segment(self, incoming: int) -> Path:
+        segments = self._segments()
+        if segments and segments[-1].stat().st_size + incoming <= self.segment_max_bytes:
+            return segments[-1]
+        number = int(segments[-1].stem.split("-")[1]) + 1 if segments else 1
+        return self.storage_dir / f"segment-{number:06d}.log"
+
+    @staticmethod
+    def _encode_record(record: Dict[str, Any]) -> bytes:
+        payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def _append(self, records: List[Dict[str, Any]], segment: Optional[Path] = None) -> List[Tuple[str, int, int]]:
+        """레코드들을 세그먼트 끝에 추가하고 fsync 후 (세그먼트, offset, length) 목록 반환 (잠금 안에서 호출)"""
+        frames = [self._encode_record(record) for record in records]
+        path = segment or self._active_segment(sum(len(frame) for frame in frames))
+        locations = []
+        with open(path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for frame in frames:
+                f.write(frame)
+                locations.append((path.name, offset, len(frame)))
+                offset += len(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        return locations
+
+    def _read_record(self, segment: str, offset: int, length: int) -> Dict[str, Any]:
+        with open(self.storage_dir / segment, "rb") as f:
+            f.seek(offset)
+            frame = f.read(length)
+        size, checksum = _HEADER.unpack_from(frame)
+        payload = frame[_HEADER.size:_HEADER.size + size]
+        if len(payload) != size or zlib.crc32(payload) != checksum:
+            raise ValueError(f"Corrupt content record at {segment}:{offset}")
+        return json.loads(payload)
+
+    def _scan_segment(self, path: Path) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """세그먼트의 (offset, length, 레코드) 순회 - 끝부분이 잘린 레코드(쓰기 중 중단)에서 멈춤"""
+        with open(path, "rb") as f:
+            offset = 0
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                size, checksum = _HEADER.unpack(header)
+                payload = f.read(size)
+                if len(payload) < size or zlib.crc32(payload) != checksum:
+                    return
+                yield offset, _HEADER.size + size, json.loads(payload)
+                offset += _HEADER.size + size
+
+    # ---- 색인 ----
+
+    @staticmethod
+    def _index_values(content: Dict[str, Any], location: Tuple[str, int, int]) -> Tuple:
+        return (
+            content["id"], content.get("title"), content.get("keyword"), content.get("content_type"),
+            content.get("status", "draft"), content.get("seo_score", 0), content.get("word_count", 0),
+            content.get("created_at"), content.get("updated_at"), *location
+        )
+
+    def _put_index(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO contents (id, title, keyword, content_type, status, seo_score, word_count, "
+            "created_at, updated_at, segment, record_offset, record_length) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _write(self, contents: List[Dict[str, Any]]):
+        """전체 콘텐츠 레코드 추가 + 색인 갱신"""
+        with self._locked():
+            locations = self._append([{"op": "put", "data": content} for content in contents])
+            with self._transaction() as conn:
+                self._put_index(conn, [self._index_values(c, loc) for c, loc in zip(contents, locations)])
+        content_search.safe_index(SOURCE_SAVED, [saved_document(content) for content in contents])
+        related_index.safe_add(RELATED_SOURCE_SAVED, [saved_related_document(content) for content in contents])
+
+    def _location(self, content_id: str) -> Optional[sqlite3.Row]:
+        return self._db().execute(
+            "SELECT segment, record_offset, record_length FROM contents WHERE id = ?", (content_id,)
+        ).fetchone()
+
+    # ---- 공개 API ----
+
+    def load_content_list(self) -> List[Dict[str, Any]]:
+        """저장된 콘텐츠 목록 로드 (최신 순 메타데이터)"""
+        rows = self._db().execute(
+            f"SELECT {', '.join(_META_FIELDS)} FROM contents ORDER BY created_at DESC"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
     def save_content(self, content_data: Dict[str, Any]) -> str:
         """새로운 콘텐츠 저장"""
         content_id = str(uuid.uuid4())
         timestamp = datetime.now().isoformat()
-        
-        # 콘텐츠 메타데이터 생성
-        content_meta = {
+
+        full_content = {
             "id": content_id,
             "title": content_data.get("title", "제목 없음"),
             "keyword": content_data.get("keyword", ""),
@@ -48,139 +246,253 @@ class ContentStorage:
             "updated_at": timestamp,
             "word_count": len(content_data.get("content", "")),
             "seo_score": content_data.get("seo_score", 0),
-            "status": "draft"  # draft, published, archived
-        }
-        
-        # 개별 콘텐츠 파일 저장
-        content_file = self.storage_dir / f"{content_id}.json"
-        full_content = {
-            **content_meta,
+            "status": "draft",  # draft, published, archived
             "content": content_data.get("content", ""),
             "keywords_used": content_data.get("keywords_used", []),
             "images": content_data.get("images", []),
             "metadata": content_data.get("metadata", {})
         }
-        
-        with open(content_file, 'w', encoding='utf-8') as f:
-            json.dump(full_content, f, ensure_ascii=False, indent=2)
-        
-        # 콘텐츠 목록 업데이트
-        content_list = self.load_content_list()
-        content_list.insert(0, content_meta)  # 최신 순으로 정렬
-        
-        # 최대 1000개까지만 유지
-        if len(content_list) > 1000:
-            # 오래된 콘텐츠 파일 삭제
-            old_content = content_list[1000:]
-            for old_item in old_content:
-                old_file = self.storage_dir / f"{old_item['id']}.json"
-                if old_file.exists():
-                    old_file.unlink()
-            content_list = content_list[:1000]
-        
-        self.save_content_list(content_list)
+        self._write([full_content])
+
+        # 보관 정책은 매 저장이 아니라 일정 횟수마다 적용 (저장 비용을 상수로 유지)
+        self._writes_since_retention += 1
+        if self._writes_since_retention >= self.retention_check_every:
+            self._writes_since_retention = 0
+            self.apply_retention()
         return content_id
-    
+
     def get_content(self, content_id: str) -> Optional[Dict[str, Any]]:
         """특정 콘텐츠 조회"""
-        content_file = self.storage_dir / f"{content_id}.json"
-        if not content_file.exists():
-            return None
-        
-        try:
-            with open(content_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return None
-    
+        for _ in range(2):
+            location = self._location(content_id)
+            if location is None:
+                # 보관 계층으로 옮겨진 콘텐츠
+                from archive_store import find_saved_content
+                return find_saved_content(content_id)
+            try:
+                return self._read_record(*location)["data"]
+            except FileNotFoundError:
+                # 읽는 사이 압축으로 세그먼트가 바뀜 - 새 위치로 한 번 더
+                continue
+            except (ValueError, KeyError):
+                return None
+        return None
+
     def update_content(self, content_id: str, updates: Dict[str, Any]) -> bool:
         """콘텐츠 업데이트"""
-        content = self.get_content(content_id)
-        if not content:
-            return False
-        
-        # 업데이트 적용
-        content.update(updates)
-        content["updated_at"] = datetime.now().isoformat()
-        
-        # 파일 저장
-        content_file = self.storage_dir / f"{content_id}.json"
-        with open(content_file, 'w', encoding='utf-8') as f:
-            json.dump(content, f, ensure_ascii=False, indent=2)
-        
-        # 목록에서도 메타데이터 업데이트
-        content_list = self.load_content_list()
-        for i, item in enumerate(content_list):
-            if item["id"] == content_id:
-                content_list[i].update({
-                    "title": content.get("title"),
-                    "updated_at": content["updated_at"],
-                    "word_count": len(content.get("content", "")),
-                    "seo_score": content.get("seo_score", 0),
-                    "status": content.get("status", "draft")
-                })
-                break
-        
-        self.save_content_list(content_list)
+        with self._locked():
+            content = self.get_content(content_id)
+            if not content or self._location(content_id) is None:
+                return False
+
+            content.update(updates)
+            content["id"] = content_id
+            content["updated_at"] = datetime.now().isoformat()
+            content["word_count"] = len(content.get("content", ""))
+            self._write([content])
         return True
-    
+
     def delete_content(self, content_id: str) -> bool:
-        """콘텐츠 삭제"""
-        content_file = self.storage_dir / f"{content_id}.json"
-        if content_file.exists():
-            content_file.unlink()
-        
-        # 목록에서 제거
-        content_list = self.load_content_list()
-        content_list = [item for item in content_list if item["id"] != content_id]
-        self.save_content_list(content_list)
+        """콘텐츠 삭제 (삭제 표시 레코드 추가, 공간은 압축 때 회수)"""
+        with self._locked():
+            self._append([{"op": "del", "id": content_id}])
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM contents WHERE id = ?", (content_id,))
+        content_search.safe_remove(SOURCE_SAVED, [content_id])
+        related_index.safe_remove(RELATED_SOURCE_SAVED, [content_id])
         return True
-    
-    def search_content(self, query: str = "", status: str = "", limit: int = 50) -> List[Dict[str, Any]]:
-        """콘텐츠 검색"""
-        content_list = self.load_content_list()
-        
-        # 필터링
-        if status:
-            content_list = [item for item in content_list if item.get("status") == status]
-        
+
+    def search_content(
+        self,
+        query: str = "",
+        status: str = "",
+        limit: int = 50,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """콘텐츠 검색 - 검색어가 있으면 전문 검색 순위순, 없으면 최신 순"""
+        columns = ", ".join(_META_FIELDS)
         if query:
-            query = query.lower()
-            content_list = [
-                item for item in content_list 
-                if query in item.get("title", "").lower() or 
-                   query in item.get("keyword", "").lower()
-            ]
-        
-        return content_list[:limit]
-    
+            hits = content_search.search(
+                query, SOURCE_SAVED, status=status or None, date_from=date_from, date_to=date_to, limit=limit
+            )
+            if not hits:
+                return []
+            rows = self._db().execute(
+                f"SELECT {columns} FROM contents WHERE id IN ({', '.join('?' * len(hits))})",
+                [hit["doc_id"] for hit in hits]
+            ).fetchall()
+            by_id = {row["id"]: dict(row) for row in rows}
+            return [{**by_id[hit["doc_id"]], "score": hit["score"]} for hit in hits if hit["doc_id"] in by_id]
+
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if date_from:
+            conditions.append("created_at >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("created_at < ?")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._db().execute(
+            f"SELECT {columns} FROM contents {where} ORDER BY created_at DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
     def get_stats(self) -> Dict[str, Any]:
         """저장 통계"""
-        content_list = self.load_content_list()
-        
-        total_content = len(content_list)
-        total_words = sum(item.get("word_count", 0) for item in content_list)
-        avg_seo_score = sum(item.get("seo_score", 0) for item in content_list) / max(total_content, 1)
-        
-        status_counts = {}
-        for item in content_list:
-            status = item.get("status", "draft")
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
+        conn = self._db()
+        total_content, total_words, avg_seo_score = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(word_count), 0), COALESCE(AVG(seo_score), 0) FROM contents"
+        ).fetchone()
+        status_counts = {
+            row["status"] or "draft": row["count"]
+            for row in conn.execute("SELECT status, COUNT(*) AS count FROM contents GROUP BY status")
+        }
+        live_bytes = conn.execute("SELECT COALESCE(SUM(record_length), 0) FROM contents").fetchone()[0]
+        segment_bytes = sum(path.stat().st_size for path in self._segments())
+
         return {
             "total_content": total_content,
             "total_words": total_words,
             "avg_seo_score": round(avg_seo_score, 1),
             "status_counts": status_counts,
-            "storage_size_mb": self._get_storage_size()
+            "storage_size_mb": self._get_storage_size(),
+            "segments": len(self._segments()),
+            "reclaimable_mb": round((segment_bytes - live_bytes) / (1024 * 1024), 2),
+            "retention": {"max_items": self.max_items, "max_age_days": self.max_age_days}
         }
-    
+
+    # ---- 보관 정책 / 압축 ----
+
+    def expired_entries(self, before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """보관 대상 메타데이터 - 최신 max_items 밖의 항목 + 마지막 수정이 before(기본: 보관 기간) 이전인 항목"""
+        conn = self._db()
+        if before is None and self.max_age_days:
+            before = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+        columns = ", ".join(_META_FIELDS)
+        rows = conn.execute(
+            f"SELECT {columns} FROM contents ORDER BY created_at DESC LIMIT -1 OFFSET ?", (self.max_items,)
+        ).fetchall() if self.max_items else []
+        if before:
+            rows += conn.execute(
+                f"SELECT {columns} FROM contents WHERE COALESCE(updated_at, created_at) < ?", (before,)
+            ).fetchall()
+        return list({row["id"]: dict(row) for row in rows}.values())
+
+    def drop_entries(self, content_ids: List[str]):
+        """보관 계층으로 옮긴 항목을 색인에서 제거 (본문 공간은 압축 때 회수)"""
+        if not content_ids:
+            return
+        with self._locked():
+            self._append([{"op": "del", "id": content_id} for content_id in content_ids])
+            with self._transaction() as conn:
+                conn.executemany("DELETE FROM contents WHERE id = ?", [(content_id,) for content_id in content_ids])
+        content_search.safe_remove(SOURCE_SAVED, content_ids)
+        related_index.safe_remove(RELATED_SOURCE_SAVED, content_ids)
+
+    def apply_retention(self) -> int:
+        """보관 정책 적용 - 초과/만료 항목을 보관 계층으로 이동하고 이동한 개수 반환"""
+        expired = self.expired_entries()
+        if not expired:
+            return 0
+        from archive_store import archive_saved_items
+        archived = archive_saved_items(self, expired)
+        self.compact_if_needed()
+        return archived
+
+    def compact_if_needed(self, min_dead_ratio: float = 0.5, min_dead_bytes: int = 1024 * 1024) -> bool:
+        live_bytes = self._db().execute("SELECT COALESCE(SUM(record_length), 0) FROM contents").fetchone()[0]
+        segment_bytes = sum(path.stat().st_size for path in self._segments())
+        dead_bytes = segment_bytes - live_bytes
+        if dead_bytes < min_dead_bytes or dead_bytes < segment_bytes * min_dead_ratio:
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> Dict[str, int]:
+        """살아 있는 레코드만 새 세그먼트에 다시 쓰고 색인을 한 트랜잭션으로 교체한 뒤 이전 세그먼트 삭제
+
+        새 세그먼트는 fsync 후 색인을 바꾸므로 어느 시점에 중단돼도 색인은 항상 온전한 레코드를 가리킨다.
+        """
+        with self._locked():
+            old_segments = self._segments()
+            rows = self._db().execute(
+                "SELECT id, segment, record_offset, record_length FROM contents ORDER BY created_at"
+            ).fetchall()
+            number = int(old_segments[-1].stem.split("-")[1]) + 1 if old_segments else 1
+            target = self.storage_dir / f"segment-{number:06d}.log"
+
+            index_rows = []
+            for start in range(0, len(rows), 500):
+                batch = rows[start:start + 500]
+                records = [self._read_record(row["segment"], row["record_offset"], row["record_length"]) for row in batch]
+                locations = self._append(records, segment=target)
+                index_rows.extend(
+                    (location[0], location[1], location[2], row["id"]) for row, location in zip(batch, locations)
+                )
+            with self._transaction() as conn:
+                conn.executemany(
+                    "UPDATE contents SET segment = ?, record_offset = ?, record_length = ? WHERE id = ?", index_rows
+                )
+
+            reclaimed = 0
+            for path in old_segments:
+                reclaimed += path.stat().st_size
+                path.unlink()
+            if target.exists():
+                reclaimed -= target.stat().st_size
+        return {"records": len(index_rows), "segments_removed": len(old_segments), "reclaimed_bytes": reclaimed}
+
+    def rebuild_index(self) -> int:
+        """세그먼트를 순서대로 재생해 색인 재구성 (색인 파일 손상/분실 복구용)"""
+        with self._locked():
+            latest: Dict[str, Tuple[Dict[str, Any], Tuple[str, int, int]]] = {}
+            for path in self._segments():
+                for offset, length, record in self._scan_segment(path):
+                    if record.get("op") == "del":
+                        latest.pop(record["id"], None)
+                    else:
+                        latest[record["data"]["id"]] = (record["data"], (path.name, offset, length))
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM contents")
+                self._put_index(conn, [self._index_values(content, location) for content, location in latest.values()])
+        return len(latest)
+
+    def _migrate_legacy(self):
+        """content_history.json + 개별 <id>.json 파일 → 세그먼트/색인 (잠금 안에서 호출)"""
+        try:
+            with open(self.content_file, "r", encoding="utf-8") as f:
+                legacy_list = json.load(f)
+        except (OSError, ValueError):
+            legacy_list = []
+
+        contents = []
+        for item in reversed(legacy_list):  # 오래된 것부터 추가
+            item_file = self.storage_dir / f"{item['id']}.json"
+            try:
+                with open(item_file, "r", encoding="utf-8") as f:
+                    contents.append({**item, **json.load(f)})
+            except (OSError, ValueError):
+                contents.append(dict(item))
+        if contents:
+            self._write(contents)
+
+        for content in contents:
+            item_file = self.storage_dir / f"{content['id']}.json"
+            if item_file.exists():
+                item_file.unlink()
+        self.content_file.rename(self.content_file.with_name("content_history.json.migrated"))
+
     def _get_storage_size(self) -> float:
         """저장소 크기 계산 (MB)"""
-        total_size = 0
-        for file_path in self.storage_dir.glob("*.json"):
-            total_size += file_path.stat().st_size
+        total_size = sum(path.stat().st_size for path in self._segments())
+        if self.index_file.exists():
+            total_size += self.index_file.stat().st_size
         return round(total_size / (1024 * 1024), 2)
 
 # 전역 저장소 인스턴스
-content_storage = ContentStorage()
\ No newline at end of file
+content_storage = ContentStorage()
@@ -0,0 +1,20 @@
+"""
+로컬 데이터 파일 위치
+임베디드 색인(SQLite)과 배치 결과 블롭을 작업 디렉터리가 아닌 DATA_DIR 아래에 둠
+- DATA_DIR 기본값은 backend/data, 파일별 환경 변수(CONTENT_SEARCH_INDEX 등)가 있으면 그 경로 그대로
+- 처음 쓰는 시점에 환경 변수를 읽음 - import 만으로는 파일/디렉터리를 만들지 않음
+"""
+
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def data_dir() -> str:
+    """데이터 디렉터리 (없으면 생성)"""
+    path = os.getenv("DATA_DIR") or os.path.join(BACKEND_DIR, "data")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def data_path(env_name: str, name: str) -> str:
+    """env_name 환경 변수 경로, 없으면 DATA_DIR/name"""
+    return os.getenv(env_name) or os.path.join(data_dir(), name)
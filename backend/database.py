@@ -1,16 +1,149 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from db_config import DATABASE_URL, ASYNC_DATABASE_URL, IS_SQLITE, IS_POSTGRES, IS_SQLITE_MEMORY, to_async_url
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./blogauto.db")
+# SQLite 운영 프로파일 - 연결마다 적용 (journal_mode=WAL 은 DB 파일에 영구 기록됨)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",                                             # 읽기와 쓰기가 서로를 막지 않음
+    "synchronous": "NORMAL",                                           # WAL 에서는 체크포인트 시에만 fsync
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),    # 잠금 시 즉시 실패 대신 대기
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", 64000)),      # 음수 = KB 단위 (64MB)
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),        # 256MB 메모리 맵 읽기
+    "temp_store": "MEMORY",
+}
 
-engine = create_engine(DATABASE_URL)
+def apply_sqlite_profile(engine, begin_statement: str = "BEGIN", query_only: bool = False) -> None:
+    """SQLite 엔진에 PRAGMA 및 트랜잭션 시작 방식 적용 (동기/비동기 엔진 모두)
+    
+    pysqlite 의 암묵적 트랜잭션 관리를 끄고 BEGIN 을 직접 발행해야 SAVEPOINT 가 정상 동작한다.
+    단일 쓰기 엔진은 BEGIN IMMEDIATE 로 쓰기 잠금을 트랜잭션 시작 시점에 확보한다.
+    읽기 전용 풀은 query_only 로 실수로 쓰기가 섞여도 잠금을 잡지 않고 실패하게 한다.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                if IS_SQLITE_MEMORY and name in ("journal_mode", "mmap_size"):
+                    continue
+                cursor.execute(f"PRAGMA {name} = {value}")
+            if query_only:
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+    
+    @event.listens_for(sync_engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql(begin_statement)
+
+# SQLite 연결은 요청 스레드풀 / 쓰기 지연 배처 스레드에서 함께 사용됨
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+# 파일 기반 SQLite 는 읽기 동시성에 맞춘 풀 사용 (메모리 DB 는 연결마다 별도 DB 이므로 기본 풀 유지)
+sqlite_pool_args = {} if IS_SQLITE_MEMORY else {
+    "pool_size": int(os.getenv("SQLITE_POOL_SIZE", 8)),
+    "max_overflow": int(os.getenv("SQLITE_MAX_OVERFLOW", 8)),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+}
+
+# 동기 엔진 - 테이블 생성, 체크포인트/쓰기 지연 배처 등 백그라운드 스레드 작업용
+if IS_SQLITE:
+    engine = create_engine(
+        DATABASE_URL, connect_args=connect_args,
+        **({} if IS_SQLITE_MEMORY else {"poolclass": QueuePool, **sqlite_pool_args})
+    )
+    apply_sqlite_profile(engine)
+else:
+    engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 단일 쓰기 전용 엔진 (SQLite) - 백그라운드 쓰기를 한 연결/한 스레드로 모아 "database is locked" 방지
+SINGLE_WRITER_ENABLED = os.getenv("DB_SINGLE_WRITER", "1" if IS_SQLITE and not IS_SQLITE_MEMORY else "0") == "1"
+if SINGLE_WRITER_ENABLED and IS_SQLITE:
+    writer_engine = create_engine(DATABASE_URL, connect_args=connect_args, poolclass=QueuePool, pool_size=1, max_overflow=0)
+    apply_sqlite_profile(writer_engine, begin_statement="BEGIN IMMEDIATE")
+else:
+    writer_engine = engine
+WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=writer_engine)
+
+def create_server_async_engine(url: str, pool_size: int = int(os.getenv("DB_POOL_SIZE", 20)), application_name: str = os.getenv("DB_APPLICATION_NAME", "blogauto")):
+    """PostgreSQL 등 서버형 DB 의 비동기 엔진 (주 DB / 읽기 복제본 공용)"""
+    async_connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # 짧은 OLTP 쿼리에서 JIT 컴파일은 지연만 늘리므로 끔, pg_stat_statements 구분용 이름 지정
+        async_connect_args = {
+            "server_settings": {
+                "application_name": application_name,
+                "jit": os.getenv("PG_JIT", "off")
+            },
+            "statement_cache_size": int(os.getenv("PG_STATEMENT_CACHE_SIZE", 100))
+        }
+    return create_async_engine(
+        url,
+        connect_args=async_connect_args,
+        pool_size=pool_size,
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        pool_pre_ping=True
+    )
+
+# 비동기 엔진 - 요청 경로 전용 (DB 대기 중 이벤트 루프를 막지 않음)
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **({} if IS_SQLITE_MEMORY else {"poolclass": AsyncAdaptedQueuePool, **sqlite_pool_args})
+    )
+    apply_sqlite_profile(async_engine)
+else:
+    async_engine = create_server_async_engine(ASYNC_DATABASE_URL)
+
+# 읽기 엔진 - 분석/이력/목록 조회를 쓰기 풀과 분리 (주 DB 와의 선택은 read_replica.get_read_db)
+# DATABASE_REPLICA_URL 이 있으면 스트리밍 복제본, 없으면 파일 SQLite 에서 같은 파일의 읽기 전용 풀 (WAL 이므로 쓰기와 서로 막지 않음)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv(
+    "ASYNC_DATABASE_REPLICA_URL", to_async_url(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
+)
+READ_POOL_ENABLED = os.getenv("DB_READ_POOL", "1" if IS_SQLITE and not IS_SQLITE_MEMORY else "0") == "1"
+READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 10))
+
+if ASYNC_DATABASE_REPLICA_URL and ASYNC_DATABASE_REPLICA_URL.startswith("sqlite"):
+    read_async_engine = create_async_engine(
+        ASYNC_DATABASE_REPLICA_URL, poolclass=AsyncAdaptedQueuePool,
+        **{**sqlite_pool_args, "pool_size": READ_POOL_SIZE}
+    )
+    apply_sqlite_profile(read_async_engine, query_only=True)
+elif ASYNC_DATABASE_REPLICA_URL:
+    read_async_engine = create_server_async_engine(
+        ASYNC_DATABASE_REPLICA_URL,
+        pool_size=READ_POOL_SIZE,
+        application_name=os.getenv("DB_APPLICATION_NAME", "blogauto") + "-read"
+    )
+elif READ_POOL_ENABLED and ASYNC_DATABASE_URL.startswith("sqlite") and not IS_SQLITE_MEMORY:
+    read_async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, poolclass=AsyncAdaptedQueuePool,
+        **{**sqlite_pool_args, "pool_size": READ_POOL_SIZE}
+    )
+    apply_sqlite_profile(read_async_engine, query_only=True)
+else:
+    read_async_engine = None
+
+# 커밋 후 속성 재조회(지연 IO)를 막기 위해 expire_on_commit=False
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 metadata = MetaData()
 
@@ -19,4 +152,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
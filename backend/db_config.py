@@ -0,0 +1,27 @@
+"""
+데이터베이스 연결 설정
+URL 과 방언 판별만 담당하여 models 같은 모듈이 엔진 생성 없이 방언별 스키마를 결정할 수 있도록 함
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./blogauto.db")
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 비동기 드라이버 URL로 변환 (sqlite → aiosqlite, postgres → asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_POSTGRES = DATABASE_URL.startswith(("postgres://", "postgresql"))
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") in ("sqlite:", "sqlite:/"))
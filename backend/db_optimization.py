@@ -38,33 +38,18 @@ class DatabaseOptimizer:
             conn.close()
     
     def create_indexes(self):
-        """필요한 인덱스 생성"""
+        """모델(models.py)에 선언된 인덱스 중 DB 에 없는 것 생성
+        
+        기존 테이블에는 create_all 이 인덱스를 추가하지 않으므로 메타데이터 기준으로 맞춘다.
+        """
         print("🔧 데이터베이스 인덱스 최적화 시작...")
         
+        from models import Base
+        
         indexes = [
-            # 사용자 관련 인덱스
-            ("idx_users_email", "users(email)"),
-            ("idx_users_username", "users(username)"),
-            
-            # 키워드 관련 인덱스
-            ("idx_keywords_user_created", "keywords(user_id, created_at DESC)"),
-            ("idx_keywords_search_volume", "keywords(search_volume DESC)"),
-            
-            # 생성된 콘텐츠 인덱스
-            ("idx_generated_content_user_created", "generated_content(user_id, created_at DESC)"),
-            ("idx_generated_content_site", "generated_content(site_id, created_at DESC)"),
-            
-            # 생성된 제목 인덱스
-            ("idx_generated_titles_user_created", "generated_titles(user_id, created_at DESC)"),
-            ("idx_generated_titles_keyword", "generated_titles(keyword_id)"),
-            
-            # 포스팅 결과 인덱스
-            ("idx_posting_results_status", "posting_results(status, created_at DESC)"),
-            ("idx_posting_results_site", "posting_results(site_id, created_at DESC)"),
-            
-            # 자동화 세션 인덱스
-            ("idx_automation_sessions_user", "automation_sessions(user_id, created_at DESC)"),
-            ("idx_automation_sessions_status", "automation_sessions(status)"),
+            (index.name, f"{table.name}({', '.join(column.name for column in index.columns)})")
+            for table in Base.metadata.sorted_tables
+            for index in sorted(table.indexes, key=lambda index: index.name)
         ]
         
         with self.get_connection() as conn:
@@ -103,8 +88,8 @@ class DatabaseOptimizer:
             ("사용자별 최근 키워드", """
                 SELECT k.*, u.username 
                 FROM keywords k 
-                JOIN users u ON k.user_id = u.id 
-                WHERE k.user_id = '1' 
+                JOIN users u ON k.created_by = u.id 
+                WHERE k.created_by = '1' 
                 ORDER BY k.created_at DESC 
                 LIMIT 10
             """),
@@ -128,7 +113,7 @@ class DatabaseOptimizer:
             ("사이트별 포스팅 통계", """
                 SELECT site_id, 
                        COUNT(*) as total_posts,
-                       SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as success_count
+                       SUM(CASE WHEN post_status = 'published' THEN 1 ELSE 0 END) as success_count
                 FROM posting_results
                 GROUP BY site_id
             """)
@@ -189,64 +174,48 @@ class DatabaseOptimizer:
                 }
             })
     
-    def create_materialized_views(self):
-        """자주 사용되는 집계 데이터를 위한 뷰 생성"""
-        print("\n📊 집계 뷰 생성...")
+    def refresh_activity_rollups(self):
+        """일별 활동 집계 테이블 재구성 (기존 user_stats / daily_stats 뷰 대체)
         
-        views = [
-            ("user_stats", """
-                CREATE VIEW IF NOT EXISTS user_stats AS
-                SELECT 
-                    u.id as user_id,
-                    u.username,
-                    COUNT(DISTINCT k.id) as total_keywords,
-                    COUNT(DISTINCT gc.id) as total_content,
-                    COUNT(DISTINCT pr.id) as total_posts
-                FROM users u
-                LEFT JOIN keywords k ON u.id = k.user_id
-                LEFT JOIN generated_content gc ON u.id = gc.user_id
-                LEFT JOIN posting_results pr ON gc.id = pr.content_id
-                GROUP BY u.id
-            """),
-            
-            ("daily_stats", """
-                CREATE VIEW IF NOT EXISTS daily_stats AS
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(CASE WHEN type = 'keyword' THEN 1 END) as keywords_created,
-                    COUNT(CASE WHEN type = 'content' THEN 1 END) as content_created,
-                    COUNT(CASE WHEN type = 'post' THEN 1 END) as posts_published
-                FROM (
-                    SELECT 'keyword' as type, created_at FROM keywords
-                    UNION ALL
-                    SELECT 'content' as type, created_at FROM generated_content
-                    UNION ALL
-                    SELECT 'post' as type, created_at FROM posting_results WHERE status = 'success'
-                )
-                GROUP BY DATE(created_at)
-            """)
-        ]
+        뷰는 조회할 때마다 전체 이력을 JOIN/UNION 하므로 제거하고,
+        생성 시점에 증분 갱신되는 daily_activity_rollups 를 이력에서 다시 맞춘다.
+        """
+        print("\n📊 일별 활동 집계 재구성...")
         
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            for view_name, view_sql in views:
-                try:
-                    start_time = time.time()
-                    cursor.execute(view_sql)
-                    elapsed = (time.time() - start_time) * 1000
-                    
-                    self.optimization_results.append({
-                        "type": "view",
-                        "name": view_name,
-                        "time_ms": round(elapsed, 2),
-                        "status": "created"
-                    })
-                    print(f"  ✅ {view_name} 뷰 생성됨 ({elapsed:.2f}ms)")
-                except Exception as e:
-                    print(f"  ❌ {view_name} 실패: {e}")
-            
+            for view_name in ("user_stats", "daily_stats"):
+                conn.execute(f"DROP VIEW IF EXISTS {view_name}")
             conn.commit()
+        
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from models import DailyActivityRollup
+        from activity_rollup import rebuild_rollups
+        
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        try:
+            DailyActivityRollup.__table__.create(bind=engine, checkfirst=True)
+            session = sessionmaker(bind=engine)()
+            try:
+                start_time = time.time()
+                rows = rebuild_rollups(session)
+                elapsed = (time.time() - start_time) * 1000
+                
+                self.optimization_results.append({
+                    "type": "rollup",
+                    "name": DailyActivityRollup.__tablename__,
+                    "rows": rows,
+                    "time_ms": round(elapsed, 2),
+                    "status": "rebuilt"
+                })
+                print(f"  ✅ {DailyActivityRollup.__tablename__} {rows}행 재구성됨 ({elapsed:.2f}ms)")
+            except Exception as e:
+                session.rollback()
+                print(f"  ❌ 집계 재구성 실패: {e}")
+            finally:
+                session.close()
+        finally:
+            engine.dispose()
     
     def get_optimization_report(self) -> Dict[str, Any]:
         """최적화 결과 보고서"""
@@ -256,7 +225,7 @@ class DatabaseOptimizer:
             "summary": {
                 "indexes_created": len([r for r in self.optimization_results if r["type"] == "index" and r.get("status") == "created"]),
                 "queries_analyzed": len([r for r in self.optimization_results if r["type"] == "query"]),
-                "views_created": len([r for r in self.optimization_results if r["type"] == "view" and r.get("status") == "created"]),
+                "rollup_rows": sum(r.get("rows", 0) for r in self.optimization_results if r["type"] == "rollup"),
             }
         }
         
@@ -281,8 +250,8 @@ class DatabaseOptimizer:
         # 3. 테이블 구조 최적화
         self.optimize_table_structure()
         
-        # 4. 집계 뷰 생성
-        self.create_materialized_views()
+        # 4. 일별 활동 집계 재구성
+        self.refresh_activity_rollups()
         
         # 5. 보고서 출력
         report = self.get_optimization_report()
@@ -292,7 +261,7 @@ class DatabaseOptimizer:
         print("=" * 60)
         print(f"  인덱스 생성: {report['summary']['indexes_created']}개")
         print(f"  쿼리 분석: {report['summary']['queries_analyzed']}개")
-        print(f"  뷰 생성: {report['summary']['views_created']}개")
+        print(f"  집계 행: {report['summary']['rollup_rows']}개")
         
         if "avg_query_time_ms" in report["summary"]:
             print(f"  평균 쿼리 시간: {report['summary']['avg_query_time_ms']}ms")
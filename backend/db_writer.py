@@ -0,0 +1,145 @@
+"""
+단일 쓰기 큐
+SQLite 는 동시에 하나의 쓰기 트랜잭션만 허용하므로 백그라운드 쓰기(쓰기 지연 배처, 체크포인트)를
+전용 스레드 하나로 모아 실행하고, 대기 중인 작업을 한 트랜잭션으로 묶어 커밋(group commit)
+요청 경로의 커밋(AsyncSession)은 이 큐를 거치지 않고 자체 연결에서 busy_timeout 으로 대기한다
+(경합 지연은 sqlite_benchmark.py 의 request_commit_* 항목으로 측정)
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from database import SINGLE_WRITER_ENABLED, WriterSessionLocal
+from logger import app_logger
+
+WriteJob = Callable[[Any], Any]
+
+class SingleWriter:
+    """전용 쓰기 스레드
+
+    작업은 fn(session) 형태이며 커밋하지 않는다. 쓰기 스레드가 큐에 쌓인 작업을 최대
+    max_batch_jobs 개까지 꺼내 각각 SAVEPOINT 안에서 실행한 뒤 한 번에 커밋하므로,
+    실패한 작업만 롤백되고 나머지는 같은 fsync 로 기록된다.
+    """
+
+    def __init__(self, session_factory: Callable, max_batch_jobs: int = 200, batch_window: float = 0.002):
+        self.session_factory = session_factory
+        self.max_batch_jobs = max_batch_jobs
+        self.batch_window = batch_window
+
+        self._queue: "queue.Queue[Optional[Tuple[WriteJob, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.stats = {
+            "jobs": 0,
+            "jobs_failed": 0,
+            "transactions": 0,
+            "transactions_failed": 0,
+            "busy_seconds": 0.0
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-single-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, fn: WriteJob) -> Future:
+        """쓰기 작업 등록 - 커밋 후 fn 의 반환값으로 완료되는 Future"""
+        if threading.current_thread() is self._thread:
+            # 쓰기 스레드 안에서 다시 대기하면 교착되므로 금지
+            raise RuntimeError("SingleWriter.submit() called from the writer thread")
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn: WriteJob) -> Any:
+        """동기 호출자용 - 커밋될 때까지 대기"""
+        return self.submit(fn).result()
+
+    async def run_async(self, fn: WriteJob) -> Any:
+        """비동기 호출자용 - 이벤트 루프를 막지 않고 커밋 대기"""
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            jobs = [item]
+            # 짧게 기다려 동시에 들어온 작업을 같은 트랜잭션으로 묶음
+            deadline = time.monotonic() + self.batch_window
+            while len(jobs) < self.max_batch_jobs:
+                try:
+                    timeout = max(0.0, deadline - time.monotonic())
+                    next_item = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item is None:
+                    self._execute(jobs)
+                    return
+                jobs.append(next_item)
+
+            self._execute(jobs)
+
+    def _execute(self, jobs: List[Tuple[WriteJob, Future]]):
+        started = time.perf_counter()
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+        session = self.session_factory()
+        try:
+            for fn, future in jobs:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = fn(session)
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+
+            session.commit()
+            self.stats["transactions"] += 1
+        except Exception as e:
+            # 커밋 자체가 실패하면 묶인 작업 전체 실패
+            session.rollback()
+            self.stats["transactions_failed"] += 1
+            app_logger.error(f"Single writer commit failed: {e}")
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        finally:
+            session.close()
+            self.stats["busy_seconds"] += time.perf_counter() - started
+
+        for future, result, error in outcomes:
+            self.stats["jobs"] += 1
+            if error is not None:
+                self.stats["jobs_failed"] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def close(self, timeout: float = 10.0):
+        """남은 작업을 처리한 뒤 스레드 종료"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        transactions = self.stats["transactions"]
+        return {
+            **self.stats,
+            "queued_jobs": self._queue.qsize(),
+            "avg_jobs_per_transaction": round(self.stats["jobs"] / transactions, 2) if transactions else 0
+        }
+
+# 전역 단일 쓰기 큐 (비활성화 시 None - 호출자는 자체 세션으로 직접 커밋)
+single_writer: Optional[SingleWriter] = SingleWriter(WriterSessionLocal) if SINGLE_WRITER_ENABLED else None
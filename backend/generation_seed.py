@@ -0,0 +1,116 @@
+"""
+재현 가능한 템플릿 생성
+템플릿 생성기(본문/제목/황금 키워드)가 모듈 전역 random 대신 요청마다 받은 random.Random 을 씀
+- 결정적 모드: 입력 지문(생성기 이름 + 입력값)과 변형 번호로 시드 - 같은 요청은 같은 결과, A/B 변형은 번호로 재현
+- 기본 모드: OS 엔트로피로 시드한 새 Random - 지금처럼 매번 다른 결과
+- 결정적 결과는 (지문, 변형 번호, 날짜) 로 LRU 캐시 - 시기/연도 어휘가 날짜를 따르므로 날짜가 바뀌면 다시 생성
+"""
+
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+# 변형 번호 없이도 항상 결정적으로 생성할지
+DETERMINISTIC_GENERATION = os.getenv("DETERMINISTIC_GENERATION", "false").lower() == "true"
+CACHE_SIZE = int(os.getenv("GENERATION_CACHE_SIZE", 512))
+
+T = TypeVar("T")
+
+def input_fingerprint(generator: str, *inputs: Any) -> str:
+    """생성기 이름 + 입력값의 SHA-256 지문 (dict 는 키 순서와 무관)"""
+    payload = json.dumps([generator, *inputs], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def is_deterministic(variation: Optional[int] = None) -> bool:
+    return DETERMINISTIC_GENERATION or variation is not None
+
+def generation_rng(generator: str, *inputs: Any, variation: Optional[int] = None) -> random.Random:
+    """생성기에 넘길 Random - 결정적 모드면 (지문, 변형 번호) 시드, 아니면 매번 새 시드"""
+    if not is_deterministic(variation):
+        return random.Random()
+    digest = hashlib.sha256(f"{input_fingerprint(generator, *inputs)}:{variation or 0}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+def variant_rng(generator: str, *inputs: Any, variation: Optional[int] = None) -> Optional[random.Random]:
+    """원래 무작위 요소가 없는 생성기(고정 순서 템플릿)용 - 변형 번호가 1 이상일 때만 Random (변형 0 이 기존 결과)"""
+    return generation_rng(generator, *inputs, variation=variation) if variation else None
+
+def variant_order(items: Sequence[T], rng: Optional[random.Random]) -> List[T]:
+    """rng 가 있으면 섞은 순서, 없으면 원래 순서"""
+    return rng.sample(list(items), len(items)) if rng else list(items)
+
+class GenerationCache:
+    """결정적 생성 결과 LRU (스레드 안전) - 호출자가 결과를 고쳐도 캐시가 바뀌지 않도록 복사해서 주고받음"""
+
+    def __init__(self, max_size: int = CACHE_SIZE):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, int, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(generator: str, inputs: Tuple[Any, ...], variation: Optional[int] = None) -> Tuple[str, int, str]:
+        return input_fingerprint(generator, *inputs), variation or 0, date.today().isoformat()
+
+    def get(self, key: Tuple[str, int, str]) -> Optional[Any]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Tuple[str, int, str], value: Any):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    async def get_or_generate(
+        self,
+        generator: str,
+        inputs: Tuple[Any, ...],
+        variation: Optional[int],
+        produce: Callable[[], Awaitable[T]]
+    ) -> T:
+        """결정적 모드면 캐시된 결과, 없으면 생성해 저장 (기본 모드는 항상 생성)"""
+        if not is_deterministic(variation):
+            return await produce()
+        key = self.key(generator, inputs, variation)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        result = await produce()
+        self.put(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "deterministic_default": DETERMINISTIC_GENERATION,
+                "cached_results": len(self._items),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+# 전역 생성 결과 캐시
+generation_cache = GenerationCache()
@@ -12,6 +12,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import openai
 from logger import ai_logger
+from generation_seed import variant_rng, variant_order
 import requests
 from collections import defaultdict
 import re
@@ -35,23 +36,29 @@ class GoldenKeywordService:
         self, 
         category: str, 
         domain: str = "", 
-        platform: str = "wordpress"
+        platform: str = "wordpress",
+        variation: Optional[int] = None
     ) -> Dict[str, List[str]]:
-        """메인 황금 키워드 생성 함수"""
+        """메인 황금 키워드 생성 함수
+
+        조합 규칙이 고정이라 같은 입력은 같은 키워드 (변형 0), variation 이 1 이상이면
+        입력 지문 + 변형 번호로 조합할 수식어를 다르게 골라 재현 가능한 변형을 만듦
+        """
+        rng = variant_rng("golden_keywords", category, domain, platform, variation=variation)
         
         try:
             # 1. 기본 카테고리 키워드 생성
             base_keywords = await self._generate_base_keywords(category)
             
             # 2. 수익성 키워드 생성 (돈이 되는 키워드)
-            profitable_keywords = await self._generate_profitable_keywords(category, base_keywords)
+            profitable_keywords = await self._generate_profitable_keywords(category, base_keywords, rng)
             
             # 3. 트렌딩 키워드 생성 (현재 핫한 키워드)
             trending_keywords = await self._generate_trending_keywords(category, base_keywords)
             
             # 4. 황금 키워드 생성 (창의적이고 유입량 높은 키워드)
             golden_keywords = await self._generate_creative_golden_keywords(
-                category, base_keywords, profitable_keywords, trending_keywords
+                category, base_keywords, profitable_keywords, trending_keywords, rng
             )
             
             ai_logger.info(
@@ -111,7 +118,9 @@ class GoldenKeywordService:
         
         return seeds + expanded_keywords
     
-    async def _generate_profitable_keywords(self, category: str, base_keywords: List[str]) -> List[str]:
+    async def _generate_profitable_keywords(
+        self, category: str, base_keywords: List[str], rng: Optional[random.Random] = None
+    ) -> List[str]:
         """수익성이 높은 키워드 생성 (구매 의도가 높은 키워드)"""
         
         profit_indicators = [
@@ -124,7 +133,7 @@ class GoldenKeywordService:
         
         # 기본 키워드와 수익 지시어 조합
         for keyword in base_keywords[:8]:
-            for indicator in profit_indicators[:6]:
+            for indicator in variant_order(profit_indicators, rng)[:6]:
                 profitable_keywords.append(f"{keyword} {indicator}")
         
         # AI를 통한 수익성 키워드 생성
@@ -168,18 +177,19 @@ class GoldenKeywordService:
         category: str, 
         base_keywords: List[str], 
         profitable_keywords: List[str], 
-        trending_keywords: List[str]
+        trending_keywords: List[str],
+        rng: Optional[random.Random] = None
     ) -> List[str]:
         """창의적이고 유입량이 높은 황금 키워드 생성"""
         
         golden_keywords = []
         
         # 1. 롱테일 키워드 생성 (3-5단어 조합)
-        longtail_keywords = await self._generate_longtail_keywords(category, base_keywords)
+        longtail_keywords = await self._generate_longtail_keywords(category, base_keywords, rng)
         golden_keywords.extend(longtail_keywords)
         
         # 2. 의외의 조합 키워드 (창의적 접근)
-        creative_combinations = await self._generate_creative_combinations(category, base_keywords)
+        creative_combinations = await self._generate_creative_combinations(category, base_keywords, rng)
         golden_keywords.extend(creative_combinations)
         
         # 3. 문제 해결형 키워드
@@ -187,7 +197,7 @@ class GoldenKeywordService:
         golden_keywords.extend(problem_solving_keywords)
         
         # 4. 감정 유발 키워드
-        emotional_keywords = await self._generate_emotional_keywords(category, base_keywords)
+        emotional_keywords = await self._generate_emotional_keywords(category, base_keywords, rng)
         golden_keywords.extend(emotional_keywords)
         
         # 유입량 점수로 정렬
@@ -288,7 +298,9 @@ class GoldenKeywordService:
             ai_logger.error(f"AI trending keyword generation failed", error=e)
             return []
     
-    async def _generate_longtail_keywords(self, category: str, base_keywords: List[str]) -> List[str]:
+    async def _generate_longtail_keywords(
+        self, category: str, base_keywords: List[str], rng: Optional[random.Random] = None
+    ) -> List[str]:
         """롱테일 키워드 생성"""
         modifiers = [
             '방법', '팁', '가이드', '추천', '비교', '순위', '리스트', '정보',
@@ -300,13 +312,15 @@ class GoldenKeywordService:
         longtail_keywords = []
         
         for keyword in base_keywords[:8]:
-            for modifier in modifiers[:10]:
+            for modifier in variant_order(modifiers, rng)[:10]:
                 longtail_keywords.append(f"{modifier} {keyword}")
                 longtail_keywords.append(f"{keyword} {modifier}")
         
         return longtail_keywords
     
-    async def _generate_creative_combinations(self, category: str, base_keywords: List[str]) -> List[str]:
+    async def _generate_creative_combinations(
+        self, category: str, base_keywords: List[str], rng: Optional[random.Random] = None
+    ) -> List[str]:
         """창의적 키워드 조합 생성"""
         unexpected_modifiers = [
             '혼자서', '집에서', '5분만에', '간단하게', '쉽게', '빠르게',
@@ -318,7 +332,7 @@ class GoldenKeywordService:
         creative_keywords = []
         
         for keyword in base_keywords[:6]:
-            for modifier in unexpected_modifiers[:8]:
+            for modifier in variant_order(unexpected_modifiers, rng)[:8]:
                 creative_keywords.append(f"{modifier} {keyword}")
         
         return creative_keywords
@@ -333,7 +347,9 @@ class GoldenKeywordService:
         
         return problem_patterns
     
-    async def _generate_emotional_keywords(self, category: str, base_keywords: List[str]) -> List[str]:
+    async def _generate_emotional_keywords(
+        self, category: str, base_keywords: List[str], rng: Optional[random.Random] = None
+    ) -> List[str]:
         """감정 유발 키워드 생성"""
         emotional_modifiers = [
             '놀라운', '충격적인', '감동적인', '웃긴', '재밌는', '신기한',
@@ -343,7 +359,7 @@ class GoldenKeywordService:
         emotional_keywords = []
         
         for keyword in base_keywords[:5]:
-            for emotion in emotional_modifiers[:6]:
+            for emotion in variant_order(emotional_modifiers, rng)[:6]:
                 emotional_keywords.append(f"{emotion} {keyword}")
         
         return emotional_keywords
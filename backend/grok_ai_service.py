@@ -14,6 +14,8 @@ import os
 from dataclasses import dataclass
 import logging
 
+from seo_scoring import score_document
+
 @dataclass
 class GrokConfig:
     """Grok API 설정"""
@@ -297,35 +299,8 @@ JSON 형식으로 응답해주세요."""
             }
     
     def _calculate_seo_score(self, content: str, keyword: str) -> float:
-        """간단한 SEO 점수 계산"""
-        score = 70.0  # 기본 점수
-        
-        # 키워드 밀도 확인
-        keyword_count = content.lower().count(keyword.lower())
-        content_length = len(content)
-        
-        if content_length > 0:
-            keyword_density = (keyword_count * len(keyword)) / content_length
-            if 0.01 <= keyword_density <= 0.03:  # 1-3% 적정
-                score += 10
-            elif keyword_density > 0:
-                score += 5
-        
-        # 구조 확인
-        if '##' in content:  # H2 헤딩 존재
-            score += 5
-        if '###' in content:  # H3 헤딩 존재
-            score += 3
-        if '-' in content or '*' in content:  # 리스트 존재
-            score += 2
-        
-        # 길이 확인
-        if 1000 <= content_length <= 3000:
-            score += 5
-        elif content_length > 500:
-            score += 3
-        
-        return min(score, 100.0)
+        """SEO 점수 계산 (공통 점수 엔진)"""
+        return score_document(content, keyword=keyword)["seo_score"]
 
 class MultiAIGrokService:
     """다중 AI 모델과 Grok 통합 서비스"""
@@ -0,0 +1,209 @@
+"""
+생성 이력 조회 (키셋 페이지네이션 + 컬럼 프로젝션)
+(created_by, created_at, id) 인덱스를 따라 커서 이후 행만 읽고,
+요청된 필드의 컬럼만 SELECT 하여 누적 행 수와 무관하게 일정한 비용으로 조회
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, or_, and_, type_coerce, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Keyword, GeneratedTitle, GeneratedContent, EXCERPT_LENGTH, make_excerpt
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def _float(value: Any) -> float:
+    return float(value) if value else 0.0
+
+def _isoformat(value: Any) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _identity(value: Any) -> Any:
+    return value
+
+class HistoryField:
+    """응답 필드 → SELECT 식 + 직렬화 함수"""
+    
+    def __init__(self, expression, serialize: Callable[[Any], Any] = _identity):
+        self.expression = expression
+        self.serialize = serialize
+
+# 요약이 없는 기존 행은 본문 앞부분으로 대체 (요약이 있으면 본문 컬럼은 평가되지 않음)
+_content_excerpt = func.coalesce(
+    GeneratedContent.excerpt,
+    func.substr(GeneratedContent.content, 1, EXCERPT_LENGTH)
+)
+
+# 모델별 조회 가능 필드 (순서 = 기본 응답 필드 순서)
+HISTORY_FIELDS: Dict[Any, Dict[str, HistoryField]] = {
+    Keyword: {
+        "id": HistoryField(Keyword.id),
+        "keyword": HistoryField(Keyword.keyword),
+        "search_volume": HistoryField(Keyword.search_volume),
+        "competition": HistoryField(Keyword.competition),
+        "cpc": HistoryField(Keyword.cpc, _float),
+        "opportunity_score": HistoryField(Keyword.opportunity_score),
+        "created_at": HistoryField(Keyword.created_at, _isoformat),
+    },
+    GeneratedTitle: {
+        "id": HistoryField(GeneratedTitle.id),
+        "title": HistoryField(GeneratedTitle.title),
+        "keyword_id": HistoryField(GeneratedTitle.keyword_id),
+        "length_option": HistoryField(GeneratedTitle.length_option),
+        "language": HistoryField(GeneratedTitle.language),
+        "tone": HistoryField(GeneratedTitle.tone),
+        "duplicate_rate": HistoryField(GeneratedTitle.duplicate_rate, _float),
+        "ai_model": HistoryField(GeneratedTitle.ai_model),
+        "created_at": HistoryField(GeneratedTitle.created_at, _isoformat),
+    },
+    GeneratedContent: {
+        "id": HistoryField(GeneratedContent.id),
+        "title_id": HistoryField(GeneratedContent.title_id),
+        # 기존 응답 호환: 목록의 content 는 요약본
+        "content": HistoryField(_content_excerpt),
+        "keywords": HistoryField(GeneratedContent.keywords),
+        "seo_score": HistoryField(GeneratedContent.seo_score),
+        "geo_score": HistoryField(GeneratedContent.geo_score),
+        "copyscape_result": HistoryField(GeneratedContent.copyscape_result),
+        "ai_model": HistoryField(GeneratedContent.ai_model),
+        "created_at": HistoryField(GeneratedContent.created_at, _isoformat),
+    },
+}
+
+# 기본 응답에는 포함하지 않고 ?fields= 로만 요청하는 필드
+EXTRA_HISTORY_FIELDS: Dict[Any, Dict[str, HistoryField]] = {
+    GeneratedContent: {
+        "excerpt": HistoryField(_content_excerpt),
+    },
+}
+
+def parse_fields(model, fields: Optional[str]) -> List[str]:
+    """?fields=id,title,created_at 파싱 (미지정 시 기본 필드 전체)"""
+    available = HISTORY_FIELDS[model]
+    if not fields:
+        return list(available)
+    
+    extra = EXTRA_HISTORY_FIELDS.get(model, {})
+    requested = []
+    for name in (part.strip() for part in fields.split(",")):
+        if not name or name in requested:
+            continue
+        if name not in available and name not in extra:
+            raise ValueError(f"Unknown field '{name}'. Available: {', '.join([*available, *extra])}")
+        requested.append(name)
+    return requested
+
+def sortable_created_at(column, dialect_name: str):
+    """커서 비교 대상 created_at 식
+    
+    SQLite 는 날짜를 문자열로 저장·정렬하므로 저장된 원문 그대로 비교해야
+    server_default(초 단위)와 바인드 값(마이크로초 포함) 형식 차이로 행이 중복/누락되지 않는다.
+    """
+    if dialect_name == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+def encode_cursor(created_at: Any, row_id: str) -> str:
+    value = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, dialect_name: str) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if dialect_name != "sqlite":
+            created_at = datetime.fromisoformat(created_at)
+        return created_at, str(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+async def fetch_history_page(
+    db: AsyncSession,
+    model,
+    user_id: Any,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    include_archived: bool = False
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """최신순 한 페이지와 다음 페이지 커서 반환 (마지막 페이지면 커서 None)
+    
+    include_archived 이면 보관 계층(archive_store)의 행도 같은 (created_at, id) 순서로 병합한다.
+    잘못된 fields / cursor 는 ValueError.
+    """
+    names = parse_fields(model, fields)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    dialect_name = db.get_bind().dialect.name
+    cursor_column = sortable_created_at(model.created_at, dialect_name)
+    
+    field_map = {**HISTORY_FIELDS[model], **EXTRA_HISTORY_FIELDS.get(model, {})}
+    columns = [field_map[name].expression.label(name) for name in names]
+    
+    query = select(
+        *columns,
+        cursor_column.label("_cursor_at"),
+        model.id.label("_cursor_id")
+    ).where(model.created_by == user_id)
+    
+    cursor_at = cursor_id = None
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor, dialect_name)
+        query = query.where(or_(
+            cursor_column < cursor_at,
+            and_(cursor_column == cursor_at, model.id < cursor_id)
+        ))
+    
+    # 한 행 더 읽어 다음 페이지 존재 여부 판단
+    rows = (await db.execute(
+        query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    )).all()
+    
+    page = [
+        (
+            row._mapping["_cursor_at"],
+            row._mapping["_cursor_id"],
+            {name: field_map[name].serialize(row._mapping[name]) for name in names}
+        )
+        for row in rows
+    ]
+    
+    if include_archived:
+        from archive_store import fetch_archived_rows
+        archive_cursor = (_sort_text(cursor_at), cursor_id) if cursor else None
+        archived = await db.run_sync(lambda session: fetch_archived_rows(
+            session, model.__tablename__, user_id, archive_cursor, limit + 1
+        ))
+        page.extend(
+            (sort_at, row_id, _archived_item(model, names, record))
+            for sort_at, row_id, record in archived
+        )
+        page.sort(key=lambda entry: (_sort_text(entry[0]), entry[1]), reverse=True)
+    
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        cursor_at, cursor_id, _ = page[-1]
+        next_cursor = encode_cursor(cursor_at, cursor_id)
+    
+    return [item for _, _, item in page], next_cursor
+
+def _sort_text(value: Any) -> str:
+    """hot 행 커서값과 보관 색인의 created_at 문자열을 같은 기준으로 비교"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def _archived_item(model, names: List[str], record: Dict[str, Any]) -> Dict[str, Any]:
+    """보관 레코드(JSON)를 이력 응답 필드로 투영"""
+    item = {}
+    for name in names:
+        if model is GeneratedContent and name in ("content", "excerpt"):
+            item[name] = record.get("excerpt") or make_excerpt(record.get("content"))
+        else:
+            item[name] = record.get(name)
+    item["archived"] = True
+    return item
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+인덱스 추천기
+실행 중 수집된 쿼리 로그(performance_optimizer.db_optimizer.query_log)의 상위 쿼리를 EXPLAIN 으로 확인하고,
+WHERE/ORDER BY 컬럼을 SQLAlchemy 모델 메타데이터와 실제 DB 인덱스에 대조하여 빠진 인덱스를 추천/적용
+
+    python index_advisor.py --emit migrations/   # 모델에 선언됐지만 DB 에 없는 인덱스 마이그레이션 작성
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import MetaData, UniqueConstraint, inspect
+
+from logger import app_logger
+
+MAX_INDEX_COLUMNS = 4
+
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?', re.I)
+_WHERE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|\bLIMIT\b|\bOFFSET\b|$)", re.I | re.S)
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR\s+UPDATE\b|$)", re.I | re.S)
+_PREDICATE = re.compile(
+    r'(?:"?(\w+)"?\.)?"?(\w+)"?\s*(=|!=|<>|<=|>=|<|>|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b)',
+    re.I
+)
+_ORDER_TERM = re.compile(r'^\s*(?:"?(\w+)"?\.)?"?(\w+)"?(?:\s+(?:ASC|DESC))?(?:\s+NULLS\s+(?:FIRST|LAST))?\s*$', re.I)
+_SQL_KEYWORDS = {
+    "where", "join", "left", "right", "inner", "outer", "cross", "full", "on", "using", "group",
+    "order", "limit", "offset", "having", "union", "as", "natural", "lateral", "for", "and", "or"
+}
+_EQUALITY_OPS = {"=", "in", "is"}
+_RANGE_OPS = {"<", ">", "<=", ">=", "between", "like"}
+
+@dataclass
+class ColumnUsage:
+    """한 쿼리에서 테이블별로 쓰인 컬럼 (등호 조건 → 범위 조건 → 정렬 순서가 인덱스 컬럼 순서)"""
+    equality: List[str] = field(default_factory=list)
+    range: List[str] = field(default_factory=list)
+    order_by: List[str] = field(default_factory=list)
+
+    def index_columns(self) -> List[str]:
+        columns = list(self.equality)
+        tail = self.range[:1] if self.range else self.order_by
+        for column in tail:
+            if column not in columns:
+                columns.append(column)
+        return columns[:MAX_INDEX_COLUMNS]
+
+@dataclass
+class IndexRecommendation:
+    table: str
+    columns: List[str]
+    name: str
+    source: str                     # "query_log" | "model"
+    reason: str
+    fingerprint: Optional[str] = None
+    calls: int = 0
+    total_time: float = 0.0
+    plan: List[str] = field(default_factory=list)
+
+    def model_declaration(self) -> str:
+        """models.py 의 __table_args__ 에 옮겨 적을 선언"""
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        return f'Index("{self.name}", {columns})'
+
+    def as_dict(self, dialect=None) -> Dict[str, Any]:
+        data = asdict(self)
+        data["total_time"] = round(self.total_time, 4)
+        data["model_declaration"] = self.model_declaration()
+        if dialect is not None:
+            data["ddl"] = index_ddl(dialect, self.table, self.name, self.columns)
+        return data
+
+def index_name(table: str, columns: Sequence[str]) -> str:
+    # PostgreSQL 식별자 길이 제한 63자
+    return f"idx_{table}_{'_'.join(columns)}"[:63]
+
+def index_ddl(dialect, table: str, name: str, columns: Sequence[str], concurrently: bool = False) -> str:
+    quote = dialect.identifier_preparer.quote
+    keyword = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX"
+    column_list = ", ".join(quote(column) for column in columns)
+    return f"{keyword} IF NOT EXISTS {quote(name)} ON {quote(table)} ({column_list})"
+
+def extract_column_usage(statement: str, known_tables: Sequence[str]) -> Dict[str, ColumnUsage]:
+    """SELECT 문에서 테이블별 조건/정렬 컬럼 추출 (정규식 기반 - 서브쿼리는 바깥 별칭 기준으로 근사)"""
+    aliases: Dict[str, str] = {}
+    for table, alias in _TABLE_REF.findall(statement):
+        if table not in known_tables:
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    if not aliases:
+        return {}
+
+    tables = set(aliases.values())
+    default_table = next(iter(tables)) if len(tables) == 1 else None
+    usage: Dict[str, ColumnUsage] = {table: ColumnUsage() for table in tables}
+
+    def resolve(qualifier: Optional[str]) -> Optional[str]:
+        return aliases.get(qualifier) if qualifier else default_table
+
+    where = _WHERE.search(statement)
+    if where:
+        for qualifier, column, op in _PREDICATE.findall(where.group(1)):
+            table = resolve(qualifier)
+            if table is None:
+                continue
+            op = op.lower()
+            bucket = usage[table].equality if op in _EQUALITY_OPS else usage[table].range if op in _RANGE_OPS else None
+            if bucket is not None and column not in bucket:
+                bucket.append(column)
+
+    order = _ORDER_BY.search(statement)
+    if order:
+        for term in order.group(1).split(","):
+            match = _ORDER_TERM.match(term)
+            if not match:
+                # 표현식 정렬은 인덱스로 대체 불가
+                break
+            table = resolve(match.group(1))
+            if table is not None and match.group(2) not in usage[table].order_by:
+                usage[table].order_by.append(match.group(2))
+
+    return {table: columns for table, columns in usage.items() if columns.index_columns()}
+
+def _plan_problems(dialect_name: str, plan: List[str], table: str, sorts: bool) -> List[str]:
+    """EXPLAIN 결과에서 해당 테이블의 전체 스캔/정렬 단계 (정렬은 ORDER BY 를 가진 테이블에만 귀속)"""
+    problems = []
+    for line in plan:
+        text = line.strip()
+        if dialect_name == "sqlite":
+            if re.match(rf"SCAN (?:TABLE )?{table}\b", text) and "INDEX" not in text:
+                problems.append(text)
+            elif sorts and "USE TEMP B-TREE" in text:
+                problems.append(text)
+        elif f"Seq Scan on {table}" in text or (sorts and text.lstrip("-> ").startswith("Sort ")):
+            problems.append(text)
+    return problems
+
+class IndexAdvisor:
+    """쿼리 로그 기반 인덱스 추천
+
+    추천 대상은 누적 시간이 큰 SELECT 지문이며, 후보 인덱스는
+    1) 모델에 없는 컬럼이면 버리고 2) 모델/DB 의 기존 인덱스(또는 PK)가 후보로 시작하면 이미 커버된 것으로 보고
+    3) EXPLAIN 에 전체 스캔이나 임시 정렬이 보일 때만 남긴다.
+    """
+
+    def __init__(self, engine, metadata: Optional[MetaData] = None, query_log=None):
+        if metadata is None:
+            from models import Base
+            metadata = Base.metadata
+        if query_log is None:
+            from performance_optimizer import db_optimizer
+            query_log = db_optimizer.query_log
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.metadata = metadata
+        self.query_log = query_log
+
+    # ---- 인덱스 현황 ----
+
+    def _model_index_columns(self, table_name: str) -> List[Tuple[str, ...]]:
+        table = self.metadata.tables[table_name]
+        existing = [tuple(column.name for column in index.columns) for index in table.indexes]
+        existing.append(tuple(column.name for column in table.primary_key.columns))
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                existing.append(tuple(column.name for column in constraint.columns))
+        existing.extend((column.name,) for column in table.columns if column.unique or column.index)
+        return existing
+
+    def _live_index_columns(self, inspector, table_name: str) -> List[Tuple[str, ...]]:
+        try:
+            existing = [tuple(index["column_names"]) for index in inspector.get_indexes(table_name)]
+            existing.extend(
+                tuple(constraint["column_names"]) for constraint in inspector.get_unique_constraints(table_name)
+            )
+            primary_key = inspector.get_pk_constraint(table_name).get("constrained_columns") or []
+            if primary_key:
+                existing.append(tuple(primary_key))
+            return existing
+        except Exception:
+            # 아직 생성되지 않은 테이블
+            return []
+
+    @staticmethod
+    def _covered(columns: Sequence[str], existing: List[Tuple[str, ...]]) -> bool:
+        wanted = tuple(columns)
+        return any(index[:len(wanted)] == wanted for index in existing if index)
+
+    def missing_model_indexes(self) -> List[IndexRecommendation]:
+        """모델에 선언됐지만 DB 에 없는 인덱스 (create_all 은 기존 테이블에 인덱스를 추가하지 않음)"""
+        recommendations = []
+        with self.engine.connect() as conn:
+            inspector = inspect(conn)
+            live_tables = set(inspector.get_table_names())
+            for table in self.metadata.sorted_tables:
+                if table.name not in live_tables:
+                    continue
+                live_names = {index["name"] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in live_names:
+                        continue
+                    recommendations.append(IndexRecommendation(
+                        table=table.name,
+                        columns=[column.name for column in index.columns],
+                        name=index.name,
+                        source="model",
+                        reason="declared in models but missing from database"
+                    ))
+        return recommendations
+
+    # ---- 쿼리 로그 분석 ----
+
+    def explain(self, conn, statement: str, parameters: Any) -> List[str]:
+        prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+        result = conn.exec_driver_sql(prefix + statement, parameters if parameters is not None else ())
+        if self.engine.dialect.name == "sqlite":
+            return [row[-1] for row in result]
+        return [row[0] for row in result]
+
+    def analyze(self, top: int = 20, min_calls: int = 1) -> List[IndexRecommendation]:
+        """쿼리 로그 상위 지문에서 인덱스 후보 도출"""
+        known_tables = list(self.metadata.tables)
+        dialect = self.engine.dialect
+        recommendations: Dict[Tuple[str, Tuple[str, ...]], IndexRecommendation] = {}
+
+        with self.engine.connect() as conn:
+            inspector = inspect(conn)
+            for entry in self.query_log.top(top):
+                statement = entry.get("sample_statement")
+                if not statement or entry["calls"] < min_calls:
+                    continue
+
+                usage = extract_column_usage(statement, known_tables)
+                if not usage:
+                    continue
+
+                # 다른 드라이버(asyncpg 등)로 기록된 문장은 자리표시자 형식이 달라 재실행 불가
+                plan: Optional[List[str]] = None
+                if entry.get("paramstyle") in (None, dialect.paramstyle):
+                    try:
+                        plan = self.explain(conn, statement, entry.get("sample_parameters"))
+                    except Exception as e:
+                        app_logger.debug(f"EXPLAIN failed for {entry['fingerprint'][:80]}: {e}")
+                        conn.rollback()
+
+                for table_name, columns_used in usage.items():
+                    table = self.metadata.tables[table_name]
+                    columns = [column for column in columns_used.index_columns() if column in table.columns]
+                    if not columns:
+                        continue
+                    existing = self._model_index_columns(table_name) + self._live_index_columns(inspector, table_name)
+                    if self._covered(columns, existing):
+                        continue
+
+                    problems = _plan_problems(dialect.name, plan, table_name, bool(columns_used.order_by)) if plan is not None else []
+                    if plan is not None and not problems:
+                        continue
+
+                    key = (table_name, tuple(columns))
+                    recommendation = recommendations.get(key)
+                    if recommendation is None:
+                        recommendation = recommendations[key] = IndexRecommendation(
+                            table=table_name,
+                            columns=columns,
+                            name=index_name(table_name, columns),
+                            source="query_log",
+                            reason="; ".join(problems) if problems else "plan unavailable; uncovered predicate columns",
+                            fingerprint=entry["fingerprint"],
+                            plan=plan or []
+                        )
+                    recommendation.calls += entry["calls"]
+                    recommendation.total_time += entry["total_time"]
+
+        return sorted(recommendations.values(), key=lambda item: item.total_time, reverse=True)
+
+    def recommend(self, top: int = 20) -> List[IndexRecommendation]:
+        return self.missing_model_indexes() + self.analyze(top)
+
+    # ---- 마이그레이션 ----
+
+    def _partitioned(self, table_name: str) -> bool:
+        table = self.metadata.tables.get(table_name)
+        return table is not None and bool(table.dialect_options["postgresql"].get("partition_by"))
+
+    def migration_sql(self, recommendations: List[IndexRecommendation]) -> str:
+        dialect = self.engine.dialect
+        lines = [f"-- index advisor migration ({time.strftime('%Y-%m-%d %H:%M:%S')}, {dialect.name})"]
+        for recommendation in recommendations:
+            lines.append(f"-- {recommendation.source}: {recommendation.reason}")
+            lines.append(index_ddl(dialect, recommendation.table, recommendation.name, recommendation.columns) + ";")
+        return "\n".join(lines) + "\n"
+
+    def write_migration(self, recommendations: List[IndexRecommendation], directory: str = "migrations") -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"index_advisor_{time.strftime('%Y%m%d_%H%M%S')}.sql")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.migration_sql(recommendations))
+        return path
+
+    def apply(self, recommendations: List[IndexRecommendation]) -> List[Dict[str, Any]]:
+        """추천 인덱스 생성 (PostgreSQL 일반 테이블은 쓰기를 막지 않도록 CONCURRENTLY)"""
+        dialect = self.engine.dialect
+        results = []
+        for recommendation in recommendations:
+            concurrently = dialect.name == "postgresql" and not self._partitioned(recommendation.table)
+            ddl = index_ddl(dialect, recommendation.table, recommendation.name, recommendation.columns, concurrently)
+            started = time.perf_counter()
+            try:
+                if concurrently:
+                    # CONCURRENTLY 는 트랜잭션 안에서 실행 불가
+                    with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                        conn.exec_driver_sql(ddl)
+                else:
+                    with self.engine.begin() as conn:
+                        conn.exec_driver_sql(ddl)
+                results.append({
+                    "name": recommendation.name,
+                    "status": "created",
+                    "time_ms": round((time.perf_counter() - started) * 1000, 2)
+                })
+                app_logger.info(f"Index created: {ddl}")
+            except Exception as e:
+                results.append({"name": recommendation.name, "status": "failed", "error": str(e)})
+                app_logger.error(f"Index creation failed ({recommendation.name}): {e}")
+        return results
+
+def main():
+    import argparse
+    from database import engine
+
+    parser = argparse.ArgumentParser(description="모델 기반 인덱스 추천")
+    parser.add_argument("--emit", metavar="DIR", help="마이그레이션 SQL 을 DIR 에 작성")
+    parser.add_argument("--apply", action="store_true", help="추천 인덱스를 바로 생성")
+    args = parser.parse_args()
+
+    # CLI 프로세스에는 쿼리 로그가 없으므로 모델 선언 대비 누락 인덱스만 확인
+    advisor = IndexAdvisor(engine)
+    recommendations = advisor.missing_model_indexes()
+    if not recommendations:
+        print("✅ 누락된 인덱스 없음")
+        return
+
+    for recommendation in recommendations:
+        print(f"  • {index_ddl(engine.dialect, recommendation.table, recommendation.name, recommendation.columns)}")
+    if args.emit:
+        print(f"📝 {advisor.write_migration(recommendations, args.emit)}")
+    if args.apply:
+        for result in advisor.apply(recommendations):
+            print(f"  {result}")
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from naver_datalab_service import NaverDataLabService
 from google_ads_service import GoogleAdsKeywordService, IntegratedKeywordAnalyzer
 from seo_keyword_analyzer import SEOKeywordAnalyzer, SEOKeyword
+from korean_text import keyword_key
 
 @dataclass
 class IntegratedKeywordResult:
@@ -119,7 +120,11 @@ class IntegratedKeywordService:
             f"{item_name} 비교",
             f"인기 {item_name}"
         ]
-        return list(set(seed_keywords))  # 중복 제거
+        # 중복 제거 (대소문자/공백/조사만 다른 표기는 하나로)
+        unique: Dict[str, str] = {}
+        for keyword in seed_keywords:
+            unique.setdefault(keyword_key(keyword), keyword)
+        return list(unique.values())
     
     async def _analyze_with_naver(self, keywords: List[str]) -> Dict[str, Any]:
         """네이버 DataLab 분석"""
@@ -157,36 +162,29 @@ class IntegratedKeywordService:
         """각 서비스 결과를 통합"""
         integrated_results = []
         
-        # 모든 키워드를 수집
-        all_keywords = set(seed_keywords)
+        # 서비스마다 표기가 조금씩 달라도("다이어트 식단" / "다이어트식단은") 같은 키워드로 묶음 - 먼저 나온 표기 사용
+        google_ideas = google_data.get('google_keyword_ideas', [])
+        all_keywords: Dict[str, str] = {}
+        for keyword in [*seed_keywords, *(idea['keyword'] for idea in google_ideas), *(kw.keyword for kw in seo_data)]:
+            all_keywords.setdefault(keyword_key(keyword), keyword)
         
-        # Google 키워드 추가
-        for google_idea in google_data.get('google_keyword_ideas', []):
-            all_keywords.add(google_idea['keyword'])
+        def by_key(items, get_keyword) -> Dict[str, Any]:
+            indexed: Dict[str, Any] = {}
+            for item in items:
+                indexed.setdefault(keyword_key(get_keyword(item)), item)
+            return indexed
         
-        # SEO 키워드 추가
-        for seo_keyword in seo_data:
-            all_keywords.add(seo_keyword.keyword)
+        naver_trends = by_key(naver_data.get('trend_data', {}).items(), lambda item: item[0])
+        naver_competition = by_key(naver_data.get('competition_data', {}).items(), lambda item: item[0])
+        google_by_key = by_key(google_ideas, lambda idea: idea['keyword'])
+        seo_by_key = by_key(seo_data, lambda kw: kw.keyword)
         
         # 각 키워드에 대해 통합 분석 수행
-        for keyword in all_keywords:
-            # 네이버 데이터 찾기
-            naver_info = naver_data.get('trend_data', {}).get(keyword, {})
-            naver_comp = naver_data.get('competition_data', {}).get(keyword, {})
-            
-            # Google 데이터 찾기
-            google_info = None
-            for g_idea in google_data.get('google_keyword_ideas', []):
-                if g_idea['keyword'] == keyword:
-                    google_info = g_idea
-                    break
-            
-            # SEO 데이터 찾기
-            seo_info = None
-            for seo_kw in seo_data:
-                if seo_kw.keyword == keyword:
-                    seo_info = seo_kw
-                    break
+        for key, keyword in all_keywords.items():
+            naver_info = naver_trends.get(key, (None, {}))[1]
+            naver_comp = naver_competition.get(key, (None, {}))[1]
+            google_info = google_by_key.get(key)
+            seo_info = seo_by_key.get(key)
             
             # 통합 결과 생성
             integrated_result = self._create_integrated_result(keyword, naver_info, naver_comp, google_info, seo_info)
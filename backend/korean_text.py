@@ -0,0 +1,203 @@
+"""
+한국어 키워드 분석
+외부 형태소 분석기 없이 어절 토큰화 + 조사 떼기로 키워드 출현을 셈 ("다이어트는", "다이어트를" 도 "다이어트")
+- 정규화: NFKC(전각/호환 문자) + 소문자 + 공백 정리
+- 조사 떼기: 어절 끝의 조사(긴 것부터)를 떼되 어간이 MIN_STEM_LENGTH 글자 이상 남을 때만 ("평가" 의 "가" 는 그대로)
+- 어절이 키워드(마지막 어절은 어간)로 시작하면 일치 - 합성어("다이어트식단")도 "다이어트" 로 셈
+- 여러 어절 키워드: 연속 어절의 어간이 같거나(마지막 어절은 접두 일치), 붙여 쓴 한 어절("다이어트식단")이면 일치
+- 분석 결과는 (본문 해시, 키워드) 로 LRU 메모 - 같은 본문을 여러 점수기가 다시 읽지 않음
+"""
+
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_SIZE = int(os.getenv("KEYWORD_ANALYSIS_CACHE_SIZE", 2048))
+MIN_STEM_LENGTH = 2
+
+# 어절 끝에 붙는 조사 (복합 조사 포함) - 긴 것부터 떼어봄
+PARTICLES = tuple(sorted({
+    "은", "는", "이", "가", "을", "를", "의", "에", "도", "만", "과", "와", "로", "나", "랑",
+    "으로", "에서", "에게", "한테", "께서", "까지", "부터", "보다", "처럼", "만큼", "마다", "조차",
+    "밖에", "이나", "이랑", "하고", "이며", "라도", "이라도", "에는", "에도", "에서는", "에서도",
+    "으로는", "로는", "으로도", "로도", "에게는", "까지는", "부터는", "만은", "만의", "과의", "와의",
+    "에서의", "으로의", "로의", "이란", "란", "이라는", "라는", "이다", "입니다", "이에요", "예요",
+    "들", "들은", "들이", "들을", "들의", "들도", "들에게",
+}, key=len, reverse=True))
+
+_WORD = re.compile(r"[^\W_]+")
+_SPACES = re.compile(r"\s+")
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+def normalize(text: str) -> str:
+    """NFKC + 소문자 + 연속 공백 하나로"""
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text or "").lower()).strip()
+
+def strip_particle(word: str) -> str:
+    """어절에서 조사를 뗀 어간 (한글로 끝나는 어절만, 어간이 너무 짧아지면 그대로)"""
+    if len(word) <= MIN_STEM_LENGTH or not _is_hangul(word[-1]):
+        return word
+    for particle in PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= MIN_STEM_LENGTH:
+            return word[:-len(particle)]
+    return word
+
+@dataclass(frozen=True)
+class Token:
+    text: str      # 정규화된 어절
+    stem: str      # 조사를 뗀 어간
+    start: int     # 원문에서의 시작 위치
+
+def tokenize(text: str, start: int = 0, end: Optional[int] = None) -> List[Token]:
+    """원문[start:end] → 어절 토큰 (위치는 원문 기준)"""
+    text = text or ""
+    tokens = []
+    for match in _WORD.finditer(text, start, len(text) if end is None else end):
+        word = unicodedata.normalize("NFKC", match.group()).lower()
+        tokens.append(Token(word, strip_particle(word), match.start()))
+    return tokens
+
+def keyword_stems(keyword: str) -> Tuple[str, ...]:
+    """키워드의 어절별 어간 ("다이어트를 위한" → ("다이어트", "위한"))"""
+    return tuple(token.stem for token in tokenize(normalize(keyword)))
+
+def keyword_key(keyword: str) -> str:
+    """같은 키워드로 볼 표기를 하나로 모은 키 (대소문자/전각/공백/조사 차이 무시)"""
+    return " ".join(keyword_stems(keyword))
+
+@dataclass
+class KeywordAnalysis:
+    """본문 한 개에 대한 키워드 출현 분석"""
+    keyword: str
+    count: int = 0
+    words: int = 0
+    letters: int = 0                  # 어절 글자 수 (공백/기호 제외)
+    density: float = 0.0              # 키워드 글자 비율 (%)
+    first_position: int = -1          # 원문에서 첫 출현 위치 (없으면 -1)
+    variants: Dict[str, int] = field(default_factory=dict)   # 실제 쓰인 표기별 횟수
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def _analyze(tokens: List[Token], keyword: str) -> KeywordAnalysis:
+    stems = keyword_stems(keyword)
+    letters = sum(len(token.text) for token in tokens)
+    analysis = KeywordAnalysis(keyword=keyword, words=len(tokens), letters=letters)
+    if not stems:
+        return analysis
+    size = len(stems)
+    head, last = stems[:-1], stems[-1]
+    joined = "".join(stems)
+    variants: Counter = Counter()
+    i = 0
+    while i < len(tokens):
+        window = tokens[i:i + size]
+        if (len(window) == size and window[-1].text.startswith(last)
+                and tuple(token.stem for token in window[:-1]) == head):
+            matched = size
+        elif size > 1 and tokens[i].text.startswith(joined):
+            matched = 1
+        else:
+            i += 1
+            continue
+        if analysis.first_position < 0:
+            analysis.first_position = tokens[i].start
+        variants[" ".join(token.text for token in tokens[i:i + matched])] += 1
+        analysis.count += 1
+        i += matched
+    analysis.variants = dict(variants.most_common())
+    if letters:
+        analysis.density = round(analysis.count * len(joined) / letters * 100, 3)
+    return analysis
+
+class KeywordAnalyzer:
+    """본문 해시 기준 LRU 메모 분석기 (스레드 안전)
+
+    토큰 목록(본문 해시별)과 분석 결과(본문 해시 + 키워드별)를 따로 메모해
+    같은 본문에 키워드만 바꿔 물어도 토큰화는 한 번만 함.
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE):
+        self.max_size = max_size
+        self._tokens: "OrderedDict[bytes, List[Token]]" = OrderedDict()
+        self._results: "OrderedDict[Tuple[bytes, str], KeywordAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _get(self, cache: OrderedDict, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _put(self, cache: OrderedDict, key, value):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_size:
+                cache.popitem(last=False)
+
+    def tokens(self, text: str) -> List[Token]:
+        return self._tokens_for(text or "", self._digest(text or ""))
+
+    def _tokens_for(self, text: str, digest: bytes) -> List[Token]:
+        cached = self._get(self._tokens, digest)
+        if cached is None:
+            cached = tokenize(text)
+            self._put(self._tokens, digest, cached)
+        return cached
+
+    def analyze(self, text: str, keyword: str) -> KeywordAnalysis:
+        """본문의 키워드 횟수/밀도/첫 위치 (메모된 결과는 공유되므로 수정하지 말 것)"""
+        text = text or ""
+        digest = self._digest(text)
+        key = (digest, normalize(keyword))
+        cached = self._get(self._results, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        analysis = _analyze(self._tokens_for(text, digest), key[1])
+        self._put(self._results, key, analysis)
+        return analysis
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "cached_texts": len(self._tokens),
+                "cached_results": len(self._results),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+# 전역 키워드 분석기
+keyword_analyzer = KeywordAnalyzer()
+
+def analyze_keyword(text: str, keyword: Optional[str]) -> KeywordAnalysis:
+    return keyword_analyzer.analyze(text, keyword or "")
+
+def analyze_tokens(tokens: List[Token], keyword: Optional[str]) -> KeywordAnalysis:
+    """이미 만든 어절 토큰으로 분석 (본문을 다른 목적으로 순회하며 토큰을 모은 호출자용, 메모하지 않음)"""
+    return _analyze(tokens, normalize(keyword or ""))
@@ -121,6 +121,22 @@ class AIServiceLogger:
             tokens_used=tokens_used,
             cost=cost
         )
+    
+    def info(self, message: str, **kwargs):
+        """정보 로그"""
+        self.logger.info(message, **kwargs)
+    
+    def warning(self, message: str, **kwargs):
+        """경고 로그"""
+        self.logger.warning(message, **kwargs)
+    
+    def error(self, message: str, error: Optional[Exception] = None, **kwargs):
+        """에러 로그"""
+        self.logger.error(message, error=error, **kwargs)
+    
+    def debug(self, message: str, **kwargs):
+        """디버그 로그"""
+        self.logger.debug(message, **kwargs)
 
 # 글로벌 로거 인스턴스
 app_logger = StructuredLogger()
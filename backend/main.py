@@ -1,8 +1,11 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError
 from typing import List, Optional
@@ -10,6 +13,7 @@ import uvicorn
 from datetime import timedelta, datetime
 from contextlib import asynccontextmanager
 import time
+import asyncio
 
 # 새로운 로깅 및 에러 핸들링 시스템
 from logger import app_logger, api_logger, ai_logger
@@ -21,19 +25,21 @@ from error_handlers import (
     general_exception_handler, safe_execute, safe_execute_async
 )
 
-from database import get_db, engine
+from database import get_db, get_async_db, engine, async_engine, read_async_engine, SessionLocal, AsyncSessionLocal, IS_POSTGRES
 from models import (
     Base, User, Country, Keyword, GeneratedTitle, GeneratedContent,
     Site, AutomationSession, GeneratedKeywordBatch, GeneratedTitleBatch, PostingResult
 )
 from auth import (
     authenticate_user, 
+    get_user_by_email,
     create_access_token,
     create_refresh_token,
     get_password_hash, 
     get_current_user,
     get_current_active_user,
     get_current_admin_user,
+    get_optional_current_user,
     verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
@@ -65,10 +71,31 @@ from prompt_manager import PromptManager
 from batch_processor import batch_processor, BatchTask, TaskType, TaskStatus
 from site_manager import site_manager
 from automation_engine import automation_engine
+from progress_broker import progress_broker, task_topic, session_topic, user_topic, parse_last_event_id, ActiveCheck
+from performance_optimizer import write_behind_batcher, db_optimizer
+from index_advisor import IndexAdvisor
+from query_profiler import query_profiler
+from db_writer import single_writer
+from postgres_profile import partition_maintainer
+from activity_rollup import batcher_flush_hook, record_activity, get_activity_totals
+from history_queries import fetch_history_page
+from content_blobs import content_columns_async, ensure_body_columns
+from archive_store import run_archive, get_archive_stats, ARCHIVE_HORIZON_DAYS
+from read_replica import get_read_db, read_router
+from content_search import content_search, generated_document, reindex_all, SOURCE_GENERATED
+from title_similarity import title_index, apply_duplicate_rates
+from title_lexicon import title_lexicon
+from generation_seed import generation_cache, is_deterministic
+from related_content import related_index, rebuild as rebuild_related_content
+from seo_scoring import score_documents, NUMPY_AVAILABLE
+from body_fingerprints import body_index, rescan as rescan_body_duplicates, SOURCE_GENERATED as FINGERPRINT_SOURCE_GENERATED
 import uuid
+import json
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# 기존 DB 의 generated_content 에 본문 blob 참조 컬럼 추가
+ensure_body_columns(engine)
 
 # Initialize default countries
 def init_countries(db: Session):
@@ -96,10 +123,40 @@ def init_countries(db: Session):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # 요청 경로(비동기)와 백그라운드(동기) 엔진의 쿼리를 지문별로 수집 - 인덱스 추천 입력
+    db_optimizer.attach_engine(engine)
+    db_optimizer.attach_engine(async_engine)
+    if read_async_engine is not None:
+        db_optimizer.attach_engine(read_async_engine)
+    # 복제 지연 측정 시작 (지연이 크면 읽기 세션을 주 DB 로 대체)
+    read_router.start()
     db = next(get_db())
     init_countries(db)
+    if IS_POSTGRES:
+        # generated_content / posting_results 다가올 달의 파티션 미리 생성 (이후 주기적으로 다시 확인)
+        await partition_maintainer.run_once(engine)
+        partition_maintainer.start(engine)
+    # 워커 재시작으로 중단된 배치 작업 복원 (체크포인트에서 재개 가능)
+    batch_processor.restore_interrupted_tasks()
+    # 유휴 상태에서도 보존 기간이 지난 배치 작업 정리
+    batch_processor.start()
+    # 배처로 기록되는 키워드/제목/콘텐츠를 같은 트랜잭션에서 일별 집계에 반영
+    write_behind_batcher.add_flush_hook(batcher_flush_hook)
+    # 기존 생성/발행 제목으로 중복률 색인 채우기 (백그라운드 - 적재 중에도 요청 처리)
+    title_index_load = asyncio.create_task(asyncio.to_thread(title_index.load_from_db, SessionLocal))
+    # 지침 저장소의 제목 어휘 덮어쓰기 주기적 반영
+    title_lexicon.start(AsyncSessionLocal)
     yield
-    # Shutdown (cleanup if needed)
+    # Shutdown - 쓰기 지연 버퍼에 남은 행 기록 후 단일 쓰기 스레드 종료
+    await write_behind_batcher.close()
+    await read_router.stop()
+    await title_lexicon.stop()
+    await partition_maintainer.stop()
+    await batch_processor.stop()
+    if not title_index_load.done():
+        title_index_load.cancel()
+    if single_writer is not None:
+        await asyncio.to_thread(single_writer.close)
 
 app = FastAPI(title="Blog Auto Process API", version="2.0.0", lifespan=lifespan)
 
@@ -137,6 +194,9 @@ async def log_requests(request: Request, call_next):
     
     return response
 
+# 요청별 쿼리 프로파일링 (라우트/사용자 태그, N+1 감지)
+app.middleware("http")(query_profiler.middleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -150,6 +210,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 이력 목록 다음 페이지 커서
 )
 
 # 정적 파일 서빙
@@ -169,12 +230,12 @@ async def api_health_check():
 
 # Authentication endpoints
 @app.post("/api/auth/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user.email) | (User.username == user.username)
-    ).first()
+    existing_user = (await db.execute(
+        select(User.id).where((User.email == user.email) | (User.username == user.username))
+    )).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -189,14 +250,14 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         password_hash=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @app.post("/api/auth/login", response_model=Token)
-async def login(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login and get access token."""
-    user = authenticate_user(db, user_login.email, user_login.password)
+    user = await authenticate_user(db, user_login.email, user_login.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -215,7 +276,7 @@ async def login(user_login: UserLogin, db: Session = Depends(get_db)):
     }
 
 @app.post("/api/auth/refresh", response_model=Token)
-async def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token."""
     try:
         payload = verify_token(request.refresh_token)
@@ -226,7 +287,7 @@ async def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_
             )
         
         email = payload.get("sub")
-        user = db.query(User).filter(User.email == email).first()
+        user = await get_user_by_email(db, email)
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -256,19 +317,20 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 @app.get("/api/dashboard/stats", response_model=DashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics (테스트용 - 인증 비활성화)."""
+async def get_dashboard_stats(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get dashboard statistics for the current user."""
     try:
-        # Return demo stats for testing
-        keywords_count = 25
-        titles_count = 150  
-        content_count = 42
+        # 일별 집계 테이블의 합계만 읽음 (이력 테이블 스캔 없음)
+        totals = await get_activity_totals(db, user_id=current_user.id)
         
         return DashboardStats(
-            keywords_analyzed=keywords_count,
-            titles_generated=titles_count,
-            content_generated=content_count,
-            posts_published=0  # Will implement when we add posting functionality
+            keywords_analyzed=totals["keywords_count"],
+            titles_generated=totals["titles_count"],
+            content_generated=totals["contents_count"],
+            posts_published=totals["posts_published_count"]
         )
     except Exception as e:
         print(f"Error in dashboard stats: {e}")
@@ -279,84 +341,213 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
             posts_published=0
         )
 
+async def _history_page(db: AsyncSession, response: Response, model, user_id, fields, cursor, limit, archived=False) -> list:
+    """이력 목록 한 페이지 - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달 (본문은 기존 목록 형식 유지)
+    
+    archived=true 이면 보관 계층으로 옮겨진 오래된 항목까지 이어서 조회.
+    """
+    try:
+        items, next_cursor = await fetch_history_page(
+            db, model, user_id, fields=fields, cursor=cursor, limit=limit, include_archived=archived
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
 @app.get("/api/history/keywords")
-async def get_keyword_history(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Get user's keyword analysis history."""
+async def get_keyword_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    fields: Optional[str] = None,
+    archived: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get user's keyword analysis history (keyset pagination, ?fields= projection)."""
     try:
-        keywords = db.query(Keyword).filter(
-            Keyword.created_by == current_user.id
-        ).order_by(Keyword.created_at.desc()).limit(50).all()
-        
-        return [
-            {
-                "id": k.id,
-                "keyword": k.keyword,
-                "search_volume": k.search_volume,
-                "competition": k.competition,
-                "cpc": float(k.cpc) if k.cpc else 0.0,
-                "opportunity_score": k.opportunity_score,
-                "created_at": k.created_at.isoformat() if k.created_at else None
-            }
-            for k in keywords
-        ]
+        return await _history_page(db, response, Keyword, current_user.id, fields, cursor, limit, archived)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in keyword history: {e}")
         return []
 
 @app.get("/api/history/titles")
-async def get_title_history(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Get user's title generation history."""
-    titles = db.query(GeneratedTitle).filter(
-        GeneratedTitle.created_by == current_user.id
-    ).order_by(GeneratedTitle.created_at.desc()).limit(50).all()
-    
-    return [
-        {
-            "id": t.id,
-            "title": t.title,
-            "keyword_id": t.keyword_id,
-            "length_option": t.length_option,
-            "language": t.language,
-            "tone": t.tone,
-            "duplicate_rate": float(t.duplicate_rate) if t.duplicate_rate else 0.0,
-            "ai_model": t.ai_model,
-            "created_at": t.created_at.isoformat()
-        }
-        for t in titles
-    ]
+async def get_title_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    fields: Optional[str] = None,
+    archived: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get user's title generation history (keyset pagination, ?fields= projection)."""
+    return await _history_page(db, response, GeneratedTitle, current_user.id, fields, cursor, limit, archived)
 
 @app.get("/api/history/content")
-async def get_content_history(current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    """Get user's content generation history."""
-    contents = db.query(GeneratedContent).filter(
-        GeneratedContent.created_by == current_user.id
-    ).order_by(GeneratedContent.created_at.desc()).limit(20).all()
+async def get_content_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    fields: Optional[str] = None,
+    archived: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get user's content generation history.
     
-    return [
-        {
-            "id": c.id,
-            "title_id": c.title_id,
-            "content": c.content[:500] + "..." if len(c.content) > 500 else c.content,  # Truncate for list view
-            "keywords": c.keywords,
-            "seo_score": c.seo_score,
-            "geo_score": c.geo_score,
-            "copyscape_result": c.copyscape_result,
-            "ai_model": c.ai_model,
-            "created_at": c.created_at.isoformat()
+    목록에는 저장된 요약(excerpt)만 읽고 본문 컬럼은 조회하지 않음.
+    """
+    return await _history_page(db, response, GeneratedContent, current_user.id, fields, cursor, limit, archived)
+
+@app.get("/api/content/search")
+async def search_generated_content(
+    q: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    current_user: User = Depends(get_current_active_user)
+):
+    """내 생성 콘텐츠 전문 검색 (제목/키워드/본문, 관련도 순, 끝에 * 를 붙이면 접두어 검색)"""
+    results = await asyncio.to_thread(
+        content_search.search, q, SOURCE_GENERATED,
+        owner=current_user.id, date_from=date_from, date_to=date_to, limit=min(limit, 100), offset=offset
+    )
+    return {"success": True, "data": results}
+
+@app.post("/api/content/duplicate-check")
+async def check_content_duplication(
+    request: dict,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """본문 중복 검사 - 기존 생성/발행 글 전체와의 겹침 비율, 겹치는 문서 목록은 내 글 / 내 사이트 글만"""
+    content = request.get("content")
+    if not content:
+        raise HTTPException(
+            status_code=400,
+            detail="content is required"
+        )
+    site_ids = (await db.execute(select(Site.id).where(Site.created_by == current_user.id))).scalars().all()
+    result = await asyncio.to_thread(body_index.check_visible, content, current_user.id, site_ids)
+    return {"success": True, "data": result}
+
+@app.post("/api/seo/score")
+async def score_seo_documents(
+    request: dict,
+    current_user: User = Depends(get_current_active_user)
+):
+    """문서 배치 SEO / 가독성 / GEO 점수
+
+    documents: [{"content", "keyword", "title", "meta_description", "language"}], include_features 로 특징값 포함
+    """
+    documents = request.get("documents") or []
+    if not documents or len(documents) > 500:
+        raise HTTPException(
+            status_code=400,
+            detail="documents must contain 1-500 items"
+        )
+    started = time.perf_counter()
+    results = await asyncio.to_thread(score_documents, documents, bool(request.get("include_features")))
+    return {
+        "success": True,
+        "data": {
+            "results": results,
+            "count": len(results),
+            "vectorized": NUMPY_AVAILABLE,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
         }
-        for c in contents
-    ]
+    }
+
+@app.post("/api/titles/score")
+async def score_candidate_titles(
+    request: dict,
+    current_user: User = Depends(get_current_active_user)
+):
+    """후보 제목 일괄 CTR / SEO / 참여도 점수
+
+    titles: [제목, ...] (최대 5000), keyword, category, platform, include_matches 로 일치 어휘 포함
+    """
+    titles = request.get("titles") or []
+    keyword = request.get("keyword", "")
+    if not titles or len(titles) > 5000:
+        raise HTTPException(
+            status_code=400,
+            detail="titles must contain 1-5000 items"
+        )
+    started = time.perf_counter()
+    service = OptimizedTitleService()
+    results = await asyncio.to_thread(
+        service.score_titles,
+        [str(title) for title in titles],
+        keyword,
+        request.get("category", "general"),
+        request.get("platform", "wordpress")
+    )
+    if request.get("include_matches"):
+        for item, matches in zip(results, title_lexicon.scan_batch(item["title"] for item in results)):
+            item["matches"] = matches.to_dict("optimized.")
+    return {
+        "success": True,
+        "data": {
+            "results": results,
+            "count": len(results),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
+
+@app.post("/api/content/related")
+async def get_related_content(
+    request: dict,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """초안과 가까운 발행 글 / 저장 콘텐츠 (내부 링크 추천)
+
+    content, title, site_id (내 사이트만, 없으면 사이트 없는 저장 콘텐츠 범위), limit (최대 20), links_only
+    """
+    content = request.get("content") or ""
+    title = request.get("title") or ""
+    if not content.strip() and not title.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="content or title is required"
+        )
+    if request.get("site_id") and not await site_manager.get_site_by_id(db, request["site_id"], current_user.id):
+        raise HTTPException(
+            status_code=404,
+            detail="사이트를 찾을 수 없습니다"
+        )
+    started = time.perf_counter()
+    results = await asyncio.to_thread(
+        related_index.related, content, title, request.get("site_id"),
+        min(int(request.get("limit", 5)), 20), None, bool(request.get("links_only"))
+    )
+    return {
+        "success": True,
+        "data": {
+            "results": results,
+            "count": len(results),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
 
 @app.get("/api/seo/dashboard")
 async def get_seo_dashboard(
     days: int = 30,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """SEO 분석 대시보드 데이터"""
     try:
         seo_analytics = SEOAnalytics(db)
-        dashboard_data = seo_analytics.get_comprehensive_dashboard(
+        dashboard_data = await seo_analytics.get_comprehensive_dashboard(
             user_id=current_user.id,
             days=days
         )
@@ -384,12 +575,12 @@ async def get_seo_dashboard(
 async def get_keyword_performance(
     days: int = 30,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """키워드 성과 분석"""
     try:
         seo_analytics = SEOAnalytics(db)
-        performance_data = seo_analytics.get_keyword_performance(
+        performance_data = await seo_analytics.get_keyword_performance(
             user_id=current_user.id,
             days=days
         )
@@ -411,12 +602,12 @@ async def get_keyword_performance(
 async def get_content_analytics(
     days: int = 30,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """콘텐츠 분석 데이터"""
     try:
         seo_analytics = SEOAnalytics(db)
-        analytics_data = seo_analytics.get_content_analytics(
+        analytics_data = await seo_analytics.get_content_analytics(
             user_id=current_user.id,
             days=days
         )
@@ -438,12 +629,12 @@ async def get_content_analytics(
 async def get_productivity_metrics(
     days: int = 30,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """생산성 지표"""
     try:
         seo_analytics = SEOAnalytics(db)
-        productivity_data = seo_analytics.get_productivity_metrics(
+        productivity_data = await seo_analytics.get_productivity_metrics(
             user_id=current_user.id,
             days=days
         )
@@ -538,7 +729,9 @@ async def get_batch_task_status(
         "started_at": task.started_at.isoformat() if task.started_at else None,
         "completed_at": task.completed_at.isoformat() if task.completed_at else None,
         "error_message": task.error_message,
-        "result": task.result
+        "failed_items": task.failed_items,
+        "resumed_count": task.resumed_count,
+        "result": batch_processor.get_task_result(task)
     }
 
 @app.get("/api/batch/tasks")
@@ -562,6 +755,81 @@ async def get_user_batch_tasks(
         for task in sorted(tasks, key=lambda x: x.created_at, reverse=True)
     ]
 
+def _event_stream_response(
+    topic: str,
+    last_event_id: int,
+    stop_on_terminal: bool = False,
+    snapshot: Optional[dict] = None,
+    is_active: Optional[ActiveCheck] = None
+) -> StreamingResponse:
+    """진행률 SSE 응답 생성 (최초 연결 시 현재 상태 스냅샷 선행)"""
+    async def event_generator():
+        if snapshot is not None and last_event_id == 0:
+            yield f"event: snapshot\ndata: {json.dumps(snapshot, ensure_ascii=False, default=str)}\n\n"
+        async for frame in progress_broker.sse_stream(topic, last_event_id, stop_on_terminal, is_active):
+            yield frame
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@app.get("/api/batch/stream/{task_id}")
+async def stream_batch_task_progress(
+    task_id: str,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """배치 작업 진행률 스트림 (SSE) - 상태 폴링 대체"""
+    task = batch_processor.get_task_status(task_id)
+    
+    if not task:
+        raise HTTPException(
+            status_code=404,
+            detail="Task not found"
+        )
+    
+    if task.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this task"
+        )
+    
+    def task_running() -> bool:
+        # 종료되었거나 보존 정책으로 제거된 작업은 종료 이벤트가 다시 오지 않으므로 스트림 종료
+        current = batch_processor.get_task_status(task_id)
+        return current is not None and current.status in (TaskStatus.PENDING, TaskStatus.RUNNING)
+    
+    return _event_stream_response(
+        task_topic(task_id),
+        parse_last_event_id(last_event_id_header or last_event_id),
+        stop_on_terminal=True,
+        snapshot={
+            "task_id": task.id,
+            "task_type": task.task_type.value,
+            "status": task.status.value,
+            "progress": task.progress
+        },
+        is_active=task_running
+    )
+
+@app.get("/api/batch/events")
+async def stream_user_batch_events(
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """사용자 단위 진행률 스트림 (SSE) - 배치 작업과 자동화 세션 이벤트 통합"""
+    return _event_stream_response(
+        user_topic(current_user.id),
+        parse_last_event_id(last_event_id_header or last_event_id)
+    )
+
 @app.delete("/api/batch/cancel/{task_id}")
 async def cancel_batch_task(
     task_id: str,
@@ -598,6 +866,49 @@ async def cancel_batch_task(
             detail="Failed to cancel task"
         )
 
+@app.post("/api/batch/resume/{task_id}")
+async def resume_batch_task(
+    task_id: str,
+    resume_data: Optional[dict] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """실패/취소된 배치 작업 재개 - 완료 항목은 체크포인트에서 재사용, item_keys 지정 시 해당 항목만 재시도"""
+    task = batch_processor.get_task_status(task_id)
+    
+    if not task:
+        raise HTTPException(
+            status_code=404,
+            detail="Task not found"
+        )
+    
+    if task.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied to this task"
+        )
+    
+    if task.status not in [TaskStatus.FAILED, TaskStatus.CANCELLED]:
+        raise HTTPException(
+            status_code=400,
+            detail="Only failed or cancelled tasks can be resumed"
+        )
+    
+    item_keys = (resume_data or {}).get("item_keys")
+    success = await batch_processor.resume_task(task_id, item_keys)
+    
+    if not success:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to resume task"
+        )
+    
+    return {
+        "task_id": task_id,
+        "status": task.status.value,
+        "retry_items": item_keys or list(task.failed_items),
+        "message": "Task has been resumed from its last checkpoint"
+    }
+
 @app.post("/api/batch/workflow")
 async def submit_batch_workflow(
     workflow_data: dict,
@@ -656,7 +967,7 @@ async def submit_batch_workflow(
 async def integrated_keyword_analysis(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """통합 키워드 분석 API - 네이버 + Google + SEO 통합 분석"""
     item_name = request.get("item_name")
@@ -747,7 +1058,7 @@ async def integrated_keyword_analysis(
 async def analyze_seo_keywords(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """SEO 키워드 분석 API - 최신 트렌드, 검색량, 경쟁도 분석"""
     item_name = request.get("item_name")
@@ -819,12 +1130,13 @@ async def analyze_seo_keywords(
 async def generate_golden_keywords(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """황금 키워드 생성 API - 수익성, 창의성, 유입량을 고려한 최적의 키워드"""
     category = request.get("category")
     domain = request.get("domain", "")
     platform = request.get("platform", "wordpress")
+    variation = request.get("variation")  # 주면 같은 요청에 같은 결과 (캐시), 번호마다 다른 변형
     
     app_logger.info(
         f"Starting golden keyword generation",
@@ -840,10 +1152,16 @@ async def generate_golden_keywords(
         
         # 카테고리별 최적화된 키워드 생성
         golden_data = await safe_execute_async(
-            golden_keyword_service.generate_golden_keywords,
-            category=category,
-            domain=domain,
-            platform=platform,
+            generation_cache.get_or_generate,
+            "golden_keywords",
+            (category, domain, platform),
+            variation,
+            lambda: golden_keyword_service.generate_golden_keywords(
+                category=category,
+                domain=domain,
+                platform=platform,
+                variation=variation
+            ),
             fallback_value={
                 "golden_keywords": [],
                 "trending_keywords": [],
@@ -879,8 +1197,7 @@ async def generate_golden_keywords(
 
 @app.post("/api/keywords/analyze", response_model=List[KeywordAnalysisResponse])
 async def analyze_keywords(
-    request: KeywordAnalysisRequest, 
-    db: Session = Depends(get_db)
+    request: KeywordAnalysisRequest
 ):
     """키워드 분석 API (테스트용 - 인증 비활성화)"""
     app_logger.info(
@@ -918,32 +1235,32 @@ async def analyze_keywords(
         
         # Save to database with user association
         try:
-            for item in keywords_data:
-                keyword_record = Keyword(
-                    keyword=item["keyword"],
-                    country_id=1,  # Default to first country (KR)
-                    search_volume=item["search_volume"],
-                    competition=item["competition"],
-                    cpc=item["cpc"],
-                    opportunity_score=item["opportunity_score"],
-                    created_by=1  # Demo user ID
-                )
-                db.add(keyword_record)
-            db.commit()
+            # 응답은 저장 완료를 기다리지 않음 - 동시 요청의 키워드와 묶어 일괄 INSERT
+            await write_behind_batcher.enqueue(Keyword, [
+                {
+                    "keyword": item["keyword"],
+                    "country_id": 1,  # Default to first country (KR)
+                    "search_volume": item["search_volume"],
+                    "competition": item["competition"],
+                    "cpc": item["cpc"],
+                    "opportunity_score": item["opportunity_score"],
+                    "created_by": 1  # Demo user ID
+                }
+                for item in keywords_data
+            ])
             
             app_logger.info(
                 f"Keyword analysis completed successfully",
-                user_id=current_user.id,
+                user_id="demo",
                 keyword=request.keyword,
                 results_count=len(keywords_data)
             )
             
         except SQLAlchemyError as e:
-            db.rollback()
             app_logger.error(
                 f"Database error saving keywords",
                 error=e,
-                user_id=current_user.id,
+                user_id="demo",
                 keyword=request.keyword
             )
             # Continue with response even if save fails
@@ -978,18 +1295,18 @@ async def analyze_keywords(
         ]
         
         # Save fallback data to database
-        for item in fallback_data[:request.max_results]:
-            keyword_record = Keyword(
-                keyword=item["keyword"],
-                country_id=1,
-                search_volume=item["search_volume"],
-                competition=item["competition"],
-                cpc=item["cpc"],
-                opportunity_score=item["opportunity_score"],
-                created_by=1  # Demo user ID
-            )
-            db.add(keyword_record)
-        db.commit()
+        await write_behind_batcher.enqueue(Keyword, [
+            {
+                "keyword": item["keyword"],
+                "country_id": 1,
+                "search_volume": item["search_volume"],
+                "competition": item["competition"],
+                "cpc": item["cpc"],
+                "opportunity_score": item["opportunity_score"],
+                "created_by": 1  # Demo user ID
+            }
+            for item in fallback_data[:request.max_results]
+        ])
         
         fallback_results = [
             KeywordAnalysisResponse(
@@ -1004,15 +1321,46 @@ async def analyze_keywords(
         
         return fallback_results
 
+async def _save_generated_titles(db: AsyncSession, keyword: str, owner_id, title_rows: List[dict]):
+    """키워드 조회/생성 후 제목들을 쓰기 지연 배처로 일괄 저장 (커밋 완료 후 반환)"""
+    keyword_record = (await db.execute(
+        select(Keyword.id).where(
+            Keyword.keyword == keyword,
+            Keyword.created_by == owner_id
+        )
+    )).first()
+    
+    if keyword_record:
+        keyword_id = keyword_record.id
+    else:
+        # 키 선발급으로 같은 플러시 안에서 키워드 → 제목 순서로 기록
+        keyword_id = (await write_behind_batcher.enqueue(Keyword, [{
+            "keyword": keyword,
+            "country_id": 1,
+            "search_volume": 0,
+            "competition": "Unknown",
+            "cpc": 0.0,
+            "opportunity_score": 50,
+            "created_by": owner_id
+        }]))[0]
+    
+    await write_behind_batcher.enqueue(
+        GeneratedTitle,
+        [{**row, "keyword_id": keyword_id, "created_by": owner_id} for row in title_rows],
+        durable=True
+    )
+    title_index.add_many(row["title"] for row in title_rows)
+
 @app.post("/api/titles/advanced-generate")
 async def generate_advanced_titles(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """고급 블로그 제목 생성 API - 시의성, SEO, 바이럴성 최적화"""
     keyword = request.get("keyword")
     count = request.get("count", 5)
+    variation = request.get("variation")  # 주면 같은 요청에 같은 제목 (캐시), 번호마다 다른 변형
     
     if not keyword:
         raise HTTPException(
@@ -1030,7 +1378,11 @@ async def generate_advanced_titles(
     try:
         # 고급 제목 생성기 사용
         advanced_generator = AdvancedTitleGenerator()
-        titles_data = await advanced_generator.generate_optimized_titles(keyword, count)
+        titles_data = await generation_cache.get_or_generate(
+            "advanced_titles", (keyword, count), variation,
+            lambda: advanced_generator.generate_optimized_titles(keyword, count, variation)
+        )
+        apply_duplicate_rates(titles_data)
         
         # 응답 데이터 구성
         response_data = {
@@ -1050,6 +1402,7 @@ async def generate_advanced_titles(
                             "total_score": item["total_score"]
                         },
                         "length": item["length"],
+                        "duplicate_rate": item["duplicate_rate"],
                         "reason": item["reason"]
                     }
                     for item in titles_data
@@ -1064,39 +1417,17 @@ async def generate_advanced_titles(
         }
         
         # 데이터베이스에 저장
-        keyword_record = db.query(Keyword).filter(
-            Keyword.keyword == keyword,
-            Keyword.created_by == current_user.id
-        ).first()
-        
-        if not keyword_record:
-            keyword_record = Keyword(
-                keyword=keyword,
-                country_id=1,
-                search_volume=0,
-                competition="Unknown",
-                cpc=0.0,
-                opportunity_score=50,
-                created_by=1  # Demo user ID
-            )
-            db.add(keyword_record)
-            db.commit()
-            db.refresh(keyword_record)
-        
-        # 생성된 제목들 저장
-        for item in titles_data:
-            title_record = GeneratedTitle(
-                keyword_id=keyword_record.id,
-                title=item["title"],
-                length_option="advanced",
-                language="ko",
-                tone=item["format_type"],
-                duplicate_rate=100 - item["total_score"],  # 점수가 높을수록 중복률 낮음
-                ai_model="advanced_generator",
-                created_by=1  # Demo user ID
-            )
-            db.add(title_record)
-        db.commit()
+        await _save_generated_titles(db, keyword, current_user.id, [
+            {
+                "title": item["title"],
+                "length_option": "advanced",
+                "language": "ko",
+                "tone": item["format_type"],
+                "duplicate_rate": item["duplicate_rate"],
+                "ai_model": "advanced_generator"
+            }
+            for item in titles_data
+        ])
         
         app_logger.info(
             f"Advanced title generation completed",
@@ -1123,9 +1454,11 @@ async def generate_advanced_titles(
 @app.post("/api/titles/generate", response_model=List[TitleGenerationResponse])
 async def generate_titles(
     request: TitleGenerationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
 ):
-    """최적화된 제목 생성 API (테스트용 - 인증 비활성화)"""
+    """최적화된 제목 생성 API (테스트용 - 인증 비활성화, 토큰이 있으면 그 사용자 소유로 저장)"""
+    owner_id = current_user.id if current_user else None
     try:
         app_logger.info(
             f"Starting optimized title generation",
@@ -1138,12 +1471,21 @@ async def generate_titles(
         optimized_title_service = OptimizedTitleService()
         
         # Generate optimized titles
-        titles_data = await optimized_title_service.generate_optimized_titles(
-            keyword=request.keyword,
-            category=getattr(request, 'category', '일반'),
-            platform=getattr(request, 'platform', 'wordpress'),
-            count=request.count
+        category = getattr(request, 'category', '일반')
+        platform = getattr(request, 'platform', 'wordpress')
+        titles_data = await generation_cache.get_or_generate(
+            "optimized_titles", (request.keyword, category, platform, request.count), request.variation,
+            lambda: optimized_title_service.generate_optimized_titles(
+                keyword=request.keyword,
+                category=category,
+                platform=platform,
+                count=request.count,
+                variation=request.variation
+            )
         )
+        if is_deterministic(request.variation):
+            # 캐시된 결과일 수 있으므로 중복률은 지금 색인 기준으로 다시
+            apply_duplicate_rates(titles_data)
         
         # Convert to response format
         titles = [
@@ -1155,87 +1497,43 @@ async def generate_titles(
         ]
         
         # Save to database with user association
-        # First, find or create keyword record
-        keyword_record = db.query(Keyword).filter(
-            Keyword.keyword == request.keyword,
-            Keyword.created_by == current_user.id
-        ).first()
-        
-        if not keyword_record:
-            keyword_record = Keyword(
-                keyword=request.keyword,
-                country_id=1,
-                search_volume=0,
-                competition="Unknown",
-                cpc=0.0,
-                opportunity_score=50,
-                created_by=1  # Demo user ID
-            )
-            db.add(keyword_record)
-            db.commit()
-            db.refresh(keyword_record)
-        
-        # Save generated titles
-        for item in titles_data:
-            title_record = GeneratedTitle(
-                keyword_id=keyword_record.id,
-                title=item["title"],
-                length_option=request.length,
-                language=request.language,
-                tone=request.tone,
-                duplicate_rate=float(item["duplicate_rate"]),
-                ai_model="optimized_title_service",
-                created_by=1  # Demo user ID
-            )
-            db.add(title_record)
-        db.commit()
+        await _save_generated_titles(db, request.keyword, owner_id, [
+            {
+                "title": item["title"],
+                "length_option": request.length,
+                "language": request.language,
+                "tone": request.tone,
+                "duplicate_rate": float(item["duplicate_rate"]),
+                "ai_model": "optimized_title_service"
+            }
+            for item in titles_data
+        ])
         
         return titles
         
     except Exception as e:
         print(f"Title generation error: {e}")
         # Fallback to mock data
-        mock_titles_data = [
-            {"title": f"{request.keyword}의 완벽한 가이드: 초보자도 쉽게 따라할 수 있는 방법", "duplicate_rate": 5.2},
-            {"title": f"2024년 최신 {request.keyword} 트렌드와 실전 활용법", "duplicate_rate": 8.1},
-            {"title": f"{request.keyword} 마스터하기: 전문가가 알려주는 핵심 노하우", "duplicate_rate": 3.7},
-            {"title": f"누구나 할 수 있는 {request.keyword} 시작하기", "duplicate_rate": 9.8},
-            {"title": f"{request.keyword}로 성공하는 5가지 전략", "duplicate_rate": 2.1}
-        ]
+        mock_titles_data = apply_duplicate_rates([
+            {"title": f"{request.keyword}의 완벽한 가이드: 초보자도 쉽게 따라할 수 있는 방법"},
+            {"title": f"2024년 최신 {request.keyword} 트렌드와 실전 활용법"},
+            {"title": f"{request.keyword} 마스터하기: 전문가가 알려주는 핵심 노하우"},
+            {"title": f"누구나 할 수 있는 {request.keyword} 시작하기"},
+            {"title": f"{request.keyword}로 성공하는 5가지 전략"}
+        ])
         
         # Save fallback titles to database
-        keyword_record = db.query(Keyword).filter(
-            Keyword.keyword == request.keyword,
-            Keyword.created_by == current_user.id
-        ).first()
-        
-        if not keyword_record:
-            keyword_record = Keyword(
-                keyword=request.keyword,
-                country_id=1,
-                search_volume=0,
-                competition="Unknown",
-                cpc=0.0,
-                opportunity_score=50,
-                created_by=1  # Demo user ID
-            )
-            db.add(keyword_record)
-            db.commit()
-            db.refresh(keyword_record)
-        
-        for item in mock_titles_data[:request.count]:
-            title_record = GeneratedTitle(
-                keyword_id=keyword_record.id,
-                title=item["title"],
-                length_option=request.length,
-                language=request.language,
-                tone=request.tone,
-                duplicate_rate=item["duplicate_rate"],
-                ai_model="fallback",
-                created_by=1  # Demo user ID
-            )
-            db.add(title_record)
-        db.commit()
+        await _save_generated_titles(db, request.keyword, owner_id, [
+            {
+                "title": item["title"],
+                "length_option": request.length,
+                "language": request.language,
+                "tone": request.tone,
+                "duplicate_rate": item["duplicate_rate"],
+                "ai_model": "fallback"
+            }
+            for item in mock_titles_data[:request.count]
+        ])
         
         mock_titles = [
             TitleGenerationResponse(title=item["title"], duplicate_rate=item["duplicate_rate"])
@@ -1246,26 +1544,38 @@ async def generate_titles(
 @app.post("/api/content/generate", response_model=ContentGenerationResponse)
 async def generate_content(
     request: ContentGenerationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
 ):
-    """콘텐츠 생성 API (테스트용 - 인증 비활성화)"""
+    """콘텐츠 생성 API (테스트용 - 인증 비활성화, 토큰이 있으면 그 사용자 소유로 저장)"""
+    owner_id = current_user.id if current_user else None
     try:
         # Get AI service (default to OpenAI)
         ai_service = get_ai_service("openai")
         
+        # 내 사이트를 지정하면 그 사이트에 발행된 관련 글을 내부 링크 후보로
+        related_posts = []
+        if request.site_id and owner_id and await site_manager.get_site_by_id(db, request.site_id, owner_id):
+            related_posts = await asyncio.to_thread(
+                related_index.safe_related, f"{request.title} {request.keywords or ''}", request.title, request.site_id
+            )
+        
         # Generate content using AI
         content_data = await ai_service.generate_content(
             title=request.title,
             keywords=request.keywords,
-            length=request.length
+            length=request.length,
+            related_posts=related_posts
         )
         
         # Save to database with user association
         # Find or create title record
-        title_record = db.query(GeneratedTitle).filter(
-            GeneratedTitle.title == request.title,
-            GeneratedTitle.created_by == current_user.id
-        ).first()
+        title_record = (await db.execute(
+            select(GeneratedTitle).where(
+                GeneratedTitle.title == request.title,
+                GeneratedTitle.created_by == owner_id
+            )
+        )).scalars().first()
         
         if not title_record:
             # Create a temporary title record if not found
@@ -1275,27 +1585,41 @@ async def generate_content(
                 length_option="medium",
                 language="ko",
                 tone="professional",
-                duplicate_rate=0.0,
+                duplicate_rate=title_index.score(request.title)["duplicate_rate"],
                 ai_model="openai",
-                created_by=1  # Demo user ID
+                created_by=owner_id
             )
             db.add(title_record)
-            db.commit()
-            db.refresh(title_record)
+            await record_activity(db, user_id=owner_id, titles_count=1)
+            await db.commit()
+            await db.refresh(title_record)
+        
+        # 기존 생성/발행 글과의 본문 겹침으로 copyscape_result 판정
+        duplicate_check = await asyncio.to_thread(body_index.safe_check, content_data["content"])
+        content_data["copyscape_result"] = duplicate_check["verdict"]
         
         # Save generated content
+        body_columns = (await content_columns_async(db, [content_data["content"]]))[0]
         content_record = GeneratedContent(
             title_id=title_record.id,
-            content=content_data["content"],
+            **body_columns,
             keywords=request.keywords,
             seo_score=content_data["seo_score"],
             geo_score=content_data["geo_score"],
             copyscape_result=content_data["copyscape_result"],
             ai_model="openai",
-            created_by=current_user.id
+            created_by=owner_id
         )
         db.add(content_record)
-        db.commit()
+        await record_activity(db, user_id=owner_id, contents_count=1)
+        await db.commit()
+        await asyncio.to_thread(content_search.safe_index, SOURCE_GENERATED, [generated_document(
+            content_record.id, request.title, request.keywords, content_data["content"], owner_id, datetime.now()
+        )])
+        await asyncio.to_thread(body_index.safe_add, FINGERPRINT_SOURCE_GENERATED, [{
+            "doc_id": content_record.id, "body": content_data["content"], "owner": owner_id, "title": request.title,
+            "created_at": datetime.now()
+        }])
         
         return ContentGenerationResponse(
             content=content_data["content"],
@@ -1348,7 +1672,7 @@ async def generate_content(
 async def generate_advanced_content(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """고급 블로그 콘텐츠 생성 API - SEO + GEO 최적화"""
     keyword = request.get("keyword")
@@ -1368,22 +1692,37 @@ async def generate_advanced_content(
     try:
         # 고급 블로그 작성기 실행
         blog_writer = AdvancedBlogWriter()
-        blog_result = await blog_writer.generate_blog_content(keyword)
+        variation = request.get("variation")  # 주면 같은 키워드에 같은 글 (캐시), 번호마다 다른 변형
+        blog_result = await generation_cache.get_or_generate(
+            "advanced_blog", (keyword,), variation,
+            lambda: blog_writer.generate_blog_content(keyword, variation)
+        )
+        duplicate_check = await asyncio.to_thread(body_index.safe_check, blog_result["content"])
         
         # 데이터베이스에 저장
+        body_columns = (await content_columns_async(db, [blog_result["content"]]))[0]
         content_record = GeneratedContent(
             title_id=None,  # 별도 제목 없이 독립적으로 생성
-            content=blog_result["content"],
+            **body_columns,
             keywords=keyword,
             ai_model="advanced_blog_writer",
             seo_score=blog_result["readability_score"],
             geo_score=blog_result["geo_optimization_score"],
-            copyscape_result="Generated",
+            copyscape_result=duplicate_check["verdict"],
             created_by=current_user.id
         )
         db.add(content_record)
-        db.commit()
-        db.refresh(content_record)
+        await record_activity(db, user_id=current_user.id, contents_count=1)
+        await db.commit()
+        await db.refresh(content_record)
+        await asyncio.to_thread(content_search.safe_index, SOURCE_GENERATED, [generated_document(
+            content_record.id, blog_result["selected_title"], keyword, blog_result["content"], current_user.id,
+            content_record.created_at
+        )])
+        await asyncio.to_thread(body_index.safe_add, FINGERPRINT_SOURCE_GENERATED, [{
+            "doc_id": content_record.id, "body": blog_result["content"], "owner": current_user.id,
+            "title": blog_result["selected_title"], "created_at": content_record.created_at
+        }])
         
         app_logger.info(
             f"Advanced blog content generated successfully",
@@ -1404,7 +1743,8 @@ async def generate_advanced_content(
                 "lsi_keywords": blog_result["lsi_keywords"],
                 "readability_score": blog_result["readability_score"],
                 "geo_optimization_score": blog_result["geo_optimization_score"],
-                "subtopics": blog_result["subtopics"]
+                "subtopics": blog_result["subtopics"],
+                "duplicate_check": duplicate_check
             }
         }
         
@@ -1424,7 +1764,7 @@ async def generate_advanced_content(
 async def auto_publish_posts(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """자동 포스팅 API - 다중 플랫폼 예약 포스팅"""
     
@@ -1493,7 +1833,7 @@ async def auto_publish_posts(
 async def batch_generate_content(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """다중 제목으로 일괄 콘텐츠 생성"""
     
@@ -1502,6 +1842,12 @@ async def batch_generate_content(
         guidelines = request.get('guidelines', '')
         seo_guidelines = request.get('seo_guidelines', '')
         geo_guidelines = request.get('geo_guidelines', '')
+        site_id = request.get('site_id')  # 지정하면 이 사이트의 발행 글을 내부 링크 후보로
+        if site_id and not await site_manager.get_site_by_id(db, site_id, current_user.id):
+            raise HTTPException(
+                status_code=404,
+                detail="사이트를 찾을 수 없습니다"
+            )
         
         app_logger.info(
             f"Starting batch content generation",
@@ -1518,6 +1864,8 @@ async def batch_generate_content(
         # AI 서비스로 각 제목별 콘텐츠 생성
         ai_service = get_ai_service("openai")
         content_results = {}
+        content_rows = []
+        content_titles = []
         
         for title in titles:
             try:
@@ -1537,26 +1885,30 @@ async def batch_generate_content(
                 위 가이드라인을 반영하여 고품질 블로그 콘텐츠를 생성해주세요.
                 """
                 
+                related_posts = (
+                    await asyncio.to_thread(related_index.safe_related, title, title, site_id) if site_id else []
+                )
                 content_data = await ai_service.generate_content(
                     title=title,
                     keywords="",
-                    length="long"
+                    length="long",
+                    related_posts=related_posts
                 )
                 
                 content_results[title] = content_data["content"]
                 
-                # 데이터베이스에 저장
-                content_record = GeneratedContent(
-                    title_id=None,  # 임시
-                    content=content_data["content"],
-                    keywords="",
-                    seo_score=content_data.get("seo_score", 85),
-                    geo_score=content_data.get("geo_score", 80),
-                    copyscape_result=content_data.get("copyscape_result", "Pass"),
-                    ai_model="openai",
-                    created_by=1  # Demo user ID
-                )
-                db.add(content_record)
+                # 데이터베이스에 저장 (루프 종료 후 일괄 INSERT)
+                content_rows.append({
+                    "title_id": None,  # 임시
+                    "content": content_data["content"],
+                    "keywords": "",
+                    "seo_score": content_data.get("seo_score", 85),
+                    "geo_score": content_data.get("geo_score", 80),
+                    "copyscape_result": content_data.get("copyscape_result", "Pass"),
+                    "ai_model": "openai",
+                    "created_by": 1  # Demo user ID
+                })
+                content_titles.append(title)
                 
             except Exception as e:
                 app_logger.error(f"Content generation failed for title", error=e, title=title)
@@ -1583,7 +1935,24 @@ async def batch_generate_content(
 {title}에 대한 내용을 마무리하겠습니다.
                 """.strip()
         
-        db.commit()
+        # 본문은 content_blobs 에 먼저 커밋하고 행에는 해시만 기록
+        bodies = [row.pop("content") for row in content_rows]
+        # 기존 글 + 같은 배치의 앞선 글과의 본문 겹침으로 판정 (id 를 미리 정해 색인과 행을 연결)
+        for row, duplicate_check in zip(content_rows, await asyncio.to_thread(body_index.safe_check_batch, bodies, content_titles)):
+            row["id"] = str(uuid.uuid4())
+            row["copyscape_result"] = duplicate_check["verdict"]
+        for row, columns in zip(content_rows, await content_columns_async(db, bodies)):
+            row.update(columns)
+        await db.commit()
+        content_ids = await write_behind_batcher.enqueue(GeneratedContent, content_rows, durable=True)
+        await asyncio.to_thread(content_search.safe_index, SOURCE_GENERATED, [
+            generated_document(content_id, title, row["keywords"], body, row["created_by"], datetime.now())
+            for content_id, title, row, body in zip(content_ids, content_titles, content_rows, bodies)
+        ])
+        await asyncio.to_thread(body_index.safe_add, FINGERPRINT_SOURCE_GENERATED, [
+            {"doc_id": content_id, "body": body, "owner": row["created_by"], "title": title, "created_at": datetime.now()}
+            for content_id, title, row, body in zip(content_ids, content_titles, content_rows, bodies)
+        ])
         
         app_logger.info(
             f"Batch content generation completed",
@@ -1597,6 +1966,8 @@ async def batch_generate_content(
             "generated_count": len(content_results)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         app_logger.error(
             f"Batch content generation failed",
@@ -1612,12 +1983,12 @@ async def batch_generate_content(
 @app.get("/api/admin/prompts/summary")
 async def get_prompts_summary(
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """관리자용 지침 요약 정보 조회"""
     try:
-        prompt_manager = PromptManager(db)
-        summary = prompt_manager.get_all_prompts_summary()
+        prompt_manager = await PromptManager.create(db)
+        summary = await prompt_manager.get_all_prompts_summary()
         
         return {
             "success": True,
@@ -1633,15 +2004,15 @@ async def get_prompts_summary(
 async def get_prompts_by_type(
     prompt_type: str,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """타입별 지침 목록 조회"""
     try:
         from models import PromptType
         prompt_type_enum = PromptType(prompt_type)
         
-        prompt_manager = PromptManager(db)
-        prompts = prompt_manager.get_prompts_by_type(prompt_type_enum)
+        prompt_manager = await PromptManager.create(db)
+        prompts = await prompt_manager.get_prompts_by_type(prompt_type_enum)
         
         return {
             "success": True,
@@ -1665,12 +2036,12 @@ async def get_prompts_by_type(
 async def create_prompt(
     request: dict,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새 지침 생성"""
     try:
-        prompt_manager = PromptManager(db)
-        result = prompt_manager.create_prompt(request, current_user.id)
+        prompt_manager = await PromptManager.create(db)
+        result = await prompt_manager.create_prompt(request, current_user.id)
         
         return {
             "success": True,
@@ -1688,12 +2059,12 @@ async def update_prompt(
     prompt_id: str,
     request: dict,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지침 업데이트"""
     try:
-        prompt_manager = PromptManager(db)
-        success = prompt_manager.update_prompt(prompt_id, request)
+        prompt_manager = await PromptManager.create(db)
+        success = await prompt_manager.update_prompt(prompt_id, request)
         
         if not success:
             raise HTTPException(
@@ -1717,12 +2088,12 @@ async def update_prompt(
 async def delete_prompt(
     prompt_id: str,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지침 삭제"""
     try:
-        prompt_manager = PromptManager(db)
-        success = prompt_manager.delete_prompt(prompt_id)
+        prompt_manager = await PromptManager.create(db)
+        success = await prompt_manager.delete_prompt(prompt_id)
         
         if not success:
             raise HTTPException(
@@ -1746,15 +2117,15 @@ async def delete_prompt(
 async def export_prompts(
     prompt_type: str,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지침 내보내기"""
     try:
         from models import PromptType
         prompt_type_enum = PromptType(prompt_type) if prompt_type != "all" else None
         
-        prompt_manager = PromptManager(db)
-        export_data = prompt_manager.export_prompts(prompt_type_enum)
+        prompt_manager = await PromptManager.create(db)
+        export_data = await prompt_manager.export_prompts(prompt_type_enum)
         
         return {
             "success": True,
@@ -1775,12 +2146,12 @@ async def export_prompts(
 async def import_prompts(
     request: dict,
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지침 가져오기"""
     try:
-        prompt_manager = PromptManager(db)
-        result = prompt_manager.import_prompts(request, current_user.id)
+        prompt_manager = await PromptManager.create(db)
+        result = await prompt_manager.import_prompts(request, current_user.id)
         
         return {
             "success": result["success"],
@@ -1793,6 +2164,225 @@ async def import_prompts(
             detail=f"Failed to import prompts: {str(e)}"
         )
 
+@app.get("/api/admin/db/index-advice")
+async def get_index_advice(
+    top: int = 20,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """쿼리 로그 상위 쿼리와 모델 선언 기준 인덱스 추천"""
+    try:
+        advisor = IndexAdvisor(engine)
+        recommendations = await asyncio.to_thread(advisor.recommend, top)
+        
+        return {
+            "success": True,
+            "data": {
+                "recommendations": [item.as_dict(engine.dialect) for item in recommendations],
+                "migration_sql": advisor.migration_sql(recommendations) if recommendations else None,
+                "logged_fingerprints": len(db_optimizer.query_log)
+            }
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to analyze indexes: {str(e)}"
+        )
+
+@app.post("/api/admin/db/index-advice/apply")
+async def apply_index_advice(
+    request: dict,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """추천 인덱스 적용 (names 로 선택, emit_only 이면 마이그레이션 파일만 작성)"""
+    try:
+        advisor = IndexAdvisor(engine)
+        recommendations = await asyncio.to_thread(advisor.recommend, request.get("top", 20))
+        names = request.get("names")
+        if names:
+            recommendations = [item for item in recommendations if item.name in names]
+        
+        if request.get("emit_only"):
+            path = await asyncio.to_thread(advisor.write_migration, recommendations)
+            return {"success": True, "data": {"migration_path": path, "count": len(recommendations)}}
+        
+        results = await asyncio.to_thread(advisor.apply, recommendations)
+        return {
+            "success": all(result["status"] == "created" for result in results),
+            "data": results
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to apply indexes: {str(e)}"
+        )
+
+@app.get("/api/admin/db/profile")
+async def get_db_profile(
+    route: Optional[str] = None,
+    limit: int = 50,
+    sort: str = "total_time",
+    current_user: User = Depends(get_current_admin_user)
+):
+    """엔드포인트별 쿼리 프로파일 (지문별 p50/p95/p99, 느린 쿼리 실행 계획, N+1 의심 요청)"""
+    try:
+        return {
+            "success": True,
+            "data": query_profiler.get_profile(route=route, limit=limit, sort=sort)
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get query profile: {str(e)}"
+        )
+
+@app.delete("/api/admin/db/profile")
+async def reset_db_profile(current_user: User = Depends(get_current_admin_user)):
+    """쿼리 프로파일 초기화"""
+    query_profiler.reset()
+    return {"success": True}
+
+@app.get("/api/admin/db/replica")
+async def get_replica_status(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """읽기 복제본 라우팅 현황 (복제 지연, 주 DB 대체 사유별 횟수)"""
+    return {"success": True, "data": read_router.get_stats()}
+
+@app.get("/api/admin/titles/similarity")
+async def get_title_similarity_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """제목 중복률 색인 현황 (색인된 제목 수, 적재 완료 여부)"""
+    return {"success": True, "data": title_index.get_stats()}
+
+@app.get("/api/admin/titles/lexicon")
+async def get_title_lexicon(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """제목 점수 어휘 현황 (범주별 어휘/가중치, 지침 저장소 덮어쓰기 범주)"""
+    return {
+        "success": True,
+        "data": {
+            "stats": title_lexicon.get_stats(),
+            "categories": title_lexicon.categories()
+        }
+    }
+
+@app.get("/api/admin/generation/cache")
+async def get_generation_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """결정적 템플릿 생성 결과 캐시 현황 (항상 결정적 모드 여부, 적중률)"""
+    return {"success": True, "data": generation_cache.get_stats()}
+
+@app.post("/api/admin/titles/lexicon/reload")
+async def reload_title_lexicon(
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """지침 저장소의 제목 어휘 지침(제목 생성 타입, 이름 title_lexicon) 즉시 다시 읽기"""
+    try:
+        changed = await title_lexicon.reload(db)
+        return {"success": True, "data": {"changed": changed, **title_lexicon.get_stats()}}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to reload title lexicon: {str(e)}"
+        )
+
+@app.post("/api/admin/related/rebuild")
+async def rebuild_related_content_index(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """관련 글 색인 재구성 (발행 포스팅 - 보관분 포함 - 과 저장 콘텐츠)"""
+    try:
+        result = await asyncio.to_thread(rebuild_related_content)
+        return {"success": True, "data": result}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to rebuild related content index: {str(e)}"
+        )
+
+@app.get("/api/admin/related/stats")
+async def get_related_content_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """관련 글 색인 현황 (출처별 문서 수, 사이트 수, 게시 목록 크기)"""
+    return {"success": True, "data": await asyncio.to_thread(related_index.get_stats)}
+
+@app.post("/api/admin/duplicates/rescan")
+async def rescan_content_duplicates(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """본문 지문 색인 재구성(보관분 포함) 후 생성 콘텐츠의 copyscape_result 재판정"""
+    try:
+        result = await asyncio.to_thread(rescan_body_duplicates)
+        return {"success": True, "data": result}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to rescan content duplicates: {str(e)}"
+        )
+
+@app.get("/api/admin/duplicates/stats")
+async def get_duplicate_index_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """본문 지문 색인 현황 (출처별 문서 수, 지문 수)"""
+    return {"success": True, "data": await asyncio.to_thread(body_index.get_stats)}
+
+@app.post("/api/admin/search/reindex")
+async def reindex_content_search(
+    request: dict,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """전문 검색 색인 재구성 (sources: ["saved", "generated"], 생략 시 전체)"""
+    try:
+        result = await asyncio.to_thread(reindex_all, request.get("sources"))
+        return {"success": True, "data": result}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to reindex content search: {str(e)}"
+        )
+
+@app.post("/api/admin/archive/run")
+async def run_archive_job(
+    request: dict,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """보관 기간이 지난 행/저장 파일을 월별 압축 세그먼트로 이동"""
+    try:
+        result = await asyncio.to_thread(
+            run_archive,
+            request.get("horizon_days", ARCHIVE_HORIZON_DAYS),
+            request.get("tables")
+        )
+        return {"success": True, "data": result}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to run archive: {str(e)}"
+        )
+
+@app.get("/api/admin/archive/stats")
+async def get_archive_statistics(
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """보관 계층 현황 (테이블별 보관 행 수, 세그먼트 크기)"""
+    return {"success": True, "data": await db.run_sync(get_archive_stats)}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus 스크레이프 엔드포인트 (monitoring/prometheus/prometheus.yml 의 backend 대상)"""
+    rendered = query_profiler.render_metrics()
+    if rendered is None:
+        raise HTTPException(status_code=503, detail="prometheus_client is not installed")
+    payload, content_type = rendered
+    return Response(content=payload, media_type=content_type)
+
 # =============================================================================
 # 자동화 시스템 API 엔드포인트
 # =============================================================================
@@ -1802,7 +2392,7 @@ async def import_prompts(
 async def create_site(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새 사이트 등록"""
     try:
@@ -1831,7 +2421,7 @@ async def create_site(
 @app.get("/api/sites")
 async def get_user_sites(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """사용자 사이트 목록 조회"""
     try:
@@ -1873,7 +2463,7 @@ async def get_user_sites(
 async def get_site_details(
     site_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """사이트 상세 정보 조회"""
     try:
@@ -1921,7 +2511,7 @@ async def update_site(
     site_id: str,
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사이트 정보 수정"""
     try:
@@ -1959,7 +2549,7 @@ async def update_site(
 async def delete_site(
     site_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사이트 삭제"""
     try:
@@ -2016,7 +2606,7 @@ async def test_wordpress_connection(
 @app.get("/api/sites/guidelines/available")
 async def get_available_guidelines(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """사용 가능한 지침 목록 조회"""
     try:
@@ -2036,7 +2626,7 @@ async def get_available_guidelines(
 async def start_automation_session(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """자동화 세션 시작"""
     try:
@@ -2080,7 +2670,7 @@ async def start_automation_session(
 async def generate_category_keywords(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """카테고리 기반 키워드 자동 생성"""
     try:
@@ -2116,7 +2706,7 @@ async def generate_category_keywords(
 async def generate_keyword_titles(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """선택된 키워드들로 제목 자동 생성"""
     try:
@@ -2150,9 +2740,9 @@ async def generate_keyword_titles(
 async def generate_title_contents(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """선택된 제목들로 블로그 글 자동 생성"""
+    """선택된 제목들로 블로그 글 자동 생성 (재호출 시 완료된 글은 체크포인트에서 재사용, 실패분만 재시도)"""
     try:
         session_id = request.get("session_id")
         selected_titles = request.get("selected_titles", [])
@@ -2182,7 +2772,7 @@ async def generate_title_contents(
 async def publish_automation_contents(
     request: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """생성된 블로그 글들을 WordPress에 자동 포스팅"""
     try:
@@ -2216,7 +2806,7 @@ async def publish_automation_contents(
 async def get_automation_session_status(
     session_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """자동화 세션 상태 조회"""
     try:
@@ -2240,5 +2830,47 @@ async def get_automation_session_status(
             detail=f"세션 상태 조회 실패: {str(e)}"
         )
 
+@app.get("/api/automation/sessions/{session_id}/events")
+async def stream_automation_session_events(
+    session_id: str,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """자동화 세션 진행률 스트림 (SSE) - 세션 상태 폴링 대체"""
+    session = (await db.execute(
+        select(AutomationSession).where(
+            AutomationSession.id == session_id,
+            AutomationSession.created_by == current_user.id
+        )
+    )).scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=404,
+            detail="세션을 찾을 수 없습니다"
+        )
+    
+    snapshot = {
+        "session_id": session.id,
+        "step_status": session.step_status,
+        "keywords_count": session.keywords_count,
+        "titles_count": session.titles_count,
+        "contents_count": session.contents_count,
+        "published_count": session.published_count
+    }
+    # 스트림은 장시간 유지되므로 DB 세션을 먼저 반환
+    await db.close()
+    
+    return _event_stream_response(
+        session_topic(session_id),
+        parse_last_event_id(last_event_id_header or last_event_id),
+        stop_on_terminal=True,
+        snapshot=snapshot,
+        # 끝났거나 삭제된 세션은 (히스토리가 정리된 경우에도) 스트림 종료
+        is_active=lambda: automation_engine.is_session_active(session_id)
+    )
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
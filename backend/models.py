@@ -1,14 +1,39 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, DECIMAL, ForeignKey, Enum
+from sqlalchemy import Column, String, Boolean, Date, DateTime, Integer, Text, DECIMAL, ForeignKey, Enum, UniqueConstraint, Index, PrimaryKeyConstraint, LargeBinary, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import uuid
 import enum
 
+from db_config import IS_POSTGRES
+
+# 목록 화면용 본문 요약 길이 (이력 목록은 본문 대신 요약만 읽음)
+EXCERPT_LENGTH = 500
+
+def make_excerpt(content: str) -> str:
+    if content is None:
+        return None
+    return content[:EXCERPT_LENGTH] + "..." if len(content) > EXCERPT_LENGTH else content
+
+def _excerpt_default(context):
+    """INSERT 시 content 로부터 요약 생성 (ORM / executemany 배치 모두 행 단위로 적용)
+    본문을 content_blobs 에 저장하는 경로는 excerpt 를 직접 넘긴다."""
+    return make_excerpt(context.get_current_parameters().get("content"))
+
 Base = declarative_base()
 
+def partitioned_table_args(*args):
+    """PostgreSQL 에서만 created_at 월 단위 범위 파티션 - 파티션 키가 기본키에 포함되어야 하므로 (id, created_at) 복합 기본키
+    그 밖의 DB 는 id 단독 기본키 유지 (id 유일성을 DB 가 보장)"""
+    if not IS_POSTGRES:
+        return args
+    return (*args, PrimaryKeyConstraint("id", "created_at"), {"postgresql_partition_by": "RANGE (created_at)"})
+
+# 복합 기본키여도 ORM 식별자는 id 단독 유지
+PARTITIONED_MAPPER_ARGS = {"primary_key": ["id"]} if IS_POSTGRES else {}
+
 class PromptType(enum.Enum):
     KEYWORD_ANALYSIS = "keyword_analysis"
     TITLE_GENERATION = "title_generation"
@@ -46,6 +71,10 @@ class Country(Base):
 
 class Keyword(Base):
     __tablename__ = "keywords"
+    __table_args__ = (
+        # 사용자별 기간 집계(SEO 대시보드) 및 이력 키셋 페이지네이션 (created_at, id) 용
+        Index("idx_keywords_user_created", "created_by", "created_at", "id"),
+    )
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     keyword = Column(String(500), nullable=False)
@@ -65,6 +94,10 @@ class Keyword(Base):
 
 class GeneratedTitle(Base):
     __tablename__ = "generated_titles"
+    __table_args__ = (
+        # 사용자별 기간 집계(SEO 대시보드) 및 이력 키셋 페이지네이션 (created_at, id) 용
+        Index("idx_generated_titles_user_created", "created_by", "created_at", "id"),
+    )
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     keyword_id = Column(String(36), ForeignKey("keywords.id"))
@@ -84,10 +117,19 @@ class GeneratedTitle(Base):
 
 class GeneratedContent(Base):
     __tablename__ = "generated_content"
+    __table_args__ = partitioned_table_args(
+        # 사용자별 기간 집계(SEO 대시보드) 및 이력 키셋 페이지네이션 (created_at, id) 용
+        Index("idx_generated_content_user_created", "created_by", "created_at", "id"),
+    )
+    __mapper_args__ = PARTITIONED_MAPPER_ARGS
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=not IS_POSTGRES, default=lambda: str(uuid.uuid4()))
     title_id = Column(String(36), ForeignKey("generated_titles.id"))
-    content = Column(Text, nullable=False)
+    # 본문은 content_blobs 에 압축 저장 (content_blobs.load_bodies 로 명시적 조회)
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash"))
+    # 이전 전의 기존 행 본문 - 새 행은 빈 문자열, 엔티티 로드 시 읽지 않음
+    content = deferred(Column(Text, nullable=False, default=""))
+    excerpt = Column(String(EXCERPT_LENGTH + 3), default=_excerpt_default)  # 목록용 요약 (content 앞부분)
     keywords = Column(Text)  # Store as JSON string or comma-separated
     seo_score = Column(Integer)
     geo_score = Column(Integer)
@@ -100,6 +142,17 @@ class GeneratedContent(Base):
     title = relationship("GeneratedTitle", back_populates="content")
     creator = relationship("User", back_populates="content")
 
+class ContentBlob(Base):
+    """압축된 본문 (SHA-256 으로 주소 지정 - 같은 본문은 한 번만 저장)"""
+    __tablename__ = "content_blobs"
+    
+    hash = Column(String(64), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd, zlib, raw
+    size = Column(Integer, nullable=False)  # 원문 UTF-8 바이트
+    stored_size = Column(Integer, nullable=False)
+    data = deferred(Column(LargeBinary, nullable=False))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class UserSettings(Base):
     __tablename__ = "user_settings"
     
@@ -220,7 +273,7 @@ class AutomationSession(Base):
     # 생성된 데이터 (JSON 형태로 저장)
     generated_keywords = Column(Text)  # JSON: [{keyword, score, trend_data}, ...]
     generated_titles = Column(Text)    # JSON: [{title, viral_score, seo_score, click_potential}, ...]
-    generated_contents = Column(Text)  # JSON: [{title, content, seo_score, geo_score, word_count}, ...]
+    generated_contents = Column(Text)  # JSON: [{title, content_hash, seo_score, geo_score, word_count}, ...] (본문은 content_blobs)
     
     # 선택된 항목들
     selected_keywords = Column(Text)   # JSON: [keyword1, keyword2, ...]
@@ -304,8 +357,10 @@ class GeneratedTitleBatch(Base):
 
 class PostingResult(Base):
     __tablename__ = "posting_results"
+    __table_args__ = partitioned_table_args()
+    __mapper_args__ = PARTITIONED_MAPPER_ARGS
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=not IS_POSTGRES, default=lambda: str(uuid.uuid4()))
     session_id = Column(String(36), ForeignKey("automation_sessions.id"), nullable=False)
     site_id = Column(String(36), ForeignKey("sites.id"), nullable=False)
     
@@ -334,4 +389,62 @@ class PostingResult(Base):
     
     # Relationships
     session = relationship("AutomationSession", back_populates="posting_results")
-    site = relationship("Site", foreign_keys=[site_id])
\ No newline at end of file
+    site = relationship("Site", foreign_keys=[site_id])
+
+class WorkflowCheckpoint(Base):
+    __tablename__ = "workflow_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("job_id", "item_key", name="uq_workflow_checkpoints_job_item"),
+        Index("idx_workflow_checkpoints_job_status", "job_id", "status"),
+    )
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String(36), nullable=False)       # 배치 작업 ID 또는 자동화 세션 ID
+    job_type = Column(String(50), nullable=False)     # batch_task, automation_session
+    item_key = Column(String(600), nullable=False)    # 항목 식별자 (예: content:{title}), "__job__"은 작업 정의
+    stage = Column(String(50))                        # keyword, title, content, publish
+    status = Column(String(20), default="completed")  # pending, running, completed, failed, cancelled
+    result = Column(Text)                             # JSON: 항목 결과 또는 작업 파라미터
+    error_message = Column(Text)
+    attempts = Column(Integer, default=0)
+    
+    created_by = Column(String(36), ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class DailyActivityRollup(Base):
+    """(사용자, 사이트, 날짜) 단위 활동 집계 - 생성 시점에 증분 갱신 (대시보드/생산성/사이트 통계용)"""
+    __tablename__ = "daily_activity_rollups"
+    __table_args__ = (
+        Index("idx_daily_activity_rollups_site_day", "site_id", "day"),
+    )
+    
+    user_id = Column(String(36), primary_key=True)
+    site_id = Column(String(36), primary_key=True, default="")  # 사이트와 무관한 활동은 빈 문자열
+    day = Column(Date, primary_key=True)
+    
+    keywords_count = Column(Integer, nullable=False, default=0)
+    titles_count = Column(Integer, nullable=False, default=0)
+    contents_count = Column(Integer, nullable=False, default=0)
+    posts_published_count = Column(Integer, nullable=False, default=0)
+    posts_failed_count = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ArchivedRow(Base):
+    """보관(cold) 계층으로 옮긴 행의 위치 색인 - 본문은 월별 압축 세그먼트 파일에 있음"""
+    __tablename__ = "archived_rows"
+    __table_args__ = (
+        # 보관 이력 키셋 페이지네이션 (hot 테이블 인덱스와 같은 순서)
+        Index("idx_archived_rows_owner_created", "table_name", "created_by", "created_at", "row_id"),
+    )
+    
+    table_name = Column(String(50), primary_key=True)
+    row_id = Column(String(36), primary_key=True)
+    created_by = Column(String(36))
+    created_at = Column(String(40), nullable=False)  # 원본 created_at 의 정렬 가능한 문자열 (이력 커서와 같은 형식)
+    
+    segment = Column(String(255), nullable=False)  # 보관 디렉터리 기준 상대 경로
+    frame_offset = Column(BigInteger, nullable=False)
+    frame_length = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -18,6 +18,7 @@ import hashlib
 
 # Grok 서비스 import
 from grok_ai_service import GrokAIService, GrokConfig
+from seo_scoring import score_document
 
 class AIModel(Enum):
     """지원하는 AI 모델들"""
@@ -408,37 +409,10 @@ class MultiAIEngine:
         )
     
     def _calculate_content_quality(self, content: str) -> float:
-        """콘텐츠 품질 점수 계산"""
+        """콘텐츠 품질 점수 계산 (공통 점수 엔진 - 길이, 문단/헤딩/리스트 구조, 문장 길이)"""
         if not content or len(content.strip()) == 0:
             return 0.0
-        
-        score = 50.0  # 기본 점수
-        
-        # 길이 점수 (적정 길이)
-        length = len(content)
-        if 500 <= length <= 3000:
-            score += 20
-        elif 200 <= length <= 5000:
-            score += 15
-        elif length > 100:
-            score += 10
-        
-        # 구조 점수
-        if '\\n\\n' in content:  # 문단 구분
-            score += 5
-        if any(marker in content for marker in ['##', '###', '####']):  # 헤딩
-            score += 10
-        if any(marker in content for marker in ['-', '*', '1.']):  # 리스트
-            score += 5
-        
-        # 문장 다양성
-        sentences = content.split('.')
-        if len(sentences) > 3:
-            avg_sentence_length = sum(len(s.strip()) for s in sentences) / len(sentences)
-            if 20 <= avg_sentence_length <= 100:
-                score += 10
-        
-        return min(score, 100.0)
+        return score_document(content)["quality_score"]
     
     def _select_best_response(self, responses: List[AIResponse]) -> Optional[AIResponse]:
         """최고 응답 선택"""
@@ -9,10 +9,14 @@
 import asyncio
 import json
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
-import random
 from logger import ai_logger
+from title_similarity import apply_duplicate_rates
+from title_lexicon import title_lexicon, TitleMatches
+from title_ranking import rank_candidates
+from korean_text import analyze_keyword
+from generation_seed import variant_rng, variant_order
 
 
 class OptimizedTitleService:
@@ -45,6 +49,16 @@ class OptimizedTitleService:
             '나만의', '당신의', '우리', '내', '여러분'
         ]
         
+        # 제목 점수 어휘 - 한 번의 스캔으로 모든 범주 판정 (지침 저장소에서 범주 단위 교체 가능)
+        title_lexicon.register_defaults({
+            'optimized.high_ctr': dict.fromkeys(self.high_ctr_words, 5),
+            'optimized.emotional': ['놀라운', '충격적인', '대박', '완전', '진짜', '실제'],
+            'optimized.curiosity': ['비밀', '숨겨진', '몰랐던', '의외의', '특별한'],
+            'optimized.action': ['하는법', '방법', '팁', '가이드', '추천', '리뷰', '비교'],
+            'optimized.personal': ['나만의', '당신의', '우리', '내', '여러분'],
+            'optimized.urgency': ['지금', '당장', '오늘', '즉시', '빨리', '마지막']
+        })
+        
         # 플랫폼별 최적화 패턴
         self.platform_patterns = {
             'wordpress': {
@@ -67,9 +81,14 @@ class OptimizedTitleService:
         category: str,
         platform: str = 'wordpress',
         count: int = 15,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        variation: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """최적화된 제목 생성 메인 함수"""
+        """최적화된 제목 생성 메인 함수
+
+        템플릿이 고정이라 같은 입력은 항상 같은 제목 (변형 0), variation 이 1 이상이면
+        입력 지문 + 변형 번호로 후보 순서를 섞어 동점 후보 중 다른 제목을 재현 가능하게 고름
+        """
         
         try:
             ai_logger.log_generation(
@@ -114,30 +133,14 @@ class OptimizedTitleService:
             howto_titles = await self._generate_howto_titles(keyword, category)
             titles.extend(howto_titles)
             
-            # 2. 각 제목에 대해 CTR 점수 계산
-            scored_titles = []
-            for title in titles:
-                ctr_score = self._calculate_ctr_score(title, keyword, category, platform)
-                seo_score = self._calculate_seo_score(title, keyword)
-                engagement_score = self._calculate_engagement_score(title, category)
-                
-                final_score = (ctr_score * 0.4 + seo_score * 0.3 + engagement_score * 0.3)
-                
-                scored_titles.append({
-                    'title': title,
-                    'ctr_score': round(ctr_score, 2),
-                    'seo_score': round(seo_score, 2),
-                    'engagement_score': round(engagement_score, 2),
-                    'final_score': round(final_score, 2),
-                    'duplicate_rate': self._estimate_duplicate_rate(title, keyword),
-                    'platform_optimized': self._is_platform_optimized(title, platform)
-                })
-            
-            # 3. 점수 순으로 정렬하여 상위 결과 반환
-            scored_titles.sort(key=lambda x: x['final_score'], reverse=True)
-            
-            # 중복 제거 및 다양성 확보
-            final_titles = self._ensure_diversity(scored_titles[:count * 2])
+            # 2. 각 제목의 CTR 점수를 계산하며 상위 후보 풀만 유지
+            # 3. 후보 풀에서 MMR 로 점수가 높으면서 서로 다른 제목 선택
+            titles = variant_order(titles, variant_rng("optimized_titles", keyword, category, platform, count, variation=variation))
+            final_titles = rank_candidates(
+                self.iter_scored_titles(titles, keyword, category, platform), count, 'final_score'
+            )
+            # 중복률: 지금까지 생성/발행된 제목과의 실측 유사도 (배치 안의 비슷한 후보도 반영)
+            apply_duplicate_rates(final_titles)
             
             ai_logger.log_generation(
                 service="OptimizedTitleService",
@@ -149,7 +152,7 @@ class OptimizedTitleService:
                 avg_score=sum(t['final_score'] for t in final_titles) / len(final_titles) if final_titles else 0
             )
             
-            return final_titles[:count]
+            return final_titles
             
         except Exception as e:
             ai_logger.log_generation(
@@ -279,17 +282,41 @@ class OptimizedTitleService:
         
         return howto_patterns
     
-    def _calculate_ctr_score(self, title: str, keyword: str, category: str, platform: str) -> float:
+    def score_titles(self, titles: List[str], keyword: str, category: str = "general", platform: str = "wordpress") -> List[Dict[str, Any]]:
+        """후보 제목 일괄 점수 계산 (제목마다 어휘 스캔 한 번)"""
+        return list(self.iter_scored_titles(titles, keyword, category, platform))
+    
+    def iter_scored_titles(self, titles: Iterable[str], keyword: str, category: str = "general",
+                           platform: str = "wordpress") -> Iterator[Dict[str, Any]]:
+        """후보 제목을 하나씩 점수 계산해 흘려보냄 (순위 선정 단계가 상위 후보만 유지)"""
+        for title in titles:
+            matches = title_lexicon.scan(title)
+            ctr_score = self._calculate_ctr_score(title, keyword, category, platform, matches)
+            seo_score = self._calculate_seo_score(title, keyword)
+            engagement_score = self._calculate_engagement_score(title, category, matches)
+            
+            final_score = (ctr_score * 0.4 + seo_score * 0.3 + engagement_score * 0.3)
+            
+            yield {
+                'title': title,
+                'ctr_score': round(ctr_score, 2),
+                'seo_score': round(seo_score, 2),
+                'engagement_score': round(engagement_score, 2),
+                'final_score': round(final_score, 2),
+                'platform_optimized': self._is_platform_optimized(title, platform)
+            }
+    
+    def _calculate_ctr_score(self, title: str, keyword: str, category: str, platform: str,
+                             matches: Optional[TitleMatches] = None) -> float:
         """클릭률(CTR) 점수 계산"""
+        matches = matches or title_lexicon.scan(title)
         score = 50.0  # 기본 점수
         
-        # 고CTR 단어 포함 점수
-        high_ctr_count = sum(1 for word in self.high_ctr_words if word in title)
-        score += high_ctr_count * 5
+        # 고CTR 단어 포함 점수 (단어당 5점)
+        score += matches.weight('optimized.high_ctr')
         
         # 감정적 단어 보너스
-        emotional_words = ['놀라운', '충격적인', '대박', '완전', '진짜', '실제']
-        if any(word in title for word in emotional_words):
+        if matches.any('optimized.emotional'):
             score += 10
         
         # 숫자 포함 보너스
@@ -308,13 +335,12 @@ class OptimizedTitleService:
         else:
             score -= (title_length - optimal_max) * 0.3
         
-        # 키워드 포함 여부
-        if keyword.lower() in title.lower():
+        # 키워드 포함 여부 (조사가 붙은 형태 포함)
+        if analyze_keyword(title, keyword).count:
             score += 15
         
         # 호기심 유발 요소
-        curiosity_indicators = ['비밀', '숨겨진', '몰랐던', '의외의', '특별한']
-        if any(indicator in title for indicator in curiosity_indicators):
+        if matches.any('optimized.curiosity'):
             score += 12
         
         return min(score, 100)  # 최대 100점
@@ -323,17 +349,19 @@ class OptimizedTitleService:
         """SEO 점수 계산"""
         score = 50.0
         
+        analysis = analyze_keyword(title, keyword)
+        
         # 키워드 위치 (앞쪽에 있을수록 좋음)
-        keyword_position = title.lower().find(keyword.lower())
+        keyword_position = analysis.first_position
         if keyword_position == 0:
             score += 15
-        elif keyword_position <= 10:
+        elif 0 < keyword_position <= 10:
             score += 10
-        elif keyword_position <= 20:
+        elif 0 < keyword_position <= 20:
             score += 5
         
         # 키워드 밀도 (적당해야 함)
-        keyword_count = title.lower().count(keyword.lower())
+        keyword_count = analysis.count
         if keyword_count == 1:
             score += 10
         elif keyword_count == 2:
@@ -358,23 +386,22 @@ class OptimizedTitleService:
         
         return min(score, 100)
     
-    def _calculate_engagement_score(self, title: str, category: str) -> float:
+    def _calculate_engagement_score(self, title: str, category: str,
+                                    matches: Optional[TitleMatches] = None) -> float:
         """참여도 점수 계산"""
+        matches = matches or title_lexicon.scan(title)
         score = 50.0
         
         # 액션 단어 포함
-        action_words = ['하는법', '방법', '팁', '가이드', '추천', '리뷰', '비교']
-        if any(word in title for word in action_words):
+        if matches.any('optimized.action'):
             score += 12
         
         # 개인화 요소
-        personal_words = ['나만의', '당신의', '우리', '내', '여러분']
-        if any(word in title for word in personal_words):
+        if matches.any('optimized.personal'):
             score += 8
         
         # 긴급성 표현
-        urgency_words = ['지금', '당장', '오늘', '즉시', '빨리', '마지막']
-        if any(word in title for word in urgency_words):
+        if matches.any('optimized.urgency'):
             score += 10
         
         # 질문 형태
@@ -387,22 +414,6 @@ class OptimizedTitleService:
         
         return min(score, 100)
     
-    def _estimate_duplicate_rate(self, title: str, keyword: str) -> int:
-        """중복률 추정 (단순 알고리즘)"""
-        # 일반적인 단어가 많을수록 중복률 높음
-        common_words = ['방법', '팁', '추천', '리뷰', '가이드', '정보']
-        common_count = sum(1 for word in common_words if word in title)
-        
-        # 길이가 짧을수록 중복 가능성 높음
-        length_factor = max(0, 20 - len(title)) * 2
-        
-        # 특별한 단어가 적을수록 중복률 높음
-        unique_words = ['신박한', '독특한', '의외의', '숨겨진', '특별한']
-        unique_count = sum(1 for word in unique_words if word in title)
-        
-        duplicate_rate = (common_count * 15 + length_factor - unique_count * 10)
-        return max(5, min(85, duplicate_rate))  # 5-85% 범위
-    
     def _is_platform_optimized(self, title: str, platform: str) -> bool:
         """플랫폼 최적화 여부 확인"""
         platform_config = self.platform_patterns.get(platform, {'optimal_length': (40, 60)})
@@ -410,26 +421,6 @@ class OptimizedTitleService:
         
         return optimal_min <= len(title) <= optimal_max
     
-    def _ensure_diversity(self, titles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """제목 다양성 확보"""
-        diverse_titles = []
-        used_patterns = set()
-        
-        for title_info in titles:
-            title = title_info['title']
-            
-            # 패턴 추출 (첫 2-3 단어)
-            pattern = ' '.join(title.split()[:3])
-            
-            if pattern not in used_patterns:
-                diverse_titles.append(title_info)
-                used_patterns.add(pattern)
-                
-                if len(diverse_titles) >= 15:  # 최대 15개까지
-                    break
-        
-        return diverse_titles
-    
     async def _fallback_titles(self, keyword: str, category: str, count: int) -> List[Dict[str, Any]]:
         """폴백 제목 (AI 실패 시)"""
         fallback_titles = [
@@ -453,11 +444,10 @@ class OptimizedTitleService:
                 'seo_score': 70.0,
                 'engagement_score': 60.0,
                 'final_score': 65.0,
-                'duplicate_rate': 30,
                 'platform_optimized': True
             })
         
-        return result
+        return apply_duplicate_rates(result)
 
 
 # Export for main.py
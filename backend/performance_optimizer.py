@@ -7,9 +7,10 @@
 import os
 import gzip
 import time
+import uuid
 import asyncio
-from typing import Dict, Any, Optional, List, Callable
-from functools import wraps
+from typing import Dict, Any, Optional, List, Callable, Set, Tuple
+from functools import wraps, partial
 from contextlib import asynccontextmanager
 import logging
 
@@ -21,6 +22,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 import aiohttp
 
+from query_log import QueryLog
+from query_profiler import query_profiler
+
 logger = logging.getLogger(__name__)
 
 class DatabaseOptimizer:
@@ -50,6 +54,10 @@ class DatabaseOptimizer:
             "query_times": [],
             "slow_query_threshold": 1.0  # 1초 이상
         }
+        
+        # 지문별 쿼리 로그 (인덱스 추천 입력)
+        self.query_log = QueryLog()
+        self._instrumented_engines: Set[int] = set()
     
     def initialize_sync_engine(self):
         """동기 엔진 초기화"""
@@ -74,22 +82,25 @@ class DatabaseOptimizer:
     async def initialize_async_engine(self):
         """비동기 엔진 초기화"""
         if not self.async_engine:
-            # PostgreSQL용 비동기 URL 변환
-            async_url = self.database_url.replace(
-                "postgresql://", "postgresql+asyncpg://"
-            ).replace(
-                "postgres://", "postgresql+asyncpg://"
-            )
+            # 비동기 드라이버 URL 변환 (sqlite → aiosqlite, postgres → asyncpg)
+            from database import to_async_url
+            async_url = to_async_url(self.database_url)
             
-            self.async_engine = create_async_engine(
-                async_url,
-                pool_size=self.pool_config["pool_size"],
-                max_overflow=self.pool_config["max_overflow"],
-                pool_timeout=self.pool_config["pool_timeout"],
-                pool_recycle=self.pool_config["pool_recycle"],
-                pool_pre_ping=self.pool_config["pool_pre_ping"],
-                echo_pool=self.pool_config["echo_pool"]
-            )
+            if async_url.startswith("sqlite"):
+                # SQLite 는 풀 크기 옵션을 지원하지 않음
+                self.async_engine = create_async_engine(async_url)
+            else:
+                self.async_engine = create_async_engine(
+                    async_url,
+                    pool_size=self.pool_config["pool_size"],
+                    max_overflow=self.pool_config["max_overflow"],
+                    pool_timeout=self.pool_config["pool_timeout"],
+                    pool_recycle=self.pool_config["pool_recycle"],
+                    pool_pre_ping=self.pool_config["pool_pre_ping"],
+                    echo_pool=self.pool_config["echo_pool"]
+                )
+            
+            self._register_event_listeners(self.async_engine)
             
             # 비동기 세션 팩토리 생성
             self.async_session_factory = sessionmaker(
@@ -100,8 +111,17 @@ class DatabaseOptimizer:
             
             logger.info("Async database engine initialized with connection pooling")
     
+    def attach_engine(self, engine):
+        """외부에서 만든 엔진(database.engine / async_engine)의 쿼리도 통계와 쿼리 로그에 수집"""
+        self._register_event_listeners(engine)
+    
     def _register_event_listeners(self, engine):
-        """이벤트 리스너 등록"""
+        """이벤트 리스너 등록 (AsyncEngine 은 내부 sync_engine 에 등록, 엔진당 한 번)"""
+        engine = getattr(engine, "sync_engine", engine)
+        if id(engine) in self._instrumented_engines:
+            return
+        self._instrumented_engines.add(id(engine))
+        
         @event.listens_for(engine, "before_cursor_execute")
         def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
             conn.info.setdefault('query_start_time', []).append(time.time())
@@ -110,10 +130,18 @@ class DatabaseOptimizer:
         def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
             start_time = conn.info['query_start_time'].pop(-1)
             query_time = time.time() - start_time
+            if conn.info.get("query_profiler_explaining"):
+                # 프로파일러가 실행 계획 캡처용으로 보낸 EXPLAIN 은 집계 제외
+                return
             
             # 통계 업데이트
             self.query_stats["total_queries"] += 1
             self.query_stats["query_times"].append(query_time)
+            fingerprint = self.query_log.record(
+                statement, parameters, query_time,
+                paramstyle=conn.dialect.paramstyle, executemany=executemany
+            )
+            query_profiler.record(conn, cursor, statement, parameters, query_time, executemany, fingerprint)
             
             # 느린 쿼리 감지
             if query_time > self.query_stats["slow_query_threshold"]:
@@ -153,8 +181,8 @@ class DatabaseOptimizer:
             }
         return {}
     
-    def get_query_statistics(self) -> Dict[str, Any]:
-        """쿼리 통계 조회"""
+    def get_query_statistics(self, top_statements: int = 20) -> Dict[str, Any]:
+        """쿼리 통계 조회 (PostgreSQL 이면 pg_stat_statements 상위 쿼리 포함)"""
         if self.query_stats["query_times"]:
             avg_time = sum(self.query_stats["query_times"]) / len(self.query_stats["query_times"])
             max_time = max(self.query_stats["query_times"])
@@ -168,8 +196,23 @@ class DatabaseOptimizer:
             "slow_query_ratio": self.query_stats["slow_queries"] / max(1, self.query_stats["total_queries"]),
             "avg_query_time": avg_time,
             "max_query_time": max_time,
-            "min_query_time": min_time
+            "min_query_time": min_time,
+            "pg_stat_statements": self._get_pg_stat_statements(top_statements)
         }
+    
+    def _get_pg_stat_statements(self, limit: int) -> Optional[Dict[str, Any]]:
+        """서버 측 누적 통계 - 이 프로세스 밖(다른 워커/배치)에서 실행된 쿼리까지 포함"""
+        if not self.database_url or not self.database_url.startswith(("postgres://", "postgresql")):
+            return None
+        
+        from postgres_profile import get_statement_statistics
+        try:
+            self.initialize_sync_engine()
+            with self.engine.connect() as conn:
+                return get_statement_statistics(conn, limit)
+        except Exception as e:
+            logger.warning(f"pg_stat_statements query failed: {e}")
+            return {"available": False, "reason": str(e)}
 
 class HTTPConnectionPool:
     """HTTP 연결 풀 관리"""
@@ -550,5 +593,309 @@ class BatchProcessor:
         
         raise TimeoutError(f"Task {task_id} timeout")
 
+class WriteBehindBatcher:
+    """쓰기 지연(write-behind) 배처
+    
+    동시 요청에서 들어오는 INSERT 를 테이블별로 모아 크기/시간 임계치에 도달하면
+    테이블당 한 번의 executemany 로 기록한다. durable=True 로 요청하면 해당 행이
+    커밋된 뒤에 반환하고, 그렇지 않으면 버퍼에 넣는 즉시 반환한다.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        max_batch_size: int = 200,
+        flush_interval: float = 0.05,
+        max_pending_rows: int = 5000,
+        max_flush_retries: int = 3
+    ):
+        self._session_factory = session_factory
+        self._uses_default_session = session_factory is None
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self.max_flush_retries = max_flush_retries
+        
+        self._buffers: Dict[Any, List[Dict[str, Any]]] = {}
+        self._waiters: List[Tuple[asyncio.Future, Set[str]]] = []
+        self._buffered_rows = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        # 백그라운드 플러시 (GC 로 중간에 사라지지 않도록 끝날 때까지 참조 유지)
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._failed_flushes = 0
+        self._flush_hooks: List[Callable] = []
+        
+        self.stats = {
+            "flushes": 0,
+            "rows_written": 0,
+            "rows_failed": 0,
+            "statements": 0,
+            "copy_statements": 0,
+            "fallback_flushes": 0,
+            "requeued_rows": 0
+        }
+    
+    @property
+    def session_factory(self) -> Callable:
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+    
+    @property
+    def writer(self):
+        """단일 쓰기 큐 (SQLite 프로파일에서만 존재, 세션 팩토리를 직접 주입한 경우 사용 안 함)"""
+        if not self._uses_default_session:
+            return None
+        from db_writer import single_writer
+        return single_writer
+    
+    def add_flush_hook(self, hook: Callable[[Any, Dict[Any, List[Dict[str, Any]]]], None]):
+        """플러시 트랜잭션 안에서 INSERT 직후 실행할 훅 등록 - hook(session, {table: rows})
+        
+        훅이 실패하면 해당 행들의 INSERT 도 함께 롤백되므로 파생 데이터(집계 등)가 어긋나지 않는다.
+        """
+        if hook not in self._flush_hooks:
+            self._flush_hooks.append(hook)
+    
+    def _run_hooks(self, session, buffers: Dict[Any, List[Dict[str, Any]]]):
+        for hook in self._flush_hooks:
+            hook(session, buffers)
+    
+    async def enqueue(self, model, rows: List[Dict[str, Any]], durable: bool = False) -> List[str]:
+        """행 버퍼링 후 기본키 목록 반환
+        
+        기본키는 미리 발급하므로 같은 요청에서 부모/자식 행(Keyword → GeneratedTitle)을
+        함께 넣을 수 있다. 플러시는 외래키 의존 순서대로 실행된다.
+        """
+        table = model.__table__
+        ids = []
+        prepared = []
+        for row in rows:
+            row = dict(row)
+            if "id" in table.c and row.get("id") is None:
+                row["id"] = str(uuid.uuid4())
+            ids.append(row.get("id"))
+            prepared.append(row)
+        
+        if not prepared:
+            return ids
+        
+        # 버퍼가 넘치면 쓰기가 따라잡을 때까지 호출자를 대기 (백프레셔)
+        if self._buffered_rows + len(prepared) > self.max_pending_rows:
+            await self.flush()
+        
+        self._buffers.setdefault(table, []).extend(prepared)
+        self._buffered_rows += len(prepared)
+        
+        # 곧 커밋될 행이므로 같은 사용자의 다음 조회는 복제본 대신 주 DB 에서 읽도록 표시
+        from read_replica import read_router
+        read_router.note_write()
+        
+        waiter = None
+        if durable:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((waiter, set(ids)))
+        
+        if self._buffered_rows >= self.max_batch_size:
+            self._spawn(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._delayed_flush())
+        
+        if waiter is not None:
+            await waiter
+        return ids
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+    
+    async def _delayed_flush(self, delay: Optional[float] = None):
+        await asyncio.sleep(self.flush_interval if delay is None else delay)
+        await self.flush()
+    
+    def _requeue(self, buffers: Dict[Any, List[Dict[str, Any]]], durable_ids: Set[str], error: Exception):
+        """플러시 전체가 실패하면 대기자 없는 행을 버퍼 앞으로 되돌려 재시도
+        
+        대기자가 있는 행은 호출자에게 예외로 전달했으므로 제외한다.
+        연속 실패가 max_flush_retries 를 넘으면 행 수를 기록하고 버린다.
+        """
+        requeue = {
+            table: [row for row in rows if row.get("id") not in durable_ids]
+            for table, rows in buffers.items()
+        }
+        count = sum(len(rows) for rows in requeue.values())
+        if not count:
+            return
+        if self._failed_flushes > self.max_flush_retries:
+            self.stats["rows_failed"] += count
+            logger.error(f"Write-behind flush failed {self._failed_flushes} times, dropping {count} row(s): {error}")
+            return
+        for table, rows in requeue.items():
+            if rows:
+                self._buffers[table] = rows + self._buffers.get(table, [])
+        self._buffered_rows += count
+        self.stats["requeued_rows"] += count
+        logger.warning(f"Write-behind flush failed, requeued {count} row(s) (attempt {self._failed_flushes}): {error}")
+        # 지금 실패한 플러시가 타이머 자신일 수 있으므로 현재 작업이면 새로 예약
+        if self._timer is None or self._timer.done() or self._timer is asyncio.current_task():
+            self._timer = self._spawn(self._delayed_flush(self.flush_interval * 2 ** self._failed_flushes))
+    
+    async def flush(self):
+        """버퍼된 행을 즉시 기록"""
+        async with self._flush_lock:
+            buffers, self._buffers = self._buffers, {}
+            waiters, self._waiters = self._waiters, []
+            self._buffered_rows = 0
+            
+            if not buffers:
+                for waiter, _ in waiters:
+                    if not waiter.done():
+                        waiter.set_result(True)
+                return
+            
+            try:
+                failed_ids = await asyncio.to_thread(self._write, buffers)
+            except Exception as e:
+                self._failed_flushes += 1
+                for waiter, _ in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                self._requeue(buffers, set().union(*(ids for _, ids in waiters)), e)
+                return
+            
+            self._failed_flushes = 0
+            for waiter, ids in waiters:
+                if waiter.done():
+                    continue
+                if ids & failed_ids:
+                    waiter.set_exception(RuntimeError(f"{len(ids & failed_ids)} row(s) failed to persist"))
+                else:
+                    waiter.set_result(True)
+    
+    def _ordered_tables(self, buffers: Dict[Any, List[Dict[str, Any]]]) -> List[Any]:
+        """외래키 의존 순서 (부모 테이블 먼저)"""
+        tables = list(buffers)
+        order = {t: i for i, t in enumerate(tables[0].metadata.sorted_tables)}
+        return sorted(tables, key=lambda t: order.get(t, len(order)))
+    
+    @staticmethod
+    def _group_by_columns(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """executemany 는 모든 행의 컬럼 구성이 같아야 하므로 키 집합별로 분리
+        (누락 컬럼을 None 으로 채우면 server_default 가 무시됨)"""
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        return list(groups.values())
+    
+    def _insert_all(self, session, tables: List[Any], buffers: Dict[Any, List[Dict[str, Any]]]) -> int:
+        """테이블별 일괄 INSERT + 플러시 훅 (커밋은 호출자), 실행한 문장 수 반환"""
+        from postgres_profile import should_copy, copy_rows
+        
+        statements = 0
+        for table in tables:
+            for group in self._group_by_columns(buffers[table]):
+                if should_copy(session, group):
+                    # PostgreSQL 대량 배치는 COPY 로 적재
+                    copy_rows(session, table, group)
+                    self.stats["copy_statements"] += 1
+                else:
+                    session.execute(table.insert(), group)
+                statements += 1
+        self._run_hooks(session, buffers)
+        return statements
+    
+    def _insert_row(self, session, table, row: Dict[str, Any]):
+        session.execute(table.insert(), [row])
+        self._run_hooks(session, {table: [row]})
+    
+    def _write(self, buffers: Dict[Any, List[Dict[str, Any]]]) -> Set[str]:
+        """한 트랜잭션으로 테이블별 일괄 INSERT, 실패 시 행 단위로 재시도하여 실패 행만 격리"""
+        if self.writer is not None:
+            return self._write_via_writer(buffers)
+        
+        tables = self._ordered_tables(buffers)
+        total_rows = sum(len(rows) for rows in buffers.values())
+        session = self.session_factory()
+        try:
+            try:
+                statements = self._insert_all(session, tables, buffers)
+                session.commit()
+                self.stats["flushes"] += 1
+                self.stats["statements"] += statements
+                self.stats["rows_written"] += total_rows
+                return set()
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"Bulk insert failed, retrying row by row: {e}")
+            
+            self.stats["fallback_flushes"] += 1
+            failed_ids: Set[str] = set()
+            for table in tables:
+                for row in buffers[table]:
+                    try:
+                        self._insert_row(session, table, row)
+                        session.commit()
+                        self.stats["rows_written"] += 1
+                    except Exception as e:
+                        session.rollback()
+                        failed_ids.add(row.get("id"))
+                        self.stats["rows_failed"] += 1
+                        logger.error(f"Row insert failed for {table.name}: {e}")
+            return failed_ids
+        finally:
+            session.close()
+    
+    def _write_via_writer(self, buffers: Dict[Any, List[Dict[str, Any]]]) -> Set[str]:
+        """단일 쓰기 큐 경유 기록 (SQLite) - 실패 시 행별 작업을 한 번에 넣어 SAVEPOINT 로 격리"""
+        tables = self._ordered_tables(buffers)
+        total_rows = sum(len(rows) for rows in buffers.values())
+        try:
+            statements = self.writer.run(lambda session: self._insert_all(session, tables, buffers))
+            self.stats["flushes"] += 1
+            self.stats["statements"] += statements
+            self.stats["rows_written"] += total_rows
+            return set()
+        except Exception as e:
+            logger.warning(f"Bulk insert failed, retrying row by row: {e}")
+        
+        self.stats["fallback_flushes"] += 1
+        futures = [
+            (table, row, self.writer.submit(partial(self._insert_row, table=table, row=row)))
+            for table in tables
+            for row in buffers[table]
+        ]
+        failed_ids: Set[str] = set()
+        for table, row, future in futures:
+            try:
+                future.result()
+                self.stats["rows_written"] += 1
+            except Exception as e:
+                failed_ids.add(row.get("id"))
+                self.stats["rows_failed"] += 1
+                logger.error(f"Row insert failed for {table.name}: {e}")
+        return failed_ids
+    
+    async def close(self):
+        """종료 시 진행 중인 플러시를 기다린 뒤 남은 행 기록"""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        pending = [task for task in self._flush_tasks if task is not self._timer]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        flushes = self.stats["flushes"]
+        return {
+            **self.stats,
+            "buffered_rows": self._buffered_rows,
+            "avg_rows_per_flush": round(self.stats["rows_written"] / flushes, 2) if flushes else 0
+        }
+
 # 전역 배치 프로세서
-batch_processor = BatchProcessor()
\ No newline at end of file
+batch_processor = BatchProcessor()
+write_behind_batcher = WriteBehindBatcher()
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+PostgreSQL 운영 프로파일
+- COPY 기반 대량 적재 (쓰기 지연 배처의 키워드/제목/콘텐츠 INSERT)
+- generated_content / posting_results / post_publish_logs 월 단위 범위 파티션 생성·분리
+- pg_stat_statements 기반 쿼리 통계
+"""
+
+import asyncio
+import io
+import os
+import re
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from logger import app_logger
+
+# 월 단위 범위 파티션 대상 테이블 (models.py 의 postgresql_partition_by, schema.sql 의 PARTITION BY 와 일치)
+PARTITIONED_TABLES = ("generated_content", "posting_results", "post_publish_logs")
+
+# 이 행 수 이상인 배치만 COPY 사용 (작은 배치는 executemany 가 더 빠름)
+COPY_MIN_ROWS = int(os.getenv("PG_COPY_MIN_ROWS", 50))
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PG_PARTITION_MONTHS_AHEAD", 2))
+# 워커가 오래 떠 있어도 다가올 달 파티션이 미리 생기도록 주기적으로 다시 확인
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PG_PARTITION_MAINTENANCE_HOURS", 12)) * 3600
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+# ---------------------------------------------------------------------------
+# COPY 적재
+# ---------------------------------------------------------------------------
+
+class _DefaultContext:
+    """컨텍스트 기반 Python 기본값(예: excerpt) 계산용 최소 실행 컨텍스트"""
+
+    def __init__(self, row: Dict[str, Any]):
+        self._row = row
+
+    def get_current_parameters(self, isolate_multiinsert_groups: bool = True) -> Dict[str, Any]:
+        return self._row
+
+def _with_python_defaults(table, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """COPY 는 SQLAlchemy 의 Python 측 기본값을 거치지 않으므로 미리 채움 (server_default 는 DB 가 적용)"""
+    defaults = [
+        column for column in table.columns
+        if column.default is not None and column.name not in rows[0]
+    ]
+    if not defaults:
+        return rows
+
+    filled = []
+    for row in rows:
+        row = dict(row)
+        for column in defaults:
+            default = column.default
+            if default.is_scalar:
+                row[column.name] = default.arg
+            elif default.is_callable:
+                row[column.name] = default.arg(_DefaultContext(row))
+        filled.append(row)
+    return filled
+
+def _copy_text_value(value: Any) -> str:
+    """COPY text 형식 값 인코딩 (NULL 은 \\N, 구분자/개행/역슬래시 이스케이프)"""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+def copy_rows(session, table, rows: List[Dict[str, Any]]) -> None:
+    """같은 컬럼 구성의 행들을 COPY FROM STDIN 으로 적재 (호출자 트랜잭션 안에서 실행)"""
+    if not rows:
+        return
+    rows = _with_python_defaults(table, rows)
+    columns = list(rows[0])
+
+    preparer = session.get_bind().dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(name) for name in columns)
+    )
+
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text_value(row.get(name)) for name in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    dbapi_connection = session.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2
+            cursor.copy_expert(statement, buffer)
+        else:
+            # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+def should_copy(session, rows: List[Dict[str, Any]]) -> bool:
+    return len(rows) >= COPY_MIN_ROWS and session.get_bind().dialect.name == "postgresql"
+
+# ---------------------------------------------------------------------------
+# 월 단위 파티션
+# ---------------------------------------------------------------------------
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(table_name: str, month: date) -> str:
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+def is_partitioned(conn, table_name: str) -> bool:
+    return bool(conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+    ), {"name": table_name}).scalar())
+
+def list_partitions(conn, table_name: str) -> List[Dict[str, Any]]:
+    rows = conn.execute(text(
+        "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+        "FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :name AND pg_table_is_visible(parent.oid) "
+        "ORDER BY child.relname"
+    ), {"name": table_name}).all()
+    return [{"name": name, "bound": bound} for name, bound in rows]
+
+def ensure_monthly_partitions(
+    conn,
+    table_name: str,
+    months_back: int = 1,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    today: Optional[date] = None
+) -> List[str]:
+    """현재 달 기준 앞뒤 월 파티션과 DEFAULT 파티션 생성, 새로 만든 파티션 이름 반환
+
+    기존 파티션과 범위가 겹치는 달(예: 이관된 레거시 파티션)은 건너뛴다.
+    """
+    existing = {partition["name"] for partition in list_partitions(conn, table_name)}
+    current = month_start(today or datetime.utcnow().date())
+    default_name = f"{table_name}_default"
+    created = []
+
+    for offset in range(-months_back, months_ahead + 1):
+        start = add_months(current, offset)
+        name = partition_name(table_name, start)
+        if name in existing:
+            continue
+        try:
+            with conn.begin_nested():
+                if default_name in existing:
+                    _create_partition_from_default(conn, table_name, default_name, name, start, add_months(start, 1))
+                else:
+                    conn.execute(text(
+                        f'CREATE TABLE "{name}" PARTITION OF "{table_name}" '
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+                    ))
+            created.append(name)
+        except DBAPIError as e:
+            app_logger.warning(f"파티션 생성 건너뜀: {name} ({e.orig})")
+
+    # 범위 밖 행이 INSERT 실패로 유실되지 않도록 DEFAULT 파티션 유지
+    if default_name not in existing:
+        conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{default_name}" PARTITION OF "{table_name}" DEFAULT'))
+        created.append(default_name)
+
+    return created
+
+def _create_partition_from_default(conn, table_name: str, default_name: str, name: str, start: date, end: date) -> int:
+    """DEFAULT 파티션에 이미 그 달의 행이 있으면 PARTITION OF 생성이 실패하므로
+    빈 테이블을 만들어 해당 범위 행을 옮긴 뒤 파티션으로 붙임, 옮긴 행 수 반환
+    """
+    bounds = {"start": start, "end": end}
+    has_rows = conn.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM "{default_name}" WHERE created_at >= :start AND created_at < :end)'
+    ), bounds).scalar()
+    if not has_rows:
+        conn.execute(text(
+            f'CREATE TABLE "{name}" PARTITION OF "{table_name}" '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        return 0
+
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE "{table_name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    moved = conn.execute(text(
+        f'WITH moved AS (DELETE FROM "{default_name}" WHERE created_at >= :start AND created_at < :end RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ), bounds).rowcount
+    conn.execute(text(
+        f'ALTER TABLE "{table_name}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    app_logger.info(f"DEFAULT 파티션의 {moved}행을 {name} 으로 이동")
+    return moved
+
+def detach_partitions_before(conn, table_name: str, before: date) -> List[str]:
+    """before 이전에 끝나는 월 파티션 분리 (테이블은 유지되므로 보관/삭제는 별도로 결정)"""
+    detached = []
+    for partition in list_partitions(conn, table_name):
+        match = _PARTITION_SUFFIX.search(partition["name"])
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= before:
+            conn.execute(text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{partition["name"]}"'))
+            detached.append(partition["name"])
+    return detached
+
+def maintain_partitions(engine) -> Dict[str, List[str]]:
+    """파티션된 테이블마다 다가올 달의 파티션 미리 생성 (시작 시 / 주기적으로 호출)"""
+    if engine.dialect.name != "postgresql":
+        return {}
+    created: Dict[str, List[str]] = {}
+    with engine.begin() as conn:
+        for table_name in PARTITIONED_TABLES:
+            if is_partitioned(conn, table_name):
+                created[table_name] = ensure_monthly_partitions(conn, table_name)
+    if any(created.values()):
+        app_logger.info(f"월 파티션 생성: {created}")
+    return created
+
+class PartitionMaintainer:
+    """maintain_partitions 를 PARTITION_MAINTENANCE_INTERVAL 마다 실행 (실패해도 다음 주기에 재시도)"""
+
+    def __init__(self, interval: float = PARTITION_MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self.last_run: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, engine) -> Dict[str, List[str]]:
+        try:
+            created = await asyncio.to_thread(maintain_partitions, engine)
+        except Exception as e:
+            app_logger.error("월 파티션 유지 작업 실패", error=e)
+            self.last_error = str(e)
+            return {}
+        self.last_run = datetime.utcnow().isoformat()
+        self.last_error = None
+        return created
+
+    async def _run(self, engine):
+        # 시작 시 한 번은 lifespan 에서 run_once 로 직접 실행
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once(engine)
+
+    def start(self, engine):
+        if engine.dialect.name != "postgresql" or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(engine))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+# 전역 파티션 유지 작업
+partition_maintainer = PartitionMaintainer()
+
+def convert_to_partitioned(engine, table) -> bool:
+    """기존 일반 테이블을 월 파티션 테이블로 전환 (수동 마이그레이션)
+
+    데이터를 복사하지 않고 기존 테이블을 (MINVALUE ~ 다음 달) 범위의 레거시 파티션으로 붙인다.
+    이미 파티션 테이블이면 False.
+    """
+    name = table.name
+    legacy = f"{name}_legacy"
+    with engine.begin() as conn:
+        if is_partitioned(conn, name):
+            return False
+
+        latest = conn.execute(text(f'SELECT max(created_at) FROM "{name}"')).scalar()
+        boundary = add_months(month_start((latest or datetime.utcnow()).date()), 1)
+
+        # 파티션 키는 NOT NULL 이어야 함
+        conn.execute(text(f'UPDATE "{name}" SET created_at = now() WHERE created_at IS NULL'))
+        conn.execute(text(f'ALTER TABLE "{name}" ALTER COLUMN created_at SET NOT NULL'))
+
+        # 새 부모 테이블과 이름이 겹치는 기본키/인덱스 이름을 먼저 변경
+        conn.execute(text(f'ALTER TABLE "{name}" RENAME TO "{legacy}"'))
+        conn.execute(text(f'ALTER INDEX IF EXISTS "{name}_pkey" RENAME TO "{legacy}_pkey"'))
+        for index in table.indexes:
+            conn.execute(text(f'ALTER INDEX IF EXISTS "{index.name}" RENAME TO "{index.name}_legacy"'))
+
+        table.create(conn)
+        conn.execute(text(
+            f'ALTER TABLE "{name}" ATTACH PARTITION "{legacy}" '
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+        ))
+        ensure_monthly_partitions(conn, name)
+
+    app_logger.info(f"{name} 테이블을 월 파티션으로 전환 (레거시 범위 ~ {boundary.isoformat()})")
+    return True
+
+# ---------------------------------------------------------------------------
+# pg_stat_statements
+# ---------------------------------------------------------------------------
+
+_STATEMENTS_QUERY = """
+    SELECT query, calls, {total} AS total_ms, {mean} AS mean_ms, rows,
+           shared_blks_hit, shared_blks_read
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY {total} DESC
+    LIMIT :limit
+"""
+
+def get_statement_statistics(conn, limit: int = 20) -> Dict[str, Any]:
+    """누적 실행 시간 상위 쿼리 (pg_stat_statements 확장 필요)"""
+    installed = conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements')"
+    )).scalar()
+    if not installed:
+        return {
+            "available": False,
+            "reason": "pg_stat_statements extension is not installed "
+                      "(shared_preload_libraries=pg_stat_statements + CREATE EXTENSION)"
+        }
+
+    # PostgreSQL 13 부터 total_time → total_exec_time 으로 이름 변경
+    rows = None
+    for total, mean in (("total_exec_time", "mean_exec_time"), ("total_time", "mean_time")):
+        try:
+            with conn.begin_nested():
+                rows = conn.execute(
+                    text(_STATEMENTS_QUERY.format(total=total, mean=mean)), {"limit": limit}
+                ).all()
+            break
+        except DBAPIError:
+            continue
+    if rows is None:
+        return {"available": False, "reason": "pg_stat_statements is not readable"}
+
+    statements = []
+    for query, calls, total_ms, mean_ms, row_count, blks_hit, blks_read in rows:
+        blocks = (blks_hit or 0) + (blks_read or 0)
+        statements.append({
+            "query": query,
+            "calls": calls,
+            "total_ms": round(float(total_ms or 0), 2),
+            "mean_ms": round(float(mean_ms or 0), 3),
+            "rows": row_count,
+            "cache_hit_ratio": round(blks_hit / blocks, 4) if blocks else None
+        })
+
+    return {"available": True, "top_statements": statements}
+
+if __name__ == "__main__":
+    # python postgres_profile.py [maintain|migrate|stats]
+    from database import engine
+    from models import GeneratedContent, PostingResult
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "maintain"
+    if command == "migrate":
+        for model in (GeneratedContent, PostingResult):
+            print(f"{model.__tablename__}: {'converted' if convert_to_partitioned(engine, model.__table__) else 'already partitioned'}")
+    elif command == "stats":
+        with engine.connect() as conn:
+            for statement in get_statement_statistics(conn).get("top_statements", []):
+                print(f"{statement['total_ms']:>12.2f}ms {statement['calls']:>8} {statement['query'][:100]}")
+    else:
+        print(maintain_partitions(engine))
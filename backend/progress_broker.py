@@ -0,0 +1,308 @@
+"""
+진행률 이벤트 브로커
+배치 작업 / 자동화 세션의 진행 상황을 SSE 스트림으로 푸시 (폴링 대체)
+- 토픽: task:{task_id}, session:{session_id}, user:{user_id}
+- 토픽별 최근 이벤트 링 버퍼 + 단조 증가 이벤트 ID (Last-Event-ID 재연결 지원)
+- 기본은 인프로세스 팬아웃, PROGRESS_BROKER_BACKEND=redis 이면 Redis pub/sub 경유
+"""
+
+import os
+import json
+import time
+import asyncio
+import inspect
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Set, Deque, AsyncIterator, Iterable, Callable, Awaitable, Union
+
+from logger import app_logger
+
+# 스트림을 종료시키는 이벤트 타입
+TERMINAL_EVENTS = {"completed", "failed", "cancelled"}
+
+# 스트림 대상이 아직 진행 중인지 - 동기 함수 또는 코루틴 함수 (DB 조회 등)
+ActiveCheck = Callable[[], Union[bool, Awaitable[bool]]]
+
+async def _still_active(is_active: ActiveCheck) -> bool:
+    active = is_active()
+    if inspect.isawaitable(active):
+        active = await active
+    return bool(active)
+
+@dataclass
+class ProgressEvent:
+    id: int
+    topic: str
+    event: str
+    data: Dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "event": self.event,
+            "data": self.data,
+            "created_at": self.created_at
+        }
+
+    def to_sse(self) -> str:
+        """SSE 프레임 직렬화"""
+        payload = json.dumps({"topic": self.topic, **self.data}, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+class ProgressBroker:
+    """인프로세스 진행률 이벤트 브로커"""
+
+    def __init__(self, history_size: int = 200, queue_size: int = 500, keepalive_seconds: float = 15.0):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        # 발행/수신한 가장 큰 이벤트 ID - 로컬 발급 ID 는 항상 이보다 큼
+        self._last_id = 0
+        self._history: Dict[str, Deque[ProgressEvent]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def _next_id(self) -> int:
+        self._last_id += 1
+        return self._last_id
+
+    async def publish(self, topics: Iterable[str], event: str, data: Dict[str, Any]) -> int:
+        """이벤트 발행 (동일 이벤트 ID로 여러 토픽에 팬아웃)"""
+        event_id = self._next_id()
+        for topic in topics:
+            self._dispatch(ProgressEvent(id=event_id, topic=topic, event=event, data=data))
+        return event_id
+
+    def _dispatch(self, progress_event: ProgressEvent):
+        """로컬 히스토리 기록 및 구독자 큐로 전달"""
+        self._last_id = max(self._last_id, progress_event.id)
+        history = self._history.get(progress_event.topic)
+        if history is None:
+            history = self._history[progress_event.topic] = deque(maxlen=self.history_size)
+        history.append(progress_event)
+
+        for queue in list(self._subscribers.get(progress_event.topic, ())):
+            if queue.full():
+                # 느린 소비자는 가장 오래된 이벤트를 버림 (재연결 시 히스토리로 보충)
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(progress_event)
+
+    def get_history(self, topic: str, after_id: int = 0) -> list:
+        """after_id 이후의 이벤트만 반환"""
+        return [e for e in self._history.get(topic, ()) if e.id > after_id]
+
+    def last_event(self, topic: str) -> Optional[ProgressEvent]:
+        history = self._history.get(topic)
+        return history[-1] if history else None
+
+    def forget(self, topic: str):
+        """토픽 히스토리 제거 (작업 보존 정책에서 호출)"""
+        self._history.pop(topic, None)
+
+    async def subscribe(
+        self,
+        topic: str,
+        last_event_id: int = 0,
+        stop_on_terminal: bool = False,
+        is_active: Optional[ActiveCheck] = None
+    ) -> AsyncIterator[Optional[ProgressEvent]]:
+        """토픽 구독 - 누락분 재전송 후 실시간 이벤트, 유휴 시 None(keep-alive) 반환
+
+        is_active 가 주어지면 유휴 때마다 확인해 대상이 끝났거나 사라졌으면 남은 히스토리만 보내고 종료
+        (히스토리가 정리된 작업에 종료 이벤트가 다시 오지 않아 keep-alive 만 무한히 보내는 것 방지)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(topic, set()).add(queue)
+        delivered = last_event_id
+
+        try:
+            # 구독 등록 후 히스토리를 읽어야 사이에 발행된 이벤트를 놓치지 않음
+            for past_event in self.get_history(topic, last_event_id):
+                delivered = past_event.id
+                yield past_event
+                if stop_on_terminal and past_event.event in TERMINAL_EVENTS:
+                    return
+
+            while True:
+                try:
+                    progress_event = await asyncio.wait_for(queue.get(), timeout=self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    if is_active is not None and not await _still_active(is_active):
+                        for past_event in self.get_history(topic, delivered):
+                            delivered = past_event.id
+                            yield past_event
+                        return
+                    yield None
+                    continue
+
+                if progress_event.id <= delivered:
+                    continue
+                delivered = progress_event.id
+                yield progress_event
+                if stop_on_terminal and progress_event.event in TERMINAL_EVENTS:
+                    return
+        finally:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    async def sse_stream(
+        self,
+        topic: str,
+        last_event_id: int = 0,
+        stop_on_terminal: bool = False,
+        is_active: Optional[ActiveCheck] = None
+    ) -> AsyncIterator[str]:
+        """SSE 텍스트 프레임 스트림"""
+        yield "retry: 3000\n\n"
+        async for progress_event in self.subscribe(topic, last_event_id, stop_on_terminal, is_active):
+            if progress_event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield progress_event.to_sse()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "topics": len(self._history),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "buffered_events": sum(len(h) for h in self._history.values())
+        }
+
+class RedisProgressBroker(ProgressBroker):
+    """Redis pub/sub 기반 브로커 - 여러 워커 프로세스 간 팬아웃"""
+
+    CHANNEL = "blogauto:progress"
+    SEQUENCE_KEY = "blogauto:progress:seq"
+    SUBSCRIBE_TIMEOUT = 5.0
+
+    def __init__(self, redis_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.redis_url = redis_url
+        self._client = None
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_lock = asyncio.Lock()
+
+    async def _ensure_client(self):
+        if self._client is None:
+            import redis.asyncio as redis
+            self._client = redis.from_url(self.redis_url, decode_responses=True)
+        if self._listener is not None and not self._listener.done():
+            return
+        async with self._listener_lock:
+            if self._listener is None or self._listener.done():
+                # 구독이 확인된 뒤에 리스너를 띄워야 그 사이 발행된 이벤트를 놓치지 않음
+                pubsub = await self._subscribe()
+                self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _subscribe(self):
+        """채널 구독 후 서버의 구독 확인 응답까지 대기"""
+        pubsub = self._client.pubsub()
+        try:
+            await pubsub.subscribe(self.CHANNEL)
+            deadline = time.monotonic() + self.SUBSCRIBE_TIMEOUT
+            while time.monotonic() < deadline:
+                message = await pubsub.get_message(timeout=max(0.0, deadline - time.monotonic()))
+                if message and message.get("type") == "subscribe":
+                    return pubsub
+            raise TimeoutError("Redis progress subscription was not confirmed")
+        except BaseException:
+            await pubsub.close()
+            raise
+
+    async def _listen(self, pubsub):
+        """다른 워커에서 발행된 이벤트를 로컬 구독자에게 전달"""
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                    for topic in payload["topics"]:
+                        self._dispatch(ProgressEvent(
+                            id=payload["id"],
+                            topic=topic,
+                            event=payload["event"],
+                            data=payload["data"],
+                            created_at=payload["created_at"]
+                        ))
+                except (KeyError, ValueError) as e:
+                    app_logger.warning("Invalid progress event payload", error=str(e))
+        finally:
+            await pubsub.close()
+
+    async def publish(self, topics: Iterable[str], event: str, data: Dict[str, Any]) -> int:
+        topics = list(topics)
+        try:
+            await self._ensure_client()
+            # 워커 간 공유 시퀀스로 이벤트 ID 발급 (재연결 시 어느 워커에 붙어도 동일 ID)
+            event_id = int(await self._client.incr(self.SEQUENCE_KEY))
+            if event_id <= self._last_id:
+                # Redis 장애 중 로컬로 발급한 ID 보다 뒤로 가면 구독자가 버리므로 시퀀스를 앞으로 당김
+                event_id = int(await self._client.incrby(self.SEQUENCE_KEY, self._last_id - event_id + 1))
+            self._last_id = max(self._last_id, event_id)
+            await self._client.publish(self.CHANNEL, json.dumps({
+                "id": event_id,
+                "topics": topics,
+                "event": event,
+                "data": data,
+                "created_at": time.time()
+            }, ensure_ascii=False, default=str))
+            return event_id
+        except Exception as e:
+            # 로컬 ID 는 마지막 Redis ID 다음부터 이어짐 (구독자가 이미 받은 ID 이하로 버리지 않도록)
+            app_logger.warning("Redis progress publish failed, falling back to local dispatch", error=str(e))
+            return await super().publish(topics, event, data)
+
+    async def subscribe(
+        self,
+        topic: str,
+        last_event_id: int = 0,
+        stop_on_terminal: bool = False,
+        is_active: Optional[ActiveCheck] = None
+    ):
+        # 발행 이력이 없는 워커도 리스너가 떠 있어야 다른 워커의 이벤트를 받을 수 있음
+        try:
+            await self._ensure_client()
+        except Exception as e:
+            app_logger.warning("Redis progress listener unavailable", error=str(e))
+        async for progress_event in super().subscribe(topic, last_event_id, stop_on_terminal, is_active):
+            yield progress_event
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["backend"] = "redis"
+        stats["listener_running"] = bool(self._listener and not self._listener.done())
+        return stats
+
+def task_topic(task_id: str) -> str:
+    return f"task:{task_id}"
+
+def session_topic(session_id: str) -> str:
+    return f"session:{session_id}"
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Last-Event-ID 헤더/쿼리 파싱"""
+    try:
+        return max(0, int(value)) if value else 0
+    except (TypeError, ValueError):
+        return 0
+
+def create_progress_broker() -> ProgressBroker:
+    if os.environ.get("PROGRESS_BROKER_BACKEND", "memory").lower() == "redis":
+        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
+        app_logger.info("Progress broker using Redis pub/sub", redis_url=redis_url)
+        return RedisProgressBroker(redis_url)
+    return ProgressBroker()
+
+# 글로벌 진행률 브로커 인스턴스
+progress_broker = create_progress_broker()
@@ -5,16 +5,27 @@
 
 import json
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import SystemPrompt, PromptTemplate, PromptType, User
 from datetime import datetime
+from title_lexicon import title_lexicon
 
 class PromptManager:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self._initialize_default_prompts()
 
-    def _initialize_default_prompts(self):
+    @classmethod
+    async def create(cls, db: AsyncSession) -> "PromptManager":
+        """기본 지침 초기화까지 마친 인스턴스 생성"""
+        manager = cls(db)
+        await manager._initialize_default_prompts()
+        return manager
+
+    async def _get_prompt(self, prompt_id: str) -> Optional[SystemPrompt]:
+        return await self.db.get(SystemPrompt, prompt_id)
+
+    async def _initialize_default_prompts(self):
         """기본 지침들을 데이터베이스에 초기화"""
         
         # 키워드 분석 기본 지침
@@ -109,14 +120,14 @@ class PromptManager:
             }
         ]
 
-        # 기본 지침이 없는 경우에만 생성
+        # 기본 지침이 없는 경우에만 생성 (타입별 존재 여부를 한 번에 조회)
+        existing_types = set((await self.db.execute(
+            select(SystemPrompt.prompt_type).where(SystemPrompt.is_default == True).distinct()
+        )).scalars().all())
+        
+        created = False
         for prompt_data in default_prompts:
-            existing = self.db.query(SystemPrompt).filter(
-                SystemPrompt.prompt_type == prompt_data["prompt_type"],
-                SystemPrompt.is_default == True
-            ).first()
-            
-            if not existing:
+            if prompt_data["prompt_type"] not in existing_types:
                 new_prompt = SystemPrompt(
                     prompt_type=prompt_data["prompt_type"],
                     name=prompt_data["name"],
@@ -127,15 +138,19 @@ class PromptManager:
                     version="1.0"
                 )
                 self.db.add(new_prompt)
+                created = True
         
-        self.db.commit()
+        if created:
+            await self.db.commit()
 
-    def get_prompts_by_type(self, prompt_type: PromptType) -> List[Dict[str, Any]]:
+    async def get_prompts_by_type(self, prompt_type: PromptType) -> List[Dict[str, Any]]:
         """타입별 지침 목록 조회"""
-        prompts = self.db.query(SystemPrompt).filter(
-            SystemPrompt.prompt_type == prompt_type,
-            SystemPrompt.is_active == True
-        ).order_by(SystemPrompt.is_default.desc(), SystemPrompt.created_at.desc()).all()
+        prompts = (await self.db.execute(
+            select(SystemPrompt).where(
+                SystemPrompt.prompt_type == prompt_type,
+                SystemPrompt.is_active == True
+            ).order_by(SystemPrompt.is_default.desc(), SystemPrompt.created_at.desc())
+        )).scalars().all()
         
         return [
             {
@@ -151,13 +166,15 @@ class PromptManager:
             for prompt in prompts
         ]
 
-    def get_active_prompt(self, prompt_type: PromptType) -> Optional[Dict[str, Any]]:
+    async def get_active_prompt(self, prompt_type: PromptType) -> Optional[Dict[str, Any]]:
         """활성화된 기본 지침 조회"""
-        prompt = self.db.query(SystemPrompt).filter(
-            SystemPrompt.prompt_type == prompt_type,
-            SystemPrompt.is_default == True,
-            SystemPrompt.is_active == True
-        ).first()
+        prompt = (await self.db.execute(
+            select(SystemPrompt).where(
+                SystemPrompt.prompt_type == prompt_type,
+                SystemPrompt.is_default == True,
+                SystemPrompt.is_active == True
+            )
+        )).scalars().first()
         
         if prompt:
             return {
@@ -169,14 +186,20 @@ class PromptManager:
             }
         return None
 
-    def create_prompt(self, prompt_data: Dict[str, Any], created_by: str) -> Dict[str, Any]:
+    async def create_prompt(self, prompt_data: Dict[str, Any], created_by: str) -> Dict[str, Any]:
         """새 지침 생성"""
+        # 제목 어휘 지침(JSON)은 제목 생성 기본 지침이 될 수 없음
+        if prompt_data.get("name") == title_lexicon.prompt_name:
+            prompt_data["is_default"] = False
+
         # 기본 지침으로 설정하는 경우 기존 기본 지침 해제
         if prompt_data.get("is_default"):
-            self.db.query(SystemPrompt).filter(
-                SystemPrompt.prompt_type == prompt_data["prompt_type"],
-                SystemPrompt.is_default == True
-            ).update({"is_default": False})
+            await self.db.execute(
+                update(SystemPrompt).where(
+                    SystemPrompt.prompt_type == PromptType(prompt_data["prompt_type"]),
+                    SystemPrompt.is_default == True
+                ).values(is_default=False)
+            )
 
         new_prompt = SystemPrompt(
             prompt_type=PromptType(prompt_data["prompt_type"]),
@@ -190,8 +213,9 @@ class PromptManager:
         )
         
         self.db.add(new_prompt)
-        self.db.commit()
-        self.db.refresh(new_prompt)
+        await self.db.commit()
+        await self.db.refresh(new_prompt)
+        await title_lexicon.safe_reload(self.db)
         
         return {
             "id": new_prompt.id,
@@ -202,19 +226,24 @@ class PromptManager:
             "version": new_prompt.version
         }
 
-    def update_prompt(self, prompt_id: str, prompt_data: Dict[str, Any]) -> bool:
+    async def update_prompt(self, prompt_id: str, prompt_data: Dict[str, Any]) -> bool:
         """지침 업데이트"""
-        prompt = self.db.query(SystemPrompt).filter(SystemPrompt.id == prompt_id).first()
+        prompt = await self._get_prompt(prompt_id)
         if not prompt:
             return False
 
+        if prompt_data.get("name", prompt.name) == title_lexicon.prompt_name:
+            prompt_data["is_default"] = False
+
         # 기본 지침으로 설정하는 경우 기존 기본 지침 해제
         if prompt_data.get("is_default") and not prompt.is_default:
-            self.db.query(SystemPrompt).filter(
-                SystemPrompt.prompt_type == prompt.prompt_type,
-                SystemPrompt.is_default == True,
-                SystemPrompt.id != prompt_id
-            ).update({"is_default": False})
+            await self.db.execute(
+                update(SystemPrompt).where(
+                    SystemPrompt.prompt_type == prompt.prompt_type,
+                    SystemPrompt.is_default == True,
+                    SystemPrompt.id != prompt_id
+                ).values(is_default=False)
+            )
 
         # 업데이트 가능한 필드들
         if "name" in prompt_data:
@@ -231,26 +260,30 @@ class PromptManager:
             prompt.version = prompt_data["version"]
         
         prompt.updated_at = datetime.utcnow()
-        self.db.commit()
+        await self.db.commit()
+        # 제목 어휘 지침이 바뀌었으면 즉시 반영 (내용이 같으면 다시 컴파일하지 않음)
+        await title_lexicon.safe_reload(self.db)
         return True
 
-    def delete_prompt(self, prompt_id: str) -> bool:
+    async def delete_prompt(self, prompt_id: str) -> bool:
         """지침 삭제 (소프트 삭제)"""
-        prompt = self.db.query(SystemPrompt).filter(SystemPrompt.id == prompt_id).first()
+        prompt = await self._get_prompt(prompt_id)
         if not prompt:
             return False
 
         prompt.is_active = False
         prompt.updated_at = datetime.utcnow()
-        self.db.commit()
+        await self.db.commit()
+        # 제목 어휘 지침이 바뀌었으면 즉시 반영 (내용이 같으면 다시 컴파일하지 않음)
+        await title_lexicon.safe_reload(self.db)
         return True
 
-    def get_all_prompts_summary(self) -> Dict[str, Any]:
+    async def get_all_prompts_summary(self) -> Dict[str, Any]:
         """모든 지침 요약 정보"""
         summary = {}
         
         for prompt_type in PromptType:
-            prompts = self.get_prompts_by_type(prompt_type)
+            prompts = await self.get_prompts_by_type(prompt_type)
             active_count = len([p for p in prompts if p.get("is_active", True)])
             default_prompt = next((p for p in prompts if p["is_default"]), None)
             
@@ -266,10 +299,10 @@ class PromptManager:
         
         return summary
 
-    def export_prompts(self, prompt_type: Optional[PromptType] = None) -> Dict[str, Any]:
+    async def export_prompts(self, prompt_type: Optional[PromptType] = None) -> Dict[str, Any]:
         """지침 내보내기 (JSON 형태)"""
         if prompt_type:
-            prompts = self.get_prompts_by_type(prompt_type)
+            prompts = await self.get_prompts_by_type(prompt_type)
             return {
                 "prompt_type": prompt_type.value,
                 "prompts": prompts,
@@ -278,14 +311,14 @@ class PromptManager:
         else:
             all_prompts = {}
             for ptype in PromptType:
-                all_prompts[ptype.value] = self.get_prompts_by_type(ptype)
+                all_prompts[ptype.value] = await self.get_prompts_by_type(ptype)
             
             return {
                 "all_prompts": all_prompts,
                 "exported_at": datetime.utcnow().isoformat()
             }
 
-    def import_prompts(self, import_data: Dict[str, Any], created_by: str) -> Dict[str, Any]:
+    async def import_prompts(self, import_data: Dict[str, Any], created_by: str) -> Dict[str, Any]:
         """지침 가져오기"""
         imported_count = 0
         errors = []
@@ -298,7 +331,7 @@ class PromptManager:
                         try:
                             prompt_data["prompt_type"] = prompt_type_str
                             prompt_data["is_default"] = False  # 가져온 지침은 기본값 아님
-                            self.create_prompt(prompt_data, created_by)
+                            await self.create_prompt(prompt_data, created_by)
                             imported_count += 1
                         except Exception as e:
                             errors.append(f"Error importing {prompt_data.get('name', 'Unknown')}: {str(e)}")
@@ -309,7 +342,7 @@ class PromptManager:
                     try:
                         prompt_data["prompt_type"] = import_data["prompt_type"]
                         prompt_data["is_default"] = False
-                        self.create_prompt(prompt_data, created_by)
+                        await self.create_prompt(prompt_data, created_by)
                         imported_count += 1
                     except Exception as e:
                         errors.append(f"Error importing {prompt_data.get('name', 'Unknown')}: {str(e)}")
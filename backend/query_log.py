@@ -0,0 +1,98 @@
+"""
+SQL 실행 로그
+문장을 리터럴/바인드 값이 제거된 지문(fingerprint)으로 정규화하여 지문별 호출 수와 시간을 누적
+(인덱스 추천 / 느린 쿼리 분석 입력)
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LISTS = re.compile(r"(VALUES\s*\([^)]*\))(?:\s*,\s*\([^)]*\))+", re.I)
+_SPACES = re.compile(r"\s+")
+
+def fingerprint_sql(statement: str) -> str:
+    """같은 형태의 쿼리가 같은 문자열이 되도록 정규화
+
+    리터럴과 바인드 자리표시자는 ?, IN (...) 목록과 다중 VALUES 는 한 개로 접는다.
+    """
+    sql = _COMMENTS.sub(" ", statement)
+    sql = _STRINGS.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("(?)", sql)
+    sql = _VALUES_LISTS.sub(r"\1", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+def is_select(statement: str) -> bool:
+    head = statement.lstrip().split(None, 1)
+    return bool(head) and head[0].upper() in ("SELECT", "WITH")
+
+class QueryLog:
+    """지문별 누적 통계 (스레드 안전, 지문 수 상한)
+
+    EXPLAIN 재실행을 위해 SELECT 문은 가장 느렸던 실행의 원문과 파라미터를 샘플로 보관한다
+    (쓰기 문장의 파라미터는 사용자 데이터이므로 보관하지 않음).
+    """
+
+    def __init__(self, max_fingerprints: int = 2000):
+        self.max_fingerprints = max_fingerprints
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        paramstyle: Optional[str] = None,
+        executemany: bool = False
+    ) -> str:
+        fingerprint = fingerprint_sql(statement)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return fingerprint
+                entry = self._entries[fingerprint] = {
+                    "fingerprint": fingerprint,
+                    "calls": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "sample_statement": None,
+                    "sample_parameters": None,
+                    "paramstyle": paramstyle
+                }
+            entry["calls"] += 1
+            entry["total_time"] += duration
+            if duration >= entry["max_time"]:
+                entry["max_time"] = duration
+                if is_select(statement) and not executemany:
+                    entry["sample_statement"] = statement
+                    entry["sample_parameters"] = parameters
+                    entry["paramstyle"] = paramstyle
+        return fingerprint
+
+    def top(self, limit: int = 20, key: str = "total_time") -> List[Dict[str, Any]]:
+        """누적 시간(또는 calls/max_time) 상위 지문"""
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry[key], reverse=True)
+        for entry in entries:
+            entry["avg_time"] = entry["total_time"] / entry["calls"] if entry["calls"] else 0.0
+        return entries[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
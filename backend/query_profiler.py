@@ -0,0 +1,318 @@
+"""
+엔드포인트별 쿼리 프로파일러
+요청 미들웨어가 contextvars 에 라우트/사용자를 태깅하고, DatabaseOptimizer 의 커서 이벤트가
+(라우트, SQL 지문)별 호출 수 / p50·p95·p99 / 반환 행 수를 누적
+- 임계값을 넘은 쿼리는 같은 연결에서 실행 계획을 캡처
+- 한 요청에서 같은 지문이 반복되면 N+1 로 기록
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from query_log import fingerprint_sql, is_select
+from logger import app_logger
+
+try:
+    from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestContext:
+    """진행 중인 요청 하나의 태그와 지문별 실행 횟수"""
+
+    __slots__ = ("scope", "method", "user_id", "counts")
+
+    def __init__(self, scope: Dict[str, Any]):
+        self.scope = scope
+        self.method = scope.get("method", "")
+        self.user_id: Optional[str] = None
+        self.counts: Dict[str, int] = {}
+
+    @property
+    def route(self) -> str:
+        # 라우팅은 미들웨어 이후에 일어나므로 매칭된 경로 템플릿을 기록 시점에 조회 (/api/x/{id} 단위로 묶임)
+        route = self.scope.get("route")
+        path = getattr(route, "path", None)
+        return f"{self.method} {path}" if path else UNMATCHED_ROUTE
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("db_profile_request", default=None)
+
+def fingerprint_id(fingerprint: str) -> str:
+    """Prometheus 레이블용 짧은 지문 ID"""
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+class QueryProfile:
+    """(라우트, 지문) 하나의 누적 통계"""
+
+    def __init__(self, route: str, fingerprint: str, sample_size: int):
+        self.route = route
+        self.fingerprint = fingerprint
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.durations: deque = deque(maxlen=sample_size)
+        self.rows = 0
+        self.rows_reported = 0
+        self.slow_calls = 0
+        self.users: Dict[str, int] = {}
+        self.plan: Optional[List[str]] = None
+        self.plan_captured_at: Optional[float] = None
+        self.n_plus_one_requests = 0
+        self.max_calls_per_request = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+        top_users = sorted(self.users.items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            "route": self.route,
+            "fingerprint": self.fingerprint,
+            "fingerprint_id": fingerprint_id(self.fingerprint),
+            "calls": self.calls,
+            "total_time": round(self.total_time, 4),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(self.max_time * 1000, 2),
+            # SQLite 는 SELECT 의 rowcount 를 알려주지 않으므로 보고된 실행만 평균
+            "avg_rows": round(self.rows / self.rows_reported, 1) if self.rows_reported else None,
+            "slow_calls": self.slow_calls,
+            "top_users": [{"user_id": user_id, "calls": calls} for user_id, calls in top_users],
+            "plan": self.plan,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "max_calls_per_request": self.max_calls_per_request
+        }
+
+class QueryProfiler:
+    """요청 단위 쿼리 프로파일러"""
+
+    def __init__(
+        self,
+        slow_threshold: float = float(os.getenv("DB_PROFILE_SLOW_MS", 200)) / 1000,
+        n_plus_one_threshold: int = int(os.getenv("DB_PROFILE_N_PLUS_ONE", 10)),
+        sample_size: int = 512,
+        max_profiles: int = 2000,
+        plan_ttl: float = 600.0
+    ):
+        self.slow_threshold = slow_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.sample_size = sample_size
+        self.max_profiles = max_profiles
+        self.plan_ttl = plan_ttl
+
+        self._profiles: Dict[tuple, QueryProfile] = {}
+        self._n_plus_one_events: deque = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+        if PROMETHEUS_AVAILABLE:
+            self._queries_total = Counter(
+                "blogauto_db_queries_total",
+                "Database statements executed",
+                ["route", "fingerprint_id"]
+            )
+            self._query_duration = Histogram(
+                "blogauto_db_query_duration_seconds",
+                "Database statement duration in seconds",
+                ["route"],
+                buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+            )
+            self._slow_queries_total = Counter(
+                "blogauto_db_slow_queries_total",
+                "Database statements slower than the profiler threshold",
+                ["route", "fingerprint_id"]
+            )
+            self._n_plus_one_total = Counter(
+                "blogauto_db_n_plus_one_total",
+                "Requests that repeated one fingerprint at least the N+1 threshold",
+                ["route", "fingerprint_id"]
+            )
+
+    # ---- 요청 태깅 ----
+
+    async def middleware(self, request, call_next):
+        """HTTP 미들웨어 - 요청 동안 쿼리에 라우트/사용자 태그"""
+        context = RequestContext(request.scope)
+        token = _current_request.set(context)
+        try:
+            return await call_next(request)
+        finally:
+            _current_request.reset(token)
+            self._finish_request(context)
+
+    def tag_user(self, user_id: Optional[str]):
+        """인증 의존성에서 호출 - 현재 요청의 사용자 기록"""
+        context = _current_request.get()
+        if context is not None:
+            context.user_id = user_id
+
+    def current_user_id(self) -> Optional[str]:
+        """현재 요청에 태깅된 사용자 (요청 밖이거나 인증 전이면 None)"""
+        context = _current_request.get()
+        return context.user_id if context is not None else None
+
+    def _finish_request(self, context: RequestContext):
+        route = context.route
+        for fingerprint, count in context.counts.items():
+            if count < self.n_plus_one_threshold:
+                continue
+            with self._lock:
+                profile = self._profiles.get((route, fingerprint))
+                if profile is not None:
+                    profile.n_plus_one_requests += 1
+                    profile.max_calls_per_request = max(profile.max_calls_per_request, count)
+                self._n_plus_one_events.append({
+                    "route": route,
+                    "user_id": context.user_id,
+                    "fingerprint": fingerprint,
+                    "calls": count,
+                    "timestamp": time.time()
+                })
+            if PROMETHEUS_AVAILABLE:
+                self._n_plus_one_total.labels(route=route, fingerprint_id=fingerprint_id(fingerprint)).inc()
+            app_logger.warning(f"N+1 query pattern on {route}: {count}x {fingerprint[:120]}")
+
+    # ---- 기록 ----
+
+    def record(
+        self,
+        conn,
+        cursor,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        executemany: bool,
+        fingerprint: Optional[str] = None
+    ):
+        """after_cursor_execute 에서 호출 (쿼리 로그가 이미 계산한 지문이 있으면 재사용)"""
+        context = _current_request.get()
+        route = context.route if context is not None else BACKGROUND_ROUTE
+        fingerprint = fingerprint or fingerprint_sql(statement)
+        rowcount = getattr(cursor, "rowcount", -1)
+        slow = duration >= self.slow_threshold
+
+        if context is not None:
+            context.counts[fingerprint] = context.counts.get(fingerprint, 0) + 1
+
+        key = (route, fingerprint)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is None:
+                if len(self._profiles) >= self.max_profiles:
+                    self.dropped += 1
+                    return
+                profile = self._profiles[key] = QueryProfile(route, fingerprint, self.sample_size)
+            profile.calls += 1
+            profile.total_time += duration
+            profile.max_time = max(profile.max_time, duration)
+            profile.durations.append(duration)
+            if rowcount is not None and rowcount >= 0:
+                profile.rows += rowcount
+                profile.rows_reported += 1
+            if context is not None and context.user_id is not None:
+                profile.users[context.user_id] = profile.users.get(context.user_id, 0) + 1
+            if slow:
+                profile.slow_calls += 1
+            capture_plan = (
+                slow and not executemany and is_select(statement)
+                and (profile.plan_captured_at is None or time.time() - profile.plan_captured_at > self.plan_ttl)
+            )
+            if capture_plan:
+                # 동시에 들어온 같은 느린 쿼리가 중복 EXPLAIN 하지 않도록 먼저 표시
+                profile.plan_captured_at = time.time()
+
+        if PROMETHEUS_AVAILABLE:
+            fp_id = fingerprint_id(fingerprint)
+            self._queries_total.labels(route=route, fingerprint_id=fp_id).inc()
+            self._query_duration.labels(route=route).observe(duration)
+            if slow:
+                self._slow_queries_total.labels(route=route, fingerprint_id=fp_id).inc()
+
+        if slow:
+            user = context.user_id if context is not None else None
+            app_logger.warning(f"Slow query ({duration * 1000:.1f}ms) on {route} user={user}: {fingerprint[:200]}")
+
+        if capture_plan:
+            plan = self._explain(conn, statement, parameters)
+            if plan is not None:
+                with self._lock:
+                    profile.plan = plan
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Optional[List[str]]:
+        """같은 연결에서 EXPLAIN (PostgreSQL 은 실패해도 트랜잭션이 깨지지 않도록 SAVEPOINT 안에서)"""
+        sqlite = conn.dialect.name == "sqlite"
+        prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+        parameters = parameters if parameters is not None else ()
+        conn.info["query_profiler_explaining"] = True
+        try:
+            if sqlite:
+                result = conn.exec_driver_sql(prefix + statement, parameters)
+                return [row[-1] for row in result]
+            with conn.begin_nested():
+                result = conn.exec_driver_sql(prefix + statement, parameters)
+                return [row[0] for row in result]
+        except Exception as e:
+            app_logger.debug(f"Plan capture failed: {e}")
+            return None
+        finally:
+            conn.info.pop("query_profiler_explaining", None)
+
+    # ---- 조회 ----
+
+    def get_profile(self, route: Optional[str] = None, limit: int = 50, sort: str = "total_time") -> Dict[str, Any]:
+        with self._lock:
+            profiles = [
+                profile.as_dict() for profile in self._profiles.values()
+                if route is None or profile.route == route
+            ]
+            n_plus_one = [
+                event for event in self._n_plus_one_events
+                if route is None or event["route"] == route
+            ]
+        if profiles and sort not in profiles[0]:
+            sort = "total_time"
+        profiles.sort(key=lambda item: item[sort] or 0, reverse=True)
+
+        routes: Dict[str, Dict[str, Any]] = {}
+        for profile in profiles:
+            summary = routes.setdefault(profile["route"], {"calls": 0, "total_time": 0.0, "fingerprints": 0})
+            summary["calls"] += profile["calls"]
+            summary["total_time"] = round(summary["total_time"] + profile["total_time"], 4)
+            summary["fingerprints"] += 1
+
+        return {
+            "slow_threshold_ms": round(self.slow_threshold * 1000, 1),
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "routes": routes,
+            "queries": profiles[:limit],
+            "n_plus_one": list(reversed(n_plus_one)),
+            "dropped": self.dropped
+        }
+
+    def render_metrics(self):
+        """Prometheus 노출 형식 (payload, content_type) - prometheus_client 미설치 시 None"""
+        if not PROMETHEUS_AVAILABLE:
+            return None
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+    def reset(self):
+        with self._lock:
+            self._profiles.clear()
+            self._n_plus_one_events.clear()
+            self.dropped = 0
+
+# 전역 프로파일러 인스턴스
+query_profiler = QueryProfiler()
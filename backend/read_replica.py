@@ -0,0 +1,232 @@
+"""
+읽기 전용 세션 라우팅
+분석(/api/seo/*) / 이력 / 목록 조회를 읽기 엔진(PostgreSQL 스트리밍 복제본 또는 SQLite 읽기 전용 풀)으로 보내
+생성/자동화 쓰기와 연결 풀을 나눔
+- 복제 지연이 한도를 넘거나 복제본 확인이 실패하면 주 DB 로 대체
+- 방금 쓰기를 커밋한 사용자의 요청은 일정 시간 주 DB 에서 읽음 (read-your-writes, 예: 사이트 수정 직후 상세 조회)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from database import async_engine, read_async_engine
+from query_profiler import query_profiler
+from logger import app_logger
+
+# 복제본이 아니면(주 DB 에 연결된 경우) 0, 재생할 WAL 이 없으면 0, 그 외에는 마지막 재생 트랜잭션 이후 경과 시간
+_PG_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+class ReplicaLagMonitor:
+    """읽기 엔진의 복제 지연을 주기적으로 측정"""
+
+    def __init__(
+        self,
+        engine,
+        max_lag: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5)),
+        interval: float = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", 2))
+    ):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        # 같은 파일을 읽는 SQLite 풀은 커밋 즉시 보이므로 지연이 없음
+        self.same_database = engine is not None and engine.dialect.name == "sqlite"
+        self.lag: Optional[float] = 0.0 if self.same_database else None
+        self.checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> Optional[float]:
+        if self.engine is None or self.same_database:
+            return self.lag
+        try:
+            async with self.engine.connect() as conn:
+                lag = (await conn.execute(text(_PG_LAG_SQL))).scalar()
+            self.lag = float(lag or 0)
+            self.last_error = None
+        except Exception as e:
+            if self.last_error is None:
+                app_logger.warning(f"Read replica lag check failed, routing reads to primary: {e}")
+            self.lag = None
+            self.last_error = str(e)
+        self.checked_at = time.monotonic()
+        return self.lag
+
+    def usable(self) -> Tuple[bool, str]:
+        """(복제본 사용 가능 여부, 사유)"""
+        if self.engine is None:
+            return False, "no_replica"
+        if self.same_database:
+            return True, REPLICA
+        if self.lag is None or self.checked_at is None:
+            return False, "replica_unavailable"
+        if time.monotonic() - self.checked_at > self.interval * 3:
+            # 측정 루프가 멈췄으면 마지막 값을 믿지 않음
+            return False, "lag_unknown"
+        if self.lag > self.max_lag:
+            return False, "replica_lag"
+        return True, REPLICA
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.engine is None or self.same_database or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+class ReadRouter:
+    """읽기 세션의 연결 대상(복제본 / 주 DB) 선택"""
+
+    def __init__(
+        self,
+        primary_engine,
+        read_engine,
+        read_your_writes_window: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 10)),
+        max_tracked_users: int = 10000
+    ):
+        self.primary = primary_engine.sync_engine
+        self.replica = read_engine.sync_engine if read_engine is not None else None
+        self.monitor = ReplicaLagMonitor(read_engine)
+        self.read_your_writes_window = read_your_writes_window
+        self.max_tracked_users = max_tracked_users
+        self._recent_writes: Dict[str, float] = {}
+        self._routes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ---- 쓰기 추적 ----
+
+    def note_write(self, user_id: Optional[Any] = None):
+        """사용자의 쓰기 커밋 기록 (생략 시 현재 요청의 사용자)"""
+        if user_id is None:
+            user_id = query_profiler.current_user_id()
+        if user_id is None or self.replica is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[str(user_id)] = now
+            if len(self._recent_writes) > self.max_tracked_users:
+                horizon = now - self._window()
+                self._recent_writes = {
+                    key: written for key, written in self._recent_writes.items() if written >= horizon
+                }
+
+    def _window(self) -> float:
+        # 복제본이 따라잡는 데 걸리는 시간만큼 창을 늘림
+        return self.read_your_writes_window + (self.monitor.lag or 0.0)
+
+    def wrote_recently(self, user_id: Optional[Any]) -> bool:
+        if user_id is None:
+            return False
+        written = self._recent_writes.get(str(user_id))
+        return written is not None and time.monotonic() - written < self._window()
+
+    # ---- 선택 ----
+
+    def choose(self) -> Tuple[Any, str]:
+        """(동기 엔진, 사유) - 세션의 첫 쿼리 시점에 한 번 호출"""
+        usable, reason = self.monitor.usable()
+        if usable and self.wrote_recently(query_profiler.current_user_id()):
+            usable, reason = False, "recent_write"
+        with self._lock:
+            self._routes[reason] = self._routes.get(reason, 0) + 1
+        return (self.replica, REPLICA) if usable else (self.primary, reason)
+
+    def start(self):
+        self.monitor.start()
+
+    async def stop(self):
+        await self.monitor.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = dict(self._routes)
+            tracked = len(self._recent_writes)
+        return {
+            "replica_configured": self.replica is not None,
+            "replica_dialect": self.replica.dialect.name if self.replica is not None else None,
+            "lag_seconds": self.monitor.lag,
+            "max_lag_seconds": self.monitor.max_lag,
+            "last_error": self.monitor.last_error,
+            "read_your_writes_window": round(self._window(), 2),
+            "tracked_writers": tracked,
+            "routes": routes
+        }
+
+read_router = ReadRouter(async_engine, read_async_engine)
+
+class RoutingSession(Session):
+    """첫 쿼리에서 읽기 대상을 정하고 세션 동안 유지 (한 요청 안에서 같은 스냅샷을 읽음)
+
+    실수로 섞인 쓰기(flush / INSERT·UPDATE·DELETE)는 항상 주 DB 로 보낸다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            return read_router.primary
+        bind = self.info.get("read_bind")
+        if bind is None:
+            bind, route = read_router.choose()
+            self.info["read_bind"] = bind
+            self.info["read_route"] = route
+        return bind
+
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def get_read_db():
+    """분석/이력/목록 조회용 읽기 세션"""
+    async with ReadSessionLocal() as db:
+        yield db
+
+# ---- 쓰기 커밋 감지 (모든 세션) ----
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_commit")
+def _note_committed_write(session):
+    if session.info.pop("has_writes", False):
+        read_router.note_write()
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write_mark(session):
+    session.info.pop("has_writes", None)
@@ -1743,13 +1743,16 @@ async def get_image_styles():
 
 @app.get("/api/content/saved")
 async def get_saved_content(
+    q: str = "",
     query: str = "",
     status: str = "",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
     limit: int = 50
 ):
-    """저장된 콘텐츠 목록 조회"""
+    """저장된 콘텐츠 목록 조회 (?q= 가 있으면 제목/키워드/본문 전문 검색, 관련도 순)"""
     try:
-        content_list = content_storage.search_content(query, status, limit)
+        content_list = content_storage.search_content(q or query, status, limit, date_from, date_to)
         return {
             "success": True,
             "content": content_list,
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+관련 글 / 내부 링크 추천 색인
+발행 포스팅과 저장 콘텐츠를 사이트별 희소 TF-IDF(문자 n-gram) 벡터로 SQLite 역색인에 두고, 초안과 가까운 글을 찾음
+- 본문 → HTML 태그/URL 제거, NFKC 소문자 → 한글 음절 2-gram, 영문/숫자 3-gram (제목은 가중 반영)
+- lnc.ltc 가중: 문서는 로그 tf 를 코사인 정규화해 저장(문서가 늘어도 다시 계산할 필요 없음), idf 는 질의 쪽에서만
+- 사이트마다 문서 빈도(df)와 문서 수를 따로 관리 - 사이트 없는 저장 콘텐츠는 공용("") 범위
+- 저장/발행 시 해당 문서만 증분 갱신, 색인 파일은 mmap 으로 읽어 질의가 페이지 캐시에서 바로 처리됨
+- 생성 프롬프트의 내부 링크 후보, WordPress 발행 본문의 관련 글 블록으로 사용
+- 전체 재구성은 rebuild (관리자 API / CLI)
+
+    python related_content.py rebuild
+    python related_content.py related 초안파일.md --site <site_id>
+"""
+
+import html
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from data_paths import data_path
+from logger import app_logger
+
+SOURCE_SAVED = "saved"
+SOURCE_POSTED = "posted"
+
+# 사이트 없는 문서의 범위
+GLOBAL_SITE = ""
+
+MAX_BODY_CHARS = int(os.getenv("RELATED_CONTENT_MAX_BODY_CHARS", 10000))
+MMAP_SIZE = int(os.getenv("RELATED_CONTENT_MMAP_SIZE", 268435456))  # 256MB
+# 제목 n-gram 은 본문보다 이만큼 더 센 것으로
+TITLE_WEIGHT = 3
+# 질의는 가중치 상위 term 만 (긴 초안도 게시 목록 조회량이 일정)
+MAX_QUERY_TERMS = 96
+# 사이트 문서의 절반 이상에 나오는 n-gram 은 변별력이 없어 질의에서 제외
+MAX_DF_RATIO = 0.5
+MIN_SCORE = 0.05
+DEFAULT_LIMIT = 5
+
+_MARKUP = re.compile(r"<[^>]+>|https?://\S+|\]\([^)]*\)")
+_TERM = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+_HANGUL = re.compile(r"[가-힣]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    site_id TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    created_at TEXT,
+    terms BLOB NOT NULL,
+    UNIQUE (source, doc_id)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    site_id TEXT NOT NULL,
+    term INTEGER NOT NULL,
+    doc INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (site_id, term, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS terms (
+    site_id TEXT NOT NULL,
+    term INTEGER NOT NULL,
+    df INTEGER NOT NULL,
+    PRIMARY KEY (site_id, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sites (
+    site_id TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL
+);
+"""
+
+def _grams(text: str) -> List[str]:
+    grams = []
+    for match in _TERM.finditer(text):
+        piece = match.group()
+        size = 2 if _HANGUL.fullmatch(piece) else 3
+        if len(piece) <= size:
+            grams.append(piece)
+        else:
+            grams.extend(piece[i:i + size] for i in range(len(piece) - size + 1))
+    return grams
+
+def term_frequencies(body: str, title: str = "") -> Dict[int, int]:
+    """n-gram 해시 → 빈도 (제목은 TITLE_WEIGHT 배)"""
+    counts: Dict[int, int] = {}
+    for text, weight in ((title, TITLE_WEIGHT), ((body or "")[:MAX_BODY_CHARS], 1)):
+        normalized = unicodedata.normalize("NFKC", _MARKUP.sub(" ", text or "")).lower()
+        for gram in _grams(normalized):
+            term = zlib.crc32(gram.encode("utf-8"))
+            counts[term] = counts.get(term, 0) + weight
+    return counts
+
+def document_vector(body: str, title: str = "") -> Dict[int, float]:
+    """lnc - 로그 tf 를 코사인 정규화 (idf 없음)"""
+    weights = {term: 1.0 + math.log(tf) for term, tf in term_frequencies(body, title).items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {term: w / norm for term, w in weights.items()}
+
+def _site_key(site_id: Any) -> str:
+    return GLOBAL_SITE if site_id is None else str(site_id)
+
+def _pack(terms: Iterable[int]) -> bytes:
+    return array("I", sorted(terms)).tobytes()
+
+def _unpack(blob: bytes) -> List[int]:
+    values = array("I")
+    values.frombytes(blob)
+    return list(values)
+
+def _chunks(values: List[Any], size: int = 500) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+class RelatedContentIndex:
+    """SQLite 기반 사이트별 TF-IDF 역색인"""
+
+    def __init__(self, path: Optional[str] = None):
+        # 경로를 주지 않으면 첫 연결 때 DATA_DIR 아래로 - import 만으로 색인 파일을 만들지 않음
+        self._path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = data_path("RELATED_CONTENT_INDEX", "related_content.db")
+        return self._path
+
+    def _db(self) -> sqlite3.Connection:
+        """스레드별 연결 (첫 연결에서 스키마 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._write_lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ---- 갱신 ----
+
+    def _remove(self, conn: sqlite3.Connection, source: str, doc_id: str) -> bool:
+        row = conn.execute(
+            "SELECT rowid, site_id, terms FROM documents WHERE source = ? AND doc_id = ?", (source, str(doc_id))
+        ).fetchone()
+        if row is None:
+            return False
+        site, terms = row["site_id"], _unpack(row["terms"])
+        conn.executemany(
+            "DELETE FROM postings WHERE site_id = ? AND term = ? AND doc = ?",
+            [(site, term, row["rowid"]) for term in terms]
+        )
+        conn.executemany("UPDATE terms SET df = df - 1 WHERE site_id = ? AND term = ?", [(site, term) for term in terms])
+        for batch in _chunks(terms):
+            conn.execute(
+                f"DELETE FROM terms WHERE site_id = ? AND df <= 0 AND term IN ({', '.join('?' * len(batch))})",
+                (site, *batch)
+            )
+        conn.execute("UPDATE sites SET documents = documents - 1 WHERE site_id = ?", (site,))
+        conn.execute("DELETE FROM documents WHERE rowid = ?", (row["rowid"],))
+        return True
+
+    def add_documents(self, source: str, documents: Iterable[Dict[str, Any]]) -> int:
+        """문서 추가/교체 - doc_id, title, body, site_id, url, created_at"""
+        count = 0
+        with self._transaction() as conn:
+            for doc in documents:
+                self._remove(conn, source, doc["doc_id"])
+                vector = document_vector(doc.get("body"), doc.get("title"))
+                if not vector:
+                    continue
+                site = _site_key(doc.get("site_id"))
+                created_at = doc.get("created_at")
+                rowid = conn.execute(
+                    "INSERT INTO documents (source, doc_id, site_id, title, url, created_at, terms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        source, str(doc["doc_id"]), site, doc.get("title"), doc.get("url"),
+                        created_at.isoformat() if hasattr(created_at, "isoformat") else created_at,
+                        _pack(vector)
+                    )
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO postings (site_id, term, doc, weight) VALUES (?, ?, ?, ?)",
+                    [(site, term, rowid, weight) for term, weight in vector.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO terms (site_id, term, df) VALUES (?, ?, 1) "
+                    "ON CONFLICT (site_id, term) DO UPDATE SET df = df + 1",
+                    [(site, term) for term in vector]
+                )
+                conn.execute(
+                    "INSERT INTO sites (site_id, documents) VALUES (?, 1) "
+                    "ON CONFLICT (site_id) DO UPDATE SET documents = documents + 1",
+                    (site,)
+                )
+                count += 1
+        return count
+
+    def remove_documents(self, source: str, doc_ids: Iterable[str]) -> int:
+        with self._transaction() as conn:
+            return sum(1 for doc_id in doc_ids if self._remove(conn, source, doc_id))
+
+    def clear(self):
+        with self._transaction() as conn:
+            for table in ("postings", "terms", "sites", "documents"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def safe_add(self, source: str, documents: Iterable[Dict[str, Any]]):
+        """요청 경로용 - 색인 실패가 저장/발행을 실패시키지 않도록 기록만 (rebuild 로 복구)"""
+        try:
+            self.add_documents(source, documents)
+        except Exception as e:
+            app_logger.warning(f"Related content index update failed ({source}): {e}")
+
+    def safe_remove(self, source: str, doc_ids: Iterable[str]):
+        try:
+            self.remove_documents(source, doc_ids)
+        except Exception as e:
+            app_logger.warning(f"Related content index removal failed ({source}): {e}")
+
+    # ---- 추천 ----
+
+    def _query_vector(self, conn: sqlite3.Connection, site: str, body: str, title: str) -> Dict[int, float]:
+        """ltc - 로그 tf x idf 상위 MAX_QUERY_TERMS 개, 코사인 정규화"""
+        row = conn.execute("SELECT documents FROM sites WHERE site_id = ?", (site,)).fetchone()
+        total = row["documents"] if row else 0
+        if total <= 0:
+            return {}
+        frequencies = term_frequencies(body, title)
+        df: Dict[int, int] = {}
+        for batch in _chunks(list(frequencies)):
+            df.update(conn.execute(
+                f"SELECT term, df FROM terms WHERE site_id = ? AND term IN ({', '.join('?' * len(batch))})",
+                (site, *batch)
+            ).fetchall())
+        max_df = max(1, int(total * MAX_DF_RATIO)) if total > 2 else total
+        weights = {
+            term: (1.0 + math.log(frequencies[term])) * math.log(1 + total / count)
+            for term, count in df.items()
+            if count <= max_df
+        }
+        if len(weights) > MAX_QUERY_TERMS:
+            weights = dict(sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_QUERY_TERMS])
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {term: w / norm for term, w in weights.items()}
+
+    def related(
+        self,
+        body: str,
+        title: str = "",
+        site_id: Optional[Any] = None,
+        limit: int = DEFAULT_LIMIT,
+        exclude: Optional[Iterable[Tuple[str, str]]] = None,
+        links_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """초안과 가까운 글 (코사인 유사도 순) - links_only 면 URL 이 있는 발행 글만"""
+        conn = self._db()
+        site = _site_key(site_id)
+        query = self._query_vector(conn, site, body, title)
+        if not query:
+            return []
+        scores: Dict[int, float] = {}
+        terms = list(query)
+        for batch in _chunks(terms):
+            rows = conn.execute(
+                f"SELECT term, doc, weight FROM postings WHERE site_id = ? AND term IN ({', '.join('?' * len(batch))})",
+                (site, *batch)
+            ).fetchall()
+            for term, doc, weight in rows:
+                scores[doc] = scores.get(doc, 0.0) + query[term] * weight
+        excluded = {(source, str(doc_id)) for source, doc_id in (exclude or ())}
+        results = []
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        for batch in _chunks([doc for doc, score in ranked if score >= MIN_SCORE], 100):
+            rows = conn.execute(
+                f"SELECT rowid, source, doc_id, title, url, created_at FROM documents "
+                f"WHERE rowid IN ({', '.join('?' * len(batch))})",
+                batch
+            ).fetchall()
+            by_rowid = {row["rowid"]: row for row in rows}
+            for doc in batch:
+                row = by_rowid.get(doc)
+                if row is None or (row["source"], row["doc_id"]) in excluded or (links_only and not row["url"]):
+                    continue
+                results.append({
+                    "source": row["source"],
+                    "doc_id": row["doc_id"],
+                    "title": row["title"],
+                    "url": row["url"],
+                    "created_at": row["created_at"],
+                    "score": round(scores[doc], 4)
+                })
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def safe_related(self, body: str, title: str = "", site_id: Optional[Any] = None,
+                     limit: int = DEFAULT_LIMIT, links_only: bool = True) -> List[Dict[str, Any]]:
+        """생성/발행 경로용 - 추천 실패 시 빈 목록 (링크 없이 계속 진행)"""
+        try:
+            return self.related(body, title, site_id, limit, links_only=links_only)
+        except Exception as e:
+            app_logger.warning(f"Related content lookup failed: {e}")
+            return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._db()
+        sources = conn.execute("SELECT source, COUNT(*) AS count FROM documents GROUP BY source").fetchall()
+        sites = conn.execute("SELECT COUNT(*) FROM sites WHERE documents > 0").fetchone()[0]
+        postings = conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        return {
+            "documents": {row["source"]: row["count"] for row in sources},
+            "sites": sites,
+            "postings": postings,
+            "index_size_mb": round(os.path.getsize(self.path) / (1024 * 1024), 2) if os.path.exists(self.path) else 0
+        }
+
+# ---- 프롬프트 / 발행 본문 ----
+
+def link_guideline(related: List[Dict[str, Any]]) -> str:
+    """생성 프롬프트용 내부 링크 후보 블록"""
+    links = [item for item in related if item.get("url")]
+    if not links:
+        return ""
+    lines = ["내부 링크 후보 (본문 맥락에 맞는 3-5개를 마크다운 링크로 자연스럽게 포함):"]
+    lines.extend(f"- [{item['title']}]({item['url']})" for item in links)
+    return "\n".join(lines)
+
+def related_posts_html(related: List[Dict[str, Any]], content: str = "") -> str:
+    """발행 본문 끝에 붙일 관련 글 목록 (본문에 이미 링크된 글은 제외)"""
+    links = [item for item in related if item.get("url") and item["url"] not in (content or "")]
+    if not links:
+        return ""
+    items = "".join(
+        f'<li><a href="{html.escape(item["url"], quote=True)}">{html.escape(item.get("title") or item["url"])}</a></li>'
+        for item in links
+    )
+    return f'\n\n<h3>함께 보면 좋은 글</h3>\n<ul class="related-posts">{items}</ul>'
+
+# ---- 재구성 ----
+
+def _index_posted(session, index: RelatedContentIndex, batch_size: int) -> int:
+    """발행된 포스팅 (hot + 보관)"""
+    from sqlalchemy import select
+    from models import ArchivedRow, PostingResult
+    from archive_store import segment_store
+
+    count, last_id = 0, ""
+    while True:
+        rows = session.execute(
+            select(PostingResult.id, PostingResult.site_id, PostingResult.title, PostingResult.content,
+                   PostingResult.post_url, PostingResult.created_at)
+            .where(PostingResult.post_status == "published", PostingResult.id > last_id)
+            .order_by(PostingResult.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        count += index.add_documents(SOURCE_POSTED, [
+            {"doc_id": row.id, "site_id": row.site_id, "title": row.title, "body": row.content,
+             "url": row.post_url, "created_at": row.created_at}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    frames = session.execute(
+        select(ArchivedRow.segment, ArchivedRow.frame_offset, ArchivedRow.frame_length)
+        .where(ArchivedRow.table_name == PostingResult.__tablename__)
+        .distinct()
+    ).all()
+    for frame in frames:
+        count += index.add_documents(SOURCE_POSTED, [
+            {"doc_id": record["id"], "site_id": record.get("site_id"), "title": record.get("title"),
+             "body": record.get("content"), "url": record.get("post_url"), "created_at": record.get("created_at")}
+            for record in segment_store.read_frame(*frame)
+            if record.get("post_status") == "published"
+        ])
+    return count
+
+def saved_related_document(content: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "doc_id": content["id"],
+        "site_id": content.get("site_id"),
+        "title": content.get("title"),
+        "body": content.get("content"),
+        "created_at": content.get("created_at")
+    }
+
+def _index_saved(index: RelatedContentIndex, storage) -> int:
+    batch, count = [], 0
+    for item in storage.load_content_list():
+        content = storage.get_content(item["id"]) or item
+        batch.append(saved_related_document(content))
+        if len(batch) >= 200:
+            count += index.add_documents(SOURCE_SAVED, batch)
+            batch = []
+    return count + index.add_documents(SOURCE_SAVED, batch)
+
+def rebuild(index: RelatedContentIndex = None, batch_size: int = 500, session_factory=None) -> Dict[str, Any]:
+    """색인 전체 재구성 - 발행 포스팅(보관분 포함) + 저장 콘텐츠"""
+    from database import SessionLocal
+    from content_storage import content_storage
+
+    index = index or related_index
+    started = time.perf_counter()
+    index.clear()
+    result: Dict[str, Any] = {"indexed": {}}
+    session = (session_factory or SessionLocal)()
+    try:
+        result["indexed"][SOURCE_POSTED] = _index_posted(session, index, batch_size)
+    finally:
+        session.close()
+    result["indexed"][SOURCE_SAVED] = _index_saved(index, content_storage)
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 1)
+    app_logger.info(f"Related content index rebuilt: {result}")
+    return result
+
+# 전역 관련 글 색인
+related_index = RelatedContentIndex()
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="관련 글 / 내부 링크 추천 색인 관리")
+    parser.add_argument("command", choices=["rebuild", "related", "stats"])
+    parser.add_argument("path", nargs="?", help="related 할 초안 파일")
+    parser.add_argument("--site", default=None)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(f"✅ 재구성 완료: {rebuild()}")
+    elif args.command == "related":
+        with open(args.path, "r", encoding="utf-8") as f:
+            body = f.read()
+        started = time.perf_counter()
+        results = related_index.related(body, site_id=args.site, limit=args.limit)
+        print(f"🔗 {len(results)}건 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"📊 {related_index.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import asyncio
 
+from seo_scoring import score_document, score_title
+
 router = APIRouter(prefix="/api/language", tags=["language"])
 
 # 지원 언어 목록
@@ -292,25 +294,20 @@ def optimize_content_for_language(content: str, lang: str) -> str:
     return content
 
 def calculate_seo_score(content: Dict, lang: str) -> int:
-    """언어별 SEO 점수 계산"""
-    score = 70
-    
-    # 제목 길이 확인
-    title_len = len(content.get("title", ""))
-    if lang == "en" and 50 <= title_len <= 60:
-        score += 10
-    elif lang == "ko" and 25 <= title_len <= 35:
-        score += 10
-    
-    # 메타 설명 확인
-    if content.get("meta_description"):
-        score += 10
-    
-    # 키워드 확인
-    if len(content.get("keywords", [])) >= 3:
-        score += 10
-    
-    return min(score, 100)
+    """언어별 SEO 점수 계산 (공통 점수 엔진 - 언어별 제목 권장 길이 적용)"""
+    keywords = content.get("keywords") or []
+    keyword = keywords[0] if keywords else None
+    if content.get("content"):
+        score = score_document(
+            content["content"], keyword=keyword, title=content.get("title"),
+            meta_description=content.get("meta_description"), language=lang
+        )["seo_score"]
+    else:
+        score = score_title(content.get("title", ""), keyword, language=lang)
+    # 키워드를 3개 이상 지정하면 가산
+    if len(keywords) >= 3:
+        score += 5
+    return int(min(score, 100))
 
 def get_language_specific_recommendations(lang: str) -> List[str]:
     """언어별 SEO 권장사항"""
@@ -73,6 +73,7 @@ class TitleGenerationRequest(BaseModel):
     language: str = "ko"
     tone: str = "professional"
     count: int = 5
+    variation: Optional[int] = None  # 주면 같은 요청에 같은 제목, 번호마다 재현 가능한 변형
 
 class TitleGenerationResponse(BaseModel):
     title: str
@@ -82,6 +83,7 @@ class ContentGenerationRequest(BaseModel):
     title: str
     keywords: Optional[str] = None
     length: str = "medium"
+    site_id: Optional[str] = None  # 지정하면 이 사이트의 발행 글을 내부 링크 후보로
 
 class ContentGenerationResponse(BaseModel):
     content: str
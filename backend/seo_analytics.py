@@ -1,27 +1,48 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, case, literal_column
 from models import Keyword, GeneratedTitle, GeneratedContent, User
-import statistics
+from activity_rollup import get_activity_totals
+
+# SEO 점수 히스토그램 구간 (하한, 라벨) - 높은 구간부터 평가
+SCORE_RANGES: List[Tuple[int, str]] = [
+    (90, "90-100 (Excellent)"),
+    (80, "80-89 (Good)"),
+    (70, "70-79 (Average)"),
+    (60, "60-69 (Poor)"),
+]
+LOWEST_SCORE_RANGE = "0-59 (Very Poor)"
 
 class SEOAnalytics:
-    """SEO 분석 및 리포팅 클래스"""
+    """SEO 분석 및 리포팅 클래스
+    
+    평균/분포/일별 집계/상위 N개를 모두 GROUP BY 집계 쿼리로 계산하고
+    ORM 객체 대신 컬럼 튜플만 받아오므로 누적 행 수와 무관하게 응답 크기가 일정하다.
+    (created_by, created_at) 복합 인덱스를 전제로 한다.
+    """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_keyword_performance(self, user_id: str, days: int = 30) -> Dict:
+    async def get_keyword_performance(self, user_id: str, days: int = 30) -> Dict:
         """키워드 성과 분석"""
         since_date = datetime.now() - timedelta(days=days)
-        
-        # 키워드 분석 통계
-        keywords = self.db.query(Keyword).filter(
+        period_filter = (
             Keyword.created_by == user_id,
             Keyword.created_at >= since_date
-        ).all()
+        )
+        
+        # 키워드 분석 통계 (건수 / 평균을 한 번에)
+        total_keywords, avg_search_volume, avg_opportunity_score = (await self.db.execute(
+            select(
+                func.count(Keyword.id),
+                func.avg(Keyword.search_volume),
+                func.avg(self._nonzero(Keyword.opportunity_score))
+            ).where(*period_filter)
+        )).one()
         
-        if not keywords:
+        if not total_keywords:
             return {
                 "total_keywords": 0,
                 "avg_search_volume": 0,
@@ -30,49 +51,56 @@ class SEOAnalytics:
                 "top_keywords": []
             }
         
-        # 통계 계산
-        search_volumes = [k.search_volume for k in keywords]
-        opportunity_scores = [k.opportunity_score for k in keywords if k.opportunity_score]
-        
         # 경쟁도 분포
-        competition_dist = {}
-        for keyword in keywords:
-            comp = keyword.competition or "Unknown"
-            competition_dist[comp] = competition_dist.get(comp, 0) + 1
+        competition_dist = await self._distribution(
+            func.coalesce(Keyword.competition, "Unknown"), period_filter
+        )
         
         # 상위 키워드 (기회점수 기준)
-        top_keywords = sorted(
-            keywords, 
-            key=lambda x: x.opportunity_score or 0, 
-            reverse=True
-        )[:10]
+        top_keywords = (await self.db.execute(
+            select(
+                Keyword.keyword,
+                Keyword.search_volume,
+                Keyword.opportunity_score,
+                Keyword.competition
+            ).where(*period_filter)
+            .order_by(desc(func.coalesce(Keyword.opportunity_score, 0)))
+            .limit(10)
+        )).all()
         
         return {
-            "total_keywords": len(keywords),
-            "avg_search_volume": statistics.mean(search_volumes) if search_volumes else 0,
-            "avg_opportunity_score": statistics.mean(opportunity_scores) if opportunity_scores else 0,
+            "total_keywords": total_keywords,
+            "avg_search_volume": self._number(avg_search_volume),
+            "avg_opportunity_score": self._number(avg_opportunity_score),
             "competition_distribution": competition_dist,
             "top_keywords": [
                 {
-                    "keyword": k.keyword,
-                    "search_volume": k.search_volume,
-                    "opportunity_score": k.opportunity_score,
-                    "competition": k.competition
+                    "keyword": keyword,
+                    "search_volume": search_volume,
+                    "opportunity_score": opportunity_score,
+                    "competition": competition
                 }
-                for k in top_keywords
+                for keyword, search_volume, opportunity_score, competition in top_keywords
             ]
         }
     
-    def get_content_analytics(self, user_id: str, days: int = 30) -> Dict:
+    async def get_content_analytics(self, user_id: str, days: int = 30) -> Dict:
         """콘텐츠 분석 데이터"""
         since_date = datetime.now() - timedelta(days=days)
-        
-        contents = self.db.query(GeneratedContent).filter(
+        period_filter = (
             GeneratedContent.created_by == user_id,
             GeneratedContent.created_at >= since_date
-        ).all()
+        )
+        
+        total_content, avg_seo_score, avg_geo_score = (await self.db.execute(
+            select(
+                func.count(GeneratedContent.id),
+                func.avg(self._nonzero(GeneratedContent.seo_score)),
+                func.avg(self._nonzero(GeneratedContent.geo_score))
+            ).where(*period_filter)
+        )).one()
         
-        if not contents:
+        if not total_content:
             return {
                 "total_content": 0,
                 "avg_seo_score": 0,
@@ -81,38 +109,39 @@ class SEOAnalytics:
                 "seo_score_distribution": {}
             }
         
-        # SEO 점수 통계
-        seo_scores = [c.seo_score for c in contents if c.seo_score]
-        geo_scores = [c.geo_score for c in contents if c.geo_score]
-        
         # 일별 콘텐츠 생성량
-        content_by_day = self._get_daily_counts(contents, days)
+        content_by_day = await self._daily_counts(GeneratedContent.created_at, period_filter, days)
         
-        # SEO 점수 분포
-        seo_distribution = {}
-        for content in contents:
-            if content.seo_score:
-                score_range = self._get_score_range(content.seo_score)
-                seo_distribution[score_range] = seo_distribution.get(score_range, 0) + 1
+        # SEO 점수 분포 (점수가 있는 콘텐츠만)
+        seo_distribution = await self._distribution(
+            self._score_range(GeneratedContent.seo_score),
+            period_filter + (self._nonzero(GeneratedContent.seo_score).isnot(None),)
+        )
         
         return {
-            "total_content": len(contents),
-            "avg_seo_score": statistics.mean(seo_scores) if seo_scores else 0,
-            "avg_geo_score": statistics.mean(geo_scores) if geo_scores else 0,
+            "total_content": total_content,
+            "avg_seo_score": self._number(avg_seo_score),
+            "avg_geo_score": self._number(avg_geo_score),
             "content_by_day": content_by_day,
             "seo_score_distribution": seo_distribution
         }
     
-    def get_title_analytics(self, user_id: str, days: int = 30) -> Dict:
+    async def get_title_analytics(self, user_id: str, days: int = 30) -> Dict:
         """제목 분석 데이터"""
         since_date = datetime.now() - timedelta(days=days)
-        
-        titles = self.db.query(GeneratedTitle).filter(
+        period_filter = (
             GeneratedTitle.created_by == user_id,
             GeneratedTitle.created_at >= since_date
-        ).all()
+        )
         
-        if not titles:
+        total_titles, avg_duplicate_rate = (await self.db.execute(
+            select(
+                func.count(GeneratedTitle.id),
+                func.avg(self._nonzero(GeneratedTitle.duplicate_rate))
+            ).where(*period_filter)
+        )).one()
+        
+        if not total_titles:
             return {
                 "total_titles": 0,
                 "avg_duplicate_rate": 0,
@@ -121,51 +150,28 @@ class SEOAnalytics:
                 "titles_by_day": []
             }
         
-        # 중복률 통계
-        duplicate_rates = [t.duplicate_rate for t in titles if t.duplicate_rate]
-        
-        # 언어 분포
-        lang_dist = {}
-        for title in titles:
-            lang = title.language or "unknown"
-            lang_dist[lang] = lang_dist.get(lang, 0) + 1
-        
-        # 톤 분포
-        tone_dist = {}
-        for title in titles:
-            tone = title.tone or "unknown"
-            tone_dist[tone] = tone_dist.get(tone, 0) + 1
+        # 언어 / 톤 분포
+        lang_dist = await self._distribution(func.coalesce(GeneratedTitle.language, "unknown"), period_filter)
+        tone_dist = await self._distribution(func.coalesce(GeneratedTitle.tone, "unknown"), period_filter)
         
         # 일별 제목 생성량
-        titles_by_day = self._get_daily_counts(titles, days)
+        titles_by_day = await self._daily_counts(GeneratedTitle.created_at, period_filter, days)
         
         return {
-            "total_titles": len(titles),
-            "avg_duplicate_rate": statistics.mean(duplicate_rates) if duplicate_rates else 0,
+            "total_titles": total_titles,
+            "avg_duplicate_rate": self._number(avg_duplicate_rate),
             "language_distribution": lang_dist,
             "tone_distribution": tone_dist,
             "titles_by_day": titles_by_day
         }
     
-    def get_productivity_metrics(self, user_id: str, days: int = 30) -> Dict:
+    async def get_productivity_metrics(self, user_id: str, days: int = 30) -> Dict:
         """생산성 지표"""
-        since_date = datetime.now() - timedelta(days=days)
-        
-        # 각 활동별 카운트
-        keywords_count = self.db.query(func.count(Keyword.id)).filter(
-            Keyword.created_by == user_id,
-            Keyword.created_at >= since_date
-        ).scalar()
-        
-        titles_count = self.db.query(func.count(GeneratedTitle.id)).filter(
-            GeneratedTitle.created_by == user_id,
-            GeneratedTitle.created_at >= since_date
-        ).scalar()
-        
-        content_count = self.db.query(func.count(GeneratedContent.id)).filter(
-            GeneratedContent.created_by == user_id,
-            GeneratedContent.created_at >= since_date
-        ).scalar()
+        # 각 활동별 카운트 (일별 집계 테이블에서 최근 N일 행만 합산)
+        totals = await get_activity_totals(self.db, user_id, days=days)
+        keywords_count = totals["keywords_count"]
+        titles_count = totals["titles_count"]
+        content_count = totals["contents_count"]
         
         # 일평균 계산
         daily_avg = {
@@ -191,13 +197,14 @@ class SEOAnalytics:
             "completion_rates": completion_rate
         }
     
-    def get_comprehensive_dashboard(self, user_id: str, days: int = 30) -> Dict:
+    async def get_comprehensive_dashboard(self, user_id: str, days: int = 30) -> Dict:
         """종합 대시보드 데이터"""
+        # 하나의 AsyncSession 은 동시 쿼리를 허용하지 않으므로 순차 실행
         return {
-            "keyword_performance": self.get_keyword_performance(user_id, days),
-            "content_analytics": self.get_content_analytics(user_id, days),
-            "title_analytics": self.get_title_analytics(user_id, days),
-            "productivity_metrics": self.get_productivity_metrics(user_id, days),
+            "keyword_performance": await self.get_keyword_performance(user_id, days),
+            "content_analytics": await self.get_content_analytics(user_id, days),
+            "title_analytics": await self.get_title_analytics(user_id, days),
+            "productivity_metrics": await self.get_productivity_metrics(user_id, days),
             "period": {
                 "days": days,
                 "start_date": (datetime.now() - timedelta(days=days)).isoformat(),
@@ -205,38 +212,54 @@ class SEOAnalytics:
             }
         }
     
-    def _get_daily_counts(self, items: List, days: int) -> List[Dict]:
-        """일별 카운트 데이터 생성"""
-        daily_counts = {}
-        
-        # 지난 N일 동안의 날짜 초기화
-        for i in range(days):
-            date = datetime.now() - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            daily_counts[date_str] = 0
-        
-        # 실제 데이터 카운트
-        for item in items:
-            if item.created_at:
-                date_str = item.created_at.strftime("%Y-%m-%d")
-                if date_str in daily_counts:
-                    daily_counts[date_str] += 1
-        
-        # 날짜순 정렬
-        return [
-            {"date": date, "count": count}
-            for date, count in sorted(daily_counts.items())
-        ]
+    async def _distribution(self, label, filters: tuple) -> Dict[str, int]:
+        """라벨별 건수 (GROUP BY)"""
+        rows = (await self.db.execute(
+            select(label.label("bucket"), func.count().label("count"))
+            .where(*filters)
+            .group_by("bucket")
+        )).all()
+        return {bucket: count for bucket, count in rows}
+    
+    async def _daily_counts(self, created_at_column, filters: tuple, days: int) -> List[Dict]:
+        """일별 카운트 데이터 생성 - 날짜 버킷 집계 후 빈 날짜를 0으로 채움"""
+        rows = (await self.db.execute(
+            select(func.date(created_at_column).label("day"), func.count().label("count"))
+            .where(*filters)
+            .group_by("day")
+        )).all()
+        # SQLite 는 'YYYY-MM-DD' 문자열, PostgreSQL 은 date 객체를 반환
+        counts = {str(day)[:10]: count for day, count in rows if day is not None}
+        
+        # 지난 N일 동안의 날짜 초기화 후 날짜순 정렬
+        today = datetime.now()
+        dates = sorted(
+            (today - timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range(days)
+        )
+        return [{"date": date, "count": counts.get(date, 0)} for date in dates]
+    
+    @staticmethod
+    def _nonzero(column):
+        """0 / NULL 을 제외한 값 (기존 통계가 falsy 값을 제외하던 동작 유지)"""
+        return case((column != 0, column), else_=None)
+    
+    @staticmethod
+    def _score_range(column):
+        """점수를 범위 라벨로 분류하는 CASE 식 (GROUP BY 에서 같은 식으로 인식되도록 바인드 대신 상수 사용)"""
+        return case(
+            *[(column >= lower, literal_column(f"'{label}'")) for lower, label in SCORE_RANGES],
+            else_=literal_column(f"'{LOWEST_SCORE_RANGE}'")
+        )
+    
+    @staticmethod
+    def _number(value: Any) -> float:
+        """AVG 결과(Decimal/None)를 JSON 직렬화 가능한 숫자로 변환"""
+        return float(value) if value is not None else 0
     
     def _get_score_range(self, score: int) -> str:
         """점수를 범위로 분류"""
-        if score >= 90:
-            return "90-100 (Excellent)"
-        elif score >= 80:
-            return "80-89 (Good)"
-        elif score >= 70:
-            return "70-79 (Average)"
-        elif score >= 60:
-            return "60-69 (Poor)"
-        else:
-            return "0-59 (Very Poor)"
\ No newline at end of file
+        for lower, label in SCORE_RANGES:
+            if score >= lower:
+                return label
+        return LOWEST_SCORE_RANGE
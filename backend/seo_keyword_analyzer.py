@@ -43,18 +43,20 @@ class SEOKeywordAnalyzer:
             "문제해결": ["해결", "문제", "고장", "오류", "수리", "개선", "최적화"]
         }
     
-    def get_active_guideline(self, db_session):
-        """활성화된 키워드 분석 지침 가져오기"""
+    async def get_active_guideline(self, db_session):
+        """활성화된 키워드 분석 지침 가져오기 (AsyncSession)"""
         try:
             from models import SystemPrompt
-            from sqlalchemy import and_
+            from sqlalchemy import select, and_
             
-            guideline = db_session.query(SystemPrompt).filter(
-                and_(
-                    SystemPrompt.prompt_type == 'KEYWORD_ANALYSIS',
-                    SystemPrompt.is_active == True
+            guideline = (await db_session.execute(
+                select(SystemPrompt).where(
+                    and_(
+                        SystemPrompt.prompt_type == 'KEYWORD_ANALYSIS',
+                        SystemPrompt.is_active == True
+                    )
                 )
-            ).first()
+            )).scalars().first()
             
             if guideline:
                 return guideline.prompt_content
@@ -231,7 +233,7 @@ class SEOKeywordAnalyzer:
         guideline = None
         if db_session:
             try:
-                guideline = self.get_active_guideline(db_session)
+                guideline = await self.get_active_guideline(db_session)
                 print(f"지침 로드됨: {len(guideline) if guideline else 0}자")
             except Exception as e:
                 print(f"지침 로드 실패, 기본 알고리즘 사용: {e}")
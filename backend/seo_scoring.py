@@ -0,0 +1,300 @@
+"""
+SEO / GEO / 가독성 점수 엔진
+생성기마다 따로 있던 점수 계산(str.count / in / lower() 반복)을 하나로 모음
+- 문서를 정규식 한 번의 순회로 토큰화하면서 특징(키워드 밀도, 헤딩 구조, 리스트, 문장 길이 분포, FAQ, 인용 표현)을 모두 추출
+- 특징 행렬에 점수식을 한 번에 적용 (NumPy 가 있으면 배치 전체를 벡터 연산, 없으면 문서별로 같은 식)
+- 키워드 횟수/밀도는 같은 순회에서 모은 어절 토큰을 korean_text 분석기에 넘겨 셈 (조사가 붙은 어절, 합성어도 키워드로 셈)
+- 제목 내 키워드 위치는 korean_text 의 메모된 분석 결과 사용
+- 제목 점수(score_title)도 같은 기준(언어별 권장 길이)으로 계산
+"""
+
+import math
+import re
+from dataclasses import dataclass, asdict, fields
+from typing import Any, Dict, List, Optional, Sequence
+
+from korean_text import analyze_keyword, analyze_tokens, tokenize
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# AI 답변 엔진이 인용하기 좋은 출처/근거 표현
+CITATION_PHRASES = (
+    "연구에 따르면", "보고서에 따르면", "통계적으로", "전문가들은", "연구결과", "연구 결과",
+    "데이터 분석 결과", "조사에서", "조사 결과", "학계에서는", "업계 전문가", "사례를 살펴보면",
+    "according to", "research shows", "studies show"
+)
+
+# 언어별 제목 길이 (최적 구간, 허용 구간)
+TITLE_LENGTH_RANGES = {
+    "ko": ((25, 40), (20, 60)),
+    "en": ((50, 60), (40, 70)),
+    "ja": ((20, 32), (15, 40)),
+}
+
+LONG_SENTENCE_CHARS = 80
+
+_TOKEN_PARTS = (
+    ("conclusion", r"^[ \t]*#{1,6}[ \t]*(?:마무리|결론|맺음말|정리하며|conclusion)"),
+    ("heading", r"^[ \t]*(#{1,6})[ \t]"),
+    ("list", r"^[ \t]*(?:[-*•]|\d{1,2}[.)])[ \t]"),
+    ("question", r"^[ \t]*(?:\*\*)?(?:Q\d*|질문\s*\d*)[ \t]*[:.)]"),
+    ("faq", r"자주[ \t]*묻는[ \t]*질문|FAQ"),
+    ("citation", "|".join(re.escape(phrase) for phrase in CITATION_PHRASES)),
+    ("bold", r"\*\*"),
+    ("paragraph", r"\n[ \t]*\n"),
+    ("sentence", r"[.!?](?=\s|$)"),
+    ("number", r"\d+(?:[.,]\d+)*%?"),
+    ("word", r"[^\W\d_]+"),
+)
+
+_TOKENIZER = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _TOKEN_PARTS), re.MULTILINE | re.IGNORECASE)
+
+@dataclass
+class DocumentFeatures:
+    """점수 계산에 쓰는 문서 특징 (모두 수치 - 특징 행렬의 한 행)"""
+    length: int = 0
+    letters: int = 0                 # 공백/기호를 뺀 글자 수
+    words: int = 0
+    keyword_count: int = 0
+    keyword_density: float = 0.0     # 키워드 글자 비율 (%)
+    h1: int = 0
+    h2: int = 0
+    h3: int = 0
+    headings: int = 0
+    list_items: int = 0
+    bold: int = 0
+    paragraphs: int = 0
+    sentences: int = 0
+    avg_sentence_length: float = 0.0
+    sentence_length_std: float = 0.0
+    long_sentence_ratio: float = 0.0
+    questions: int = 0
+    has_faq: int = 0
+    has_conclusion: int = 0
+    citations: int = 0
+    numbers: int = 0
+    keyword_in_title: int = 0
+    keyword_title_front: int = 0
+    title_length: int = 0
+    title_length_band: int = 0       # 2 = 최적 구간, 1 = 허용 구간
+    meta_length: int = 0
+
+FEATURE_NAMES = tuple(field.name for field in fields(DocumentFeatures))
+
+def _title_band(length: int, language: str) -> int:
+    (best_min, best_max), (ok_min, ok_max) = TITLE_LENGTH_RANGES.get(language, TITLE_LENGTH_RANGES["ko"])
+    if best_min <= length <= best_max:
+        return 2
+    if ok_min <= length <= ok_max:
+        return 1
+    return 0
+
+def extract_features(
+    content: str,
+    keyword: Optional[str] = None,
+    title: Optional[str] = None,
+    meta_description: Optional[str] = None,
+    language: str = "ko"
+) -> DocumentFeatures:
+    """본문 한 번 순회로 모든 특징 추출"""
+    content = content or ""
+    keyword = (keyword or "").strip()
+    features = DocumentFeatures(length=len(content))
+    boundaries = [0]
+    letters = 0
+    # 키워드 분석용 어절 토큰 - 붙어 있는 word/number 조각("2024년")을 한 어절로 모아 토큰화
+    tokens = [] if keyword else None
+    run_start = run_end = -1
+
+    for match in _TOKENIZER.finditer(content):
+        kind = match.lastgroup
+        if kind == "word" or kind == "number":
+            features.words += 1
+            letters += match.end() - match.start()
+            if kind == "number":
+                features.numbers += 1
+            if tokens is not None:
+                if match.start() != run_end:
+                    if run_end > 0:
+                        tokens.extend(tokenize(content, run_start, run_end))
+                    run_start = match.start()
+                run_end = match.end()
+        elif kind == "heading" or kind == "conclusion":
+            level = match.group().strip().count("#")
+            features.headings += 1
+            if level == 1:
+                features.h1 += 1
+            elif level == 2:
+                features.h2 += 1
+            elif level == 3:
+                features.h3 += 1
+            if kind == "conclusion":
+                features.has_conclusion = 1
+            boundaries.append(match.start())
+        elif kind == "list":
+            features.list_items += 1
+        elif kind == "sentence":
+            boundaries.append(match.end())
+        elif kind == "paragraph":
+            features.paragraphs += 1
+            boundaries.append(match.end())
+        elif kind == "bold":
+            features.bold += 1
+        elif kind == "question":
+            features.questions += 1
+        elif kind == "faq":
+            features.has_faq = 1
+        elif kind == "citation":
+            features.citations += 1
+
+    features.letters = letters
+    features.bold //= 2
+    features.paragraphs += 1 if content.strip() else 0
+    if features.questions >= 2:
+        features.has_faq = 1
+    if keyword:
+        if run_end > 0:
+            tokens.extend(tokenize(content, run_start, run_end))
+        analysis = analyze_tokens(tokens, keyword)
+        features.keyword_count = analysis.count
+        features.keyword_density = analysis.density
+
+    # 문장 길이 분포 (문장 끝 / 문단 / 헤딩 경계 사이 글자 수, 2자 미만 조각 제외)
+    boundaries.append(len(content))
+    lengths = [end - start for start, end in zip(boundaries, boundaries[1:]) if end - start >= 2]
+    if lengths:
+        mean = sum(lengths) / len(lengths)
+        features.sentences = len(lengths)
+        features.avg_sentence_length = round(mean, 2)
+        features.sentence_length_std = round(math.sqrt(sum((x - mean) ** 2 for x in lengths) / len(lengths)), 2)
+        features.long_sentence_ratio = round(sum(1 for x in lengths if x > LONG_SENTENCE_CHARS) / len(lengths), 3)
+
+    if title:
+        features.title_length = len(title)
+        features.title_length_band = _title_band(len(title), language)
+        if keyword:
+            position = analyze_keyword(title, keyword).first_position
+            features.keyword_in_title = int(position >= 0)
+            features.keyword_title_front = int(0 <= position <= len(title) // 2)
+    features.meta_length = len(meta_description or "")
+    return features
+
+# ---- 점수식 (NumPy 배열 열과 파이썬 스칼라 모두에 같은 식 적용) ----
+
+def _between(x, low, high):
+    return ((x >= low) & (x <= high)) * 1.0
+
+def _score_columns(c: Dict[str, Any], minimum, maximum) -> Dict[str, Any]:
+    density_ok = _between(c["keyword_density"], 1.0, 3.0)
+    seo = (
+        40
+        + 15 * density_ok + 6 * (c["keyword_density"] > 0) * (1 - density_ok)
+        + 10 * c["keyword_in_title"] + 5 * c["keyword_title_front"]
+        + 10 * minimum(c["h2"], 4) / 4 + 3 * (c["h3"] > 0)
+        + 5 * minimum(c["list_items"], 5) / 5
+        + 8 * _between(c["letters"], 1500, 4000) + 4 * (c["letters"] >= 800) * (c["letters"] < 1500)
+        + 6 * c["has_faq"] + 4 * c["has_conclusion"]
+        + 3 * _between(c["meta_length"], 80, 160)
+        + 4 * (c["title_length_band"] == 2) + 2 * (c["title_length_band"] == 1)
+    )
+    readability = (
+        60
+        # 문장 길이 구간은 [20, 40] / (40, 60] / 60 초과 - 경계 사이 빈틈 없이
+        + 15 * _between(c["avg_sentence_length"], 20, 40)
+        + 7 * (c["avg_sentence_length"] > 40) * (c["avg_sentence_length"] <= 60)
+        - 15 * (c["avg_sentence_length"] > 60)
+        - 20 * c["long_sentence_ratio"]
+        + 10 * minimum(c["paragraphs"], 4) / 4
+        + 5 * (c["headings"] >= 3) + 5 * (c["list_items"] > 0)
+    )
+    geo = (
+        minimum(c["citations"] * 15, 45)
+        + 15 * ((c["list_items"] + c["bold"]) > 0)
+        + minimum(c["headings"] * 6, 24)
+        + 6 * (c["numbers"] > 0) + 10 * c["has_faq"]
+    )
+    quality = (
+        50
+        + 20 * _between(c["length"], 500, 3000)
+        + 15 * (1 - _between(c["length"], 500, 3000)) * _between(c["length"], 200, 5000)
+        + 10 * (c["length"] > 100) * (1 - _between(c["length"], 200, 5000))
+        + 5 * (c["paragraphs"] > 1) + 10 * (c["headings"] > 0) + 5 * (c["list_items"] > 0)
+        + 10 * (c["sentences"] > 3) * _between(c["avg_sentence_length"], 20, 100)
+    )
+    # 빈 문서는 기본 가산점 없이 모두 0
+    not_empty = c["length"] > 0
+    return {
+        "seo_score": minimum(maximum(seo, 0), 100) * not_empty,
+        "readability_score": minimum(maximum(readability, 0), 100) * not_empty,
+        "geo_score": minimum(maximum(geo, 0), 100) * not_empty,
+        "quality_score": minimum(maximum(quality, 0), 100) * not_empty,
+    }
+
+def score_features(rows: Sequence[DocumentFeatures]) -> List[Dict[str, float]]:
+    """특징 행들의 점수 - NumPy 가 있으면 (문서 수 x 특징 수) 행렬에 한 번에 계산"""
+    if not rows:
+        return []
+    if NUMPY_AVAILABLE:
+        matrix = np.array([[getattr(row, name) for name in FEATURE_NAMES] for row in rows], dtype=np.float64)
+        columns = {name: matrix[:, index] for index, name in enumerate(FEATURE_NAMES)}
+        scores = _score_columns(columns, np.minimum, np.maximum)
+        rounded = {name: np.round(values, 1).tolist() for name, values in scores.items()}
+        return [{name: rounded[name][i] for name in rounded} for i in range(len(rows))]
+    results = []
+    for row in rows:
+        scores = _score_columns(asdict(row), min, max)
+        results.append({name: round(float(value), 1) for name, value in scores.items()})
+    return results
+
+def score_documents(documents: Sequence[Dict[str, Any]], include_features: bool = False) -> List[Dict[str, Any]]:
+    """문서 배치 점수 - 각 문서는 content, keyword, title, meta_description, language"""
+    rows = [
+        extract_features(
+            doc.get("content"), doc.get("keyword"), doc.get("title"),
+            doc.get("meta_description"), doc.get("language") or "ko"
+        )
+        for doc in documents
+    ]
+    results = score_features(rows)
+    if include_features:
+        for result, row in zip(results, rows):
+            result["features"] = asdict(row)
+    return results
+
+def score_document(
+    content: str,
+    keyword: Optional[str] = None,
+    title: Optional[str] = None,
+    meta_description: Optional[str] = None,
+    language: str = "ko",
+    include_features: bool = False
+) -> Dict[str, Any]:
+    return score_documents([{
+        "content": content, "keyword": keyword, "title": title,
+        "meta_description": meta_description, "language": language
+    }], include_features)[0]
+
+def score_title(title: str, keyword: Optional[str] = None, language: str = "ko") -> float:
+    """제목 SEO 점수 - 키워드 위치, 언어별 권장 길이, 숫자, 구조(:), 질문/감탄"""
+    title = title or ""
+    score = 50.0
+    if keyword:
+        position = analyze_keyword(title, keyword).first_position
+        if position == 0:
+            score += 20
+        elif 0 < position <= len(title) // 2:
+            score += 15
+        elif position > 0:
+            score += 10
+    score += (0, 8, 15)[_title_band(len(title), language)]
+    if any(char.isdigit() for char in title):
+        score += 8
+    if ":" in title:
+        score += 4
+    if "?" in title or "!" in title:
+        score += 3
+    return min(score, 100.0)
@@ -7,8 +7,8 @@ import json
 import asyncio
 import aiohttp
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from cryptography.fernet import Fernet
 import os
 import base64
@@ -16,6 +16,7 @@ from datetime import datetime
 
 from models import Site, SystemPrompt, User
 from logger import app_logger
+from activity_rollup import get_activity_totals
 
 class SiteManager:
     def __init__(self):
@@ -55,7 +56,7 @@ class SiteManager:
     
     async def create_site(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         user_id: str,
         name: str,
         url: str,
@@ -94,42 +95,46 @@ class SiteManager:
             )
             
             db.add(site)
-            db.commit()
-            db.refresh(site)
+            await db.commit()
+            await db.refresh(site)
             
             app_logger.info(f"사이트 등록 완료: {site.id}")
             return site
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             app_logger.error(f"사이트 등록 실패: {e}")
             raise
     
-    async def get_user_sites(self, db: Session, user_id: str) -> List[Site]:
+    async def get_user_sites(self, db: AsyncSession, user_id: str) -> List[Site]:
         """사용자의 사이트 목록 조회"""
         try:
-            sites = db.query(Site).filter(
-                and_(
-                    Site.created_by == user_id,
-                    Site.is_active == True
-                )
-            ).order_by(Site.created_at.desc()).all()
+            sites = (await db.execute(
+                select(Site).where(
+                    and_(
+                        Site.created_by == user_id,
+                        Site.is_active == True
+                    )
+                ).order_by(Site.created_at.desc())
+            )).scalars().all()
             
             return sites
         except Exception as e:
             app_logger.error(f"사이트 목록 조회 실패: {e}")
             raise
     
-    async def get_site_by_id(self, db: Session, site_id: str, user_id: str) -> Optional[Site]:
+    async def get_site_by_id(self, db: AsyncSession, site_id: str, user_id: str) -> Optional[Site]:
         """사이트 상세 정보 조회"""
         try:
-            site = db.query(Site).filter(
-                and_(
-                    Site.id == site_id,
-                    Site.created_by == user_id,
-                    Site.is_active == True
+            site = (await db.execute(
+                select(Site).where(
+                    and_(
+                        Site.id == site_id,
+                        Site.created_by == user_id,
+                        Site.is_active == True
+                    )
                 )
-            ).first()
+            )).scalars().first()
             
             return site
         except Exception as e:
@@ -138,7 +143,7 @@ class SiteManager:
     
     async def update_site(
         self,
-        db: Session,
+        db: AsyncSession,
         site_id: str,
         user_id: str,
         **update_data
@@ -166,18 +171,18 @@ class SiteManager:
                     setattr(site, field, value)
             
             site.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(site)
+            await db.commit()
+            await db.refresh(site)
             
             app_logger.info(f"사이트 수정 완료: {site_id}")
             return site
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             app_logger.error(f"사이트 수정 실패: {e}")
             raise
     
-    async def delete_site(self, db: Session, site_id: str, user_id: str) -> bool:
+    async def delete_site(self, db: AsyncSession, site_id: str, user_id: str) -> bool:
         """사이트 삭제 (소프트 삭제)"""
         
         app_logger.info(f"사이트 삭제 시작: {site_id}")
@@ -189,13 +194,13 @@ class SiteManager:
             
             site.is_active = False
             site.updated_at = datetime.utcnow()
-            db.commit()
+            await db.commit()
             
             app_logger.info(f"사이트 삭제 완료: {site_id}")
             return True
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             app_logger.error(f"사이트 삭제 실패: {e}")
             raise
     
@@ -261,13 +266,15 @@ class SiteManager:
                 "message": f"예상치 못한 오류: {str(e)}"
             }
     
-    async def get_available_guidelines(self, db: Session) -> Dict[str, List[Dict]]:
+    async def get_available_guidelines(self, db: AsyncSession) -> Dict[str, List[Dict]]:
         """사용 가능한 지침 목록 조회"""
         try:
             # 활성화된 지침들 조회
-            guidelines = db.query(SystemPrompt).filter(
-                SystemPrompt.is_active == True
-            ).order_by(SystemPrompt.prompt_type, SystemPrompt.created_at.desc()).all()
+            guidelines = (await db.execute(
+                select(SystemPrompt).where(
+                    SystemPrompt.is_active == True
+                ).order_by(SystemPrompt.prompt_type, SystemPrompt.created_at.desc())
+            )).scalars().all()
             
             # 타입별로 그룹화
             result = {
@@ -295,23 +302,35 @@ class SiteManager:
             app_logger.error(f"지침 목록 조회 실패: {e}")
             raise
     
-    async def get_site_statistics(self, db: Session, site_id: str, user_id: str) -> Dict[str, Any]:
+    async def get_site_statistics(
+        self,
+        db: AsyncSession,
+        site_id: str,
+        user_id: str,
+        days: Optional[int] = None
+    ) -> Dict[str, Any]:
         """사이트 통계 정보 조회"""
         try:
             site = await self.get_site_by_id(db, site_id, user_id)
             if not site:
                 return {}
             
+            # 사이트의 일별 집계 행만 합산 (days 지정 시 최근 N일)
+            totals = await get_activity_totals(db, user_id, days=days, site_id=site_id)
+            posts_generated = totals["contents_count"]
+            last_activity = totals["last_activity"] or site.updated_at
+            
             return {
-                "total_keywords_generated": site.total_keywords_generated,
-                "total_titles_generated": site.total_titles_generated,
-                "total_posts_generated": site.total_posts_generated,
-                "total_posts_published": site.total_posts_published,
+                "total_keywords_generated": totals["keywords_count"],
+                "total_titles_generated": totals["titles_count"],
+                "total_posts_generated": posts_generated,
+                "total_posts_published": totals["posts_published_count"],
+                "total_posts_failed": totals["posts_failed_count"],
                 "success_rate": (
-                    site.total_posts_published / site.total_posts_generated * 100
-                    if site.total_posts_generated > 0 else 0
+                    totals["posts_published_count"] / posts_generated * 100
+                    if posts_generated > 0 else 0
                 ),
-                "last_activity": site.updated_at.isoformat() if site.updated_at else None
+                "last_activity": last_activity.isoformat() if last_activity else None
             }
             
         except Exception as e:
@@ -7,7 +7,9 @@
 import random
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from seo_scoring import score_document
+from generation_seed import generation_rng
 
 class SmartContentGenerator:
     
@@ -121,10 +123,11 @@ class SmartContentGenerator:
         
         return "lifestyle"  # 기본 카테고리
 
-    def generate_intro(self, keyword: str, category: str) -> str:
+    def generate_intro(self, keyword: str, category: str, rng: Optional[random.Random] = None) -> str:
         """SEO 지침에 맞는 도입부 생성 (이모티콘 제거, 간결성 강화)"""
+        rng = rng or random
         template = self.category_templates.get(category, self.category_templates["lifestyle"])
-        intro_style = random.choice(template["intro_styles"])
+        intro_style = rng.choice(template["intro_styles"])
         
         if category == "health":
             return f"""{intro_style} {keyword}에 대해 알아보겠습니다.
@@ -154,14 +157,15 @@ class SmartContentGenerator:
 
 이 글에서는 {keyword}의 기본 개념과 핵심 포인트, 단계별 가이드, 실제 활용법, 전문가 추천 팁을 다룹니다."""
 
-    def generate_main_content(self, keyword: str, category: str, length: str) -> str:
+    def generate_main_content(self, keyword: str, category: str, length: str, rng: Optional[random.Random] = None) -> str:
         """카테고리에 맞는 메인 콘텐츠 생성"""
+        rng = rng or random
         template = self.category_templates.get(category, self.category_templates["lifestyle"])
         sections = template["main_sections"]
         
         # 길이에 따라 섹션 수 조정
         section_count = {"short": 3, "medium": 4, "long": 6}.get(length, 4)
-        selected_sections = random.sample(sections, min(section_count, len(sections)))
+        selected_sections = rng.sample(sections, min(section_count, len(sections)))
         
         content_parts = []
         
@@ -196,7 +200,7 @@ class SmartContentGenerator:
                 content_parts.append(self._generate_health_content(keyword, section))
                 
             elif category == "food":
-                content_parts.append(self._generate_food_content(keyword, section))
+                content_parts.append(self._generate_food_content(keyword, section, rng))
             elif category == "business":
                 content_parts.append(self._generate_business_content(keyword, section))
             else:
@@ -259,19 +263,20 @@ class SmartContentGenerator:
 - 적절한 운동과 함께 실천
 - 충분한 휴식과 수면 생활 유지"""
 
-    def _generate_food_content(self, keyword: str, section: str) -> str:
+    def _generate_food_content(self, keyword: str, section: str, rng: Optional[random.Random] = None) -> str:
         """음식 관련 콘텐츠 생성 (지침 준수: 이모티콘 제거, 자연스러운 표현)"""
+        rng = rng or random
         if "영양" in section:
             return f"""### {keyword}의 영양학적 가치
 
 {keyword}의 주요 영양 성분과 건강에 미치는 영향을 분석해보겠습니다.
 
 주요 영양 성분 (100g 기준):
-- 칼로리: {random.randint(50, 300)}kcal (일일 권장량의 {random.randint(3, 15)}%)
-- 단백질: {random.randint(2, 25)}g (일일 권장량의 {random.randint(5, 45)}%)
-- 탄수화물: {random.randint(5, 70)}g (일일 권장량의 {random.randint(2, 25)}%)
-- 지방: {random.randint(0, 15)}g (일일 권장량의 {random.randint(1, 20)}%)
-- 식이섬유: {random.randint(1, 10)}g (일일 권장량의 {random.randint(5, 40)}%)
+- 칼로리: {rng.randint(50, 300)}kcal (일일 권장량의 {rng.randint(3, 15)}%)
+- 단백질: {rng.randint(2, 25)}g (일일 권장량의 {rng.randint(5, 45)}%)
+- 탄수화물: {rng.randint(5, 70)}g (일일 권장량의 {rng.randint(2, 25)}%)
+- 지방: {rng.randint(0, 15)}g (일일 권장량의 {rng.randint(1, 20)}%)
+- 식이섬유: {rng.randint(1, 10)}g (일일 권장량의 {rng.randint(5, 40)}%)
 
 특별한 영양소:
 - 비타민 C: 면역력 강화 및 항산화 효과
@@ -460,17 +465,22 @@ A2: 기본적인 내용은 혼자서도 충분히 학습 가능합니다. 다만
 Q3: 얼마나 시간을 투자해야 의미 있는 결과를 볼 수 있나요?
 A3: 개인차가 있지만 꾸준히 실천한다면 3-6개월 후부터 눈에 띄는 변화를 경험하실 수 있습니다."""
 
-    def generate_complete_content(self, keyword: str, title: str, length: str, tone: str) -> Dict:
-        """완전한 맞춤형 콘텐츠 생성"""
+    def generate_complete_content(self, keyword: str, title: str, length: str, tone: str,
+                                  variation: Optional[int] = None, rng: Optional[random.Random] = None) -> Dict:
+        """완전한 맞춤형 콘텐츠 생성
+
+        variation 을 주거나 결정적 모드면 같은 입력에 같은 본문 (변형 번호마다 다른 본문)
+        """
+        rng = rng or generation_rng("smart_content", keyword, title, length, tone, variation=variation)
         
         # 키워드 카테고리 분류
         category = self.categorize_keyword(keyword)
         
         # 도입부 생성
-        intro = self.generate_intro(keyword, category)
+        intro = self.generate_intro(keyword, category, rng)
         
         # 메인 콘텐츠 생성  
-        main_content = self.generate_main_content(keyword, category, length)
+        main_content = self.generate_main_content(keyword, category, length, rng)
         
         # FAQ 생성
         faq_content = self.generate_faq(keyword, category)
@@ -501,42 +511,41 @@ A3: 개인차가 있지만 꾸준히 실천한다면 3-6개월 후부터 눈에
 
 {conclusion}"""
 
-        # 콘텐츠 분석
-        word_count = len(full_content.replace(' ', '').replace('\n', ''))
-        keyword_count = full_content.lower().count(keyword.lower())
-        keyword_density = (keyword_count * len(keyword)) / len(full_content) * 100 if len(full_content) > 0 else 0
-        
-        # SEO 점수 계산
-        seo_factors = {
-            "keyword_in_title": keyword.lower() in title.lower(),
-            "proper_headings": full_content.count('##') >= 4,
-            "bullet_points": full_content.count('**') >= 10,
-            "word_count_good": 1500 <= word_count <= 4000,
-            "keyword_density_good": 1.0 <= keyword_density <= 3.0,
-            "has_faq": "자주 묻는 질문" in full_content,
-            "has_conclusion": "마무리" in full_content,
-            "category_relevant": category != "lifestyle" or "라이프스타일" in keyword.lower()
-        }
-        
-        seo_score = 70 + sum([10 if factor else 0 for factor in seo_factors.values()])
-        seo_score = min(seo_score, 98)
-        
         return {
             "content": full_content,
-            "word_count": word_count,
-            "keyword_count": keyword_count,
-            "keyword_density": round(keyword_density, 2),
-            "seo_score": round(seo_score, 1),
-            "category": category,
-            "seo_analysis": seo_factors
+            **self._analyze_content(full_content, keyword, title),
+            "category": category
         }
 
-    def generate_with_guidelines(self, keyword: str, title: str, length: str, tone: str, guidelines: str = "") -> Dict:
+    def _analyze_content(self, full_content: str, keyword: str, title: str) -> Dict:
+        """공통 점수 엔진으로 본문 분석 (글자 수, 키워드 밀도, SEO 점수와 근거)"""
+        result = score_document(full_content, keyword=keyword, title=title, include_features=True)
+        features = result["features"]
+        return {
+            "word_count": features["letters"],
+            "keyword_count": features["keyword_count"],
+            "keyword_density": round(features["keyword_density"], 2),
+            "seo_score": result["seo_score"],
+            "readability_score": result["readability_score"],
+            "geo_score": result["geo_score"],
+            "seo_analysis": {
+                "keyword_in_title": bool(features["keyword_in_title"]),
+                "proper_headings": features["h2"] >= 4,
+                "bullet_points": features["list_items"] + features["bold"] >= 5,
+                "word_count_good": 1500 <= features["letters"] <= 4000,
+                "keyword_density_good": 1.0 <= features["keyword_density"] <= 3.0,
+                "has_faq": bool(features["has_faq"]),
+                "has_conclusion": bool(features["has_conclusion"])
+            }
+        }
+
+    def generate_with_guidelines(self, keyword: str, title: str, length: str, tone: str, guidelines: str = "",
+                                 variation: Optional[int] = None) -> Dict:
         """사용자 지침을 완전히 적용한 콘텐츠 생성"""
         
         if not guidelines.strip():
             # 지침이 없으면 기본 생성
-            return self.generate_complete_content(keyword, title, length, tone)
+            return self.generate_complete_content(keyword, title, length, tone, variation)
         
         print(f"사용자 지침 완전 적용 모드: {guidelines[:100]}...")
         
@@ -578,29 +587,13 @@ A3: 개인차가 있지만 꾸준히 실천한다면 3-6개월 후부터 눈에
         # 지침에 따른 최종 조정
         full_content = self._apply_final_guidelines(full_content, guidelines_lower)
         
-        # 콘텐츠 분석
-        word_count = len(full_content.replace(' ', '').replace('\n', ''))
-        keyword_count = full_content.lower().count(keyword.lower())
-        keyword_density = (keyword_count * len(keyword)) / len(full_content) * 100 if len(full_content) > 0 else 0
-        
         return {
             "content": full_content,
-            "word_count": word_count,
-            "keyword_count": keyword_count,
-            "keyword_density": round(keyword_density, 2),
-            "seo_score": round(random.uniform(85.0, 95.0), 1),
+            **self._analyze_content(full_content, keyword, title),
             "category": category,
             "guidelines_applied": True,
             "guidelines_summary": guidelines[:200] + "..." if len(guidelines) > 200 else guidelines,
-            "writing_style": writing_style,
-            "seo_analysis": {
-                "keyword_in_title": keyword.lower() in title.lower(),
-                "proper_headings": True,
-                "word_count_good": word_count > 1000,
-                "keyword_density_good": 1.0 <= keyword_density <= 4.0,
-                "bullet_points": True,
-                "category_relevant": True
-            }
+            "writing_style": writing_style
         }
 
     def _analyze_writing_style(self, guidelines_lower: str) -> dict:
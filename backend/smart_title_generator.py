@@ -7,7 +7,12 @@
 import random
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from seo_scoring import score_title
+from korean_text import analyze_keyword
+from title_lexicon import title_lexicon
+from title_ranking import rank_candidates, candidate_budget
+from generation_seed import generation_rng
 
 class SmartTitleGenerator:
     
@@ -109,6 +114,23 @@ class SmartTitleGenerator:
             "curiosity": ["숨겨진", "의외의", "모르면 손해인", "전문가만 아는"],
             "achievement": ["성공하는", "달성하는", "완성하는", "마스터하는"]
         }
+        
+        # 제목 점수 어휘 - 한 번의 스캔으로 모든 범주 판정 (지침 저장소에서 범주 단위 교체 가능)
+        category_words = {
+            "health": ["건강", "효과", "방법", "가이드", "비법"],
+            "food": ["요리", "레시피", "맛", "영양", "조리"],
+            "business": ["전략", "성공", "방법", "노하우", "시스템"],
+            "technology": ["기술", "활용", "도구", "시스템", "솔루션"],
+            "lifestyle": ["일상", "라이프", "방법", "습관", "팁"]
+        }
+        title_lexicon.register_defaults({
+            "smart.emotional": [word for words in self.emotional_words.values() for word in words],
+            "smart.number": ["3", "5", "7", "10", "30", "100"],
+            "smart.click_number": ["3", "5", "7", "10"],
+            "smart.action": ["방법", "가이드", "비법", "팁", "전략", "노하우"],
+            "smart.expert": ["전문가", "의사", "영양사", "요리사", "개발자"],
+            **{f"smart.category.{category}": words for category, words in category_words.items()}
+        })
 
     def categorize_keyword(self, keyword: str) -> str:
         """키워드를 카테고리로 분류"""
@@ -130,15 +152,16 @@ class SmartTitleGenerator:
         else:
             return "lifestyle"
 
-    def generate_number_variant(self) -> str:
+    def generate_number_variant(self, rng: Optional[random.Random] = None) -> str:
         """적절한 숫자 표현 생성"""
-        return random.choice(self.number_patterns)
+        return (rng or random).choice(self.number_patterns)
 
-    def add_emotional_appeal(self, title: str, category: str) -> str:
+    def add_emotional_appeal(self, title: str, category: str, rng: Optional[random.Random] = None) -> str:
         """감정적 호소력 추가"""
-        if random.random() < 0.3:  # 30% 확률로 감정적 단어 추가
-            emotion_type = random.choice(list(self.emotional_words.keys()))
-            emotion_word = random.choice(self.emotional_words[emotion_type])
+        rng = rng or random
+        if rng.random() < 0.3:  # 30% 확률로 감정적 단어 추가
+            emotion_type = rng.choice(list(self.emotional_words.keys()))
+            emotion_word = rng.choice(self.emotional_words[emotion_type])
             
             # 제목 앞에 추가하는 경우
             if emotion_type in ["urgency", "curiosity"]:
@@ -149,8 +172,9 @@ class SmartTitleGenerator:
         
         return title
 
-    def make_title_natural(self, title: str, keyword: str) -> str:
+    def make_title_natural(self, title: str, keyword: str, rng: Optional[random.Random] = None) -> str:
         """제목을 더 자연스럽게 만들기"""
+        rng = rng or random
         # 부자연스러운 반복 제거
         words = title.split()
         cleaned_words = []
@@ -175,36 +199,45 @@ class SmartTitleGenerator:
         
         # 자연스러운 조사 추가
         if not title.endswith(('다', '요', '법', '것', '기', '하기', '까지', '부터', '정복', '가이드')):
-            if random.random() < 0.4:
+            if rng.random() < 0.4:
                 title += " 완전정복"
-            elif random.random() < 0.3:
+            elif rng.random() < 0.3:
                 title += " 가이드"
         
         return title
 
-    def generate_seo_optimized_titles(self, keyword: str, count: int = 5, tone: str = "professional") -> List[Dict]:
-        """SEO 최적화된 제목 생성"""
+    def generate_seo_optimized_titles(self, keyword: str, count: int = 5, tone: str = "professional",
+                                      variation: Optional[int] = None, rng: Optional[random.Random] = None) -> List[Dict]:
+        """SEO 최적화된 제목 생성 (variation 을 주거나 결정적 모드면 같은 입력에 같은 제목)"""
+        rng = rng or generation_rng("smart_titles", keyword, count, tone, variation=variation)
         category = self.categorize_keyword(keyword)
         template = self.category_templates.get(category, self.category_templates["lifestyle"])
         
-        titles = []
+        # 후보를 만들며 상위 후보 풀만 유지, MMR 로 점수가 높으면서 서로 다른 제목 선택
+        candidates = self._iter_seo_candidates(keyword, category, template, tone, candidate_budget(count), rng)
+        return rank_candidates(candidates, count, "score")
+
+    def _iter_seo_candidates(self, keyword: str, category: str, template: Dict, tone: str, budget: int,
+                             rng: Optional[random.Random] = None) -> Iterator[Dict]:
+        """카테고리 템플릿 기반 후보 제목 생성"""
+        rng = rng or random
         used_patterns = set()
         
-        for i in range(count):
+        for i in range(budget):
             # 중복 방지를 위해 사용되지 않은 패턴 선택
             available_patterns = [p for p in template["title_patterns"] if p not in used_patterns]
             if not available_patterns:
                 available_patterns = template["title_patterns"]
                 used_patterns.clear()
             
-            pattern = random.choice(available_patterns)
+            pattern = rng.choice(available_patterns)
             used_patterns.add(pattern)
             
             # 패턴에 맞는 단어들 선택
-            power_word = random.choice(template["power_words"])
-            action_word = random.choice(template["action_words"])
-            benefit_word = random.choice(template["benefit_words"])
-            count_num = self.generate_number_variant()
+            power_word = rng.choice(template["power_words"])
+            action_word = rng.choice(template["action_words"])
+            benefit_word = rng.choice(template["benefit_words"])
+            count_num = self.generate_number_variant(rng)
             
             # 제목 생성
             title = pattern.format(
@@ -216,37 +249,33 @@ class SmartTitleGenerator:
             )
             
             # 자연스럽게 만들기
-            title = self.make_title_natural(title, keyword)
+            title = self.make_title_natural(title, keyword, rng)
             
             # 감정적 호소력 추가 (선택적)
-            if random.random() < 0.4:
-                title = self.add_emotional_appeal(title, category)
+            if rng.random() < 0.4:
+                title = self.add_emotional_appeal(title, category, rng)
             
             # 점수 계산
             score = self.calculate_title_score(title, keyword, category)
             seo_score = self.calculate_seo_score(title, keyword)
             click_potential = self.assess_click_potential(title)
             
-            titles.append({
+            yield {
                 "title": title,
                 "score": round(score, 1),
                 "seo_score": round(seo_score, 1),
                 "click_potential": click_potential,
                 "category": category,
                 "reason": f"카테고리별 최적화 ({category}), {tone} 톤, 자연스러운 문법"
-            })
-        
-        # 점수 순으로 정렬
-        titles.sort(key=lambda x: x["score"], reverse=True)
-        
-        return titles
+            }
 
-    def generate_with_guidelines(self, keyword: str, count: int = 5, tone: str = "professional", guidelines: str = "") -> List[Dict]:
+    def generate_with_guidelines(self, keyword: str, count: int = 5, tone: str = "professional", guidelines: str = "",
+                                 variation: Optional[int] = None) -> List[Dict]:
         """사용자 지침을 완전히 적용한 제목 생성"""
         
         if not guidelines.strip():
             # 지침이 없으면 기본 생성
-            return self.generate_seo_optimized_titles(keyword, count, tone)
+            return self.generate_seo_optimized_titles(keyword, count, tone, variation)
         
         print(f"사용자 지침 완전 적용 모드: {guidelines[:100]}...")
         
@@ -254,20 +283,28 @@ class SmartTitleGenerator:
         guidelines_lower = guidelines.lower()
         style_analysis = self._analyze_title_style(guidelines_lower)
         
-        # 지침 기반 제목 생성
-        titles = []
+        # 지침 기반 후보를 만들며 상위 후보 풀만 유지, MMR 로 점수가 높으면서 서로 다른 제목 선택
+        candidates = self._iter_guideline_candidates(
+            keyword, style_analysis, candidate_budget(count),
+            generation_rng("smart_titles_guidelines", keyword, count, tone, guidelines, variation=variation)
+        )
+        return rank_candidates(candidates, count, "score")
+
+    def _iter_guideline_candidates(self, keyword: str, style_analysis: dict, budget: int,
+                                   rng: Optional[random.Random] = None) -> Iterator[Dict]:
+        """지침 스타일 기반 후보 제목 생성"""
         used_patterns = set()
         
-        for i in range(count):
+        for i in range(budget):
             # 지침에 맞는 제목 생성
-            title = self._generate_guidelines_based_title(keyword, style_analysis, used_patterns)
+            title = self._generate_guidelines_based_title(keyword, style_analysis, used_patterns, rng)
             
             # 점수 계산
             score = self.calculate_title_score(title, keyword, "health")
             seo_score = self.calculate_seo_score(title, keyword)
             click_potential = self.assess_click_potential(title)
             
-            titles.append({
+            yield {
                 "title": title,
                 "score": round(score, 1),
                 "seo_score": round(seo_score, 1),
@@ -276,12 +313,7 @@ class SmartTitleGenerator:
                 "reason": f"사용자 지침 완전 적용: {style_analysis['tone']} 톤, {style_analysis['formality']} 스타일",
                 "guidelines_applied": True,
                 "style_applied": style_analysis
-            })
-        
-        # 점수 순으로 정렬
-        titles.sort(key=lambda x: x["score"], reverse=True)
-        
-        return titles
+            }
     
     def _analyze_title_style(self, guidelines_lower: str) -> dict:
         """제목 스타일 분석"""
@@ -322,8 +354,10 @@ class SmartTitleGenerator:
         
         return style
     
-    def _generate_guidelines_based_title(self, keyword: str, style: dict, used_patterns: set) -> str:
+    def _generate_guidelines_based_title(self, keyword: str, style: dict, used_patterns: set,
+                                         rng: Optional[random.Random] = None) -> str:
         """지침 기반 제목 생성"""
+        rng = rng or random
         
         # 기본 패턴들
         if style["formality"] == "casual":
@@ -367,7 +401,7 @@ class SmartTitleGenerator:
             available_patterns = patterns
             used_patterns.clear()
         
-        title = random.choice(available_patterns)
+        title = rng.choice(available_patterns)
         used_patterns.add(title)
         
         # 길이 조정
@@ -395,7 +429,7 @@ class SmartTitleGenerator:
                     break
         
         # 자연스러운 문법 수정
-        title = self.make_title_natural(title, keyword)
+        title = self.make_title_natural(title, keyword, rng)
         
         return title
 
@@ -403,8 +437,8 @@ class SmartTitleGenerator:
         """제목 품질 점수 계산"""
         score = 70.0  # 기본 점수
         
-        # 키워드 포함 여부
-        if keyword.lower() in title.lower():
+        # 키워드 포함 여부 (조사가 붙은 형태 포함)
+        if analyze_keyword(title, keyword).count:
             score += 15
         
         # 제목 길이 (SEO 최적화)
@@ -414,77 +448,45 @@ class SmartTitleGenerator:
         elif 20 <= title_length <= 70:
             score += 5
         
+        matches = title_lexicon.scan(title)
+        
         # 숫자 포함 (클릭률 향상)
-        if any(num in title for num in ["3", "5", "7", "10", "30", "100"]):
+        if matches.any("smart.number"):
             score += 8
         
         # 감정적 단어 포함
-        emotional_words_flat = [word for words in self.emotional_words.values() for word in words]
-        if any(word in title for word in emotional_words_flat):
+        if matches.any("smart.emotional"):
             score += 5
         
         # 카테고리 관련성
-        category_words = {
-            "health": ["건강", "효과", "방법", "가이드", "비법"],
-            "food": ["요리", "레시피", "맛", "영양", "조리"],
-            "business": ["전략", "성공", "방법", "노하우", "시스템"],
-            "technology": ["기술", "활용", "도구", "시스템", "솔루션"],
-            "lifestyle": ["일상", "라이프", "방법", "습관", "팁"]
-        }
-        
-        if category in category_words:
-            if any(word in title for word in category_words[category]):
-                score += 7
+        if matches.any(f"smart.category.{category}"):
+            score += 7
         
         return min(score, 100.0)
 
     def calculate_seo_score(self, title: str, keyword: str) -> float:
-        """SEO 점수 계산"""
-        score = 60.0  # 기본 점수
-        
-        # 키워드가 제목 앞쪽에 있는지
-        if title.lower().startswith(keyword.lower()):
-            score += 20
-        elif keyword.lower() in title.lower()[:len(title)//2]:
-            score += 15
-        elif keyword.lower() in title.lower():
-            score += 10
-        
-        # 제목 길이 SEO 최적화
-        if 50 <= len(title) <= 60:
-            score += 15
-        elif 40 <= len(title) <= 70:
-            score += 10
-        
-        # 특수문자 및 구조
-        if ":" in title:
-            score += 5
-        if any(num in title for num in ["3", "5", "7", "10"]):
-            score += 5
-        
-        return min(score, 100.0)
+        """SEO 점수 계산 (공통 점수 엔진의 제목 기준)"""
+        return score_title(title, keyword)
 
     def assess_click_potential(self, title: str) -> str:
         """클릭 잠재력 평가"""
         score = 0
+        matches = title_lexicon.scan(title)
         
         # 감정적 호소 단어
-        emotional_words_flat = [word for words in self.emotional_words.values() for word in words]
-        if any(word in title for word in emotional_words_flat):
+        if matches.any("smart.emotional"):
             score += 2
         
         # 숫자 포함
-        if any(num in title for num in ["3", "5", "7", "10"]):
+        if matches.any("smart.click_number"):
             score += 2
         
         # 행동 유도 단어
-        action_indicators = ["방법", "가이드", "비법", "팁", "전략", "노하우"]
-        if any(word in title for word in action_indicators):
+        if matches.any("smart.action"):
             score += 1
         
         # 전문성 표시
-        expert_words = ["전문가", "의사", "영양사", "요리사", "개발자"]
-        if any(word in title for word in expert_words):
+        if matches.any("smart.expert"):
             score += 1
         
         if score >= 5:
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+SQLite 동시성 벤치마크
+배치 쓰기가 진행되는 동안의 읽기 처리량을 기본 설정과 운영 프로파일(WAL + PRAGMA + 단일 쓰기 큐)로 비교
+요청 경로 쓰기(단일 쓰기 큐를 거치지 않고 자체 연결에서 한 행씩 커밋)의 지연과 잠금 오류도 함께 측정
+
+    python sqlite_benchmark.py --seconds 10 --readers 8 --writers 4 --request-writers 2
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List
+
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Index, select, insert, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from database import apply_sqlite_profile
+from db_writer import SingleWriter
+
+BenchBase = declarative_base()
+
+class BenchItem(BenchBase):
+    __tablename__ = "bench_items"
+    __table_args__ = (
+        Index("idx_bench_items_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String(36), nullable=False)
+    body = Column(Text)
+    created_at = Column(DateTime, nullable=False)
+
+def _rows(count: int, users: List[str]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": random.choice(users),
+            "body": "본문 " * 50,
+            "created_at": datetime.utcnow()
+        }
+        for _ in range(count)
+    ]
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+def run_scenario(profile: bool, args) -> Dict[str, Any]:
+    """한 시나리오 실행 (profile=False 는 기본 create_engine + 쓰기 스레드별 직접 커밋)"""
+    workdir = tempfile.mkdtemp(prefix="sqlite_bench_")
+    url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    connect_args = {"check_same_thread": False}
+
+    if profile:
+        engine = create_engine(url, connect_args=connect_args, poolclass=QueuePool,
+                               pool_size=args.readers, max_overflow=args.readers)
+        apply_sqlite_profile(engine)
+        writer_engine = create_engine(url, connect_args=connect_args, poolclass=QueuePool,
+                                      pool_size=1, max_overflow=0)
+        apply_sqlite_profile(writer_engine, begin_statement="BEGIN IMMEDIATE")
+        writer = SingleWriter(sessionmaker(bind=writer_engine))
+    else:
+        engine = create_engine(url, connect_args=connect_args)
+        writer_engine = None
+        writer = None
+
+    Session = sessionmaker(bind=engine)
+    BenchBase.metadata.create_all(bind=engine)
+
+    users = [str(uuid.uuid4()) for _ in range(args.users)]
+    with Session() as session:
+        for start in range(0, args.seed_rows, 1000):
+            session.execute(insert(BenchItem), _rows(min(1000, args.seed_rows - start), users))
+        session.commit()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_latencies: List[float] = []
+    commit_latencies: List[float] = []
+    counters = {
+        "reads": 0, "read_errors": 0, "rows_written": 0, "write_errors": 0, "locked_errors": 0,
+        "request_commits": 0, "request_locked_errors": 0
+    }
+
+    def reader():
+        latencies = []
+        reads = errors = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as session:
+                    session.execute(
+                        select(BenchItem.id, BenchItem.created_at)
+                        .where(BenchItem.user_id == random.choice(users))
+                        .order_by(BenchItem.created_at.desc())
+                        .limit(20)
+                    ).all()
+                reads += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+            except OperationalError:
+                errors += 1
+        with lock:
+            counters["reads"] += reads
+            counters["read_errors"] += errors
+            read_latencies.extend(latencies)
+
+    def batch_writer():
+        written = errors = locked = 0
+        while not stop.is_set():
+            rows = _rows(args.batch_size, users)
+            try:
+                if writer is not None:
+                    writer.run(lambda session: session.execute(insert(BenchItem), rows))
+                else:
+                    with Session() as session:
+                        session.execute(insert(BenchItem), rows)
+                        session.commit()
+                written += len(rows)
+            except OperationalError as e:
+                errors += 1
+                if "locked" in str(e):
+                    locked += 1
+        with lock:
+            counters["rows_written"] += written
+            counters["write_errors"] += errors
+            counters["locked_errors"] += locked
+
+    def request_writer():
+        # 요청 경로: 읽기 엔진 연결에서 바로 커밋 (busy_timeout 으로 쓰기 큐와 경합)
+        latencies = []
+        commits = locked = 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with Session() as session:
+                    session.execute(insert(BenchItem), _rows(1, users))
+                    session.commit()
+                commits += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+            except OperationalError as e:
+                if "locked" in str(e):
+                    locked += 1
+            time.sleep(args.request_interval)
+        with lock:
+            counters["request_commits"] += commits
+            counters["request_locked_errors"] += locked
+            commit_latencies.extend(latencies)
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=batch_writer) for _ in range(args.writers)]
+    threads += [threading.Thread(target=request_writer) for _ in range(args.request_writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if writer is not None:
+        writer.close()
+    with Session() as session:
+        total_rows = session.execute(select(func.count(BenchItem.id))).scalar()
+    engine.dispose()
+    if writer_engine is not None:
+        writer_engine.dispose()
+
+    return {
+        "profile": "wal+single_writer" if profile else "default",
+        "reads_per_sec": round(counters["reads"] / elapsed, 1),
+        "read_p50_ms": round(statistics.median(read_latencies), 2) if read_latencies else 0,
+        "read_p95_ms": round(_percentile(read_latencies, 95), 2),
+        "read_errors": counters["read_errors"],
+        "rows_written_per_sec": round(counters["rows_written"] / elapsed, 1),
+        "write_errors": counters["write_errors"],
+        "locked_errors": counters["locked_errors"],
+        "request_commits_per_sec": round(counters["request_commits"] / elapsed, 1),
+        "request_commit_p50_ms": round(statistics.median(commit_latencies), 2) if commit_latencies else 0,
+        "request_commit_p95_ms": round(_percentile(commit_latencies, 95), 2),
+        "request_locked_errors": counters["request_locked_errors"],
+        "total_rows": total_rows,
+        "writer_stats": writer.get_stats() if writer is not None else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 동시 읽기/배치 쓰기 벤치마크")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--seed-rows", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--request-writers", type=int, default=2)
+    parser.add_argument("--request-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print("🚀 SQLite 동시성 벤치마크")
+    print("=" * 60)
+    for profile in (False, True):
+        result = run_scenario(profile, args)
+        print(f"\n📊 {result['profile']}")
+        for key, value in result.items():
+            if key != "profile":
+                print(f"  {key}: {value}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
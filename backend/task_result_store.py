@@ -0,0 +1,84 @@
+"""
+배치 작업 결과 블롭 저장소
+큰 작업 결과를 압축하여 디스크에 보관하고 ID로 참조 (메모리 상주 방지)
+- 압축은 content_blobs 와 같은 코덱 (zstd, 미설치 시 zlib) - 코덱은 파일 확장자로 구분
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from content_blobs import compress_bytes, decompress_bytes
+from data_paths import data_path
+from logger import app_logger
+
+# 코덱별 파일 확장자 (.json.z 는 이전 zlib 블롭과 호환)
+CODEC_SUFFIXES = {"zstd": ".json.zst", "zlib": ".json.z"}
+
+class TaskResultStore:
+    """압축 JSON 블롭 저장소 (task_id 기반 참조)"""
+
+    def __init__(self, storage_dir: Optional[str] = None):
+        self.storage_dir = Path(storage_dir or data_path("BATCH_RESULT_DIR", "batch_results"))
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, ref: str, codec: str) -> Path:
+        return self.storage_dir / f"{ref}{CODEC_SUFFIXES[codec]}"
+
+    def _existing(self, ref: str):
+        """저장된 (codec, 경로) - 없으면 None"""
+        for codec in CODEC_SUFFIXES:
+            path = self._path(ref, codec)
+            if path.exists():
+                return codec, path
+        return None
+
+    @staticmethod
+    def encode(result: Dict[str, Any]) -> bytes:
+        """결과 직렬화 (크기 판단과 저장에 같은 바이트를 재사용)"""
+        return json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+    def put(self, ref: str, payload: bytes) -> int:
+        """직렬화된 결과를 압축 저장 후 압축 크기 반환 (임시 파일 + rename 으로 원자적 교체)"""
+        codec, data = compress_bytes(payload)
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(ref, codec))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        # 다른 코덱으로 저장된 이전 블롭이 남아 있으면 제거
+        for other in CODEC_SUFFIXES:
+            if other != codec and self._path(ref, other).exists():
+                self._path(ref, other).unlink()
+        return len(data)
+
+    def get(self, ref: str) -> Optional[Dict[str, Any]]:
+        found = self._existing(ref)
+        if found is None:
+            return None
+        codec, path = found
+        try:
+            return json.loads(decompress_bytes(codec, path.read_bytes()).decode("utf-8"))
+        except Exception as e:
+            app_logger.error("Failed to read task result blob", error=e, ref=ref)
+            return None
+
+    def delete(self, ref: str) -> bool:
+        found = self._existing(ref)
+        if found is None:
+            return False
+        found[1].unlink()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        files = [f for suffix in CODEC_SUFFIXES.values() for f in self.storage_dir.glob(f"*{suffix}")]
+        return {
+            "blobs": len(files),
+            "size_bytes": sum(f.stat().st_size for f in files)
+        }
@@ -0,0 +1,90 @@
+"""
+일별 활동 집계 테스트 - 쓰기 지연 배처/요청 경로로 기록한 뒤 집계 합계가 이력 테이블 건수와 일치해야 함
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("aiohttp")
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from activity_rollup import batcher_flush_hook, get_activity_totals, rebuild_rollups, record_activity
+from models import Base, GeneratedTitle, Keyword
+from performance_optimizer import WriteBehindBatcher
+
+USER_ID = "rollup-user"
+OTHER_USER_ID = "other-user"
+
+@pytest.fixture
+def databases():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-rollup-"), "rollup.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield sessionmaker(bind=engine), async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+def _keyword_rows(owner: str, count: int):
+    return [
+        {"keyword": f"{owner} 키워드 {i}", "country_id": 1, "search_volume": 0, "competition": "Low",
+         "cpc": 0.0, "opportunity_score": 50, "created_by": owner}
+        for i in range(count)
+    ]
+
+async def _write_history(session_factory, async_session_factory):
+    # 배처 경로: INSERT 와 같은 트랜잭션에서 플러시 훅이 집계를 갱신
+    batcher = WriteBehindBatcher(session_factory=session_factory, flush_interval=0.01)
+    batcher.add_flush_hook(batcher_flush_hook)
+    await batcher.enqueue(Keyword, _keyword_rows(USER_ID, 3))
+    await batcher.enqueue(Keyword, _keyword_rows(OTHER_USER_ID, 2))
+    await batcher.close()
+
+    # 요청 경로: 생성한 행과 집계를 한 번에 커밋
+    async with async_session_factory() as db:
+        for i in range(2):
+            db.add(GeneratedTitle(title=f"제목 {i}", created_by=USER_ID))
+        await record_activity(db, user_id=USER_ID, titles_count=2)
+        await db.commit()
+
+async def _history_count(async_session_factory, model, owner: str) -> int:
+    async with async_session_factory() as db:
+        return (await db.execute(
+            select(func.count()).select_from(model).where(model.created_by == owner)
+        )).scalar()
+
+async def _totals(async_session_factory, owner: str):
+    async with async_session_factory() as db:
+        return await get_activity_totals(db, user_id=owner)
+
+def test_rollups_match_history_tables_after_writes(databases):
+    session_factory, async_session_factory = databases
+    asyncio.run(_write_history(session_factory, async_session_factory))
+
+    for owner in (USER_ID, OTHER_USER_ID):
+        totals = asyncio.run(_totals(async_session_factory, owner))
+        assert totals["keywords_count"] == asyncio.run(_history_count(async_session_factory, Keyword, owner))
+        assert totals["titles_count"] == asyncio.run(_history_count(async_session_factory, GeneratedTitle, owner))
+
+    assert asyncio.run(_totals(async_session_factory, USER_ID))["keywords_count"] == 3
+    assert asyncio.run(_totals(async_session_factory, OTHER_USER_ID))["titles_count"] == 0
+
+def test_rebuild_reproduces_incremental_rollups(databases):
+    session_factory, async_session_factory = databases
+    asyncio.run(_write_history(session_factory, async_session_factory))
+    incremental = asyncio.run(_totals(async_session_factory, USER_ID))
+
+    with session_factory() as session:
+        rebuild_rollups(session)
+    rebuilt = asyncio.run(_totals(async_session_factory, USER_ID))
+
+    for metric in ("keywords_count", "titles_count", "contents_count", "posts_published_count"):
+        assert rebuilt[metric] == incremental[metric]
@@ -0,0 +1,101 @@
+"""
+보관 계층 테스트 - 기간이 지난 행을 월별 세그먼트로 옮기고 색인으로 다시 찾기, 이력 API 의 hot/보관 병합
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import archive_store
+from archive_store import SegmentStore, archive_table, get_archive_stats, get_archived_record
+from history_queries import fetch_history_page
+from models import ArchivedRow, Base, GeneratedTitle, Keyword
+
+USER_ID = "archive-user"
+NOW = datetime(2026, 10, 19, 9, 0, 0)
+CUTOFF = NOW - timedelta(days=365)
+
+@pytest.fixture
+def databases(monkeypatch):
+    root = tempfile.mkdtemp(prefix="blogauto-archive-")
+    engine = create_engine(f"sqlite:///{os.path.join(root, 'archive.db')}")
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(root, 'archive.db')}")
+    store = SegmentStore(os.path.join(root, "segments"))
+    # 이력 API 는 전역 세그먼트 저장소를 읽음
+    monkeypatch.setattr(archive_store.segment_store, "root", store.root)
+    session_factory = sessionmaker(bind=engine)
+
+    with session_factory() as session:
+        for i in range(4):
+            # 2025-09, 2025-10 두 달에 걸친 오래된 행
+            session.add(Keyword(
+                id=f"old-{i}", keyword=f"오래된 키워드 {i}", created_by=USER_ID,
+                created_at=CUTOFF - timedelta(days=40 - i * 10)
+            ))
+        session.add(Keyword(id="old-referenced", keyword="제목이 참조하는 키워드", created_by=USER_ID,
+                            created_at=CUTOFF - timedelta(days=100)))
+        session.add(GeneratedTitle(id="title-1", title="제목", keyword_id="old-referenced", created_by=USER_ID,
+                                   created_at=NOW))
+        for i in range(2):
+            session.add(Keyword(id=f"new-{i}", keyword=f"최근 키워드 {i}", created_by=USER_ID,
+                                created_at=NOW - timedelta(days=i)))
+        session.commit()
+
+    yield session_factory, async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False), store
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+def test_archive_moves_old_rows_into_monthly_segments(databases):
+    session_factory, _, store = databases
+
+    archived = archive_table(Keyword, CUTOFF, store=store, batch_size=3, session_factory=session_factory)
+
+    assert archived == 4
+    with session_factory() as session:
+        hot = set(session.execute(select(Keyword.id)).scalars())
+        index_count = session.execute(select(func.count()).select_from(ArchivedRow)).scalar()
+        record = get_archived_record(session, "keywords", "old-2", store=store)
+        stats = get_archive_stats(session, store=store)
+
+    # 아직 제목이 참조하는 키워드는 hot 에 남음
+    assert hot == {"old-referenced", "new-0", "new-1"}
+    assert index_count == 4
+    assert record["keyword"] == "오래된 키워드 2" and record["created_by"] == USER_ID
+    assert stats["rows"] == {"keywords": 4}
+    assert stats["segments"]["tables"]["keywords"]["segments"] == 2
+
+    # 다시 실행해도 옮길 행이 없음
+    assert archive_table(Keyword, CUTOFF, store=store, session_factory=session_factory) == 0
+
+def test_history_merges_hot_and_archived_rows_in_cursor_order(databases):
+    session_factory, async_session_factory, store = databases
+    archive_table(Keyword, CUTOFF, store=store, session_factory=session_factory)
+
+    async def walk(include_archived):
+        items, cursor = [], None
+        async with async_session_factory() as db:
+            while True:
+                page, cursor = await fetch_history_page(
+                    db, Keyword, USER_ID, fields="id", cursor=cursor, limit=2, include_archived=include_archived
+                )
+                items.extend(page)
+                if cursor is None:
+                    return items
+
+    merged = asyncio.run(walk(True))
+    hot_only = asyncio.run(walk(False))
+
+    assert [item["id"] for item in merged] == ["new-0", "new-1", "old-3", "old-2", "old-1", "old-0", "old-referenced"]
+    assert [item["id"] for item in merged if item.get("archived")] == ["old-3", "old-2", "old-1", "old-0"]
+    assert [item["id"] for item in hot_only] == ["new-0", "new-1", "old-referenced"]
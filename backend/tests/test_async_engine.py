@@ -0,0 +1,76 @@
+"""
+비동기 엔진 테스트 - 드라이버 URL 변환, 요청 경로 서비스(사이트 관리)가 AsyncSession 으로 동작하는지
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("cryptography")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database import AsyncSessionLocal, get_async_db, to_async_url
+from models import Base
+from site_manager import SiteManager
+
+@pytest.fixture
+def session_factory():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-async-"), "async.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+def test_to_async_url_maps_sync_drivers():
+    assert to_async_url("sqlite:///./blogauto.db") == "sqlite+aiosqlite:///./blogauto.db"
+    assert to_async_url("postgres://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+    assert to_async_url("postgresql+psycopg2://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+    assert to_async_url("postgresql+asyncpg://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+
+def test_request_sessions_do_not_expire_on_commit():
+    async def first_session():
+        dependency = get_async_db()
+        db = await dependency.__anext__()
+        await dependency.aclose()
+        return db
+
+    assert isinstance(asyncio.run(first_session()), AsyncSession)
+    # 커밋 후 속성 접근이 지연 IO(MissingGreenlet)로 이어지지 않도록
+    assert AsyncSessionLocal.kw["expire_on_commit"] is False
+
+def test_site_manager_round_trip_on_async_session(session_factory):
+    manager = SiteManager()
+
+    async def run():
+        async with session_factory() as db:
+            site = await manager.create_site(
+                db, "owner-1", "내 블로그", "https://blog.example.com", "설명", "여행",
+                wordpress_password="secret"
+            )
+            # 커밋 후에도 속성을 다시 읽지 않고 사용 가능
+            site_id = site.id
+        async with session_factory() as db:
+            mine = await manager.get_site_by_id(db, site_id, "owner-1")
+            theirs = await manager.get_site_by_id(db, site_id, "owner-2")
+            updated = await manager.update_site(db, site_id, "owner-1", name="새 이름")
+        async with session_factory() as db:
+            deleted = await manager.delete_site(db, site_id, "owner-1")
+            remaining = await manager.get_user_sites(db, "owner-1")
+        return mine, theirs, updated, deleted, remaining
+
+    mine, theirs, updated, deleted, remaining = asyncio.run(run())
+
+    assert mine is not None and manager.decrypt_password(mine.wordpress_password_encrypted) == "secret"
+    assert theirs is None
+    assert updated.name == "새 이름"
+    assert deleted and remaining == []
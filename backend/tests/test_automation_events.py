@@ -0,0 +1,83 @@
+"""
+자동화 세션 진행 스트림 테스트 - 실패한 단계는 종료 이벤트, 끝난 세션 스트림은 히스토리가 없어도 종료
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import automation_engine as engine_module
+from automation_engine import automation_engine
+from models import AutomationSession, Base
+from progress_broker import ProgressBroker, session_topic
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-automation-"), "automation.db")
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    factory = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+    monkeypatch.setattr(engine_module, "AsyncSessionLocal", factory)
+    return factory
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = ProgressBroker(keepalive_seconds=0.01)
+    monkeypatch.setattr(engine_module, "progress_broker", broker)
+    return broker
+
+async def _create_session(factory, step_status: str) -> str:
+    async with factory() as db:
+        # 사이트 행은 만들지 않음 - 발행 단계가 "WordPress 연동 정보 없음"으로 실패
+        session = AutomationSession(site_id="missing-site", category="건강", step_status=step_status, created_by="user-1")
+        db.add(session)
+        await db.commit()
+        return session.id
+
+async def _stream(broker: ProgressBroker, session_id: str):
+    events = []
+    async for progress_event in broker.subscribe(
+        session_topic(session_id), 0, True, is_active=lambda: automation_engine.is_session_active(session_id)
+    ):
+        if progress_event is not None:
+            events.append((progress_event.event, progress_event.data))
+    return events
+
+def test_failed_step_ends_session_stream(session_factory, broker):
+    async def run():
+        session_id = await _create_session(session_factory, "started")
+        async with session_factory() as db:
+            with pytest.raises(ValueError):
+                await automation_engine.publish_contents(db, session_id, ["제목"])
+        return session_id, await asyncio.wait_for(_stream(broker, session_id), timeout=2)
+
+    session_id, events = asyncio.run(run())
+
+    assert [event for event, _ in events] == ["failed"]
+    assert events[0][1]["session_id"] == session_id
+    assert events[0][1]["stage"] == "publish"
+
+def test_stream_ends_for_finished_or_missing_session_without_history(session_factory, broker):
+    async def run():
+        finished = await _create_session(session_factory, "published")
+        running = await _create_session(session_factory, "titles_generated")
+        return (
+            await asyncio.wait_for(_stream(broker, finished), timeout=2),
+            await asyncio.wait_for(_stream(broker, "unknown-session"), timeout=2),
+            await automation_engine.is_session_active(running),
+        )
+
+    finished_events, missing_events, running_active = asyncio.run(run())
+
+    assert finished_events == []
+    assert missing_events == []
+    assert running_active is True
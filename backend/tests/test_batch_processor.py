@@ -0,0 +1,93 @@
+"""
+배치 프로세서 테스트 - 결과 블롭 코덱, 취소 시 한 번만 정리, 유휴 상태 보존 정책
+"""
+
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import batch_processor as batch_module
+from batch_processor import BatchProcessor, BatchTask, TaskStatus, TaskType
+from content_blobs import ZSTD_AVAILABLE
+from task_result_store import TaskResultStore
+
+class StubCheckpointStore:
+    """DB 없이 호출만 받는 체크포인트 저장소"""
+
+    def __getattr__(self, name):
+        async def noop_async(*args, **kwargs):
+            return {} if name.startswith("load") else None
+        if name.endswith("_async"):
+            return noop_async
+        return lambda *args, **kwargs: {} if name.startswith("load") else None
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(batch_module, "checkpoint_store", StubCheckpointStore())
+    return BatchProcessor(
+        retention_hours=1,
+        spill_threshold_bytes=1,
+        result_store=TaskResultStore(tempfile.mkdtemp(prefix="blogauto-results-"))
+    )
+
+def _task(task_id: str) -> BatchTask:
+    return BatchTask(id=task_id, task_type=TaskType.KEYWORD_ANALYSIS, user_id="user-1", parameters={})
+
+def test_result_store_round_trip_and_legacy_zlib_blob():
+    import zlib
+
+    store = TaskResultStore(tempfile.mkdtemp(prefix="blogauto-results-"))
+    result = {"results": ["가나다"] * 100}
+    store.put("new", TaskResultStore.encode(result))
+    (store.storage_dir / "legacy.json.z").write_bytes(zlib.compress(TaskResultStore.encode(result)))
+
+    assert store.get("new") == result
+    assert store.get("legacy") == result
+    suffix = ".json.zst" if ZSTD_AVAILABLE else ".json.z"
+    assert (store.storage_dir / f"new{suffix}").exists()
+    assert store.delete("legacy") and store.get("legacy") is None
+    assert store.get_stats()["blobs"] == 1
+
+def test_cancelling_running_task_finishes_it_once(processor, monkeypatch):
+    finished = []
+    mark_finished = processor._mark_finished
+    monkeypatch.setattr(processor, "_mark_finished", lambda task: (finished.append(task.id), mark_finished(task)))
+
+    async def hang(task):
+        await asyncio.sleep(60)
+    monkeypatch.setattr(processor, "_execute_task", hang)
+
+    async def run():
+        task_id = await processor.submit_task(_task("task-1"))
+        await processor.cancel_task(task_id)
+        # 완료 콜백과 그 정리 작업까지 진행
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return task_id
+
+    task_id = asyncio.run(run())
+
+    assert finished == [task_id]
+    assert processor.get_task_status(task_id).status == TaskStatus.CANCELLED
+    assert not processor._background
+
+def test_periodic_retention_evicts_expired_tasks_without_new_submissions(processor):
+    task = _task("task-2")
+    task.status = TaskStatus.COMPLETED
+    task.completed_at = datetime.now() - timedelta(hours=2)
+    processor._register(task)
+    processor._finished[task.id] = None
+    processor.retention_interval = 0.01
+
+    async def run():
+        processor.start()
+        await asyncio.sleep(0.05)
+        await processor.stop()
+
+    asyncio.run(run())
+
+    assert processor.get_task_status("task-2") is None
@@ -0,0 +1,76 @@
+"""
+본문 지문 색인 테스트 - 재구성(rescan)이 색인을 비우지 않고 다시 추가되지 않은 문서만 지우는지,
+API 검사 결과에 다른 사용자의 문서가 노출되지 않는지
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from body_fingerprints import BodyFingerprintIndex, SOURCE_GENERATED, SOURCE_POSTED, VERDICT_DUPLICATE
+
+BODY_A = "다이어트 식단은 단백질과 채소를 충분히 먹는 것이 중요합니다. " * 6
+BODY_B = "여행 준비물 체크리스트를 미리 만들어 두면 출발 전날이 편합니다. " * 6
+
+@pytest.fixture
+def index():
+    return BodyFingerprintIndex(os.path.join(tempfile.mkdtemp(prefix="blogauto-fingerprints-"), "index.db"))
+
+def _docs(*pairs):
+    return [{"doc_id": doc_id, "body": body} for doc_id, body in pairs]
+
+def test_replaced_document_gets_larger_rowid(index):
+    index.add_documents(SOURCE_GENERATED, _docs(("a", BODY_A), ("b", BODY_B)))
+    previous = index.last_rowid()
+
+    # 가장 마지막 문서(b)를 교체해도 rowid 가 재사용되지 않아야 재구성 전 문서와 구분됨
+    index.add_documents(SOURCE_GENERATED, _docs(("b", BODY_B)))
+
+    assert index.last_rowid() > previous
+
+def test_rebuild_keeps_index_live_and_drops_missing_documents(index):
+    index.add_documents(SOURCE_GENERATED, _docs(("a", BODY_A), ("b", BODY_B)))
+    previous = index.last_rowid()
+
+    # 재구성 중: a 만 원본에 남아 있음 - 그동안에도 기존 색인으로 검사 가능
+    index.add_documents(SOURCE_GENERATED, _docs(("a", BODY_A)))
+    assert index.check(BODY_B)["verdict"] == VERDICT_DUPLICATE
+
+    assert index.remove_up_to(previous) == 1
+    assert index.get_stats()["documents"] == {SOURCE_GENERATED: 1}
+    assert index.check(BODY_A)["verdict"] == VERDICT_DUPLICATE
+    assert index.check(BODY_B)["overlap_percent"] == 0
+
+def test_visible_check_hides_other_users_documents(index):
+    index.add_documents(SOURCE_GENERATED, [
+        {"doc_id": "mine", "body": BODY_A, "owner": "user-1", "title": "내 글"},
+        {"doc_id": "theirs", "body": BODY_A, "owner": "user-2", "title": "남의 글"},
+    ])
+    index.add_documents(SOURCE_POSTED, [
+        {"doc_id": "my-site-post", "body": BODY_A, "site_id": "site-1", "title": "내 사이트 글"},
+        {"doc_id": "other-site-post", "body": BODY_A, "site_id": "site-2", "title": "남의 사이트 글"},
+    ])
+
+    result = index.check_visible(BODY_A, "user-1", ["site-1"])
+
+    # 판정은 전체 색인 기준, 목록은 내 글 / 내 사이트 글만
+    assert result["verdict"] == VERDICT_DUPLICATE
+    assert sorted(match["doc_id"] for match in result["matches"]) == ["mine", "my-site-post"]
+    assert result["hidden_matches"] == 2
+    assert all("owner" not in match for match in result["matches"])
+
+def test_index_without_owner_column_is_upgraded():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-fingerprints-"), "index.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE documents (rowid INTEGER PRIMARY KEY, source TEXT NOT NULL, doc_id TEXT NOT NULL, "
+        "site_id TEXT, title TEXT, created_at TEXT, fingerprints BLOB NOT NULL, UNIQUE (source, doc_id));"
+    )
+    conn.close()
+    index = BodyFingerprintIndex(path)
+
+    index.add_documents(SOURCE_GENERATED, [{"doc_id": "a", "body": BODY_A, "owner": "user-1"}])
+
+    assert [match["doc_id"] for match in index.check_visible(BODY_A, "user-1")["matches"]] == ["a"]
@@ -0,0 +1,102 @@
+"""
+체크포인트 저장소 테스트 - 항목 저장/재시도 갱신, 비동기 경로, 단일 쓰기 큐 대기, DB 장애 시 기본값
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from checkpoint_store import CheckpointStore, SafeCheckpointStore
+from db_writer import SingleWriter
+from models import Base
+
+@pytest.fixture
+def session_factory():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-checkpoint-"), "checkpoints.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def store(session_factory):
+    return CheckpointStore(session_factory=session_factory, writer=None)
+
+@pytest.fixture
+def writer(session_factory):
+    writer = SingleWriter(session_factory)
+    yield writer
+    writer.close()
+
+def test_save_item_then_retry_updates_same_row(store):
+    store.save_job_spec("job-1", "batch_task", None, {"task_type": "keyword_analysis"})
+    store.mark_failed("job-1", "batch_task", "keyword:a", "timeout", stage="keyword")
+    store.save_item("job-1", "batch_task", "keyword:a", {"score": 1}, stage="keyword", attempts=2)
+
+    checkpoints = store.load("job-1")
+
+    assert list(checkpoints) == ["keyword:a"]
+    assert checkpoints["keyword:a"]["status"] == "completed"
+    assert checkpoints["keyword:a"]["attempts"] == 2
+    assert store.completed_results("job-1") == {"keyword:a": {"score": 1}}
+    assert store.load_unfinished_jobs("batch_task")[0]["job_id"] == "job-1"
+
+def test_async_paths_match_sync(store):
+    async def run():
+        await store.save_item_async("job-2", "batch_task", "title:x", ["t"], stage="title")
+        await store.update_job_status_async("job-2", "completed")
+        loaded = await store.load_async("job-2")
+        cleared = await store.clear_async("job-2")
+        return loaded, cleared
+
+    loaded, cleared = asyncio.run(run())
+
+    assert loaded["title:x"]["result"] == ["t"]
+    assert cleared == 1
+    assert store.load("job-2") == {}
+
+def test_async_write_awaits_writer_without_blocking_loop(session_factory, writer):
+    store = CheckpointStore(session_factory=session_factory, writer=writer)
+    gate = threading.Event()
+    # 쓰기 스레드를 붙잡아 두어 이후 작업이 큐에서 대기하도록 함
+    writer.submit(lambda db: gate.wait(2))
+
+    async def run():
+        save = asyncio.create_task(store.save_item_async("job-4", "batch_task", "k", {"ok": True}))
+        ticks = 0
+        while not save.done() and ticks < 5:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        pending_while_ticking = not save.done()
+        gate.set()
+        await save
+        return ticks, pending_while_ticking
+
+    ticks, pending_while_ticking = asyncio.run(run())
+
+    # 쓰기 큐를 기다리는 동안에도 이벤트 루프는 계속 돈다
+    assert ticks == 5 and pending_while_ticking
+    assert store.completed_results("job-4") == {"k": {"ok": True}}
+    assert writer.get_stats()["jobs"] == 2
+
+def test_safe_store_returns_defaults_when_db_fails():
+    def broken_session():
+        raise RuntimeError("db down")
+
+    safe = SafeCheckpointStore(session_factory=broken_session, writer=None)
+
+    safe.save_item("job-3", "batch_task", "k", {})
+    safe.update_job_status("job-3", "running")
+    assert safe.load("job-3") == {}
+    assert safe.load_unfinished_jobs("batch_task") == []
+    assert safe.clear("job-3") == 0
+    assert asyncio.run(safe.load_async("job-3")) == {}
+    assert asyncio.run(safe.clear_async("job-3")) == 0
@@ -0,0 +1,125 @@
+"""
+콘텐츠 본문 저장소 테스트 - 해시 주소 중복 제거, 압축 왕복, 기존 본문 이전과 정리
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import content_blobs
+from content_blobs import (
+    MIN_COMPRESS_BYTES, content_hash, decode_body, dehydrate_contents, encode_body, ensure_body_columns,
+    get_content_body, hydrate_contents, load_bodies, migrate_legacy_bodies, prune_orphan_blobs, store_bodies
+)
+from models import AutomationSession, Base, ContentBlob, GeneratedContent, make_excerpt
+
+LONG_BODY = "## 여행 준비물\n\n여권과 충전기를 챙기세요. " * 100
+
+@pytest.fixture
+def databases():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-blobs-"), "blobs.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield sessionmaker(bind=engine), async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+def test_encode_body_round_trips_and_skips_tiny_bodies():
+    long_row = encode_body(LONG_BODY)
+    short_row = encode_body("짧은 글")
+
+    assert long_row["hash"] == content_hash(LONG_BODY)
+    assert long_row["codec"] == ("zstd" if content_blobs.ZSTD_AVAILABLE else "zlib")
+    assert long_row["stored_size"] < long_row["size"] / 5
+    assert decode_body(long_row["codec"], long_row["data"]) == LONG_BODY
+    assert len("짧은 글".encode("utf-8")) < MIN_COMPRESS_BYTES and short_row["codec"] == "raw"
+    with pytest.raises(ValueError):
+        decode_body("lz4", b"")
+
+def test_identical_bodies_are_stored_once(databases):
+    session_factory, _ = databases
+
+    with session_factory() as session:
+        first = store_bodies(session, [LONG_BODY, LONG_BODY, "다른 글"])
+        second = store_bodies(session, [LONG_BODY])
+        session.commit()
+        count = session.execute(select(func.count()).select_from(ContentBlob)).scalar()
+        bodies = load_bodies(session, first + ["missing", None])
+
+    assert first[0] == first[1] == second[0]
+    assert count == 2
+    assert bodies == {first[0]: LONG_BODY, first[2]: "다른 글"}
+
+def test_migrate_legacy_rows_then_read_bodies(databases):
+    session_factory, async_session_factory = databases
+    with session_factory() as session:
+        session.add(GeneratedContent(id="legacy", content=LONG_BODY))
+        session.add(AutomationSession(
+            id="session-1", site_id="site-1", category="여행",
+            generated_contents=json.dumps([{"title": "제목", "content": LONG_BODY}], ensure_ascii=False)
+        ))
+        session.commit()
+        stats = migrate_legacy_bodies(session, batch_size=1)
+        row = session.execute(
+            select(GeneratedContent.content, GeneratedContent.content_hash, GeneratedContent.excerpt)
+            .where(GeneratedContent.id == "legacy")
+        ).one()
+        stored = json.loads(session.get(AutomationSession, "session-1").generated_contents)
+
+    assert stats == {"contents": 1, "sessions": 1}
+    assert row.content == "" and row.content_hash == content_hash(LONG_BODY)
+    assert row.excerpt == make_excerpt(LONG_BODY)
+    assert stored == [{"title": "제목", "content_hash": content_hash(LONG_BODY)}]
+
+    async def read():
+        async with async_session_factory() as db:
+            return await get_content_body(db, "legacy"), await hydrate_contents(db, stored)
+
+    body, hydrated = asyncio.run(read())
+    assert body == LONG_BODY
+    assert hydrated[0]["content"] == LONG_BODY
+
+def test_session_json_dehydrates_and_prune_keeps_referenced_blobs(databases):
+    session_factory, async_session_factory = databases
+
+    async def dehydrate():
+        async with async_session_factory() as db:
+            contents = await dehydrate_contents(db, [{"title": "제목", "content": LONG_BODY}, {"title": "본문 없음"}])
+            db.add(AutomationSession(
+                id="session-2", site_id="site-1", category="여행", generated_contents=json.dumps(contents)
+            ))
+            await db.commit()
+            return contents
+
+    contents = asyncio.run(dehydrate())
+    with session_factory() as session:
+        store_bodies(session, ["아무도 참조하지 않는 글"])
+        session.commit()
+        pruned = prune_orphan_blobs(session)
+        remaining = list(session.execute(select(ContentBlob.hash)).scalars())
+
+    assert contents == [{"title": "제목", "content_hash": content_hash(LONG_BODY)}, {"title": "본문 없음"}]
+    assert pruned == 1
+    assert remaining == [content_hash(LONG_BODY)]
+
+def test_ensure_body_columns_upgrades_existing_table():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-blobs-legacy-"), "legacy.db")
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE generated_content (id VARCHAR(36) PRIMARY KEY, content TEXT)")
+
+    assert ensure_body_columns(engine) == ["excerpt", "content_hash"]
+    assert ensure_body_columns(engine) == []
+    assert {"excerpt", "content_hash"} <= {column["name"] for column in inspect(engine).get_columns("generated_content")}
+    engine.dispose()
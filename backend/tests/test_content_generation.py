@@ -0,0 +1,104 @@
+"""
+콘텐츠 생성 API 저장 테스트 - AI 호출이 성공하면 목업으로 빠지지 않고 generated_content 에 저장되어야 함,
+관련 글 추천은 자기 사이트 범위만 조회
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("httpx")
+
+# database 모듈이 읽기 전에 임시 DB 로 지정 (검색/지문/관련 글 색인도 임시 디렉터리에)
+_DB_DIR = tempfile.mkdtemp(prefix="blogauto-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}")
+os.environ.setdefault("DATA_DIR", _DB_DIR)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+import main
+from database import AsyncSessionLocal, Base, async_engine
+from auth import create_access_token
+from models import GeneratedContent, Site, User
+
+GENERATED_BODY = "# 테스트 제목\n\n## 본문\n\n테스트 키워드에 대한 실제 생성 본문입니다."
+
+class StubAIService:
+    async def generate_content(self, title, keywords=None, length="medium", related_posts=None):
+        return {"content": GENERATED_BODY, "seo_score": 81, "geo_score": 72}
+
+async def _create_tables():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def _content_rows(owner_id=None):
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(
+            select(func.count()).select_from(GeneratedContent).where(GeneratedContent.created_by == owner_id)
+        )).scalar()
+
+async def _create_user(email: str) -> str:
+    async with AsyncSessionLocal() as db:
+        user = User(email=email, username=email.split("@")[0], password_hash="unused")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+async def _create_site(owner_id: str) -> str:
+    async with AsyncSessionLocal() as db:
+        site = Site(name="내 블로그", url="https://blog.example.com", category="general", created_by=owner_id)
+        db.add(site)
+        await db.commit()
+        return site.id
+
+def test_related_content_requires_own_site():
+    asyncio.run(_create_tables())
+    owner_id = asyncio.run(_create_user("site-owner@example.com"))
+    asyncio.run(_create_user("other@example.com"))
+    site_id = asyncio.run(_create_site(owner_id))
+    client = TestClient(main.app)
+
+    def related(email):
+        return client.post(
+            "/api/content/related",
+            json={"content": "관련 글 초안 본문", "title": "초안", "site_id": site_id},
+            headers={"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+        )
+
+    assert related("other@example.com").status_code == 404
+    assert related("site-owner@example.com").status_code == 200
+
+def test_generate_content_persists_row(monkeypatch):
+    asyncio.run(_create_tables())
+    monkeypatch.setattr(main, "get_ai_service", lambda name: StubAIService())
+    before = asyncio.run(_content_rows())
+
+    response = TestClient(main.app).post(
+        "/api/content/generate",
+        json={"title": "테스트 제목", "keywords": "테스트 키워드"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["content"] == GENERATED_BODY
+    assert asyncio.run(_content_rows()) == before + 1
+
+def test_generate_content_is_owned_by_authenticated_caller(monkeypatch):
+    asyncio.run(_create_tables())
+    monkeypatch.setattr(main, "get_ai_service", lambda name: StubAIService())
+    user_id = asyncio.run(_create_user("owner@example.com"))
+    token = create_access_token({"sub": "owner@example.com"})
+
+    response = TestClient(main.app).post(
+        "/api/content/generate",
+        json={"title": "소유자 제목", "keywords": "테스트 키워드"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert asyncio.run(_content_rows(user_id)) == 1
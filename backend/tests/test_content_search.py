@@ -0,0 +1,108 @@
+"""
+전문 검색 색인 테스트 - 한국어 음절 bigram 부분 일치, bm25 열 가중치, 소유자/상태/기간 필터, 저장소 연동과 재색인
+"""
+
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+_DATA_DIR = tempfile.mkdtemp(prefix="blogauto-search-data-")
+os.environ.setdefault("CONTENT_STORAGE_DIR", os.path.join(_DATA_DIR, "saved_content"))
+os.environ.setdefault("DATA_DIR", _DATA_DIR)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import content_storage as content_storage_module
+from content_blobs import content_columns
+from content_search import (
+    SOURCE_GENERATED, SOURCE_SAVED, ContentSearchIndex, build_match_query, generated_document, reindex_generated
+)
+from content_storage import ContentStorage
+from models import Base, GeneratedContent, GeneratedTitle
+
+DOCUMENTS = [
+    {"doc_id": "title-hit", "title": "검색엔진최적화 가이드", "keyword": "SEO", "body": "기본 개념 정리",
+     "status": "published", "created_at": "2026-10-01T00:00:00"},
+    {"doc_id": "body-hit", "title": "블로그 운영기", "keyword": "블로그", "body": "오늘은 검색엔진최적화를 공부했다",
+     "status": "draft", "created_at": "2026-10-10T00:00:00"},
+    {"doc_id": "python", "title": "Python asyncio 입문", "keyword": "파이썬", "body": "이벤트 루프",
+     "status": "draft", "created_at": "2026-10-15T00:00:00"},
+]
+
+@pytest.fixture
+def index():
+    index = ContentSearchIndex(os.path.join(tempfile.mkdtemp(prefix="blogauto-search-"), "search.db"))
+    index.index_documents(SOURCE_SAVED, DOCUMENTS)
+    return index
+
+def _ids(results):
+    return [result["doc_id"] for result in results]
+
+def test_match_query_uses_bigram_phrases_and_prefixes():
+    assert build_match_query("최적화") == '"최적 적화"'
+    assert build_match_query("검 pyth*") == '"검"* "pyth"*'
+    assert build_match_query("  ") is None
+
+def test_korean_substring_matches_with_title_ranked_first(index):
+    # 조사가 붙은 어절(검색엔진최적화를)도 부분 문자열로 일치, 제목 일치가 본문 일치보다 앞
+    assert _ids(index.search("최적화")) == ["title-hit", "body-hit"]
+    assert _ids(index.search("최적화 공부")) == ["body-hit"]
+    assert _ids(index.search("asyncio")) == ["python"]
+    assert _ids(index.search("asyn*")) == ["python"]
+    assert index.search("없는단어") == []
+
+def test_status_and_date_filters(index):
+    assert _ids(index.search("최적화", status="draft")) == ["body-hit"]
+    assert _ids(index.search("최적화", date_from="2026-10-05")) == ["body-hit"]
+    assert _ids(index.search("최적화", date_to="2026-10-05")) == ["title-hit"]
+
+def test_update_and_remove_replace_documents(index):
+    index.index_documents(SOURCE_SAVED, [{**DOCUMENTS[0], "title": "전혀 다른 제목", "body": ""}])
+
+    assert _ids(index.search("최적화")) == ["body-hit"]
+    assert index.remove_documents(SOURCE_SAVED, ["body-hit", "missing"]) == 1
+    assert index.search("최적화") == []
+    assert index.get_stats()["documents"] == {SOURCE_SAVED: 2}
+
+def test_generated_documents_are_filtered_by_owner(index):
+    index.index_documents(SOURCE_GENERATED, [
+        generated_document("mine", "제주 여행 코스", "제주", "본문", owner="user-1"),
+        generated_document("theirs", "제주 맛집", "제주", "본문", owner="user-2"),
+    ])
+
+    assert _ids(index.search("제주", SOURCE_GENERATED, owner="user-1")) == ["mine"]
+    # 출처별 색인은 서로 섞이지 않음
+    assert index.search("제주", SOURCE_SAVED) == []
+
+def test_content_storage_keeps_index_in_sync(index, monkeypatch):
+    monkeypatch.setattr(content_storage_module, "content_search", index)
+    storage = ContentStorage(tempfile.mkdtemp(prefix="blogauto-search-storage-"))
+
+    content_id = storage.save_content({"title": "부산 여행 일정", "keyword": "부산", "content": "해운대와 광안리"})
+    storage.update_content(content_id, {"content": "감천문화마을"})
+
+    assert [item["id"] for item in storage.search_content("감천")] == [content_id]
+    assert storage.search_content("광안리") == []
+    storage.delete_content(content_id)
+    assert storage.search_content("부산") == []
+
+def test_reindex_generated_reads_bodies_from_blobs(index):
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='blogauto-search-db-'), 'search.db')}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(GeneratedTitle(id="title-1", title="강릉 카페 투어", created_by="user-1"))
+        columns = content_columns(session, ["안목해변 커피거리 " * 50])[0]
+        session.add(GeneratedContent(id="content-1", title_id="title-1", content="", created_by="user-1", **columns))
+        session.add(GeneratedContent(id="content-2", content="레거시 본문 속초", created_by="user-2"))
+        session.commit()
+
+        assert reindex_generated(index, session, batch_size=1) == 2
+
+    assert _ids(index.search("커피거리", SOURCE_GENERATED)) == ["content-1"]
+    assert _ids(index.search("강릉", SOURCE_GENERATED, owner="user-1")) == ["content-1"]
+    assert _ids(index.search("속초", SOURCE_GENERATED)) == ["content-2"]
+    engine.dispose()
@@ -0,0 +1,109 @@
+"""
+저장 콘텐츠 로그 구조 저장소 테스트 - 추가 전용 세그먼트 + SQLite 색인, 색인 재구성, 압축, 기존 JSON 이전, 보관 정책
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# 전역 저장소 인스턴스가 import 시점에 디렉터리를 만들므로 먼저 임시 경로 지정
+_DATA_DIR = tempfile.mkdtemp(prefix="blogauto-storage-data-")
+os.environ.setdefault("CONTENT_STORAGE_DIR", os.path.join(_DATA_DIR, "saved_content"))
+os.environ.setdefault("DATA_DIR", _DATA_DIR)
+
+import archive_store
+from content_storage import ContentStorage
+
+@pytest.fixture
+def storage_dir():
+    return tempfile.mkdtemp(prefix="blogauto-storage-")
+
+def _save(storage: ContentStorage, count: int):
+    return [
+        storage.save_content({"title": f"제목 {i}", "keyword": "여행", "content": f"본문 {i} " * 20, "seo_score": 70 + i})
+        for i in range(count)
+    ]
+
+def test_save_update_delete_round_trip(storage_dir):
+    storage = ContentStorage(storage_dir)
+    first, second, third = _save(storage, 3)
+
+    assert storage.update_content(second, {"status": "published", "content": "수정한 본문"})
+    assert storage.delete_content(third)
+    assert not storage.update_content(third, {"status": "published"})
+
+    listed = storage.load_content_list()
+    assert [item["id"] for item in listed] == [second, first]
+    assert "content" not in listed[0]
+    assert storage.get_content(second)["content"] == "수정한 본문"
+    assert storage.get_content(third) is None
+    assert [item["id"] for item in storage.search_content(status="published")] == [second]
+    assert storage.get_stats()["status_counts"] == {"draft": 1, "published": 1}
+
+    # 다른 인스턴스(워커 프로세스)도 같은 색인을 봄
+    assert ContentStorage(storage_dir).get_content(first)["title"] == "제목 0"
+
+def test_rebuild_index_replays_segments_and_ignores_torn_tail(storage_dir):
+    storage = ContentStorage(storage_dir)
+    kept, deleted = _save(storage, 2)
+    storage.delete_content(deleted)
+    segment = storage._segments()[-1]
+    with open(segment, "ab") as f:
+        # 쓰기 도중 중단된 레코드
+        f.write(b"\x00\x00\x01\x00partial")
+
+    os.remove(storage.index_file)
+    storage._local.conn = None
+    storage.init_storage()
+
+    assert storage.rebuild_index() == 1
+    assert storage.get_content(kept)["title"] == "제목 0"
+    assert storage.get_content(deleted) is None
+
+def test_compact_rewrites_only_live_records(storage_dir):
+    storage = ContentStorage(storage_dir)
+    ids = _save(storage, 6)
+    for content_id in ids[:4]:
+        storage.delete_content(content_id)
+    for _ in range(3):
+        storage.update_content(ids[4], {"status": "published"})
+
+    result = storage.compact()
+
+    assert result["records"] == 2 and result["reclaimed_bytes"] > 0
+    assert len(storage._segments()) == 1
+    assert storage.get_stats()["reclaimable_mb"] == 0
+    assert storage.get_content(ids[4])["status"] == "published"
+    assert storage.get_content(ids[5])["title"] == "제목 5"
+
+def test_legacy_json_history_is_imported_once(storage_dir):
+    with open(os.path.join(storage_dir, "content_history.json"), "w", encoding="utf-8") as f:
+        json.dump([
+            {"id": "new", "title": "새 글", "created_at": "2026-10-02T00:00:00"},
+            {"id": "old", "title": "옛 글", "created_at": "2026-10-01T00:00:00"}
+        ], f)
+    with open(os.path.join(storage_dir, "old.json"), "w", encoding="utf-8") as f:
+        json.dump({"id": "old", "title": "옛 글", "content": "옛 본문"}, f)
+
+    storage = ContentStorage(storage_dir)
+
+    assert [item["id"] for item in storage.load_content_list()] == ["new", "old"]
+    assert storage.get_content("old")["content"] == "옛 본문"
+    assert os.path.exists(os.path.join(storage_dir, "content_history.json.migrated"))
+    assert not os.path.exists(os.path.join(storage_dir, "old.json"))
+
+def test_retention_moves_overflow_to_archive(storage_dir, monkeypatch):
+    monkeypatch.setattr(archive_store.segment_store, "root", os.path.join(storage_dir, "archive"))
+    storage = ContentStorage(storage_dir, max_items=2, retention_check_every=1000)
+    oldest, *recent = _save(storage, 4)
+    storage.update_content(oldest, {"created_at": (datetime.now() - timedelta(days=1)).isoformat()})
+
+    assert storage.apply_retention() == 2
+
+    assert len(storage.load_content_list()) == 2
+    assert oldest not in [item["id"] for item in storage.load_content_list()]
+    # 보관된 항목도 같은 API 로 조회
+    assert storage.get_content(oldest)["title"] == "제목 0"
@@ -0,0 +1,88 @@
+"""
+이력 키셋 페이지네이션 테스트 - 커서를 따라가면 같은 시각의 행까지 중복/누락 없이 최신순, ?fields= 프로젝션
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from history_queries import fetch_history_page, parse_fields
+from models import EXCERPT_LENGTH, Base, GeneratedContent, Keyword, make_excerpt
+
+USER_ID = "history-user"
+
+@pytest.fixture
+def session_factory():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-history-"), "history.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    base = datetime(2026, 10, 1, 12, 0, 0)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            for i in range(11):
+                # 세 개씩 같은 시각 - 커서는 (created_at, id) 로 동률을 구분해야 함
+                db.add(Keyword(
+                    id=f"kw-{i:02d}", keyword=f"키워드 {i}", search_volume=i,
+                    created_by=USER_ID, created_at=base + timedelta(minutes=i // 3)
+                ))
+            db.add(Keyword(id="kw-other", keyword="남의 키워드", created_by="other-user", created_at=base))
+            db.add(GeneratedContent(
+                id="content-1", content="긴 본문 " * 200, excerpt=None, created_by=USER_ID, created_at=base
+            ))
+            await db.commit()
+
+    asyncio.run(seed())
+    yield factory
+    asyncio.run(engine.dispose())
+
+def _pages(session_factory, model, limit, fields=None):
+    async def run():
+        pages, cursor = [], None
+        async with session_factory() as db:
+            while True:
+                items, cursor = await fetch_history_page(db, model, USER_ID, fields=fields, cursor=cursor, limit=limit)
+                pages.append(items)
+                if cursor is None:
+                    return pages
+    return asyncio.run(run())
+
+def test_cursor_walks_every_row_once_newest_first(session_factory):
+    pages = _pages(session_factory, Keyword, limit=4)
+
+    ids = [item["id"] for page in pages for item in page]
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert ids == sorted((f"kw-{i:02d}" for i in range(11)), key=lambda id_: (int(id_[3:]) // 3, id_), reverse=True)
+
+def test_fields_projection_returns_only_requested_columns(session_factory):
+    pages = _pages(session_factory, Keyword, limit=50, fields="id,search_volume")
+
+    assert set(pages[0][0]) == {"id", "search_volume"}
+    with pytest.raises(ValueError):
+        parse_fields(Keyword, "id,password_hash")
+
+def test_content_list_uses_excerpt_instead_of_body(session_factory):
+    item = _pages(session_factory, GeneratedContent, limit=10, fields="id,content")[0][0]
+
+    # 목록 응답은 본문 전체가 아니라 요약만
+    assert item["id"] == "content-1"
+    assert item["content"] == make_excerpt("긴 본문 " * 200)
+    assert len(item["content"]) <= EXCERPT_LENGTH + 3
+
+def test_invalid_cursor_is_rejected(session_factory):
+    async def run():
+        async with session_factory() as db:
+            await fetch_history_page(db, Keyword, USER_ID, cursor="not-a-cursor")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
@@ -0,0 +1,113 @@
+"""
+인덱스 추천기 테스트 - 쿼리 지문 정규화, 조건/정렬 컬럼 추출, EXPLAIN 기반 추천과 누락 인덱스 검출
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine
+
+from index_advisor import IndexAdvisor, extract_column_usage
+from query_log import QueryLog, fingerprint_sql
+
+def _metadata(with_declared_index: bool = False) -> MetaData:
+    metadata = MetaData()
+    table = Table(
+        "posts", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("owner", String(50)),
+        Column("status", String(20)),
+        Column("created_at", Integer)
+    )
+    if with_declared_index:
+        Index("idx_posts_status", table.c.status)
+    return metadata
+
+@pytest.fixture
+def engine():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-advisor-"), "advisor.db")
+    engine = create_engine(f"sqlite:///{path}")
+    _metadata().create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO posts (owner, status, created_at) VALUES " +
+            ", ".join(f"('user-{i % 10}', 'draft', {i})" for i in range(200))
+        )
+    yield engine
+    engine.dispose()
+
+def _run_logged(engine, query_log: QueryLog, statement: str, parameters: tuple):
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        conn.exec_driver_sql(statement, parameters).all()
+        query_log.record(statement, parameters, time.perf_counter() - started, paramstyle=engine.dialect.paramstyle)
+
+# ---- 쿼리 로그 ----
+
+def test_fingerprint_folds_literals_placeholders_and_lists():
+    assert fingerprint_sql("SELECT * FROM posts WHERE id IN (1, 2, 3) AND owner = 'a' -- note") == \
+        fingerprint_sql("SELECT *\n  FROM posts WHERE id IN (?, ?) AND owner = :owner") == \
+        "SELECT * FROM posts WHERE id IN (?) AND owner = ?"
+    assert fingerprint_sql("INSERT INTO t (a) VALUES (1), (2), (3)") == "INSERT INTO t (a) VALUES (?)"
+
+def test_query_log_accumulates_and_keeps_only_select_samples():
+    log = QueryLog(max_fingerprints=2)
+
+    log.record("SELECT * FROM posts WHERE id = ?", (1,), 0.01)
+    log.record("SELECT * FROM posts WHERE id = ?", (2,), 0.03)
+    log.record("UPDATE posts SET status = ? WHERE id = ?", ("secret", 1), 0.5)
+    log.record("DELETE FROM posts", (), 0.1)
+
+    top = log.top()
+    assert [entry["calls"] for entry in top] == [1, 2]
+    assert top[0]["sample_statement"] is None and top[0]["sample_parameters"] is None
+    # 가장 느렸던 실행을 샘플로 보관
+    assert top[1]["sample_parameters"] == (2,)
+    assert top[1]["avg_time"] == pytest.approx(0.02)
+    assert len(log) == 2 and log.dropped == 1
+
+# ---- 컬럼 추출 ----
+
+def test_extract_column_usage_orders_equality_range_then_sort():
+    usage = extract_column_usage(
+        'SELECT p.id FROM posts AS p WHERE p.owner = ? AND p.created_at > ? AND p.status IN (?) ORDER BY p.created_at DESC LIMIT 5',
+        ["posts"]
+    )
+
+    assert usage["posts"].index_columns() == ["owner", "status", "created_at"]
+    assert extract_column_usage("SELECT 1 FROM unknown WHERE a = 1", ["posts"]) == {}
+
+# ---- 추천 ----
+
+def test_analyze_recommends_index_for_scanned_predicate(engine):
+    log = QueryLog()
+    statement = "SELECT id FROM posts WHERE owner = ? ORDER BY created_at DESC"
+    _run_logged(engine, log, statement, ("user-1",))
+    advisor = IndexAdvisor(engine, metadata=_metadata(), query_log=log)
+
+    recommendations = advisor.analyze()
+
+    assert [(item.table, item.columns) for item in recommendations] == [("posts", ["owner", "created_at"])]
+    assert recommendations[0].name == "idx_posts_owner_created_at"
+    assert recommendations[0].calls == 1 and recommendations[0].plan
+
+    results = advisor.apply(recommendations)
+    assert results[0]["status"] == "created"
+    # 인덱스 생성 후에는 같은 로그로 더 이상 추천하지 않음
+    assert advisor.analyze() == []
+
+def test_missing_model_indexes_and_migration(engine):
+    advisor = IndexAdvisor(engine, metadata=_metadata(with_declared_index=True), query_log=QueryLog())
+
+    missing = advisor.missing_model_indexes()
+
+    assert [(item.name, item.source) for item in missing] == [("idx_posts_status", "model")]
+    migration = advisor.migration_sql(missing)
+    assert 'CREATE INDEX IF NOT EXISTS idx_posts_status ON posts (status);' in migration
+    migration_dir = tempfile.mkdtemp(prefix="blogauto-advisor-migrations-")
+    assert os.path.dirname(advisor.write_migration(missing, migration_dir)) == migration_dir
@@ -0,0 +1,87 @@
+"""
+진행률 브로커 테스트 - Redis 장애 시 이벤트 ID 연속성, 구독 확인 대기, 끝난 작업 스트림 종료
+"""
+
+import asyncio
+
+from progress_broker import ProgressBroker, RedisProgressBroker
+
+class FakeRedis:
+    def __init__(self, sequence: int = 0):
+        self.sequence = sequence
+        self.available = True
+        self.published = []
+
+    async def incr(self, key):
+        if not self.available:
+            raise ConnectionError("redis down")
+        self.sequence += 1
+        return self.sequence
+
+    async def incrby(self, key, amount):
+        self.sequence += amount
+        return self.sequence
+
+    async def publish(self, channel, message):
+        self.published.append(message)
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = False
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.subscribed = True
+
+    async def get_message(self, timeout=0.0):
+        return self.messages.pop(0) if self.messages else None
+
+    async def close(self):
+        self.closed = True
+
+def _redis_broker(client: FakeRedis) -> RedisProgressBroker:
+    broker = RedisProgressBroker("redis://unused")
+    broker._client = client
+    # 리스너가 떠 있는 것으로 간주 (실제 구독 없이 발행 경로만 확인)
+    broker._listener = asyncio.get_running_loop().create_future()
+    return broker
+
+def test_fallback_ids_continue_after_last_redis_id():
+    async def run():
+        client = FakeRedis(sequence=40)
+        broker = _redis_broker(client)
+        ids = [await broker.publish(["task:1"], "progress", {})]
+        client.available = False
+        ids.append(await broker.publish(["task:1"], "progress", {}))
+        # 복구 후 Redis 시퀀스가 로컬 ID 보다 뒤처져 있어도 계속 증가
+        client.available = True
+        client.sequence = 41
+        ids.append(await broker.publish(["task:1"], "progress", {}))
+        return ids
+
+    assert asyncio.run(run()) == [41, 42, 43]
+
+def test_subscribe_waits_for_confirmation():
+    async def run():
+        broker = RedisProgressBroker("redis://unused")
+        pubsub = FakePubSub([None, {"type": "subscribe", "channel": RedisProgressBroker.CHANNEL}])
+        broker._client = type("Client", (), {"pubsub": lambda self: pubsub})()
+        return pubsub, await broker._subscribe()
+
+    pubsub, subscribed = asyncio.run(run())
+    assert subscribed is pubsub
+    assert pubsub.messages == []
+    assert not pubsub.closed
+
+def test_stream_ends_when_target_is_no_longer_active():
+    async def run():
+        broker = ProgressBroker(keepalive_seconds=0.01)
+        event_id = await broker.publish(["task:2"], "completed", {})
+        broker.forget("task:2")
+        frames = []
+        async for progress_event in broker.subscribe("task:2", event_id, True, is_active=lambda: False):
+            frames.append(progress_event)
+        return frames
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=2)) == []
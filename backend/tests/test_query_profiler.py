@@ -0,0 +1,90 @@
+"""
+쿼리 프로파일러 테스트 - 요청 미들웨어가 라우트 템플릿/사용자로 쿼리를 묶고, 느린 쿼리 계획 캡처와 N+1 검출
+"""
+
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("httpx")
+pytest.importorskip("aiohttp")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from performance_optimizer import db_optimizer
+from query_profiler import BACKGROUND_ROUTE, query_profiler
+
+@pytest.fixture
+def engine():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-profiler-"), "profiler.db")
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.exec_driver_sql("INSERT INTO items (name) VALUES " + ", ".join(f"('item {i}')" for i in range(20)))
+    db_optimizer.attach_engine(engine)
+    query_profiler.reset()
+    yield engine
+    query_profiler.reset()
+    engine.dispose()
+
+@pytest.fixture
+def thresholds(monkeypatch):
+    monkeypatch.setattr(query_profiler, "n_plus_one_threshold", 5)
+    # 모든 쿼리를 느린 쿼리로 보고 계획을 캡처
+    monkeypatch.setattr(query_profiler, "slow_threshold", 0.0)
+
+def _app(engine, loops: int) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(query_profiler.middleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        query_profiler.tag_user("user-1")
+        with engine.connect() as conn:
+            names = [
+                conn.exec_driver_sql("SELECT name FROM items WHERE id = ?", (item_id + i,)).scalar()
+                for i in range(loops)
+            ]
+        return {"names": names}
+
+    return app
+
+def test_queries_are_grouped_by_route_template_and_user(engine, thresholds):
+    client = TestClient(_app(engine, loops=2))
+
+    for item_id in (1, 2, 3):
+        assert client.get(f"/items/{item_id}").status_code == 200
+
+    profile = query_profiler.get_profile(route="GET /items/{item_id}")
+    assert profile["routes"]["GET /items/{item_id}"]["fingerprints"] == 1
+    query = profile["queries"][0]
+    assert query["fingerprint"] == "SELECT name FROM items WHERE id = ?"
+    assert query["calls"] == 6
+    assert query["top_users"] == [{"user_id": "user-1", "calls": 6}]
+    assert query["slow_calls"] == 6
+    # 느린 쿼리는 같은 연결에서 계획을 한 번 캡처하고, 캡처용 EXPLAIN 은 집계하지 않음
+    assert query["plan"] and "items" in query["plan"][0]
+    assert not profile["n_plus_one"]
+
+def test_repeated_fingerprint_in_one_request_is_flagged(engine, thresholds):
+    client = TestClient(_app(engine, loops=6))
+
+    client.get("/items/1")
+
+    profile = query_profiler.get_profile()
+    query = profile["queries"][0]
+    assert query["n_plus_one_requests"] == 1 and query["max_calls_per_request"] == 6
+    assert profile["n_plus_one"][0]["route"] == "GET /items/{item_id}"
+    assert profile["n_plus_one"][0]["user_id"] == "user-1"
+
+def test_queries_outside_requests_are_background(engine):
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT count(*) FROM items").scalar()
+
+    profile = query_profiler.get_profile(route=BACKGROUND_ROUTE)
+    assert [query["calls"] for query in profile["queries"]] == [1]
+    assert query_profiler.current_user_id() is None
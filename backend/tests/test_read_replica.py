@@ -0,0 +1,102 @@
+"""
+읽기 라우팅 테스트 - 복제본 선택, 복제 지연/측정 실패 시 주 DB 대체, 쓰기 직후 read-your-writes
+(주 DB 와 복제본을 서로 다른 SQLite 파일로 구분하여 어느 쪽에서 읽었는지 확인)
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import read_replica
+from query_profiler import query_profiler
+from read_replica import PRIMARY, REPLICA, ReadRouter, ReadSessionLocal
+
+notes = Table("notes", MetaData(), Column("id", Integer, primary_key=True), Column("source", String))
+
+@pytest.fixture
+def router(monkeypatch):
+    root = tempfile.mkdtemp(prefix="blogauto-replica-")
+    engines = {}
+    for name in (PRIMARY, REPLICA):
+        path = os.path.join(root, name + ".db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, source TEXT)")
+            conn.execute("INSERT INTO notes (source) VALUES (?)", (name,))
+        engines[name] = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    router = ReadRouter(engines[PRIMARY], engines[REPLICA], read_your_writes_window=30)
+    monkeypatch.setattr(read_replica, "read_router", router)
+    user = {"id": None}
+    monkeypatch.setattr(query_profiler, "current_user_id", lambda: user["id"])
+    router.user = user
+    router.primary_sessions = async_sessionmaker(engines[PRIMARY], class_=AsyncSession, expire_on_commit=False)
+    yield router
+    for engine in engines.values():
+        asyncio.run(engine.dispose())
+
+async def _read_source():
+    async with ReadSessionLocal() as db:
+        source = (await db.execute(text("SELECT source FROM notes ORDER BY id LIMIT 1"))).scalar()
+        return source, db.sync_session.info["read_route"]
+
+def test_reads_go_to_replica_until_the_user_writes(router):
+    router.user["id"] = "user-1"
+    assert asyncio.run(_read_source()) == (REPLICA, REPLICA)
+
+    async def write():
+        async with router.primary_sessions() as db:
+            await db.execute(insert(notes).values(source="written"))
+            await db.commit()
+
+    asyncio.run(write())
+
+    # 방금 쓴 사용자는 주 DB, 다른 사용자는 계속 복제본
+    assert asyncio.run(_read_source()) == (PRIMARY, "recent_write")
+    router.user["id"] = "user-2"
+    assert asyncio.run(_read_source()) == (REPLICA, REPLICA)
+    assert router.get_stats()["routes"] == {REPLICA: 2, "recent_write": 1}
+    assert router.get_stats()["tracked_writers"] == 1
+
+def test_read_your_writes_window_expires(router):
+    router.read_your_writes_window = 0.05
+    router.note_write("user-1")
+    router.user["id"] = "user-1"
+
+    assert router.choose()[1] == "recent_write"
+    time.sleep(0.1)
+    assert router.choose()[1] == REPLICA
+
+def test_lagging_or_unmeasured_replica_falls_back_to_primary(router):
+    monitor = router.monitor
+    # PostgreSQL 복제본처럼 지연을 측정해야 하는 상태로 전환
+    monitor.same_database = False
+
+    monitor.lag, monitor.checked_at = None, None
+    assert router.choose() == (router.primary, "replica_unavailable")
+    monitor.lag, monitor.checked_at = monitor.max_lag + 1, time.monotonic()
+    assert router.choose() == (router.primary, "replica_lag")
+    monitor.lag, monitor.checked_at = 0.5, time.monotonic() - monitor.interval * 4
+    assert router.choose() == (router.primary, "lag_unknown")
+    monitor.checked_at = time.monotonic()
+    assert router.choose() == (router.replica, REPLICA)
+
+def test_writes_in_read_session_go_to_primary(router):
+    async def run():
+        async with ReadSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+            await db.execute(insert(notes).values(source="stray write"))
+            await db.commit()
+        async with router.primary_sessions() as db:
+            return (await db.execute(text("SELECT count(*) FROM notes WHERE source = 'stray write'"))).scalar()
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,75 @@
+"""
+관련 글 색인 테스트 - 추가/교체/삭제 후 사이트별 문서 빈도(df)와 문서 수가 실제 문서와 일치하는지
+"""
+
+import os
+import tempfile
+from collections import Counter
+
+import pytest
+
+from related_content import SOURCE_POSTED, SOURCE_SAVED, RelatedContentIndex, _unpack
+
+BODIES = {
+    "diet": "다이어트 식단은 단백질과 채소를 충분히 먹는 것이 중요합니다. 식단 일지를 쓰면 도움이 됩니다.",
+    "travel": "여행 준비물 체크리스트를 미리 만들어 두면 출발 전날이 편합니다. 여권과 충전기를 챙기세요.",
+    "camping": "캠핑 준비물은 텐트와 침낭, 그리고 여행용 랜턴이 기본입니다. 식단도 미리 짜 두세요.",
+}
+
+@pytest.fixture
+def index():
+    return RelatedContentIndex(os.path.join(tempfile.mkdtemp(prefix="blogauto-related-"), "index.db"))
+
+def _assert_consistent(index: RelatedContentIndex):
+    conn = index._db()
+    expected_df, expected_sites = Counter(), Counter()
+    for row in conn.execute("SELECT site_id, terms FROM documents"):
+        expected_sites[row["site_id"]] += 1
+        expected_df.update((row["site_id"], term) for term in _unpack(row["terms"]))
+    df = {(row["site_id"], row["term"]): row["df"] for row in conn.execute("SELECT site_id, term, df FROM terms")}
+    sites = {row["site_id"]: row["documents"] for row in conn.execute("SELECT * FROM sites WHERE documents > 0")}
+    postings = Counter((row["site_id"], row["term"]) for row in conn.execute("SELECT site_id, term FROM postings"))
+
+    assert df == dict(expected_df)
+    assert dict(postings) == dict(expected_df)
+    assert sites == dict(expected_sites)
+
+def test_add_replace_remove_keeps_document_frequencies(index):
+    index.add_documents(SOURCE_POSTED, [
+        {"doc_id": "1", "site_id": 1, "title": "다이어트 식단", "body": BODIES["diet"]},
+        {"doc_id": "2", "site_id": 1, "title": "여행 준비물", "body": BODIES["travel"]},
+        {"doc_id": "3", "site_id": 2, "title": "캠핑 준비물", "body": BODIES["camping"]},
+    ])
+    index.add_documents(SOURCE_SAVED, [{"doc_id": "1", "title": "다이어트 식단", "body": BODIES["diet"]}])
+    _assert_consistent(index)
+
+    # 같은 문서를 다른 본문/사이트로 교체 - 이전 term 의 df 가 빠지고 새 사이트에 더해져야 함
+    index.add_documents(SOURCE_POSTED, [{"doc_id": "2", "site_id": 2, "title": "캠핑 여행", "body": BODIES["camping"]}])
+    _assert_consistent(index)
+
+    assert index.remove_documents(SOURCE_POSTED, ["1", "missing"]) == 1
+    _assert_consistent(index)
+
+    # 빈 본문으로 교체하면 문서가 빠짐
+    index.add_documents(SOURCE_SAVED, [{"doc_id": "1", "title": "", "body": ""}])
+    _assert_consistent(index)
+    assert index.get_stats()["documents"] == {SOURCE_POSTED: 2}
+
+    index.remove_documents(SOURCE_POSTED, ["2", "3"])
+    conn = index._db()
+    assert conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0] == 0
+    assert index.get_stats()["sites"] == 0
+
+def test_related_is_scoped_to_site(index):
+    index.add_documents(SOURCE_POSTED, [
+        {"doc_id": "1", "site_id": 1, "title": "다이어트 식단", "body": BODIES["diet"], "url": "https://a/1"},
+        {"doc_id": "2", "site_id": 1, "title": "여행 준비물", "body": BODIES["travel"], "url": "https://a/2"},
+        {"doc_id": "3", "site_id": 1, "title": "캠핑 준비물", "body": BODIES["camping"], "url": "https://a/3"},
+        {"doc_id": "4", "site_id": 2, "title": "다이어트 식단", "body": BODIES["diet"], "url": "https://b/4"},
+    ])
+
+    results = index.related(BODIES["diet"], "다이어트 식단 가이드", site_id=1)
+
+    assert results[0]["doc_id"] == "1"
+    assert all(item["url"].startswith("https://a/") for item in results)
@@ -0,0 +1,127 @@
+"""
+SEO 분석 집계 테스트 - GROUP BY 집계 결과가 행을 직접 세어 계산한 값과 같은지 (0/NULL 제외 평균, 분포, 일별 건수)
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from models import Base, GeneratedContent, GeneratedTitle, Keyword
+from seo_analytics import SEOAnalytics
+
+USER_ID = "analytics-user"
+
+KEYWORDS = [
+    # (검색량, 기회점수, 경쟁도, 며칠 전)
+    (1000, 80, "Low", 0),
+    (500, 0, "High", 1),
+    (300, None, None, 2),
+    (2000, 60, "Low", 40),
+]
+CONTENT_SCORES = [
+    # (SEO, GEO, 며칠 전)
+    (95, 70, 0),
+    (85, 0, 0),
+    (0, 50, 1),
+    (55, None, 3),
+    (75, 60, 45),
+]
+TITLES = [
+    # (언어, 톤, 중복률, 며칠 전)
+    ("ko", "professional", 10, 0),
+    ("ko", None, 0, 1),
+    ("en", "casual", 20, 1),
+]
+
+@pytest.fixture
+def session_factory():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-analytics-"), "analytics.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.now()
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            for i, (volume, score, competition, days_ago) in enumerate(KEYWORDS):
+                db.add(Keyword(
+                    keyword=f"키워드 {i}", search_volume=volume, opportunity_score=score, competition=competition,
+                    created_by=USER_ID, created_at=now - timedelta(days=days_ago)
+                ))
+            for i, (seo, geo, days_ago) in enumerate(CONTENT_SCORES):
+                db.add(GeneratedContent(
+                    content=f"본문 {i}", seo_score=seo, geo_score=geo,
+                    created_by=USER_ID, created_at=now - timedelta(days=days_ago)
+                ))
+            for i, (language, tone, duplicate_rate, days_ago) in enumerate(TITLES):
+                db.add(GeneratedTitle(
+                    title=f"제목 {i}", language=language, tone=tone, duplicate_rate=duplicate_rate,
+                    created_by=USER_ID, created_at=now - timedelta(days=days_ago)
+                ))
+            # 다른 사용자의 행은 집계에 포함되지 않아야 함
+            db.add(Keyword(keyword="남의 키워드", search_volume=99999, opportunity_score=1, created_by="other-user"))
+            await db.commit()
+
+    asyncio.run(seed())
+    yield factory
+    asyncio.run(engine.dispose())
+
+def _run(session_factory, method, days=30):
+    async def run():
+        async with session_factory() as db:
+            return await getattr(SEOAnalytics(db), method)(USER_ID, days)
+    return asyncio.run(run())
+
+def test_keyword_performance_matches_rows(session_factory):
+    result = _run(session_factory, "get_keyword_performance")
+
+    recent = [row for row in KEYWORDS if row[3] < 30]
+    scores = [row[1] for row in recent if row[1]]
+    assert result["total_keywords"] == len(recent)
+    assert result["avg_search_volume"] == sum(row[0] for row in recent) / len(recent)
+    assert result["avg_opportunity_score"] == sum(scores) / len(scores)
+    assert result["competition_distribution"] == {"Low": 1, "High": 1, "Unknown": 1}
+    # 기회점수 내림차순 (NULL 은 0 으로)
+    assert [item["search_volume"] for item in result["top_keywords"]][0] == 1000
+    assert sorted(item["search_volume"] for item in result["top_keywords"]) == [300, 500, 1000]
+
+def test_content_analytics_matches_rows(session_factory):
+    result = _run(session_factory, "get_content_analytics", days=7)
+
+    recent = [row for row in CONTENT_SCORES if row[2] < 7]
+    seo = [row[0] for row in recent if row[0]]
+    geo = [row[1] for row in recent if row[1]]
+    assert result["total_content"] == len(recent)
+    assert result["avg_seo_score"] == sum(seo) / len(seo)
+    assert result["avg_geo_score"] == sum(geo) / len(geo)
+    assert result["seo_score_distribution"] == {"90-100 (Excellent)": 1, "80-89 (Good)": 1, "0-59 (Very Poor)": 1}
+    assert len(result["content_by_day"]) == 7
+    assert [day["count"] for day in result["content_by_day"]][-4:] == [1, 0, 1, 2]
+
+def test_title_analytics_matches_rows(session_factory):
+    result = _run(session_factory, "get_title_analytics", days=7)
+
+    assert result["total_titles"] == 3
+    assert result["avg_duplicate_rate"] == 15
+    assert result["language_distribution"] == {"ko": 2, "en": 1}
+    assert result["tone_distribution"] == {"professional": 1, "casual": 1, "unknown": 1}
+    assert sum(day["count"] for day in result["titles_by_day"]) == 3
+
+def test_empty_period_returns_zeroes(session_factory):
+    async def run():
+        async with session_factory() as db:
+            return await SEOAnalytics(db).get_content_analytics("nobody", 30)
+
+    assert asyncio.run(run()) == {
+        "total_content": 0, "avg_seo_score": 0, "avg_geo_score": 0,
+        "content_by_day": [], "seo_score_distribution": {}
+    }
@@ -0,0 +1,57 @@
+"""
+SEO 점수 엔진 테스트 - 키워드 셈(조사/합성어), 본문 순회 토큰과 분석기 일치, 점수 구간, NumPy/순수 파이썬 일치
+"""
+
+import random
+
+import pytest
+
+import seo_scoring
+from korean_text import analyze_keyword
+from seo_scoring import DocumentFeatures, FEATURE_NAMES, extract_features, score_document, score_features
+
+DOCUMENT = (
+    "# 다이어트 식단 가이드\n\n"
+    "다이어트식단은 2024년 트렌드입니다. 다이어트를 위한 3.5배 효과!\n\n"
+    "## 정리\n\n다이어트는 꾸준함이 중요합니다."
+)
+
+def test_compound_words_count_as_keyword():
+    features = extract_features("다이어트식단 추천. 다이어트는 쉽다.", "다이어트")
+
+    assert features.keyword_count == 2
+
+def test_single_pass_tokens_match_keyword_analyzer():
+    for keyword in ("다이어트", "다이어트 식단", "2024년", "3.5배", "트렌드"):
+        features = extract_features(DOCUMENT, keyword)
+        analysis = analyze_keyword(DOCUMENT, keyword)
+
+        assert (features.keyword_count, features.keyword_density) == (analysis.count, analysis.density), keyword
+
+def test_empty_document_scores_zero():
+    scores = score_document("", keyword="다이어트", title="다이어트 식단")
+
+    assert scores == {"seo_score": 0.0, "readability_score": 0.0, "geo_score": 0.0, "quality_score": 0.0}
+
+def test_sentence_length_bands_have_no_gap():
+    # 40 과 40.01 사이 평균 문장 길이도 (40, 60] 구간 가산점을 받아야 함
+    gap = DocumentFeatures(length=500, avg_sentence_length=40.005)
+    upper = DocumentFeatures(length=500, avg_sentence_length=50)
+
+    assert score_features([gap])[0]["readability_score"] == score_features([upper])[0]["readability_score"]
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    rows = [extract_features(DOCUMENT, "다이어트", "다이어트 식단 가이드 - 초보자를 위한 일주일 계획", "요약" * 50)]
+    for _ in range(200):
+        rows.append(DocumentFeatures(**{
+            name: rng.choice((0, 1, 2, 3, 20, 40, 40.005, 60, 60.5, 800, 1499, 1500, 4000, 5000))
+            for name in FEATURE_NAMES
+        }))
+
+    vectorized = score_features(rows)
+    monkeypatch.setattr(seo_scoring, "NUMPY_AVAILABLE", False)
+    scalar = score_features(rows)
+
+    assert vectorized == scalar
@@ -0,0 +1,59 @@
+"""
+제목 어휘 매처 테스트 - 겹치는 패턴, 대소문자 통일, 지침 저장소 덮어쓰기, 단순 부분 문자열 검사와 일치
+"""
+
+import json
+import random
+
+from title_lexicon import AhoCorasick, TitleLexicon
+
+def _found(automaton: AhoCorasick, text: str):
+    return {automaton.patterns[index] for index in automaton.find(text)}
+
+def test_overlapping_and_nested_patterns():
+    automaton = AhoCorasick(["he", "she", "his", "hers", "", "놓치면 후회", "후회"])
+
+    assert _found(automaton, "ushers") == {"he", "she", "hers"}
+    assert _found(automaton, "지금 놓치면 후회합니다") == {"놓치면 후회", "후회"}
+    assert _found(automaton, "hi") == set()
+    assert "" not in automaton.patterns
+
+def test_matches_naive_substring_search():
+    rng = random.Random(5)
+    alphabet = "ab가나 "
+    patterns = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)})
+    automaton = AhoCorasick(patterns)
+
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert _found(automaton, text) == {pattern for pattern in patterns if pattern in text}
+
+def test_case_folding_and_weights():
+    lexicon = TitleLexicon()
+    lexicon.register_defaults({"t.trend": {"MZ세대": 3, "2025": 2}, "t.hook": ["비밀"]})
+
+    matches = lexicon.scan("mz세대가 말하는 2025 트렌드")
+
+    assert matches.phrases("t.trend") == ["2025", "MZ세대"]
+    assert matches.weight("t.trend") == 5
+    assert not matches.any("t.hook")
+    assert matches.count("t.missing") == 0
+
+def test_store_overrides_replace_categories():
+    lexicon = TitleLexicon()
+    lexicon.register_defaults({"t.trend": ["요즘"], "t.hook": ["비밀"]})
+    assert lexicon.scan("요즘 뜨는 비밀").to_dict("t.") == {"t.hook": ["비밀"], "t.trend": ["요즘"]}
+
+    applied = lexicon.apply_store([
+        json.dumps({"t.trend": {"최신": 4}}),
+        "not json",
+        json.dumps({"t.hook": []}),
+    ])
+
+    assert applied == 2
+    assert lexicon.last_error
+    assert lexicon.scan("요즘 최신 비밀").to_dict("t.") == {"t.trend": ["최신"]}
+
+    # 덮어쓰기가 사라지면 기본 어휘로 돌아감
+    lexicon.apply_store([])
+    assert lexicon.scan("요즘 최신 비밀").to_dict("t.") == {"t.hook": ["비밀"], "t.trend": ["요즘"]}
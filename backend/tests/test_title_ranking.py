@@ -0,0 +1,61 @@
+"""
+제목 후보 순위 테스트 - 상위 후보 풀의 중복 제거, MMR 다양성, NumPy/희소 벡터 경로 일치
+"""
+
+import random
+
+import pytest
+
+import title_ranking
+from title_ranking import mmr_select, rank_candidates, top_candidates
+
+def _candidates(*pairs):
+    return [{"title": title, "score": score} for title, score in pairs]
+
+def test_top_candidates_collapses_duplicates_and_keeps_best():
+    stream = _candidates(
+        ("다이어트 식단 추천", 50),
+        ("다이어트 식단 추천!", 70),
+        ("여행 준비물 목록", 60),
+        ("다이어트식단 추천", 40),
+        ("홈트레이닝 루틴", 10),
+        ("", 99),
+    )
+
+    top = top_candidates(iter(stream), 2, "score")
+
+    assert [(item["title"], item["score"]) for item in top] == [("다이어트 식단 추천!", 70), ("여행 준비물 목록", 60)]
+
+def test_top_candidates_keeps_first_on_equal_scores():
+    top = top_candidates(_candidates(("첫 번째 제목", 5), ("두 번째 제목", 5), ("세 번째 제목", 5)), 2, "score")
+
+    assert [item["title"] for item in top] == ["첫 번째 제목", "두 번째 제목"]
+
+def test_mmr_defers_near_duplicates():
+    pool = _candidates(
+        ("초보자를 위한 다이어트 식단 3가지", 90),
+        ("초보자를 위한 다이어트 식단 7가지", 89),
+        ("주말 캠핑 준비물 체크리스트", 60),
+    )
+
+    chosen = mmr_select(pool, 2, "score")
+
+    # 숫자만 다른 제목은 거의 같은 제목 - 점수가 낮아도 다른 제목을 먼저
+    assert [item["title"] for item in chosen] == [pool[0]["title"], pool[2]["title"]]
+    assert len(mmr_select(pool, 5, "score")) == 3
+    assert mmr_select(pool, 0, "score") == []
+
+def test_numpy_and_sparse_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(11)
+    words = ["다이어트", "식단", "여행", "준비물", "캠핑", "초보자", "가이드", "추천", "비밀", "루틴", "2025"]
+    candidates = [
+        {"title": " ".join(rng.sample(words, rng.randint(2, 5))), "score": rng.random() * 100}
+        for _ in range(300)
+    ]
+
+    vectorized = rank_candidates(candidates, 10, "score")
+    monkeypatch.setattr(title_ranking, "NUMPY_AVAILABLE", False)
+    sparse = rank_candidates(candidates, 10, "score")
+
+    assert [item["title"] for item in vectorized] == [item["title"] for item in sparse]
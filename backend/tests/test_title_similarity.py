@@ -0,0 +1,63 @@
+"""
+제목 유사도 색인 테스트 - shingle/Jaccard, LSH 후보 재현율, 배치 내 중복, 완전 일치/사이트 중복률
+"""
+
+import random
+
+from title_similarity import TitleSimilarityIndex, jaccard, normalize_title, shingles
+
+def test_shingles_normalize_and_short_titles():
+    assert shingles(normalize_title("다이어트 식단!")) == shingles(normalize_title("다이어트식단"))
+    assert len(shingles("abcd")) == 2
+    assert len(shingles("ab")) == 1
+    assert shingles("") == set()
+
+def test_jaccard():
+    a, b = shingles("abcdef"), shingles("abcdxy")
+    assert jaccard(a, a) == 1.0
+    assert jaccard(a, set()) == 0.0
+    assert jaccard(a, b) == len(a & b) / len(a | b)
+
+def test_lsh_finds_near_duplicates():
+    rng = random.Random(7)
+    syllables = [chr(code) for code in range(ord("가"), ord("가") + 400)]
+    index = TitleSimilarityIndex()
+    bases = ["".join(rng.choice(syllables) for _ in range(30)) for _ in range(300)]
+    index.add_many(bases)
+
+    found = 0
+    for base in bases[:100]:
+        # 한 글자만 바뀐 제목 (Jaccard 약 0.8) - 정확 비교 후보에 원본이 들어와야 함
+        position = rng.randrange(len(base))
+        query = base[:position] + "힣" + base[position + 1:]
+        result = index.score(query)
+        if result["nearest_title"] == base and result["duplicate_rate"] >= 70:
+            found += 1
+
+    assert found >= 95
+
+def test_exact_duplicate_and_site_rates():
+    index = TitleSimilarityIndex()
+    index.add("다이어트 식단 추천 10가지", site_id=1)
+
+    same_site = index.score("다이어트 식단 추천 10가지!", site_id=1)
+    other_site = index.score("다이어트 식단 추천 10가지", site_id=2)
+
+    assert same_site["duplicate_rate"] == 100.0
+    assert same_site["site_duplicate_rate"] == 100.0
+    assert other_site["duplicate_rate"] == 100.0
+    assert other_site["site_duplicate_rate"] == 0.0
+    assert index.score("다이어트 식단 추천 10가지")["site_duplicate_rate"] is None
+
+def test_score_batch_within_batch_updates_nearest_title():
+    index = TitleSimilarityIndex()
+    index.add("전혀 다른 여행 준비물 목록")
+    titles = ["초보자를 위한 홈트레이닝 루틴 가이드", "초보자를 위한 홈트레이닝 루틴 가이드 2편"]
+
+    independent = index.score_batch(titles, within_batch=False)
+    batched = index.score_batch(titles, within_batch=True)
+
+    assert independent[1]["duplicate_rate"] < 50
+    assert batched[0]["duplicate_rate"] == independent[0]["duplicate_rate"]
+    assert batched[1]["duplicate_rate"] > 80
+    assert batched[1]["nearest_title"] == normalize_title(titles[0])
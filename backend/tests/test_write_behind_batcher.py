@@ -0,0 +1,112 @@
+"""
+쓰기 지연 배처 테스트 - 백그라운드 플러시 참조 유지, 플러시 실패 시 재시도/버림, durable 대기
+"""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiohttp")
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Keyword
+from performance_optimizer import WriteBehindBatcher
+
+class FlakySessionFactory:
+    """처음 failures 번은 세션 생성부터 실패 (DB 장애 흉내)"""
+
+    def __init__(self, factory, failures: int):
+        self.factory = factory
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database is unavailable")
+        return self.factory()
+
+@pytest.fixture
+def session_factory():
+    path = os.path.join(tempfile.mkdtemp(prefix="blogauto-batcher-"), "batcher.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def _keyword_rows(count: int):
+    return [
+        {"keyword": f"키워드 {i}", "country_id": 1, "search_volume": 0, "competition": "Low", "cpc": 0.0,
+         "opportunity_score": 50}
+        for i in range(count)
+    ]
+
+def _stored(session_factory) -> int:
+    with session_factory() as session:
+        return session.execute(select(func.count()).select_from(Keyword)).scalar()
+
+def test_background_flush_is_tracked_and_written(session_factory):
+    batcher = WriteBehindBatcher(session_factory=session_factory, max_batch_size=2, flush_interval=0.01)
+
+    async def run():
+        await batcher.enqueue(Keyword, _keyword_rows(3))
+        tracked = len(batcher._flush_tasks)
+        await batcher.close()
+        return tracked
+
+    assert asyncio.run(run()) >= 1
+    assert not batcher._flush_tasks
+    assert _stored(session_factory) == 3
+
+def test_failed_flush_requeues_rows_until_it_succeeds(session_factory):
+    batcher = WriteBehindBatcher(
+        session_factory=FlakySessionFactory(session_factory, failures=2), flush_interval=0.01
+    )
+
+    async def run():
+        await batcher.enqueue(Keyword, _keyword_rows(4))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if batcher.stats["rows_written"] == 4:
+                break
+        await batcher.close()
+
+    asyncio.run(run())
+
+    assert _stored(session_factory) == 4
+    assert batcher.stats["requeued_rows"] == 8
+    assert batcher.stats["rows_failed"] == 0
+
+def test_rows_are_dropped_and_counted_after_max_retries(session_factory):
+    batcher = WriteBehindBatcher(
+        session_factory=FlakySessionFactory(session_factory, failures=100), flush_interval=0.001, max_flush_retries=2
+    )
+
+    async def run():
+        await batcher.enqueue(Keyword, _keyword_rows(2))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if batcher.stats["rows_failed"]:
+                break
+
+    asyncio.run(run())
+
+    assert batcher.stats["rows_failed"] == 2
+    assert batcher.get_stats()["buffered_rows"] == 0
+
+def test_durable_enqueue_raises_and_is_not_requeued(session_factory):
+    batcher = WriteBehindBatcher(session_factory=FlakySessionFactory(session_factory, failures=1), flush_interval=0.001)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await batcher.enqueue(Keyword, _keyword_rows(1), durable=True)
+        await batcher.close()
+
+    asyncio.run(run())
+
+    assert batcher.stats["requeued_rows"] == 0
+    assert _stored(session_factory) == 0
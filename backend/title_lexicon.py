@@ -0,0 +1,313 @@
+"""
+제목 어휘 매처
+CTR/감정/호기심 점수의 단어 목록을 하나의 Aho-Corasick 오토마톤으로 컴파일해 제목을 한 번만 훑고 모든 범주를 판정
+- 각 점수기가 자기 기본 어휘를 이름공간 범주("optimized.high_ctr" 등)로 등록 - 기존 `word in title` 과 같은 부분 문자열 일치
+- 범주별 어휘에 가중치를 두어 "일치 개수 x 점수" 형태의 점수도 한 번의 스캔 결과로 계산
+- 어휘가 바뀔 때만 다시 컴파일, 스캔은 컴파일된 스냅샷을 잠금 없이 사용
+- 지침 저장소(system_prompts, 제목 생성 타입, 이름 title_lexicon)의 JSON 으로 범주 단위 교체 - 주기적으로, 지침 변경 직후 다시 읽음
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from logger import app_logger
+
+# 지침 저장소에서 어휘로 읽을 지침 이름 (제목 생성 타입)
+LEXICON_PROMPT_NAME = os.getenv("TITLE_LEXICON_PROMPT_NAME", "title_lexicon")
+RELOAD_INTERVAL = float(os.getenv("TITLE_LEXICON_RELOAD_SECONDS", 30))
+
+PhraseSpec = Union[Iterable[str], Mapping[str, float]]
+
+def _fold(text: str) -> str:
+    # 대소문자만 통일 ("MZ세대" / "mz세대") - 띄어쓰기가 있는 어휘("놓치면 후회")는 그대로 일치
+    return (text or "").lower()
+
+def _weighted(phrases: PhraseSpec, weight: float = 1.0) -> Dict[str, float]:
+    if isinstance(phrases, Mapping):
+        return {str(phrase): float(value) for phrase, value in phrases.items() if phrase}
+    return {str(phrase): float(weight) for phrase in phrases if phrase}
+
+class AhoCorasick:
+    """다중 패턴 부분 문자열 매칭 오토마톤 - 텍스트 길이 + 일치 수에 비례 (패턴 수와 무관)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str):
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _link(self):
+        """BFS 로 실패 링크 연결 - 실패 상태의 출력을 합쳐 두어 스캔 중 링크를 따라가지 않음"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[nxt] = goto[link].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> Set[int]:
+        """텍스트에 나타난 패턴 번호 집합"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        found: Set[int] = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+class TitleMatches:
+    """한 제목의 범주별 일치 어휘"""
+
+    __slots__ = ("_hits", "_weights")
+
+    def __init__(self, hits: Dict[str, Set[str]], weights: Dict[str, Dict[str, float]]):
+        self._hits = hits
+        self._weights = weights
+
+    def any(self, category: str) -> bool:
+        return category in self._hits
+
+    def count(self, category: str) -> int:
+        return len(self._hits.get(category, ()))
+
+    def weight(self, category: str) -> float:
+        """일치한 (서로 다른) 어휘의 가중치 합"""
+        weights = self._weights.get(category, {})
+        return sum(weights.get(phrase, 0.0) for phrase in self._hits.get(category, ()))
+
+    def phrases(self, category: str) -> List[str]:
+        return sorted(self._hits.get(category, ()))
+
+    def to_dict(self, prefix: str = "") -> Dict[str, List[str]]:
+        return {
+            category: sorted(phrases)
+            for category, phrases in sorted(self._hits.items())
+            if category.startswith(prefix)
+        }
+
+class _CompiledLexicon:
+    """컴파일된 어휘 스냅샷 (불변)"""
+
+    def __init__(self, categories: Dict[str, Dict[str, float]]):
+        targets: Dict[str, List[Tuple[str, str]]] = {}
+        for category, phrases in categories.items():
+            for phrase in phrases:
+                folded = _fold(phrase)
+                if folded:
+                    targets.setdefault(folded, []).append((category, phrase))
+        self.automaton = AhoCorasick(targets)
+        # 패턴 번호 → (범주, 원래 어휘) 목록 - 같은 어휘가 여러 범주에 있어도 한 번만 일치 검사
+        self.targets = [tuple(targets[pattern]) for pattern in self.automaton.patterns]
+        self.weights = categories
+
+    def scan(self, title: str) -> TitleMatches:
+        hits: Dict[str, Set[str]] = {}
+        for pattern in self.automaton.find(_fold(title)):
+            for category, phrase in self.targets[pattern]:
+                hits.setdefault(category, set()).add(phrase)
+        return TitleMatches(hits, self.weights)
+
+class TitleLexicon:
+    """가중 범주 어휘 + 지침 저장소 덮어쓰기 (스레드 안전)"""
+
+    def __init__(self, prompt_name: str = LEXICON_PROMPT_NAME, interval: float = RELOAD_INTERVAL):
+        self.prompt_name = prompt_name
+        self.interval = interval
+        self._defaults: Dict[str, Dict[str, float]] = {}
+        self._overrides: Dict[str, Dict[str, float]] = {}
+        self._compiled: Optional[_CompiledLexicon] = None
+        self._store_digest: Optional[str] = None
+        self._lock = threading.RLock()
+        self._task: Optional[asyncio.Task] = None
+        self.compiled_at: Optional[float] = None
+        self.reloaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # ---- 어휘 등록 ----
+
+    def register_defaults(self, categories: Mapping[str, PhraseSpec], weight: float = 1.0):
+        """점수기의 기본 어휘 등록 (같은 내용이면 그대로 - 인스턴스를 매번 만들어도 다시 컴파일하지 않음)
+
+        categories: {범주: [어휘, ...]} 또는 {범주: {어휘: 가중치}}
+        """
+        normalized = {name: _weighted(phrases, weight) for name, phrases in categories.items()}
+        with self._lock:
+            changed = [name for name, phrases in normalized.items() if self._defaults.get(name) != phrases]
+            for name in changed:
+                self._defaults[name] = normalized[name]
+            if changed:
+                self._compiled = None
+
+    def categories(self) -> Dict[str, Dict[str, float]]:
+        """적용 중인 범주별 어휘 (저장소 덮어쓰기 반영)"""
+        with self._lock:
+            merged = dict(self._defaults)
+            merged.update(self._overrides)
+            return merged
+
+    def _snapshot(self) -> _CompiledLexicon:
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled
+        with self._lock:
+            if self._compiled is None:
+                started = time.perf_counter()
+                self._compiled = _CompiledLexicon(self.categories())
+                self.compiled_at = time.time()
+                app_logger.info(
+                    f"Title lexicon compiled: {len(self._compiled.automaton.patterns)} phrases, "
+                    f"{self._compiled.automaton.states} states in {(time.perf_counter() - started) * 1000:.1f}ms"
+                )
+            return self._compiled
+
+    # ---- 스캔 ----
+
+    def scan(self, title: str) -> TitleMatches:
+        return self._snapshot().scan(title)
+
+    def scan_batch(self, titles: Iterable[str]) -> List[TitleMatches]:
+        compiled = self._snapshot()
+        return [compiled.scan(title) for title in titles]
+
+    # ---- 지침 저장소 ----
+
+    def parse_store_content(self, content: str) -> Dict[str, Dict[str, float]]:
+        """지침 본문(JSON) → 범주별 어휘
+
+        {"optimized.high_ctr": {"놀라운": 5, "대박": 5}, "advanced.trend": ["2025", "요즘"]}
+        목록은 가중치 1, 빈 목록은 해당 범주를 비움.
+        """
+        data = json.loads(content)
+        if not isinstance(data, dict):
+            raise ValueError("lexicon must be a JSON object of categories")
+        categories = {}
+        for name, phrases in data.items():
+            if not isinstance(phrases, (list, dict)):
+                raise ValueError(f"category {name!r} must be a list or an object of weights")
+            categories[str(name)] = _weighted(phrases)
+        return categories
+
+    def apply_store(self, contents: List[str]) -> int:
+        """지침 본문들로 덮어쓰기 교체 (뒤 지침이 같은 범주를 이김), 적용된 범주 수"""
+        overrides: Dict[str, Dict[str, float]] = {}
+        errors = []
+        for content in contents:
+            try:
+                overrides.update(self.parse_store_content(content))
+            except (ValueError, TypeError) as e:
+                # 잘못된 지침 하나 때문에 나머지 어휘가 사라지지 않도록 건너뜀
+                errors.append(str(e))
+        with self._lock:
+            if overrides != self._overrides:
+                self._overrides = overrides
+                self._compiled = None
+        self.last_error = "; ".join(errors) or None
+        if errors:
+            app_logger.warning(f"Title lexicon: skipped invalid guideline content: {self.last_error}")
+        return len(overrides)
+
+    async def reload(self, db) -> bool:
+        """지침 저장소의 어휘 지침을 다시 읽음 (내용이 바뀐 경우만 적용), 적용했으면 True"""
+        from sqlalchemy import select
+        from models import SystemPrompt, PromptType
+
+        rows = (await db.execute(
+            select(SystemPrompt.prompt_content).where(
+                SystemPrompt.prompt_type == PromptType.TITLE_GENERATION,
+                SystemPrompt.name == self.prompt_name,
+                SystemPrompt.is_active == True
+            ).order_by(SystemPrompt.created_at)
+        )).scalars().all()
+        self.reloaded_at = time.time()
+        digest = hashlib.sha1("\0".join(rows).encode("utf-8")).hexdigest()
+        if digest == self._store_digest:
+            return False
+        applied = self.apply_store(list(rows))
+        self._store_digest = digest
+        app_logger.info(f"Title lexicon reloaded from guideline store: {applied} categories overridden")
+        return True
+
+    async def safe_reload(self, db) -> bool:
+        try:
+            return await self.reload(db)
+        except Exception as e:
+            app_logger.warning(f"Title lexicon reload failed, keeping current lexicon: {e}")
+            self.last_error = str(e)
+            return False
+
+    async def _run(self, session_factory):
+        while True:
+            async with session_factory() as db:
+                await self.safe_reload(db)
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory):
+        """주기적 다시 읽기 시작 (비동기 세션 팩토리)"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        compiled = self._snapshot()
+        with self._lock:
+            overridden = sorted(self._overrides)
+        return {
+            "categories": len(compiled.weights),
+            "phrases": len(compiled.automaton.patterns),
+            "states": compiled.automaton.states,
+            "overridden_categories": overridden,
+            "prompt_name": self.prompt_name,
+            "compiled_at": self.compiled_at,
+            "reloaded_at": self.reloaded_at,
+            "last_error": self.last_error
+        }
+
+# 전역 제목 어휘 매처
+title_lexicon = TitleLexicon()
@@ -0,0 +1,169 @@
+"""
+제목 후보 순위 선정
+생성기가 만든 후보를 스트리밍으로 받아 상위 후보 풀만 힙으로 유지하고, MMR(최대 한계 관련성)로 서로 다른 제목을 고름
+- 후보 풀: 점수 상위 k x POOL_FACTOR 개만 유지 (전체 정렬 없이 O(n log 풀 크기)), 정규화 후 같은 제목은 점수 높은 쪽만
+- 유사도: 문자 2/3-gram 해시 벡터(L2 정규화)의 코사인 - NumPy 가 있으면 행렬 연산, 없으면 희소 벡터 내적
+- 선택: λ·정규화 점수 − (1−λ)·이미 고른 제목과의 최대 유사도 가 가장 큰 후보를 차례로,
+  거의 같은 제목(유사도 DUPLICATE_SIMILARITY 이상)은 다른 후보가 모두 떨어진 뒤에만
+"""
+
+import heapq
+import os
+import re
+import zlib
+from itertools import count as _counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from title_similarity import normalize_title
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 생성기가 만들 후보 수 = 요청 개수 x CANDIDATE_OVERSAMPLE
+CANDIDATE_OVERSAMPLE = int(os.getenv("TITLE_CANDIDATE_OVERSAMPLE", 3))
+POOL_FACTOR = int(os.getenv("TITLE_RANKING_POOL_FACTOR", 3))
+MAX_POOL_SIZE = 2000
+# 1 이면 점수만, 0 이면 다양성만
+MMR_LAMBDA = float(os.getenv("TITLE_MMR_LAMBDA", 0.7))
+DUPLICATE_SIMILARITY = float(os.getenv("TITLE_DUPLICATE_SIMILARITY", 0.85))
+VECTOR_DIMS = 1024
+NGRAM_SIZES = (2, 3)
+
+_DIGITS = re.compile(r"\d+")
+
+def _ngram_hashes(text: str) -> List[int]:
+    # 숫자만 다른 제목("3가지"/"7가지")은 같은 제목으로 봄
+    normalized = _DIGITS.sub("#", normalize_title(text))
+    if len(normalized) < min(NGRAM_SIZES):
+        return [zlib.crc32(normalized.encode("utf-8")) % VECTOR_DIMS] if normalized else []
+    return [
+        zlib.crc32(normalized[i:i + size].encode("utf-8")) % VECTOR_DIMS
+        for size in NGRAM_SIZES
+        for i in range(len(normalized) - size + 1)
+    ]
+
+def _ngram_matrix(texts: Sequence[str]):
+    """제목별 L2 정규화 n-gram 해시 벡터 (행) - 행끼리 내적이 코사인 유사도"""
+    vectors = np.zeros((len(texts), VECTOR_DIMS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        np.add.at(vectors[row], _ngram_hashes(text), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+def _sparse_vectors(texts: Sequence[str]) -> List[Dict[int, float]]:
+    vectors = []
+    for text in texts:
+        vector: Dict[int, float] = {}
+        for h in _ngram_hashes(text):
+            vector[h] = vector.get(h, 0.0) + 1.0
+        norm = sum(v * v for v in vector.values()) ** 0.5 or 1.0
+        vectors.append({h: v / norm for h, v in vector.items()})
+    return vectors
+
+def top_candidates(
+    candidates: Iterable[Dict[str, Any]],
+    size: int,
+    score_key: str,
+    text_key: str = "title"
+) -> List[Dict[str, Any]]:
+    """점수 상위 size 개 후보 (점수 내림차순) - 후보 전체를 메모리에 두지 않음, 정규화 후 같은 제목은 점수 높은 쪽만"""
+    heap: List[tuple] = []
+    in_heap: Dict[str, tuple] = {}
+    order = _counter()
+    for item in candidates:
+        if not item or not item.get(text_key):
+            continue
+        score = float(item.get(score_key) or 0.0)
+        key = normalize_title(item[text_key])
+        entry = (score, -next(order), key, item)
+        existing = in_heap.get(key)
+        if existing is not None:
+            if existing[0] >= score:
+                continue
+            heap[heap.index(existing)] = entry
+            heapq.heapify(heap)
+        elif len(heap) < size:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            evicted = heapq.heapreplace(heap, entry)
+            del in_heap[evicted[2]]
+        else:
+            continue
+        in_heap[key] = entry
+    heap.sort(key=lambda entry: entry[:2], reverse=True)
+    return [entry[3] for entry in heap]
+
+def mmr_select(
+    items: List[Dict[str, Any]],
+    k: int,
+    score_key: str,
+    text_key: str = "title",
+    mmr_lambda: float = MMR_LAMBDA,
+    duplicate_similarity: float = DUPLICATE_SIMILARITY
+) -> List[Dict[str, Any]]:
+    """점수 내림차순 후보에서 MMR 로 k 개 선택 (선택 순서대로)"""
+    if len(items) <= 1 or k <= 0:
+        return items[:max(k, 0)]
+    scores = [float(item.get(score_key) or 0.0) for item in items]
+    low, high = min(scores), max(scores)
+    spread = (high - low) or 1.0
+    relevance = [(score - low) / spread for score in scores]
+    texts = [item[text_key] for item in items]
+
+    if NUMPY_AVAILABLE:
+        vectors = _ngram_matrix(texts)
+        relevance_arr = np.asarray(relevance, dtype=np.float32) * mmr_lambda
+        max_similarity = np.zeros(len(items), dtype=np.float32)
+        available = np.ones(len(items), dtype=bool)
+        selected = []
+        for _ in range(min(k, len(items))):
+            value = relevance_arr - (1 - mmr_lambda) * max_similarity - (max_similarity >= duplicate_similarity)
+            value[~available] = -np.inf
+            chosen = int(np.argmax(value))
+            available[chosen] = False
+            selected.append(chosen)
+            np.maximum(max_similarity, vectors @ vectors[chosen], out=max_similarity)
+        return [items[i] for i in selected]
+
+    vectors = _sparse_vectors(texts)
+    max_sim = [0.0] * len(items)
+    remaining = set(range(len(items)))
+    selected = []
+
+    def marginal(i: int) -> tuple:
+        value = mmr_lambda * relevance[i] - (1 - mmr_lambda) * max_sim[i]
+        if max_sim[i] >= duplicate_similarity:
+            value -= 1.0
+        return value, -i
+
+    while remaining and len(selected) < k:
+        chosen = max(remaining, key=marginal)
+        remaining.discard(chosen)
+        selected.append(chosen)
+        base = vectors[chosen]
+        for i in remaining:
+            similarity = sum(v * vectors[i].get(h, 0.0) for h, v in base.items())
+            if similarity > max_sim[i]:
+                max_sim[i] = similarity
+    return [items[i] for i in selected]
+
+def rank_candidates(
+    candidates: Iterable[Dict[str, Any]],
+    k: int,
+    score_key: str,
+    text_key: str = "title",
+    mmr_lambda: float = MMR_LAMBDA,
+    pool_factor: int = POOL_FACTOR
+) -> List[Dict[str, Any]]:
+    """후보 스트림 → 상위 후보 풀 → MMR 다양성 선택 k 개"""
+    pool_size = min(max(k * pool_factor, k), MAX_POOL_SIZE)
+    pool = top_candidates(candidates, pool_size, score_key, text_key)
+    return mmr_select(pool, k, score_key, text_key, mmr_lambda)
+
+def candidate_budget(count: int, available: Optional[int] = None) -> int:
+    """생성기가 만들 후보 수 (요청 개수 x 배수, 만들 수 있는 개수 이내)"""
+    budget = max(count, 1) * CANDIDATE_OVERSAMPLE
+    return min(budget, available) if available is not None else budget
@@ -0,0 +1,217 @@
+"""
+제목 유사도 색인
+지금까지 생성/발행된 제목과의 최대 Jaccard 유사도(문자 shingle 기준)를 중복률로 계산
+- 제목 → 정규화(NFKC, 소문자, 공백/문장부호 제거) → 문자 3-gram shingle → MinHash 서명
+- LSH 밴드 버킷으로 후보만 골라 정확한 Jaccard 를 계산 (전체 제목 수와 무관하게 후보 수에 비례)
+- 전체 색인 하나에 제목별 사이트 목록을 두어 전체 중복률 / 사이트 내 중복률을 함께 계산
+- 새 제목은 저장 시점에 증분 추가, 서버 시작 시 DB 의 기존 제목으로 채움
+"""
+
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from logger import app_logger
+
+SHINGLE_SIZE = int(os.getenv("TITLE_SHINGLE_SIZE", 3))
+# 20 밴드 x 3 행 - Jaccard 0.5 인 쌍을 후보로 찾을 확률 약 93%, 0.3 은 약 42%
+LSH_BANDS = int(os.getenv("TITLE_LSH_BANDS", 20))
+LSH_ROWS = int(os.getenv("TITLE_LSH_ROWS", 3))
+# 흔한 패턴(“~하는 방법”)으로 후보가 많을 때 충돌 밴드가 많은 순으로 이만큼만 정확히 비교
+MAX_VERIFIED_CANDIDATES = 50
+# 템플릿 제목이 몰린 버킷은 변별력이 없으므로 최근 문서만 후보로
+MAX_BUCKET_SCAN = 500
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+def normalize_title(title: str) -> str:
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", title or "").lower())
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """정규화된 제목의 문자 n-gram 해시 집합 (짧은 제목은 전체를 하나로)"""
+    if len(normalized) <= size:
+        return {zlib.crc32(normalized.encode("utf-8"))} if normalized else set()
+    return {zlib.crc32(normalized[i:i + size].encode("utf-8")) for i in range(len(normalized) - size + 1)}
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class TitleSimilarityIndex:
+    """MinHash/LSH 제목 유사도 색인 (스레드 안전)"""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        # 해시 함수 족: shingle 해시(crc32)에 무작위 마스크 XOR - min(map(...)) 이 C 루프로 돌아 서명 계산이 빠름
+        self._masks = [rng.getrandbits(32) for _ in range(bands * rows)]
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._texts: List[str] = []              # 문서 번호 → 정규화된 제목
+        self._sites: List[Set[str]] = []         # 문서 번호 → 이 제목이 쓰인 사이트
+        self._doc_ids: Dict[str, int] = {}       # 정규화된 제목 → 문서 번호 (완전 일치는 색인 조회 없이)
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    # ---- MinHash / LSH ----
+
+    def _signature(self, hashes: Set[int]) -> List[int]:
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        rows = self.rows
+        return [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def _candidates(self, band_keys: List[int]) -> List[int]:
+        """충돌한 밴드 수가 많은 순으로 후보 문서 번호"""
+        hits: Dict[int, int] = {}
+        for bucket, key in zip(self._buckets, band_keys):
+            for doc in bucket.get(key, ())[-MAX_BUCKET_SCAN:]:
+                hits[doc] = hits.get(doc, 0) + 1
+        if len(hits) > MAX_VERIFIED_CANDIDATES:
+            return sorted(hits, key=hits.get, reverse=True)[:MAX_VERIFIED_CANDIDATES]
+        return list(hits)
+
+    # ---- 추가 ----
+
+    def add(self, title: str, site_id: Optional[Any] = None) -> bool:
+        """제목 추가 (같은 제목이 이미 있으면 사이트만 추가), 새 문서면 True"""
+        normalized = normalize_title(title)
+        hashes = shingles(normalized)
+        if not hashes:
+            return False
+        with self._lock:
+            doc = self._doc_ids.get(normalized)
+            if doc is not None:
+                if site_id is not None:
+                    self._sites[doc].add(str(site_id))
+                return False
+        band_keys = self._band_keys(self._signature(hashes))
+        with self._lock:
+            if normalized in self._doc_ids:
+                return self.add(title, site_id)
+            doc = len(self._texts)
+            self._texts.append(normalized)
+            self._sites.append({str(site_id)} if site_id is not None else set())
+            self._doc_ids[normalized] = doc
+            for bucket, key in zip(self._buckets, band_keys):
+                bucket.setdefault(key, []).append(doc)
+        return True
+
+    def add_many(self, titles: Iterable[str], site_id: Optional[Any] = None) -> int:
+        return sum(1 for title in titles if self.add(title, site_id))
+
+    # ---- 점수 ----
+
+    def _score_hashes(self, normalized: str, hashes: Set[int], site: Optional[str]) -> Tuple[float, float, Optional[str]]:
+        """(전체 최대 Jaccard, 사이트 내 최대 Jaccard, 가장 비슷한 제목)"""
+        with self._lock:
+            doc = self._doc_ids.get(normalized)
+            if doc is not None:
+                return 1.0, (1.0 if site is not None and site in self._sites[doc] else 0.0), self._texts[doc]
+        if not hashes:
+            return 0.0, 0.0, None
+        band_keys = self._band_keys(self._signature(hashes))
+        best, best_site, nearest = 0.0, 0.0, None
+        with self._lock:
+            candidates = [(self._texts[doc], self._sites[doc]) for doc in self._candidates(band_keys)]
+        for text, sites in candidates:
+            similarity = jaccard(hashes, shingles(text))
+            if similarity > best:
+                best, nearest = similarity, text
+            if site is not None and site in sites and similarity > best_site:
+                best_site = similarity
+        return best, best_site, nearest
+
+    def score(self, title: str, site_id: Optional[Any] = None) -> Dict[str, Any]:
+        return self.score_batch([title], site_id)[0]
+
+    def score_batch(self, titles: List[str], site_id: Optional[Any] = None, within_batch: bool = True) -> List[Dict[str, Any]]:
+        """후보 제목들의 중복률(%) - 기존 제목과의 최대 유사도
+
+        within_batch 이면 같은 배치의 앞선 후보와의 유사도도 반영 (비슷한 후보 중 첫 번째만 낮게 나옴).
+        """
+        site = str(site_id) if site_id is not None else None
+        results = []
+        seen: List[Tuple[str, Set[int]]] = []
+        for title in titles:
+            normalized = normalize_title(title)
+            hashes = shingles(normalized)
+            best, best_site, nearest = self._score_hashes(normalized, hashes, site)
+            if within_batch:
+                for other_text, other_hashes in seen:
+                    similarity = jaccard(hashes, other_hashes)
+                    if similarity > best:
+                        best, nearest = similarity, other_text
+                    best_site = max(best_site, similarity)
+                seen.append((normalized, hashes))
+            results.append({
+                "title": title,
+                "duplicate_rate": round(best * 100, 1),
+                "site_duplicate_rate": round(best_site * 100, 1) if site is not None else None,
+                "nearest_title": nearest
+            })
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "titles": len(self._texts),
+                "sites": len({site for sites in self._sites for site in sites}),
+                "bands": self.bands,
+                "rows": self.rows,
+                "loaded": self.loaded
+            }
+
+    # ---- 초기 적재 ----
+
+    def load_from_db(self, session_factory) -> int:
+        """생성 제목 / 자동화 제목 배치 / 발행된 포스팅 제목으로 색인 채우기"""
+        import json
+        from sqlalchemy import select
+        from models import GeneratedTitle, GeneratedTitleBatch, AutomationSession, PostingResult
+
+        started = time.perf_counter()
+        session = session_factory()
+        try:
+            for (title,) in session.execute(select(GeneratedTitle.title)).yield_per(1000):
+                self.add(title)
+            batches = session.execute(
+                select(GeneratedTitleBatch.titles_data, AutomationSession.site_id)
+                .join(AutomationSession, AutomationSession.id == GeneratedTitleBatch.session_id)
+            ).yield_per(200)
+            for titles_data, site_id in batches:
+                for item in json.loads(titles_data or "[]"):
+                    self.add(item.get("title"), site_id)
+            published = session.execute(
+                select(PostingResult.title, PostingResult.site_id).where(PostingResult.post_status == "published")
+            ).yield_per(1000)
+            for title, site_id in published:
+                self.add(title, site_id)
+        except Exception as e:
+            # 색인이 일부만 채워져도 점수 계산은 가능 - 서버 시작을 막지 않음
+            app_logger.error(f"Title similarity index load failed after {len(self._texts)} titles: {e}")
+        finally:
+            session.close()
+        self.loaded = True
+        count = len(self._texts)
+        app_logger.info(f"Title similarity index loaded: {count} titles in {time.perf_counter() - started:.1f}s")
+        return count
+
+# 전역 제목 유사도 색인
+title_index = TitleSimilarityIndex()
+
+def apply_duplicate_rates(items: List[Dict[str, Any]], site_id: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """{"title": ...} 목록의 duplicate_rate 를 색인 기준 실측값으로 채움"""
+    scores = title_index.score_batch([item["title"] for item in items], site_id)
+    for item, score in zip(items, scores):
+        item["duplicate_rate"] = score["duplicate_rate"]
+        if site_id is not None:
+            item["site_duplicate_rate"] = score["site_duplicate_rate"]
+    return items
@@ -9,6 +9,7 @@ import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from logger import app_logger
+from related_content import related_posts_html
 
 class WordPressAPI:
     def __init__(self):
@@ -168,19 +169,23 @@ class WordPressAPI:
         tags: List[str] = None,
         featured_image_id: Optional[int] = None,
         scheduled_time: Optional[datetime] = None,
-        excerpt: str = ""
+        excerpt: str = "",
+        related_posts: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
-        """블로그 글 발행"""
+        """블로그 글 발행 (related_posts 가 있으면 본문 끝에 관련 글 링크 목록 추가)"""
         
         app_logger.info(f"WordPress 포스팅 시작: {title}")
         
         try:
             # 포스팅 데이터 준비
+            excerpt = excerpt or content[:150].replace('\n', ' ')
+            if related_posts:
+                content += related_posts_html(related_posts, content)
             post_data = {
                 "title": title,
                 "content": content,
                 "status": status,
-                "excerpt": excerpt[:150] if excerpt else content[:150].replace('\n', ' ')
+                "excerpt": excerpt[:150]
             }
             
             # 카테고리 설정
@@ -71,8 +71,10 @@ CREATE TABLE IF NOT EXISTS generated_titles (
 );
 
 -- Generated content table
+-- Range-partitioned by month on created_at (partitions are created by the backend),
+-- so the partition key is part of the primary key and references use (id, created_at)
 CREATE TABLE IF NOT EXISTS generated_content (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     title_id UUID REFERENCES generated_titles(id) ON DELETE CASCADE,
     content TEXT NOT NULL,
     keywords TEXT[], -- Additional keywords used in content
@@ -81,18 +83,38 @@ CREATE TABLE IF NOT EXISTS generated_content (
     copyscape_result VARCHAR(20) DEFAULT 'Pending',
     ai_model VARCHAR(50),
     created_by UUID REFERENCES users(id),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Rows outside the monthly partitions land here until their month is created
+CREATE TABLE IF NOT EXISTS generated_content_default PARTITION OF generated_content DEFAULT;
+
+-- Tables referencing generated_content copy its created_at into content_created_at.
+-- A NULL there would make the (content_id, content_created_at) foreign key skip its check,
+-- so the trigger below fills it from content_id and a CHECK rejects rows it could not resolve
+CREATE OR REPLACE FUNCTION set_content_created_at() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.content_id IS NOT NULL AND NEW.content_created_at IS NULL THEN
+        SELECT created_at INTO NEW.content_created_at FROM generated_content WHERE id = NEW.content_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
 
 -- Generated images table
 CREATE TABLE IF NOT EXISTS generated_images (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    content_id UUID REFERENCES generated_content(id) ON DELETE CASCADE,
+    content_id UUID,
+    content_created_at TIMESTAMP WITH TIME ZONE,
     image_url VARCHAR(500) NOT NULL,
     image_prompt TEXT,
     ai_model VARCHAR(50),
     created_by UUID REFERENCES users(id),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    
+    CHECK (content_id IS NULL OR content_created_at IS NOT NULL),
+    FOREIGN KEY (content_id, content_created_at) REFERENCES generated_content(id, created_at) ON DELETE CASCADE
 );
 
 -- Platform configurations for blog posting
@@ -112,7 +134,8 @@ CREATE TABLE IF NOT EXISTS platform_configs (
 -- Scheduled posts table
 CREATE TABLE IF NOT EXISTS scheduled_posts (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    content_id UUID REFERENCES generated_content(id) ON DELETE CASCADE,
+    content_id UUID,
+    content_created_at TIMESTAMP WITH TIME ZONE,
     platform_config_id UUID REFERENCES platform_configs(id) ON DELETE CASCADE,
     scheduled_time TIMESTAMP WITH TIME ZONE NOT NULL,
     status VARCHAR(20) DEFAULT 'Scheduled' CHECK (status IN ('Scheduled', 'Publishing', 'Published', 'Failed')),
@@ -121,19 +144,26 @@ CREATE TABLE IF NOT EXISTS scheduled_posts (
     retry_count INTEGER DEFAULT 0,
     created_by UUID REFERENCES users(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    
+    CHECK (content_id IS NULL OR content_created_at IS NOT NULL),
+    FOREIGN KEY (content_id, content_created_at) REFERENCES generated_content(id, created_at) ON DELETE CASCADE
 );
 
 -- Post publishing logs
+-- Append-only and range-partitioned by month on created_at like generated_content
 CREATE TABLE IF NOT EXISTS post_publish_logs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     scheduled_post_id UUID REFERENCES scheduled_posts(id) ON DELETE CASCADE,
     attempt_number INTEGER NOT NULL,
     status VARCHAR(20) NOT NULL,
     response_data JSONB,
     error_message TEXT,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS post_publish_logs_default PARTITION OF post_publish_logs DEFAULT;
 
 -- User settings and preferences
 CREATE TABLE IF NOT EXISTS user_settings (
@@ -166,7 +196,8 @@ CREATE TABLE IF NOT EXISTS api_keys (
 CREATE TABLE IF NOT EXISTS seo_analytics (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    content_id UUID REFERENCES generated_content(id) ON DELETE CASCADE,
+    content_id UUID,
+    content_created_at TIMESTAMP WITH TIME ZONE,
     url VARCHAR(500),
     page_views INTEGER DEFAULT 0,
     click_through_rate DECIMAL(5, 2) DEFAULT 0.00,
@@ -175,7 +206,9 @@ CREATE TABLE IF NOT EXISTS seo_analytics (
     date_recorded DATE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
-    UNIQUE(content_id, date_recorded)
+    UNIQUE(content_id, date_recorded),
+    CHECK (content_id IS NULL OR content_created_at IS NOT NULL),
+    FOREIGN KEY (content_id, content_created_at) REFERENCES generated_content(id, created_at) ON DELETE CASCADE
 );
 
 -- Team permissions (for future team features)
@@ -187,6 +220,25 @@ CREATE TABLE IF NOT EXISTS team_permissions (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Fill content_created_at for generated_content references
+-- (the UPDATEs backfill rows written before the column was populated)
+UPDATE generated_images gi SET content_created_at = gc.created_at
+FROM generated_content gc WHERE gi.content_id = gc.id AND gi.content_created_at IS NULL;
+UPDATE scheduled_posts sp SET content_created_at = gc.created_at
+FROM generated_content gc WHERE sp.content_id = gc.id AND sp.content_created_at IS NULL;
+UPDATE seo_analytics sa SET content_created_at = gc.created_at
+FROM generated_content gc WHERE sa.content_id = gc.id AND sa.content_created_at IS NULL;
+
+DROP TRIGGER IF EXISTS generated_images_content_created_at ON generated_images;
+CREATE TRIGGER generated_images_content_created_at BEFORE INSERT OR UPDATE OF content_id ON generated_images
+    FOR EACH ROW EXECUTE FUNCTION set_content_created_at();
+DROP TRIGGER IF EXISTS scheduled_posts_content_created_at ON scheduled_posts;
+CREATE TRIGGER scheduled_posts_content_created_at BEFORE INSERT OR UPDATE OF content_id ON scheduled_posts
+    FOR EACH ROW EXECUTE FUNCTION set_content_created_at();
+DROP TRIGGER IF EXISTS seo_analytics_content_created_at ON seo_analytics;
+CREATE TRIGGER seo_analytics_content_created_at BEFORE INSERT OR UPDATE OF content_id ON seo_analytics
+    FOR EACH ROW EXECUTE FUNCTION set_content_created_at();
+
 -- Indexes for performance optimization
 CREATE INDEX IF NOT EXISTS idx_keywords_country ON keywords(country_id);
 CREATE INDEX IF NOT EXISTS idx_keywords_created_by ON keywords(created_by);
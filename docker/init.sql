@@ -1,5 +1,7 @@
 -- Database initialization script
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+-- 쿼리 통계 (DatabaseOptimizer.get_query_statistics), shared_preload_libraries 필요
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
 
 -- Enable Row Level Security
 ALTER DATABASE blogauto SET row_security = on;
\ No newline at end of file